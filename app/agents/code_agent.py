@@ -16,15 +16,23 @@ def create_code_agent() -> Agent:
         model=create_ultra_fast_gemini(),
         tools=[
             code_tools.analyze_python_file,
+            code_tools.analyze_python_project,
+            code_tools.find_symbol,
             code_tools.check_code_style,
-            code_tools.generate_docstring
+            code_tools.check_code_style_batch,
+            code_tools.generate_docstring,
+            code_tools.generate_module_docstrings
         ],
         instructions=[
             "Você é um assistente especializado em programação e desenvolvimento.",
             "Você tem acesso a ferramentas de análise de código:",
-            "- analyze_python_file: analisa estrutura de arquivos Python",
+            "- analyze_python_file: analisa estrutura e complexidade de arquivos Python (métricas por função e hot spots)",
+            "- analyze_python_project: analisa um projeto inteiro de uma vez (totais, módulos e grafo de imports)",
+            "- find_symbol: encontra definições, imports e usos de um símbolo em um projeto (índice persistente)",
             "- check_code_style: verifica estilo com flake8",
+            "- check_code_style_batch: verifica o estilo de vários arquivos ou diretórios de uma vez",
             "- generate_docstring: gera documentação para funções",
+            "- generate_module_docstrings: gera, em uma chamada, docstrings para tudo que falta em um arquivo (retorna um patch)",
             "Analise código de forma detalhada e forneça sugestões de melhoria.",
             "Explique conceitos de programação de forma clara e didática.",
             "Sempre inclua exemplos práticos quando apropriado.",
@@ -25,6 +25,7 @@ def create_github_agent() -> Agent:
         tools=[
             github_tools.search_repositories,
             github_tools.get_repository_info,
+            github_tools.get_repositories_info,
             github_tools.get_repository_issues,
             github_tools.get_user_info
         ],
@@ -38,12 +39,14 @@ def create_github_agent() -> Agent:
             "",
             "📊 INFORMAÇÕES DE REPOSITÓRIOS:",
             "- Use get_repository_info para detalhes completos de um repo",
+            "- Use get_repositories_info para vários repos de uma vez (chamadas em paralelo)",
             "- Inclua estatísticas, linguagens, tópicos, e metadados",
             "- Forneça links úteis e informações de uso",
             "",
             "🐛 ISSUES E PROBLEMAS:",
             "- Use get_repository_issues para listar issues abertas/fechadas",
             "- Filtre por estado, labels, ou autor",
+            "- Para repositórios grandes, use max_items para percorrer várias páginas",
             "- Ajude a entender o status do projeto",
             "",
             "👤 INFORMAÇÕES DE USUÁRIOS:",
@@ -3,29 +3,33 @@ from agno.models.google import Gemini
 from app.config.gemini_simple import create_ultra_fast_gemini
 from agno.storage.sqlite import SqliteStorage
 from config.settings import get_storage_path
-from mcp.mcp_tools import MCPTools
+from mcp.mcp_tools import HEALTH_REFRESH_INTERVAL, MCPTools
 
 def create_mcp_agent() -> Agent:
     """Cria um agente para conexão com serviços MCP."""
     
-    # Inicializar ferramentas MCP
-    mcp_tools = MCPTools()
+    # Inicializar ferramentas MCP (health mantido quente em segundo plano)
+    mcp_tools = MCPTools(health_refresh_interval=HEALTH_REFRESH_INTERVAL)
     
     return Agent(
         name="MCP Agent",
         model=create_ultra_fast_gemini(),
         tools=[
             mcp_tools.register_mcp_server,
+            mcp_tools.unregister_mcp_server,
             mcp_tools.list_mcp_servers,
             mcp_tools.call_mcp_service,
+            mcp_tools.call_mcp_batch,
             mcp_tools.check_mcp_health
         ],
         instructions=[
             "Você é um agente especializado em conectar com serviços MCP.",
             "Você tem acesso a ferramentas MCP:",
-            "- register_mcp_server: registra um novo servidor MCP",
+            "- register_mcp_server: registra um novo servidor MCP (o registro persiste entre reinícios)",
+            "- unregister_mcp_server: remove um servidor do registro",
             "- list_mcp_servers: lista todos os servidores registrados",
             "- call_mcp_service: faz chamadas para serviços MCP",
+            "- call_mcp_batch: faz várias chamadas MCP de uma vez (prefira quando precisar de vários endpoints)",
             "- check_mcp_health: verifica saúde dos servidores",
             "Facilite a comunicação entre diferentes sistemas e protocolos.",
             "Forneça informações sobre conectividade e status dos serviços.",
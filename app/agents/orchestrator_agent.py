@@ -66,13 +66,18 @@ def create_orchestrator_agent() -> Agent:
         ),
         # Ferramentas de código
         code_tools.analyze_python_file,
+        code_tools.analyze_python_project,
+        code_tools.find_symbol,
         code_tools.check_code_style,
+        code_tools.check_code_style_batch,
         code_tools.generate_docstring,
+        code_tools.generate_module_docstrings,
         # Ferramentas de dados
         data_tools.load_csv,
         data_tools.create_visualization,
         data_tools.statistical_summary,
-        data_tools.correlation_analysis
+        data_tools.correlation_analysis,
+        data_tools.query_dataset
     ]
     
     # Adicionar ferramentas GitHub MCP se disponíveis
@@ -80,6 +85,7 @@ def create_orchestrator_agent() -> Agent:
         all_tools.extend([
             github_tools.search_repositories,
             github_tools.get_repository_info,
+            github_tools.get_repositories_info,
             github_tools.get_repository_issues,
             github_tools.get_user_info
         ])
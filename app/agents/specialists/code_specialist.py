@@ -21,8 +21,12 @@ def create_code_specialist() -> Agent:
         model=create_ultra_fast_gemini(),
         tools=[
             code_tools.analyze_python_file,
+            code_tools.analyze_python_project,
+            code_tools.find_symbol,
             code_tools.check_code_style,
-            code_tools.generate_docstring
+            code_tools.check_code_style_batch,
+            code_tools.generate_docstring,
+            code_tools.generate_module_docstrings
         ],
         instructions=[
             "Você é um especialista em desenvolvimento de software com expertise em:",
@@ -32,14 +36,21 @@ def create_code_specialist() -> Agent:
             "- Identificação de classes, funções e imports",
             "",
             "Ferramentas disponíveis:",
-            "- analyze_python_file: analisa estrutura de arquivos Python",
+            "- analyze_python_file: analisa estrutura e complexidade de arquivos Python (métricas por função e hot spots)",
+            "- analyze_python_project: analisa um projeto inteiro de uma vez (totais, módulos e grafo de imports)",
+            "- find_symbol: encontra definições, imports e usos de um símbolo em um projeto (índice persistente)",
             "- check_code_style: verifica estilo usando flake8",
+            "- check_code_style_batch: verifica o estilo de vários arquivos ou diretórios de uma vez",
             "- generate_docstring: gera docstrings para funções",
+            "- generate_module_docstrings: gera, em uma chamada, docstrings para tudo que falta em um arquivo (retorna um patch)",
             "",
             "Diretrizes:",
             "- Sempre analise a estrutura antes de fazer sugestões",
+            "- Para perguntas sobre um repositório ou diretório, use analyze_python_project em vez de analisar arquivo por arquivo",
+            "- Para saber onde algo é definido ou usado, use find_symbol antes de abrir arquivos",
             "- Use verificação de estilo para identificar problemas",
             "- Gere documentação clara e útil",
+            "- Para documentar um arquivo inteiro, use generate_module_docstrings em vez de uma chamada por função",
             "- Foque em melhorias práticas e implementáveis"
         ],
         storage=SqliteStorage(
@@ -23,7 +23,8 @@ def create_data_specialist() -> Agent:
             data_tools.load_csv,
             data_tools.create_visualization,
             data_tools.statistical_summary,
-            data_tools.correlation_analysis
+            data_tools.correlation_analysis,
+            data_tools.query_dataset
         ],
         instructions=[
             "Você é um especialista em análise de dados e visualização com expertise em:",
@@ -38,6 +39,11 @@ def create_data_specialist() -> Agent:
             "- create_visualization: cria gráficos e visualizações",
             "- statistical_summary: calcula estatísticas descritivas",
             "- correlation_analysis: analisa correlações entre variáveis",
+            "- query_dataset: filtros, agrupamentos e agregações sobre o dataset completo",
+            "",
+            "Após load_csv, passe o dataset_id retornado às demais ferramentas",
+            "em vez de reenviar o conteúdo CSV completo. Arquivos enviados por",
+            "upload já chegam com um dataset_id que abre o dataset completo.",
             "",
             "Diretrizes:",
             "- Sempre forneça contexto e interpretação para os resultados",
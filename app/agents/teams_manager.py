@@ -6,35 +6,51 @@ Implementa uma arquitetura estruturada com diferentes modos de operação:
 - Collaborate: Todos os agentes trabalham na mesma tarefa
 
 Baseado na documentação oficial: https://docs.agno.com/teams/introduction
+
+A importação deste módulo não tem efeitos colaterais: agno, os especialistas,
+o .env e o banco de memória só são carregados quando o gerenciador é criado
+via get_teams_manager() (ou create_teams_manager()).
 """
 
 import os
-from typing import Dict, List, Optional, Any
+import importlib
+import threading
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Any
 import logging
-from pathlib import Path
-from dotenv import load_dotenv
-
-# Carregar variáveis de ambiente
-load_dotenv()
 
-from agno.agent import Agent
-from agno.team import Team
-from agno.models.google import Gemini
-from agno.storage.sqlite import SqliteStorage
 from app.config.gemini_simple import create_ultra_fast_gemini
-from agno.memory.v2.db.sqlite import SqliteMemoryDb
-from agno.memory.v2.memory import Memory
-# Importar agentes especializados
-from .specialists.data_specialist import create_data_specialist
-from .specialists.code_specialist import create_code_specialist  
-from .specialists.finance_specialist import create_finance_specialist
-from .specialists.web_specialist import create_web_specialist
-from .specialists.github_specialist import create_github_specialist
+from app.config.settings import get_storage_path
 
-from config.settings import get_storage_path
+if TYPE_CHECKING:
+    from agno.agent import Agent
+    from agno.team import Team
 
 logger = logging.getLogger(__name__)
 
+def _lazy_specialist_factory(module_name: str, factory_name: str) -> Callable[[], "Agent"]:
+    """Retorna uma fábrica que só importa o módulo do especialista quando chamada."""
+    def factory() -> "Agent":
+        module = importlib.import_module(f".specialists.{module_name}", __package__)
+        return getattr(module, factory_name)()
+    factory.__name__ = factory_name
+    return factory
+
+# Fábricas dos especialistas disponíveis, por chave curta
+SPECIALIST_FACTORIES: Dict[str, Callable[[], "Agent"]] = {
+    "data": _lazy_specialist_factory("data_specialist", "create_data_specialist"),
+    "code": _lazy_specialist_factory("code_specialist", "create_code_specialist"),
+    "finance": _lazy_specialist_factory("finance_specialist", "create_finance_specialist"),
+    "web": _lazy_specialist_factory("web_specialist", "create_web_specialist"),
+    "github": _lazy_specialist_factory("github_specialist", "create_github_specialist"),
+}
+
+# Campos do Agent com o contexto do team em que ele roda (o Team os grava no
+# membro ao inicializá-lo): ficam fora da cópia de cada team
+_TEAM_CONTEXT_FIELDS = (
+    "agent_id", "agent_session", "team_id", "team_session_id",
+    "team_session_state", "workflow_session_state",
+)
+
 class AgnoTeamsManager:
     """Gerenciador centralizado dos teams do Agno.
     
@@ -48,15 +64,38 @@ class AgnoTeamsManager:
     - Histórico de conversas 
     - Session summaries
     - Configuração flexível de teams
+    
+    Teams e especialistas são construídos sob demanda e memoizados: um team só
+    é criado na primeira vez em que é solicitado, e cada especialista é
+    instanciado uma única vez. Cada team recebe um Agent próprio sobre o
+    modelo, as ferramentas e o storage desse especialista, para que o
+    contexto que o Team grava no membro (team_id, sessão, estado) não vaze
+    de um team para outro.
     """
     
     def __init__(self, enable_memory: bool = True, enable_history: bool = True):
-        self.teams: Dict[str, Team] = {}
+        from dotenv import load_dotenv
+        
+        # Carregar variáveis de ambiente
+        load_dotenv()
+        
+        self.teams: Dict[str, "Team"] = {}
+        self._specialists: Dict[str, "Agent"] = {}
+        self._team_builders: Dict[str, Callable[[], "Team"]] = {
+            "main": self.create_main_assistant_team,
+            "research": self.create_research_team,
+            "development": self.create_development_team,
+            "analysis": self.create_analysis_team,
+        }
+        self._lock = threading.RLock()
         self.enable_memory = enable_memory
         self.enable_history = enable_history
         
         # Configurar memória persistente se habilitada
         if self.enable_memory:
+            from agno.memory.v2.db.sqlite import SqliteMemoryDb
+            from agno.memory.v2.memory import Memory
+            
             self.memory_db = SqliteMemoryDb(
                 table_name="teams_memory", 
                 db_file=get_storage_path("teams_memory.db")
@@ -71,6 +110,45 @@ class AgnoTeamsManager:
             raise ValueError("GOOGLE_API_KEY não encontrada nas variáveis de ambiente. Configure no arquivo .env")
         
         self.default_model = create_ultra_fast_gemini()
+    
+    def get_specialist(self, key: str) -> "Agent":
+        """Retorna o especialista compartilhado, criando-o no primeiro uso."""
+        if key not in SPECIALIST_FACTORIES:
+            raise ValueError(f"Especialista inválido: {key}")
+        
+        with self._lock:
+            specialist = self._specialists.get(key)
+            if specialist is None:
+                specialist = SPECIALIST_FACTORIES[key]()
+                self._specialists[key] = specialist
+                logger.debug(f"Especialista '{key}' criado")
+            return specialist
+    
+    def _member_for_team(self, key: str) -> "Agent":
+        """Agent novo para um team, reaproveitando as partes caras do especialista memoizado."""
+        import copy
+        from dataclasses import fields
+
+        specialist = self.get_specialist(key)
+        values = {}
+        for field in fields(specialist):
+            value = getattr(specialist, field.name)
+            if field.name in _TEAM_CONTEXT_FIELDS or value is None:
+                continue
+            # Modelo, ferramentas e storage são os mesmos objetos; listas e
+            # dicts são copiados para que um team não altere o de outro
+            values[field.name] = copy.copy(value) if isinstance(value, (list, dict, set)) else value
+        return type(specialist)(**values)
+    
+    def _get_specialists(self, keys: List[str]) -> List["Agent"]:
+        """Retorna um Agent por especialista para um novo team."""
+        return [self._member_for_team(key) for key in keys]
+    
+    @staticmethod
+    def _new_team(**kwargs: Any) -> "Team":
+        """Instancia um Team do agno (importado apenas quando necessário)."""
+        from agno.team import Team
+        return Team(**kwargs)
         
     def _get_common_team_config(self, name: str, mode: str, description: str) -> Dict[str, Any]:
         """Retorna configuração comum para todos os teams."""
@@ -98,21 +176,15 @@ class AgnoTeamsManager:
             
         return config
         
-    def create_main_assistant_team(self) -> Team:
+    def create_main_assistant_team(self) -> "Team":
         """Cria o team principal que atua como assistente geral (Route Mode).
         
         Este team analisa a solicitação do usuário e direciona para o 
         especialista mais apropriado. É o ponto de entrada principal.
         """
         
-        # Criar agentes especializados
-        specialists = [
-            create_data_specialist(),
-            create_code_specialist(),
-            create_finance_specialist(),
-            create_web_specialist(),
-            create_github_specialist()
-        ]
+        # Especialistas compartilhados entre os teams
+        specialists = self._get_specialists(["data", "code", "finance", "web", "github"])
         
         # Configuração do team principal
         config = self._get_common_team_config(
@@ -146,7 +218,7 @@ class AgnoTeamsManager:
             "• 'github', 'repositório', 'git', 'commit' → GitHub Specialist",
         ]
         
-        main_team = Team(
+        main_team = self._new_team(
             members=specialists,
             instructions=instructions,
             **config
@@ -155,7 +227,7 @@ class AgnoTeamsManager:
         self.teams["main"] = main_team
         return main_team
     
-    def create_research_team(self) -> Team:
+    def create_research_team(self) -> "Team":
         """Cria um team especializado em pesquisa (Coordinate Mode).
         
         Este team coordena múltiplos especialistas para realizar pesquisas
@@ -163,11 +235,7 @@ class AgnoTeamsManager:
         """
         
         # Especialistas para pesquisa
-        research_specialists = [
-            create_web_specialist(),
-            create_data_specialist(), 
-            create_github_specialist()
-        ]
+        research_specialists = self._get_specialists(["web", "data", "github"])
         
         config = self._get_common_team_config(
             name="Research Team",
@@ -196,7 +264,7 @@ class AgnoTeamsManager:
             "• Todas as fontes e links relevantes citados",
         ]
         
-        research_team = Team(
+        research_team = self._new_team(
             members=research_specialists,
             instructions=instructions,
             **config
@@ -205,7 +273,7 @@ class AgnoTeamsManager:
         self.teams["research"] = research_team
         return research_team
     
-    def create_development_team(self) -> Team:
+    def create_development_team(self) -> "Team":
         """Cria um team especializado em desenvolvimento (Collaborate Mode).
         
         Este team permite que múltiplos especialistas trabalhem 
@@ -214,11 +282,11 @@ class AgnoTeamsManager:
         """
         
         # Especialistas para desenvolvimento
-        dev_specialists = [
-            create_code_specialist(),
-            create_github_specialist(),
-            create_data_specialist()  # Para análise de logs/métricas
-        ]
+        dev_specialists = self._get_specialists([
+            "code",
+            "github",
+            "data"  # Para análise de logs/métricas
+        ])
         
         config = self._get_common_team_config(
             name="Development Team",
@@ -248,7 +316,7 @@ class AgnoTeamsManager:
             "• Workflows de desenvolvimento",
         ]
         
-        dev_team = Team(
+        dev_team = self._new_team(
             members=dev_specialists,
             instructions=instructions,
             **config
@@ -257,7 +325,7 @@ class AgnoTeamsManager:
         self.teams["development"] = dev_team
         return dev_team
     
-    def create_analysis_team(self) -> Team:
+    def create_analysis_team(self) -> "Team":
         """Cria um team especializado em análise de dados (Coordinate Mode).
         
         Este team coordena especialistas em dados, finanças e web para
@@ -265,11 +333,7 @@ class AgnoTeamsManager:
         """
         
         # Especialistas para análise
-        analysis_specialists = [
-            create_data_specialist(),
-            create_finance_specialist(),
-            create_web_specialist()
-        ]
+        analysis_specialists = self._get_specialists(["data", "finance", "web"])
         
         config = self._get_common_team_config(
             name="Analysis Team", 
@@ -299,7 +363,7 @@ class AgnoTeamsManager:
             "• Limitações e sugestões para análises futuras",
         ]
         
-        analysis_team = Team(
+        analysis_team = self._new_team(
             members=analysis_specialists,
             instructions=instructions,
             **config
@@ -308,13 +372,18 @@ class AgnoTeamsManager:
         self.teams["analysis"] = analysis_team
         return analysis_team
     
-    def get_team(self, team_name: str) -> Optional[Team]:
-        """Retorna um team específico."""
-        return self.teams.get(team_name)
+    def get_team(self, team_name: str) -> Optional["Team"]:
+        """Retorna um team específico, construindo os teams padrão no primeiro uso."""
+        team = self.teams.get(team_name)
+        if team is None and team_name in self._team_builders:
+            with self._lock:
+                team = self.teams.get(team_name) or self._team_builders[team_name]()
+        return team
     
     def list_teams(self) -> List[str]:
-        """Lista todos os teams disponíveis."""
-        return list(self.teams.keys())
+        """Lista todos os teams disponíveis (inclusive os ainda não construídos)."""
+        custom_teams = [name for name in self.teams if name not in self._team_builders]
+        return list(self._team_builders) + custom_teams
     
     def get_team_info(self, team_name: str) -> Optional[Dict[str, Any]]:
         """Retorna informações detalhadas sobre um team."""
@@ -337,7 +406,7 @@ class AgnoTeamsManager:
                           mode: str, 
                           specialists: List[str],
                           description: str = "",
-                          custom_instructions: List[str] = None) -> Team:
+                          custom_instructions: List[str] = None) -> "Team":
         """Cria um team customizado com especialistas específicos.
         
         Args:
@@ -348,22 +417,13 @@ class AgnoTeamsManager:
             custom_instructions: Instruções específicas (opcional)
         """
         
-        # Mapeamento de especialistas
-        specialist_map = {
-            "data": create_data_specialist,
-            "code": create_code_specialist,
-            "finance": create_finance_specialist,
-            "web": create_web_specialist,
-            "github": create_github_specialist
-        }
-        
         # Validar especialistas
-        invalid_specialists = [s for s in specialists if s not in specialist_map]
+        invalid_specialists = [s for s in specialists if s not in SPECIALIST_FACTORIES]
         if invalid_specialists:
             raise ValueError(f"Especialistas inválidos: {invalid_specialists}")
             
-        # Criar instâncias dos especialistas
-        team_members = [specialist_map[s]() for s in specialists]
+        # Reutilizar as instâncias compartilhadas dos especialistas
+        team_members = self._get_specialists(specialists)
         
         # Configuração do team
         config = self._get_common_team_config(name, mode, description)
@@ -378,7 +438,7 @@ class AgnoTeamsManager:
                 "📋 Trabalhem de acordo com o modo configurado.",
             ]
         
-        custom_team = Team(
+        custom_team = self._new_team(
             members=team_members,
             instructions=instructions,
             **config
@@ -390,19 +450,13 @@ class AgnoTeamsManager:
         
         return custom_team
     
-    def initialize_all_teams(self) -> Dict[str, Team]:
+    def initialize_all_teams(self) -> Dict[str, "Team"]:
         """Inicializa todos os teams padrão disponíveis."""
-        teams = {
-            "main": self.create_main_assistant_team(),
-            "research": self.create_research_team(),
-            "development": self.create_development_team(),
-            "analysis": self.create_analysis_team(),
-        }
-        return teams
+        return {name: self.get_team(name) for name in self._team_builders}
     
     def get_session_summary(self, team_name: str) -> Optional[str]:
         """Retorna o resumo da sessão para um team específico."""
-        team = self.get_team(team_name)
+        team = self.teams.get(team_name)
         if team and hasattr(team, 'get_session_summary'):
             summary = team.get_session_summary()
             return summary.summary if summary else None
@@ -410,14 +464,29 @@ class AgnoTeamsManager:
     
     def clear_team_history(self, team_name: str) -> bool:
         """Limpa o histórico de um team específico."""
-        team = self.get_team(team_name)
+        team = self.teams.get(team_name)
         if team and hasattr(team, 'clear_conversation'):
             team.clear_conversation()
             return True
         return False
 
-# Instância global do gerenciador com configuração padrão
-teams_manager = AgnoTeamsManager(enable_memory=True, enable_history=True)
+# Instância global do gerenciador, criada no primeiro uso
+_teams_manager: Optional[AgnoTeamsManager] = None
+_teams_manager_lock = threading.Lock()
+
+def get_teams_manager() -> AgnoTeamsManager:
+    """Retorna o gerenciador global com configuração padrão, criando-o no primeiro uso."""
+    global _teams_manager
+    with _teams_manager_lock:
+        if _teams_manager is None:
+            _teams_manager = AgnoTeamsManager(enable_memory=True, enable_history=True)
+        return _teams_manager
+
+def __getattr__(name: str) -> Any:
+    # Compatibilidade com `from app.agents.teams_manager import teams_manager`
+    if name == "teams_manager":
+        return get_teams_manager()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # Função utilitária para criar team manager customizado
 def create_teams_manager(enable_memory: bool = True, enable_history: bool = True) -> AgnoTeamsManager:
@@ -431,4 +500,4 @@ TEAM_MODES = {
     "COLLABORATE": "collaborate"
 }
 
-AVAILABLE_SPECIALISTS = ["data", "code", "finance", "web", "github"]
+AVAILABLE_SPECIALISTS = list(SPECIALIST_FACTORIES)
@@ -17,6 +17,9 @@ Este playground implementa a arquitetura avançada de Teams do Agno com:
 Uso:
 python agno_teams_playground.py
 
+Ou, via application factory (nada é inicializado na importação):
+uvicorn app.backend.agno_teams_playground:create_app --factory --port 7777
+
 Baseado na documentação oficial: https://docs.agno.com/teams/introduction
 """
 
@@ -28,67 +31,52 @@ project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
 import os
-from dotenv import load_dotenv
-
-# Carregar variáveis de ambiente do .env
-load_dotenv(project_root / ".env")
 import sys
 import logging
-from typing import List, Dict, Any, Optional
+from typing import TYPE_CHECKING, List, Dict, Any, Optional
 from pathlib import Path
-from dotenv import load_dotenv
-
-# Carregar variáveis de ambiente
-load_dotenv()
 
 # Adicionar o diretório raiz ao path
 sys.path.append(str(Path(__file__).parent))
 
-import agno.agent
-import agno.team
-import agno.models.google
-import agno.playground
-import agno.storage.sqlite
+# agno e os especialistas só são importados quando o playground é montado
+# (create_app()/main()), não na importação do módulo
+from app.agents.teams_manager import SPECIALIST_FACTORIES
+from app.config.gemini_simple import create_ultra_fast_gemini
+
+from app.config.settings import get_storage_path
 
-# Importar classes específicas
-from agno.agent import Agent
-from agno.team import Team
-from agno.models.google import Gemini
-from agno.playground import Playground
-from agno.storage.sqlite import SqliteStorage
+if TYPE_CHECKING:
+    from agno.agent import Agent
+    from agno.playground import Playground
+    from agno.team import Team
 
-# Tentar importar memória v2, caso não exista usar básica
-try:
-    from agno.memory.v2.db.sqlite import SqliteMemoryDb
-    from agno.memory.v2.memory import Memory
-    MEMORY_V2_AVAILABLE = True
-except ImportError:
+logger = logging.getLogger(__name__)
+
+def _memory_classes():
+    """Classes de memória persistente do agno (v2, se existir) ou (None, None)."""
     try:
-        from agno.memory.db.sqlite import SqliteMemoryDb
-        from agno.memory.memory import Memory
-        MEMORY_V2_AVAILABLE = False
+        from agno.memory.v2.db.sqlite import SqliteMemoryDb
+        from agno.memory.v2.memory import Memory
     except ImportError:
-        # Sem memória persistente disponível
-        SqliteMemoryDb = None
-        Memory = None
-        MEMORY_V2_AVAILABLE = False
-
-# Importar especialistas
-from app.agents.specialists.data_specialist import create_data_specialist
-from app.agents.specialists.code_specialist import create_code_specialist
-from app.agents.specialists.finance_specialist import create_finance_specialist
-from app.agents.specialists.web_specialist import create_web_specialist
-from app.agents.specialists.github_specialist import create_github_specialist
-from app.config.gemini_simple import create_ultra_fast_gemini
+        try:
+            from agno.memory.db.sqlite import SqliteMemoryDb
+            from agno.memory.memory import Memory
+        except ImportError:
+            # Sem memória persistente disponível
+            return None, None
+    return SqliteMemoryDb, Memory
 
-from app.config.settings import get_storage_path
+def configure_environment():
+    """Carrega o .env e configura o logging (chamado pelos pontos de entrada, não na importação)."""
+    from dotenv import load_dotenv
 
-# Configurar logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
-logger = logging.getLogger(__name__)
+    load_dotenv(project_root / ".env")
+    load_dotenv()
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
 
 class AgnoTeamsPlayground:
     """Playground moderno para Teams do Agno com interface web."""
@@ -109,7 +97,8 @@ class AgnoTeamsPlayground:
         self.default_model = create_ultra_fast_gemini()
         
         # Configurar memória persistente
-        if self.enable_memory:
+        SqliteMemoryDb, Memory = _memory_classes()
+        if self.enable_memory and Memory is not None:
             self.memory_db = SqliteMemoryDb(
                 table_name="teams_memory", 
                 db_file=get_storage_path("teams_memory.db")
@@ -121,45 +110,17 @@ class AgnoTeamsPlayground:
         self.teams = {}
         self.playground = None
         
-    def create_specialists(self) -> List[Agent]:
+    def create_specialists(self) -> List["Agent"]:
         """Cria todos os agentes especialistas."""
         specialists = []
         
         try:
-            # Data Specialist
-            data_specialist = create_data_specialist()
-            data_specialist.model = self.default_model
-            if self.memory:
-                data_specialist.memory = self.memory
-            specialists.append(data_specialist)
-            
-            # Code Specialist
-            code_specialist = create_code_specialist()
-            code_specialist.model = self.default_model
-            if self.memory:
-                code_specialist.memory = self.memory
-            specialists.append(code_specialist)
-            
-            # Finance Specialist
-            finance_specialist = create_finance_specialist()
-            finance_specialist.model = self.default_model
-            if self.memory:
-                finance_specialist.memory = self.memory
-            specialists.append(finance_specialist)
-            
-            # Web Specialist
-            web_specialist = create_web_specialist()
-            web_specialist.model = self.default_model
-            if self.memory:
-                web_specialist.memory = self.memory
-            specialists.append(web_specialist)
-            
-            # GitHub Specialist
-            github_specialist = create_github_specialist()
-            github_specialist.model = self.default_model
-            if self.memory:
-                github_specialist.memory = self.memory
-            specialists.append(github_specialist)
+            for factory in SPECIALIST_FACTORIES.values():
+                specialist = factory()
+                specialist.model = self.default_model
+                if self.memory:
+                    specialist.memory = self.memory
+                specialists.append(specialist)
             
             logger.info(f"✅ {len(specialists)} especialistas criados com sucesso!")
             return specialists
@@ -168,8 +129,9 @@ class AgnoTeamsPlayground:
             logger.error(f"Erro ao criar especialistas: {e}")
             raise
     
-    def create_main_team_leader(self, specialists: List[Agent]) -> Team:
+    def create_main_team_leader(self, specialists: List["Agent"]) -> "Team":
         """Cria o Team Leader principal que implementa o fluxo completo."""
+        from agno.team import Team
         
         config = {
             "name": "🧠 Agno Teams Leader",
@@ -259,8 +221,9 @@ Especialistas disponíveis:
         
         return Team(**config)
     
-    def create_playground(self) -> Playground:
+    def create_playground(self) -> "Playground":
         """Cria o playground web com o Team Leader principal."""
+        from agno.playground import Playground
         
         try:
             # Criar especialistas
@@ -286,6 +249,18 @@ Especialistas disponíveis:
             logger.error(f"Erro ao criar playground: {e}")
             raise
     
+    def get_app(self):
+        """App FastAPI do playground com os endpoints de artefatos (gráficos) e datasets."""
+        from app.backend.artifacts_api import create_artifacts_router
+        from app.backend.datasets_api import create_datasets_router
+
+        if not self.playground:
+            self.create_playground()
+        app = self.playground.get_app()
+        app.include_router(create_artifacts_router())
+        app.include_router(create_datasets_router())
+        return app
+    
     def run(self):
         """Inicia o playground web."""
         
@@ -306,7 +281,7 @@ Especialistas disponíveis:
             print(f"🚀 Iniciando servidor...")
             
             # Servir o playground
-            app = self.playground.get_app()
+            app = self.get_app()
             self.playground.serve(
                 app,
                 port=self.port,
@@ -319,9 +294,21 @@ Especialistas disponíveis:
             logger.error(f"Erro ao executar playground: {e}")
             raise
 
+def create_app(port: int = 7777, enable_memory: bool = True):
+    """Application factory: monta o playground e retorna o app FastAPI.
+    
+    Toda a inicialização (.env, modelos, memória, especialistas) acontece aqui,
+    no primeiro uso, e não na importação do módulo.
+    """
+    configure_environment()
+    playground = AgnoTeamsPlayground(port=port, enable_memory=enable_memory)
+    return playground.get_app()
+
 def main():
     """Função principal."""
     
+    configure_environment()
+    
     try:
         # Verificar dependências
         print("🔍 Verificando configuração...")
@@ -0,0 +1,40 @@
+"""
+Endpoint HTTP que serve os artefatos (gráficos PNG) gravados pelas ferramentas.
+
+Os IDs são endereçados por conteúdo, então a resposta pode ser cacheada para
+sempre pelo navegador/proxies; ``If-None-Match`` recebe 304.
+"""
+
+from typing import Optional
+
+from fastapi import APIRouter, Header, HTTPException
+from fastapi.responses import FileResponse, Response
+
+from app.tools.artifacts import ARTIFACTS_ROUTE, ArtifactStore, get_artifact_store
+
+# Conteúdo imutável: o ID muda se os bytes mudarem
+CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+def create_artifacts_router(store: Optional[ArtifactStore] = None) -> APIRouter:
+    """Cria o router com ``GET /v1/artifacts/{artifact_id}``."""
+    router = APIRouter()
+
+    @router.get(ARTIFACTS_ROUTE + "/{artifact_id}")
+    def get_artifact(artifact_id: str, if_none_match: Optional[str] = Header(default=None)):
+        artifact_store = store or get_artifact_store()
+        if not artifact_store.exists(artifact_id):
+            raise HTTPException(status_code=404, detail="Artefato não encontrado")
+
+        etag = f'"{artifact_id}"'
+        headers = {"Cache-Control": CACHE_CONTROL, "ETag": etag}
+        if if_none_match and etag in [tag.strip() for tag in if_none_match.split(",")]:
+            return Response(status_code=304, headers=headers)
+
+        return FileResponse(
+            artifact_store.path_for(artifact_id),
+            media_type=artifact_store.content_type(artifact_id),
+            headers=headers
+        )
+
+    return router
@@ -0,0 +1,74 @@
+"""
+Endpoints de upload de datasets.
+
+O frontend envia o CSV uma vez em ``POST /v1/datasets``; o arquivo é convertido
+para o formato colunar do ``DatasetStore`` e a resposta traz o ``dataset_id``,
+que o chat passa às ferramentas de dados no lugar do conteúdo.
+
+Se o arquivo só acrescenta linhas a um dataset já resumido (o mesmo CSV diário
+reenviado), o resumo estatístico é atualizado lendo apenas as linhas novas.
+"""
+
+import hashlib
+import os
+import tempfile
+from typing import Optional
+
+from fastapi import APIRouter, File, HTTPException, UploadFile
+
+from app.tools.data_tools_simple import DATASET_ID_PREFIX
+from app.tools.dataset_store import HASH_BLOCK_SIZE, DatasetStore, get_dataset_store
+from app.tools.summaries import SummaryStore, get_summary_store
+
+# Rota HTTP dos datasets
+DATASETS_ROUTE = "/v1/datasets"
+
+
+def _spool_upload(upload: UploadFile, directory: str):
+    """Copia o upload para um arquivo temporário calculando o ID pelo conteúdo."""
+    digest = hashlib.blake2b(digest_size=8)
+    fd, tmp_path = tempfile.mkstemp(prefix=".upload.", suffix=".csv", dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            for block in iter(lambda: upload.file.read(HASH_BLOCK_SIZE), b""):
+                digest.update(block)
+                f.write(block)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+    return f"{DATASET_ID_PREFIX}{digest.hexdigest()}", tmp_path
+
+
+def create_datasets_router(store: Optional[DatasetStore] = None,
+                           summaries: Optional[SummaryStore] = None) -> APIRouter:
+    """Cria o router com ``POST /v1/datasets`` e ``GET /v1/datasets/{dataset_id}``."""
+    router = APIRouter()
+
+    @router.post(DATASETS_ROUTE)
+    def upload_dataset(file: UploadFile = File(...)):
+        dataset_store = store or get_dataset_store()
+        os.makedirs(dataset_store.directory, exist_ok=True)
+        dataset_id, tmp_path = _spool_upload(file, dataset_store.directory)
+        try:
+            meta = {**dataset_store.ingest_csv(tmp_path, dataset_id=dataset_id), "filename": file.filename}
+            summary_store = summaries or get_summary_store()
+            if summary_store.get(dataset_id) is None:
+                with open(tmp_path, "rb") as source:
+                    summary = summary_store.extend(source, dataset_id)
+                if summary is not None:
+                    meta.update(base_dataset_id=summary.base_dataset_id, new_rows=summary.delta_rows)
+        except Exception as e:
+            raise HTTPException(status_code=400, detail=f"Não foi possível converter o CSV: {e}")
+        finally:
+            os.remove(tmp_path)
+
+        return meta
+
+    @router.get(DATASETS_ROUTE + "/{dataset_id}")
+    def get_dataset(dataset_id: str):
+        try:
+            return (store or get_dataset_store()).info(dataset_id)
+        except KeyError:
+            raise HTTPException(status_code=404, detail="Dataset não encontrado")
+
+    return router
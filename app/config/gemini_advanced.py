@@ -1,13 +1,12 @@
 """
 Configuração avançada para controlar AFC do Gemini
+
+A configuração global de AFC é aplicada apenas quando um modelo é criado
+(ou ao chamar configure_afc_globally explicitamente), nunca na importação.
 """
 
 import os
 from typing import Any, Dict
-from dotenv import load_dotenv
-
-# Carregar .env
-load_dotenv()
 
 def configure_afc_globally():
     """
@@ -54,6 +53,10 @@ def create_afc_optimized_gemini():
     Cria Gemini com configuração AFC otimizada.
     """
     from agno.models.google import Gemini
+    from dotenv import load_dotenv
+    
+    # Carregar .env apenas quando o modelo é de fato criado
+    load_dotenv()
     
     # Configurar AFC antes de criar o modelo
     configure_afc_globally()
@@ -101,6 +104,3 @@ def create_afc_optimized_gemini():
     # Se todas falharam, usar configuração básica
     from .gemini_simple import create_ultra_fast_gemini
     return create_ultra_fast_gemini()
-
-# Executar configuração na importação
-configure_afc_globally()
@@ -1,9 +1,100 @@
 """
 Configuração simples e funcional para Gemini com foco em latência
+
+O módulo não tem efeitos colaterais na importação: agno/google-genai só são
+importados, e as variáveis de AFC só são definidas, quando o primeiro modelo
+é criado.
 """
 
 import os
-from agno.models.google import Gemini
+import threading
+from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple
+
+if TYPE_CHECKING:
+    from agno.models.google import Gemini
+    from google import genai
+
+# Limites do pool HTTP compartilhado pelos modelos Gemini
+MAX_CONNECTIONS = 20
+MAX_KEEPALIVE_CONNECTIONS = 10
+KEEPALIVE_EXPIRY_SECONDS = 120.0
+
+# Parâmetros do modelo padrão usado pelos especialistas e teams
+ULTRA_FAST_PARAMS: Dict[str, Any] = {
+    "id": "gemini-2.0-flash-lite",  # Modelo mais rápido disponível
+    "temperature": 0.01,            # EXTREMAMENTE baixa para respostas diretas
+    "max_output_tokens": 600,       # Ainda mais reduzido para velocidade
+    "top_p": 0.6,                   # Muito determinístico
+    "top_k": 10,                    # Muito limitado para velocidade máxima
+}
+
+_registry_lock = threading.Lock()
+_shared_clients: Dict[str, "genai.Client"] = {}
+_shared_models: Dict[Tuple, "Gemini"] = {}
+
+def get_shared_client(api_key: Optional[str] = None) -> Optional["genai.Client"]:
+    """
+    Retorna o cliente google-genai compartilhado para a API key, com pool de
+    conexões limitado e keep-alive. Sem API key retorna None e o modelo cria
+    o cliente sob demanda, como antes.
+    """
+    api_key = api_key or os.getenv("GOOGLE_API_KEY")
+    if not api_key:
+        return None
+    
+    with _registry_lock:
+        client = _shared_clients.get(api_key)
+        if client is None:
+            import httpx
+            from google import genai
+            from google.genai import types
+            
+            limits = httpx.Limits(
+                max_connections=MAX_CONNECTIONS,
+                max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=KEEPALIVE_EXPIRY_SECONDS,
+            )
+            client = genai.Client(
+                api_key=api_key,
+                http_options=types.HttpOptions(
+                    client_args={"limits": limits},
+                    async_client_args={"limits": limits},
+                ),
+            )
+            _shared_clients[api_key] = client
+        return client
+
+def get_shared_gemini(**params: Any) -> "Gemini":
+    """
+    Retorna uma instância Gemini compartilhada por (id do modelo, parâmetros).
+    
+    Todas as instâncias usam o mesmo cliente HTTP, de modo que os especialistas
+    de um team reaproveitam conexões TLS já abertas.
+    """
+    key = tuple(sorted(params.items()))
+    with _registry_lock:
+        model = _shared_models.get(key)
+    if model is not None:
+        return model
+    
+    from agno.models.google import Gemini
+    
+    setup_afc_environment()
+    client = get_shared_client(params.get("api_key"))
+    with _registry_lock:
+        model = _shared_models.get(key)
+        if model is None:
+            model = Gemini(**params, client=client) if client else Gemini(**params)
+            _shared_models[key] = model
+        return model
+
+def reset_model_registry():
+    """
+    Descarta modelos e clientes compartilhados (útil em testes ou após trocar a API key).
+    """
+    with _registry_lock:
+        _shared_models.clear()
+        _shared_clients.clear()
 
 def create_fast_gemini():
     """
@@ -11,7 +102,7 @@ def create_fast_gemini():
     AFC será controlado via variáveis de ambiente.
     """
     
-    return Gemini(
+    return get_shared_gemini(
         id="gemini-2.0-flash-lite",  # Modelo mais rápido
         temperature=0.3,             # Respostas mais diretas
         max_output_tokens=2048,      # Limite balanceado
@@ -23,7 +114,7 @@ def create_simple_gemini():
     """
     Cria Gemini com configuração mínima para máxima compatibilidade.
     """
-    return Gemini(
+    return get_shared_gemini(
         id="gemini-2.0-flash-lite",
         temperature=0.3
     )
@@ -38,15 +129,6 @@ def setup_afc_environment():
 
 def create_ultra_fast_gemini():
     """
-    Cria Gemini otimizado para latência e processamento direto.
+    Retorna o Gemini compartilhado otimizado para latência e processamento direto.
     """
-    return Gemini(
-        id="gemini-2.0-flash-lite",  # Modelo mais rápido disponível
-        temperature=0.01,            # EXTREMAMENTE baixa para respostas diretas
-        max_output_tokens=600,       # Ainda mais reduzido para velocidade
-        top_p=0.6,                   # Muito determinístico
-        top_k=10,                    # Muito limitado para velocidade máxima
-    )
-    
-# Executar na importação para aplicar configurações
-setup_afc_environment()
+    return get_shared_gemini(**ULTRA_FAST_PARAMS)
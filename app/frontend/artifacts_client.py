@@ -0,0 +1,52 @@
+"""
+Busca dos artefatos (gráficos PNG) referenciados nas respostas dos agentes.
+
+As ferramentas de visualização retornam URLs ``/v1/artifacts/<id>`` em vez de
+imagens base64; o frontend extrai esses IDs do texto e baixa os bytes direto
+do backend.
+"""
+
+import re
+import threading
+from collections import OrderedDict
+from typing import List, Optional
+
+import requests
+
+# Mesmo formato de app.tools.artifacts (sem importar o lado do backend)
+ARTIFACT_REFERENCE = re.compile(r"/v1/artifacts/(art_[0-9a-f]{32}\.png)")
+
+# Timeout do download de um artefato (segundos)
+FETCH_TIMEOUT = 10
+
+# Artefatos mantidos em memória (são imutáveis: o ID muda se o conteúdo mudar)
+MAX_CACHED_ARTIFACTS = 64
+
+_cache: "OrderedDict[str, bytes]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def extract_artifact_ids(text: str) -> List[str]:
+    """IDs de artefatos citados no texto, na ordem e sem repetição."""
+    return list(dict.fromkeys(ARTIFACT_REFERENCE.findall(text or "")))
+
+
+def fetch_artifact(backend_url: str, artifact_id: str) -> Optional[bytes]:
+    """Baixa o artefato do backend (None se não existir ou o backend falhar)."""
+    with _cache_lock:
+        if artifact_id in _cache:
+            _cache.move_to_end(artifact_id)
+            return _cache[artifact_id]
+
+    try:
+        response = requests.get(f"{backend_url}/v1/artifacts/{artifact_id}", timeout=FETCH_TIMEOUT)
+    except requests.RequestException:
+        return None
+    if response.status_code != 200:
+        return None
+
+    with _cache_lock:
+        _cache[artifact_id] = response.content
+        while len(_cache) > MAX_CACHED_ARTIFACTS:
+            _cache.popitem(last=False)
+    return response.content
@@ -0,0 +1,29 @@
+"""
+Upload de CSVs para o store colunar do backend.
+
+Em vez de colar o CSV (truncado) na mensagem do chat, o frontend envia o
+arquivo inteiro para ``POST /v1/datasets`` e passa só o ``dataset_id`` aos
+agentes.
+"""
+
+from typing import Any, Dict, Optional
+
+import requests
+
+# Timeout do upload (segundos): a conversão acontece na mesma requisição
+UPLOAD_TIMEOUT = 300
+
+
+def upload_dataset(backend_url: str, filename: str, data: bytes) -> Optional[Dict[str, Any]]:
+    """Envia o CSV e retorna os metadados do dataset (None se o backend falhar)."""
+    try:
+        response = requests.post(
+            f"{backend_url}/v1/datasets",
+            files={"file": (filename, data, "text/csv")},
+            timeout=UPLOAD_TIMEOUT
+        )
+    except requests.RequestException:
+        return None
+    if response.status_code != 200:
+        return None
+    return response.json()
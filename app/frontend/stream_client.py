@@ -0,0 +1,119 @@
+"""
+Cliente de streaming para as runs de teams do Agno Playground.
+
+Com ``stream=true`` o playground responde com uma sequência de eventos JSON
+(objetos concatenados, ou linhas ``data:`` no formato SSE) à medida que o team
+gera a resposta. Este módulo decodifica esses eventos de forma incremental
+para que o frontend exiba os tokens assim que chegam.
+"""
+
+import json
+from typing import Any, Dict, Iterable, Iterator
+
+import requests
+
+# Eventos com trechos incrementais da resposta do team (eventos dos membros
+# são ignorados, como na resposta sem streaming)
+CONTENT_EVENTS = {"TeamRunResponseContent"}
+
+# Eventos de conclusão (trazem o conteúdo final completo)
+COMPLETED_EVENTS = {"TeamRunCompleted"}
+
+# Eventos de erro emitidos pelo playground durante a run
+ERROR_EVENTS = {"TeamRunError"}
+
+# Timeout de conexão e timeout máximo de silêncio entre eventos (segundos)
+CONNECT_TIMEOUT = 10
+READ_TIMEOUT = 180
+
+
+class TeamStreamError(Exception):
+    """Erro reportado pelo backend (ou pela conexão) durante uma run em streaming."""
+
+
+def iter_stream_events(chunks: Iterable[str]) -> Iterator[Dict[str, Any]]:
+    """Decodifica eventos JSON de um stream de texto à medida que ficam completos.
+
+    Aceita objetos JSON concatenados (formato do Agno Playground) e também
+    linhas SSE ``data: {...}``; linhas ``event:``/``id:``/comentários e
+    linhas completas que não são JSON (``data: [DONE]``) são ignoradas.
+    """
+    decoder = json.JSONDecoder()
+    buffer = ""
+
+    for chunk in chunks:
+        buffer += chunk
+        while True:
+            buffer = buffer.lstrip()
+            if buffer.startswith("data:"):
+                buffer = buffer[len("data:"):].lstrip()
+            elif buffer.startswith(("event:", "id:", "retry:", ":")):
+                newline = buffer.find("\n")
+                if newline == -1:
+                    break
+                buffer = buffer[newline + 1:]
+                continue
+
+            if not buffer:
+                break
+            try:
+                event, end = decoder.raw_decode(buffer)
+            except json.JSONDecodeError as e:
+                # Evento incompleto falha no fim do buffer: aguardar o próximo
+                # trecho. Com uma quebra de linha depois do erro a linha está
+                # completa e não é JSON (ex.: "data: [DONE]"): descartá-la
+                newline = buffer.find("\n", e.pos)
+                if newline == -1:
+                    break
+                buffer = buffer[newline + 1:]
+                continue
+
+            buffer = buffer[end:]
+            if isinstance(event, dict):
+                yield event
+
+
+def stream_team_run(backend_url: str, team_id: str, message: str) -> Iterator[str]:
+    """Executa uma run do team em modo streaming e gera os trechos de texto.
+
+    Raises:
+        TeamStreamError: se o backend responder com erro ou a conexão falhar.
+    """
+    files = {
+        'message': (None, message),
+        'stream': (None, 'true')
+    }
+
+    try:
+        with requests.post(
+            f"{backend_url}/v1/playground/teams/{team_id}/runs",
+            files=files,
+            stream=True,
+            timeout=(CONNECT_TIMEOUT, READ_TIMEOUT)
+        ) as response:
+            if response.status_code != 200:
+                raise TeamStreamError(f"Erro do servidor: {response.status_code} - {response.text}")
+
+            response.encoding = response.encoding or "utf-8"
+            received_content = False
+
+            for event in iter_stream_events(response.iter_content(chunk_size=None, decode_unicode=True)):
+                event_type = event.get("event")
+                content = event.get("content")
+
+                if event_type in ERROR_EVENTS:
+                    raise TeamStreamError(str(content or "Erro durante a execução do team"))
+                if event_type in CONTENT_EVENTS and content:
+                    received_content = True
+                    yield content if isinstance(content, str) else json.dumps(content, ensure_ascii=False)
+                elif event_type in COMPLETED_EVENTS and content and not received_content:
+                    # Backends sem eventos incrementais: usar o conteúdo final
+                    yield content if isinstance(content, str) else json.dumps(content, ensure_ascii=False)
+
+    except requests.exceptions.Timeout:
+        raise TeamStreamError(
+            "⏱️ **Timeout** - O backend parou de enviar dados. "
+            "Tente novamente com uma pergunta mais específica ou aguarde um momento."
+        )
+    except requests.exceptions.ConnectionError:
+        raise TeamStreamError("🔌 **Conexão perdida** - Verifique se o backend está rodando na porta 7777.")
@@ -9,6 +9,9 @@ Uso:
 streamlit run streamlit_frontend.py
 """
 
+import sys
+from pathlib import Path
+
 import streamlit as st
 import requests
 import json
@@ -19,6 +22,14 @@ import time
 from typing import Optional, Dict, Any, List
 import logging
 
+# Adicionar diretório raiz do projeto ao PYTHONPATH
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.frontend.artifacts_client import extract_artifact_ids, fetch_artifact
+from app.frontend.datasets_client import upload_dataset
+from app.frontend.stream_client import TeamStreamError, stream_team_run
+
 # Configuração da página
 st.set_page_config(
     page_title="🧠 Agno Teams",
@@ -64,32 +75,48 @@ def get_teams():
         logger.error(f"Erro ao buscar teams: {e}")
         return []
 
+def build_enhanced_message(message: str, file_content: Optional[str] = None) -> str:
+    """Monta a mensagem final com o conteúdo do arquivo anexado, se houver"""
+    enhanced_message = message
+    
+    # Se há arquivo anexado, processar conforme o tipo
+    if file_content:
+        try:
+            import json
+            # Tentar carregar como JSON estruturado (novos uploads)
+            file_data = json.loads(file_content)
+            filename = file_data.get('filename', 'arquivo')
+            file_type = file_data.get('type', 'unknown')
+            
+            if file_type == 'csv' and file_data.get('dataset_id'):
+                # CSV completo já está no backend: enviar só o ID e uma prévia
+                enhanced_message = (
+                    f"{message}\n\n📊 **Dataset anexado**: {filename} "
+                    f"(dataset_id: `{file_data['dataset_id']}`, {file_data.get('rows', '?')} linhas)\n"
+                    f"```csv\n{file_data['content'][:2000]}\n```\n\n"
+                    f"Use o dataset_id `{file_data['dataset_id']}` nas ferramentas de dados "
+                    "(load_csv, statistical_summary, correlation_analysis) para analisar o dataset completo."
+                )
+            
+            elif file_type == 'csv':
+                enhanced_message = f"{message}\n\n📊 **Arquivo CSV anexado**: {filename}\n```csv\n{file_data['content'][:2000]}...\n```\n\nPor favor, analise este dataset CSV completo."
+            
+            elif file_type == 'pdf':
+                enhanced_message = f"{message}\n\n📄 **Arquivo PDF anexado**: {filename}\n[Conteúdo em Base64 - {file_data['size']} bytes]\n\nPor favor, extraia e analise o texto deste PDF."
+            
+            elif file_type in ['xls', 'xlsx']:
+                enhanced_message = f"{message}\n\n📊 **Planilha Excel anexada**: {filename}\n[Arquivo {file_type.upper()} em Base64 - {file_data['size']} bytes]\n\nPor favor, processe esta planilha e analise os dados."
+            
+        except (json.JSONDecodeError, KeyError):
+            # Fallback para uploads antigos (texto simples)
+            enhanced_message = f"{message}\n\nArquivo CSV carregado para análise:\n```csv\n{file_content[:2000]}...\n```"
+    
+    return enhanced_message
+
 def send_message_to_team(message: str, team_id: str, file_content: Optional[str] = None):
-    """Envia mensagem para um team específico"""
+    """Envia mensagem para um team específico (sem streaming)"""
     try:
-        enhanced_message = message
-        
-        # Se há arquivo anexado, processar conforme o tipo
-        if file_content:
-            try:
-                import json
-                # Tentar carregar como JSON estruturado (novos uploads)
-                file_data = json.loads(file_content)
-                filename = file_data.get('filename', 'arquivo')
-                file_type = file_data.get('type', 'unknown')
-                
-                if file_type == 'csv':
-                    enhanced_message = f"{message}\n\n📊 **Arquivo CSV anexado**: {filename}\n```csv\n{file_data['content'][:2000]}...\n```\n\nPor favor, analise este dataset CSV completo."
-                
-                elif file_type == 'pdf':
-                    enhanced_message = f"{message}\n\n📄 **Arquivo PDF anexado**: {filename}\n[Conteúdo em Base64 - {file_data['size']} bytes]\n\nPor favor, extraia e analise o texto deste PDF."
-                
-                elif file_type in ['xls', 'xlsx']:
-                    enhanced_message = f"{message}\n\n📊 **Planilha Excel anexada**: {filename}\n[Arquivo {file_type.upper()} em Base64 - {file_data['size']} bytes]\n\nPor favor, processe esta planilha e analise os dados."
-                
-            except (json.JSONDecodeError, KeyError):
-                # Fallback para uploads antigos (texto simples)
-                enhanced_message = f"{message}\n\nArquivo CSV carregado para análise:\n```csv\n{file_content[:2000]}...\n```"
+        enhanced_message = build_enhanced_message(message, file_content)
         
         # Preparar dados da execução usando multipart/form-data (formato correto da API)
         files = {
@@ -222,6 +249,7 @@ def render_sidebar():
                 st.info(f"📤 Processando arquivo {file_extension.upper()}...")
                 
                 file_content = None
+                dataset = None
                 
                 if file_extension == 'csv':
                     # Processar CSV (método ultra-simples)
@@ -246,6 +274,16 @@ def render_sidebar():
                     
                     st.success(f"✅ CSV carregado: {uploaded_file.name}")
                     st.info(f"📊 {len(data_lines)} linhas de dados")
+                    
+                    # Converter no backend para o store colunar (uma vez por arquivo:
+                    # o Streamlit reexecuta o script a cada interação)
+                    upload_key = getattr(uploaded_file, "file_id", uploaded_file.name)
+                    uploads = st.session_state.setdefault("dataset_uploads", {})
+                    if upload_key not in uploads:
+                        uploads[upload_key] = upload_dataset(BACKEND_URL, uploaded_file.name, file_bytes)
+                    dataset = uploads[upload_key]
+                    if dataset:
+                        st.info(f"🗄️ Dataset completo disponível: {dataset['dataset_id']}")
                 
                 elif file_extension == 'pdf':
                     # Processar PDF - enviar como base64 para o backend
@@ -296,7 +334,10 @@ def render_sidebar():
                 # Preparar dados para envio
                 if file_content:
                     # Limitar tamanho se muito grande (especialmente para CSV)
-                    if file_extension == 'csv' and len(file_content) > 30000:
+                    if file_extension == 'csv' and dataset:
+                        # Os agentes leem o dataset pelo ID; a mensagem leva só uma prévia
+                        file_content = '\n'.join(file_content.strip().split('\n')[:20])
+                    elif file_extension == 'csv' and len(file_content) > 30000:
                         lines = file_content.strip().split('\n')
                         sample_lines = lines[:100]
                         file_content = '\n'.join(sample_lines)
@@ -309,6 +350,9 @@ def render_sidebar():
                         "type": file_extension,
                         "size": uploaded_file.size
                     }
+                    if dataset:
+                        upload_data["dataset_id"] = dataset["dataset_id"]
+                        upload_data["rows"] = dataset["rows"]
                     
                     # Converter para string JSON para compatibilidade
                     import json
@@ -376,6 +420,15 @@ def render_sidebar():
         
         return True
 
+def render_artifacts(content: str):
+    """Exibe os gráficos (artefatos) referenciados na resposta do assistente"""
+    for artifact_id in extract_artifact_ids(content):
+        image = fetch_artifact(BACKEND_URL, artifact_id)
+        if image is not None:
+            st.image(image)
+        else:
+            st.caption(f"🖼️ Gráfico {artifact_id} indisponível")
+
 def render_chat():
     """Renderiza área de chat principal"""
     st.title("💬 Chat com Agno Teams")
@@ -414,6 +467,7 @@ def render_chat():
                         st.markdown(content)
                     else:
                         st.write(content)
+                    render_artifacts(content)
     
     # Input de mensagem
     if prompt := st.chat_input("Digite sua mensagem para os agentes..."):
@@ -449,28 +503,21 @@ def render_chat():
                 else:
                     st.caption("📎 Arquivo anexado")
         
-        # Processa resposta do backend
+        # Processa resposta do backend em streaming: os tokens são exibidos
+        # à medida que o team os gera, em vez de esperar a run inteira
         with st.chat_message("assistant"):
-            with st.spinner("🤔 Os agentes estão analisando..."):
-                # Envia para o team selecionado
-                response = send_message_to_team(
-                    message=prompt,
+            try:
+                content = st.write_stream(stream_team_run(
+                    BACKEND_URL,
                     team_id=st.session_state.selected_team_id,
-                    file_content=st.session_state.uploaded_file_data
-                )
-                
-                if "error" in response:
-                    st.error(f"❌ {response['error']}")
-                    content = f"Erro: {response['error']}"
-                else:
-                    # Processa resposta bem-sucedida
-                    content = response.get("response", response.get("message", "Resposta processada"))
-                    
-                    # Exibe resposta
-                    if "```" in content:
-                        st.markdown(content)
-                    else:
-                        st.write(content)
+                    message=build_enhanced_message(prompt, st.session_state.uploaded_file_data)
+                ))
+                if not isinstance(content, str):
+                    content = "".join(str(part) for part in content)
+                render_artifacts(content)
+            except TeamStreamError as e:
+                st.error(f"❌ {e}")
+                content = f"Erro: {e}"
         
         # Salva resposta no histórico
         st.session_state.messages.append({
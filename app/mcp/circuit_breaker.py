@@ -0,0 +1,87 @@
+"""
+Circuit breaker para servidores MCP.
+
+- closed: chamadas passam normalmente; falhas consecutivas são contadas
+- open: após ``failure_threshold`` falhas as chamadas falham na hora, sem rede
+- half_open: passado ``reset_timeout``, uma única chamada de teste é liberada;
+  sucesso fecha o circuito, falha o abre de novo
+"""
+
+import threading
+import time
+from typing import Any, Dict
+
+# Falhas consecutivas que abrem o circuito
+DEFAULT_FAILURE_THRESHOLD = 3
+
+# Tempo (segundos) com o circuito aberto antes da chamada de teste
+DEFAULT_RESET_TIMEOUT = 30.0
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Circuit breaker thread-safe com contagem de falhas e teste half-open."""
+
+    def __init__(self, failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+                 reset_timeout: float = DEFAULT_RESET_TIMEOUT):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == OPEN and self._reset_elapsed():
+                return HALF_OPEN
+            return self._state
+
+    def _reset_elapsed(self) -> bool:
+        return time.monotonic() - self._opened_at >= self.reset_timeout
+
+    def retry_in(self) -> float:
+        """Segundos até a próxima chamada de teste (0 se já liberada)."""
+        with self._lock:
+            if self._state != OPEN:
+                return 0.0
+            return max(0.0, self.reset_timeout - (time.monotonic() - self._opened_at))
+
+    def allow(self) -> bool:
+        """Indica se uma chamada pode ir à rede agora."""
+        with self._lock:
+            if self._state == CLOSED:
+                return True
+            if self._state == OPEN and self._reset_elapsed():
+                self._state = HALF_OPEN
+                self._probe_in_flight = False
+            if self._state == HALF_OPEN and not self._probe_in_flight:
+                # Apenas uma chamada de teste por vez
+                self._probe_in_flight = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._state = CLOSED
+            self._failures = 0
+            self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            self._probe_in_flight = False
+            if self._state == HALF_OPEN or self._failures >= self.failure_threshold:
+                self._state = OPEN
+                self._opened_at = time.monotonic()
+
+    def to_dict(self) -> Dict[str, Any]:
+        state = self.state
+        with self._lock:
+            failures = self._failures
+        return {"state": state, "failures": failures, "retry_in": round(self.retry_in(), 3)}
@@ -1,65 +1,388 @@
 """
 Exemplo de MCP especializado para GitHub API
 """
+import asyncio
+import hashlib
 import requests
 import json
-from typing import Dict, Any, List, Optional
-from mcp.mcp_tools import MCPTools
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
+from typing import Callable, Dict, Any, Iterable, Iterator, List, Optional
+from requests.adapters import HTTPAdapter
+from requests.utils import parse_header_links
+from app.mcp.http_cache import HTTPResponseCache
+from app.mcp.mcp_tools import MCPTools
+
+# Timeout padrão das chamadas à API (segundos)
+REQUEST_TIMEOUT = 10
+
+# Conexões keep-alive mantidas pelo pool (sync e async)
+POOL_MAXSIZE = 10
+
+# Máximo de chamadas simultâneas em operações de fan-out
+MAX_CONCURRENT_REQUESTS = 10
+
+# Maior página aceita pela API do GitHub
+MAX_PER_PAGE = 100
+
+# Páginas (requisições) no máximo por chamada de ferramenta com max_items:
+# issues descartam pull requests, e sem limite um repositório quase só de PRs
+# viraria dezenas de requisições sequenciais
+MAX_PAGES_PER_CALL = 20
+
+
+class GitHubAPIError(Exception):
+    """Resposta de erro da API do GitHub durante uma iteração paginada."""
+
+    def __init__(self, status_code: int, url: str):
+        super().__init__(f"GitHub API error: {status_code}")
+        self.status_code = status_code
+        self.url = url
 
 
 class GitHubMCPTools(MCPTools):
-    """Ferramentas MCP especializadas para GitHub API."""
+    """Ferramentas MCP especializadas para GitHub API.
+
+    Mantém um ``requests.Session`` com pool de conexões (keep-alive) durante
+    toda a vida do objeto e, para chamadores assíncronos, um
+    ``httpx.AsyncClient`` criado sob demanda. Os GETs passam por um
+    ``HTTPResponseCache`` (ETag/Last-Modified + TTL em SQLite), de modo que
+    consultas repetidas não gastam o rate limit da API.
+    """
     
-    def __init__(self, token: Optional[str] = None):
+    def __init__(self, token: Optional[str] = None, base_url: str = "https://api.github.com",
+                 pool_maxsize: int = POOL_MAXSIZE, cache: Optional[HTTPResponseCache] = None,
+                 use_cache: bool = True):
         super().__init__()
-        self.base_url = "https://api.github.com"
+        self.base_url = base_url.rstrip("/")
+        self.pool_maxsize = pool_maxsize
         self.headers = {
             "Accept": "application/vnd.github.v3+json",
             "User-Agent": "Agno-Playground-MCP"
         }
         if token:
             self.headers["Authorization"] = f"token {token}"
-    
-    def search_repositories(self, query: str, sort: str = "stars", per_page: int = 10) -> dict:
-        """Busca repositórios no GitHub."""
-        try:
-            params = {
-                "q": query,
-                "sort": sort,
-                "per_page": min(per_page, 100)  # GitHub API limit
-            }
-            
-            response = requests.get(
-                f"{self.base_url}/search/repositories",
+
+        # Respostas de tokens diferentes não podem se misturar no cache
+        self._cache_scope = hashlib.sha256((token or "").encode("utf-8")).hexdigest()[:16]
+        self.cache = (cache or HTTPResponseCache()) if use_cache else None
+
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_maxsize)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self._async_client = None
+
+    def close(self) -> None:
+        """Fecha o pool de conexões síncrono e o banco do cache."""
+        self.session.close()
+        if self.cache is not None:
+            self.cache.close()
+
+    async def aclose(self) -> None:
+        """Fecha o cliente assíncrono, se tiver sido criado."""
+        if self._async_client is not None:
+            await self._async_client.aclose()
+            self._async_client = None
+
+    def __enter__(self) -> "GitHubMCPTools":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _absolute_url(self, path: str) -> str:
+        # Links de paginação já vêm com a URL completa
+        if path.startswith(("http://", "https://")):
+            return path
+        return f"{self.base_url}{path}"
+
+    def _cache_key(self, path: str, params: Optional[Dict[str, Any]] = None) -> tuple:
+        url = requests.Request("GET", self._absolute_url(path), params=params).prepare().url
+        return f"{self._cache_scope}:{url}", url
+
+    def _get(self, path: str, params: Optional[Dict[str, Any]] = None):
+        """GET na API usando a sessão com pool de conexões e o cache condicional.
+
+        ``path`` pode ser relativo à API ou uma URL completa (links de paginação).
+        """
+        if self.cache is None:
+            return self.session.get(self._absolute_url(path), params=params, timeout=REQUEST_TIMEOUT)
+
+        key, url = self._cache_key(path, params)
+        cached, conditional_headers = self.cache.lookup(key)
+        if cached is not None:
+            return cached
+        response = self.session.get(url, headers=conditional_headers, timeout=REQUEST_TIMEOUT)
+        return self.cache.resolve(key, url, response)
+
+    def _get_async_client(self):
+        """Cria (uma única vez) o ``httpx.AsyncClient`` com pool de conexões."""
+        if self._async_client is None:
+            import httpx
+
+            self._async_client = httpx.AsyncClient(
+                base_url=self.base_url,
                 headers=self.headers,
-                params=params,
-                timeout=10
+                timeout=REQUEST_TIMEOUT,
+                limits=httpx.Limits(
+                    max_connections=self.pool_maxsize,
+                    max_keepalive_connections=self.pool_maxsize
+                )
             )
-            
-            if response.status_code == 200:
+        return self._async_client
+
+    async def _aget(self, path: str, params: Optional[Dict[str, Any]] = None):
+        """GET assíncrono na API usando o cliente httpx compartilhado e o cache condicional."""
+        if self.cache is None:
+            return await self._get_async_client().get(path, params=params)
+
+        key, url = self._cache_key(path, params)
+        cached, conditional_headers = self.cache.lookup(key)
+        if cached is not None:
+            return cached
+        response = await self._get_async_client().get(url, headers=conditional_headers)
+        return self.cache.resolve(key, url, response)
+
+    @staticmethod
+    def _next_link(response) -> Optional[str]:
+        """URL da próxima página segundo o cabeçalho ``Link`` (ou None)."""
+        link_header = response.headers.get("link") or response.headers.get("Link")
+        if not link_header:
+            return None
+        for link in parse_header_links(link_header):
+            if link.get("rel") == "next":
+                return link.get("url")
+        return None
+
+    def _iter_pages(self, path: str, params: Optional[Dict[str, Any]] = None,
+                    items_key: Optional[str] = None,
+                    metadata: Optional[Dict[str, Any]] = None,
+                    max_pages: Optional[int] = None) -> Iterator[List[Dict[str, Any]]]:
+        """Gera os itens de cada página seguindo o cabeçalho ``Link``.
+
+        A próxima página é buscada em segundo plano enquanto a atual é
+        consumida, até ``max_pages`` páginas (sem pré-busca além disso). Campos
+        fora de ``items_key`` (ex.: total_count) da primeira página são
+        copiados para ``metadata``.
+
+        Raises:
+            GitHubAPIError: se alguma página responder com erro.
+        """
+        executor = ThreadPoolExecutor(max_workers=1)
+        try:
+            future = executor.submit(self._get, path, params)
+            first_page = True
+            fetched = 1
+            while future is not None:
+                response = future.result()
+                if response.status_code != 200:
+                    raise GitHubAPIError(response.status_code, str(getattr(response, "url", path)))
+
+                next_url = self._next_link(response)
+                if next_url and (max_pages is None or fetched < max_pages):
+                    future = executor.submit(self._get, next_url)
+                    fetched += 1
+                else:
+                    future = None
+
                 data = response.json()
-                repos = []
-                for repo in data.get("items", []):
-                    repos.append({
-                        "name": repo["full_name"],
-                        "description": repo.get("description", ""),
-                        "stars": repo["stargazers_count"],
-                        "forks": repo["forks_count"],
-                        "language": repo.get("language", ""),
-                        "url": repo["html_url"]
-                    })
-                
-                return {
-                    "status": "success",
-                    "total_count": data.get("total_count", 0),
-                    "repositories": repos
+                if items_key is not None:
+                    if first_page and metadata is not None:
+                        metadata.update({key: value for key, value in data.items() if key != items_key})
+                    data = data.get(items_key, [])
+                first_page = False
+                yield data
+        finally:
+            # Consumidor parou antes do fim: não esperar pela página pré-buscada
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    @staticmethod
+    def _iter_records(pages: Iterable[List[Dict[str, Any]]],
+                      to_record: Callable[[Dict[str, Any]], Optional[Dict[str, Any]]],
+                      max_items: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """Converte os itens das páginas em registros compactos até o orçamento."""
+        if max_items is not None and max_items <= 0:
+            return
+        with closing(pages):
+            yielded = 0
+            for items in pages:
+                for item in items:
+                    record = to_record(item)
+                    if record is None:
+                        continue
+                    yield record
+                    yielded += 1
+                    if max_items is not None and yielded >= max_items:
+                        return
+
+    @staticmethod
+    def _page_size(per_page: int, max_items: Optional[int]) -> int:
+        if max_items is not None:
+            per_page = min(per_page, max(max_items, 1))
+        return max(1, min(per_page, MAX_PER_PAGE))
+
+    @staticmethod
+    def _search_record(repo: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "name": repo["full_name"],
+            "description": repo.get("description", ""),
+            "stars": repo["stargazers_count"],
+            "forks": repo["forks_count"],
+            "language": repo.get("language", ""),
+            "url": repo["html_url"]
+        }
+
+    @staticmethod
+    def _issue_record(issue: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        # Pular pull requests (eles aparecem como issues na API)
+        if "pull_request" in issue:
+            return None
+        return {
+            "number": issue["number"],
+            "title": issue["title"],
+            "state": issue["state"],
+            "created_at": issue["created_at"],
+            "updated_at": issue["updated_at"],
+            "author": issue["user"]["login"],
+            "labels": [label["name"] for label in issue.get("labels", [])],
+            "url": issue["html_url"]
+        }
+
+    def iter_search_repositories(self, query: str, sort: str = "stars", per_page: int = MAX_PER_PAGE,
+                                 max_items: Optional[int] = None,
+                                 metadata: Optional[Dict[str, Any]] = None,
+                                 max_pages: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """Gera resultados de busca página a página (até ``max_items`` e ``max_pages``).
+
+        Raises:
+            GitHubAPIError: se alguma página responder com erro.
+        """
+        params = {"q": query, "sort": sort, "per_page": self._page_size(per_page, max_items)}
+        pages = self._iter_pages("/search/repositories", params, items_key="items", metadata=metadata,
+                                 max_pages=max_pages)
+        return self._iter_records(pages, self._search_record, max_items)
+
+    def iter_repository_issues(self, owner: str, repo: str, state: str = "open",
+                               per_page: int = MAX_PER_PAGE,
+                               max_items: Optional[int] = None,
+                               max_pages: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """Gera as issues (sem pull requests) página a página (até ``max_items`` e ``max_pages``).
+
+        Raises:
+            GitHubAPIError: se alguma página responder com erro.
+        """
+        params = {"state": state, "per_page": self._page_size(per_page, max_items)}
+        pages = self._iter_pages(f"/repos/{owner}/{repo}/issues", params, max_pages=max_pages)
+        return self._iter_records(pages, self._issue_record, max_items)
+
+    @staticmethod
+    def _split_full_name(full_name: str) -> tuple:
+        owner, _, repo = full_name.partition("/")
+        return owner, repo
+
+    @staticmethod
+    def _repository_result(response, owner: str, repo: str) -> dict:
+        """Converte a resposta de /repos/{owner}/{repo} (requests ou httpx)."""
+        if response.status_code == 200:
+            data = response.json()
+            return {
+                "status": "success",
+                "repository": {
+                    "name": data["full_name"],
+                    "description": data.get("description", ""),
+                    "stars": data["stargazers_count"],
+                    "forks": data["forks_count"],
+                    "watchers": data["watchers_count"],
+                    "language": data.get("language", ""),
+                    "topics": data.get("topics", []),
+                    "created_at": data["created_at"],
+                    "updated_at": data["updated_at"],
+                    "clone_url": data["clone_url"],
+                    "html_url": data["html_url"],
+                    "default_branch": data["default_branch"]
                 }
-            else:
-                return {
-                    "status": "error",
-                    "message": f"GitHub API error: {response.status_code}"
+            }
+        elif response.status_code == 404:
+            return {
+                "status": "error",
+                "message": f"Repositório {owner}/{repo} não encontrado"
+            }
+        else:
+            return {
+                "status": "error",
+                "message": f"GitHub API error: {response.status_code}"
+            }
+
+    @staticmethod
+    def _user_result(response, username: str) -> dict:
+        """Converte a resposta de /users/{username} (requests ou httpx)."""
+        if response.status_code == 200:
+            data = response.json()
+            return {
+                "status": "success",
+                "user": {
+                    "login": data["login"],
+                    "name": data.get("name", ""),
+                    "bio": data.get("bio", ""),
+                    "company": data.get("company", ""),
+                    "location": data.get("location", ""),
+                    "email": data.get("email", ""),
+                    "blog": data.get("blog", ""),
+                    "public_repos": data["public_repos"],
+                    "followers": data["followers"],
+                    "following": data["following"],
+                    "created_at": data["created_at"],
+                    "avatar_url": data["avatar_url"],
+                    "html_url": data["html_url"]
                 }
+            }
+        elif response.status_code == 404:
+            return {
+                "status": "error",
+                "message": f"Usuário {username} não encontrado"
+            }
+        else:
+            return {
+                "status": "error",
+                "message": f"GitHub API error: {response.status_code}"
+            }
+    
+    def search_repositories(self, query: str, sort: str = "stars", per_page: int = 10,
+                            include_details: bool = False, max_items: Optional[int] = None) -> dict:
+        """Busca repositórios no GitHub.
+
+        Por padrão retorna ``per_page`` resultados (uma requisição); com
+        ``max_items`` segue a paginação até reunir essa quantidade (no máximo
+        ``MAX_PAGES_PER_CALL`` páginas). Com ``include_details=True`` as
+        informações completas de cada resultado são buscadas em paralelo e
+        anexadas em ``details``.
+        """
+        try:
+            limit = max_items if max_items is not None else min(per_page, MAX_PER_PAGE)
+            metadata: Dict[str, Any] = {}
+            repos = list(self.iter_search_repositories(
+                query, sort=sort, per_page=limit, max_items=limit, metadata=metadata,
+                max_pages=1 if max_items is None else MAX_PAGES_PER_CALL
+            ))
+
+            if include_details and repos:
+                details = self.get_repositories_info([repo["name"] for repo in repos])
+                for repo, detail in zip(repos, details["results"]):
+                    repo["details"] = detail.get("repository")
+            
+            return {
+                "status": "success",
+                "total_count": metadata.get("total_count", 0),
+                "repositories": repos
+            }
                 
+        except GitHubAPIError as e:
+            return {
+                "status": "error",
+                "message": str(e)
+            }
         except Exception as e:
             return {
                 "status": "error",
@@ -69,91 +392,64 @@ class GitHubMCPTools(MCPTools):
     def get_repository_info(self, owner: str, repo: str) -> dict:
         """Obtém informações detalhadas de um repositório."""
         try:
-            response = requests.get(
-                f"{self.base_url}/repos/{owner}/{repo}",
-                headers=self.headers,
-                timeout=10
-            )
-            
-            if response.status_code == 200:
-                data = response.json()
-                return {
-                    "status": "success",
-                    "repository": {
-                        "name": data["full_name"],
-                        "description": data.get("description", ""),
-                        "stars": data["stargazers_count"],
-                        "forks": data["forks_count"],
-                        "watchers": data["watchers_count"],
-                        "language": data.get("language", ""),
-                        "topics": data.get("topics", []),
-                        "created_at": data["created_at"],
-                        "updated_at": data["updated_at"],
-                        "clone_url": data["clone_url"],
-                        "html_url": data["html_url"],
-                        "default_branch": data["default_branch"]
-                    }
-                }
-            elif response.status_code == 404:
-                return {
-                    "status": "error",
-                    "message": f"Repositório {owner}/{repo} não encontrado"
-                }
-            else:
-                return {
-                    "status": "error",
-                    "message": f"GitHub API error: {response.status_code}"
-                }
+            response = self._get(f"/repos/{owner}/{repo}")
+            return self._repository_result(response, owner, repo)
                 
         except Exception as e:
             return {
                 "status": "error",
                 "message": f"Erro ao obter info do repositório: {str(e)}"
             }
+
+    def get_repositories_info(self, repositories: List[str]) -> dict:
+        """Obtém informações de vários repositórios ("owner/repo") em paralelo.
+
+        Os resultados seguem a ordem da lista de entrada.
+        """
+        if not repositories:
+            return {"status": "success", "results": [], "count": 0, "errors": 0}
+
+        def fetch(full_name: str) -> dict:
+            return self.get_repository_info(*self._split_full_name(full_name))
+
+        workers = min(MAX_CONCURRENT_REQUESTS, self.pool_maxsize, len(repositories))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(fetch, repositories))
+
+        return {
+            "status": "success",
+            "results": results,
+            "count": len(results),
+            "errors": sum(1 for result in results if result["status"] != "success")
+        }
     
-    def get_repository_issues(self, owner: str, repo: str, state: str = "open", per_page: int = 10) -> dict:
-        """Lista issues de um repositório."""
+    def get_repository_issues(self, owner: str, repo: str, state: str = "open", per_page: int = 10,
+                              max_items: Optional[int] = None) -> dict:
+        """Lista issues de um repositório.
+
+        Por padrão faz uma única requisição e retorna até ``per_page`` issues
+        (menos, se a página tiver pull requests); com ``max_items`` segue a
+        paginação até reunir essa quantidade, em no máximo
+        ``MAX_PAGES_PER_CALL`` páginas.
+        """
         try:
-            params = {
-                "state": state,
-                "per_page": min(per_page, 100)
-            }
+            limit = max_items if max_items is not None else min(per_page, MAX_PER_PAGE)
+            issues = list(self.iter_repository_issues(
+                owner, repo, state=state, per_page=limit, max_items=limit,
+                max_pages=1 if max_items is None else MAX_PAGES_PER_CALL
+            ))
             
-            response = requests.get(
-                f"{self.base_url}/repos/{owner}/{repo}/issues",
-                headers=self.headers,
-                params=params,
-                timeout=10
-            )
-            
-            if response.status_code == 200:
-                data = response.json()
-                issues = []
-                for issue in data:
-                    # Pular pull requests (eles aparecem como issues na API)
-                    if "pull_request" not in issue:
-                        issues.append({
-                            "number": issue["number"],
-                            "title": issue["title"],
-                            "state": issue["state"],
-                            "created_at": issue["created_at"],
-                            "updated_at": issue["updated_at"],
-                            "author": issue["user"]["login"],
-                            "labels": [label["name"] for label in issue.get("labels", [])],
-                            "url": issue["html_url"]
-                        })
-                
-                return {
-                    "status": "success",
-                    "issues": issues,
-                    "count": len(issues)
-                }
-            else:
-                return {
-                    "status": "error",
-                    "message": f"GitHub API error: {response.status_code}"
-                }
+            return {
+                "status": "success",
+                "issues": issues,
+                "count": len(issues)
+            }
                 
+        except GitHubAPIError as e:
+            return {
+                "status": "error",
+                "message": str(e)
+            }
         except Exception as e:
             return {
                 "status": "error",
@@ -163,45 +459,46 @@ class GitHubMCPTools(MCPTools):
     def get_user_info(self, username: str) -> dict:
         """Obtém informações de um usuário GitHub."""
         try:
-            response = requests.get(
-                f"{self.base_url}/users/{username}",
-                headers=self.headers,
-                timeout=10
-            )
-            
-            if response.status_code == 200:
-                data = response.json()
-                return {
-                    "status": "success",
-                    "user": {
-                        "login": data["login"],
-                        "name": data.get("name", ""),
-                        "bio": data.get("bio", ""),
-                        "company": data.get("company", ""),
-                        "location": data.get("location", ""),
-                        "email": data.get("email", ""),
-                        "blog": data.get("blog", ""),
-                        "public_repos": data["public_repos"],
-                        "followers": data["followers"],
-                        "following": data["following"],
-                        "created_at": data["created_at"],
-                        "avatar_url": data["avatar_url"],
-                        "html_url": data["html_url"]
-                    }
-                }
-            elif response.status_code == 404:
-                return {
-                    "status": "error",
-                    "message": f"Usuário {username} não encontrado"
-                }
-            else:
-                return {
-                    "status": "error",
-                    "message": f"GitHub API error: {response.status_code}"
-                }
+            response = self._get(f"/users/{username}")
+            return self._user_result(response, username)
                 
         except Exception as e:
             return {
                 "status": "error",
                 "message": f"Erro ao obter info do usuário: {str(e)}"
             }
+
+    async def aget_repository_info(self, owner: str, repo: str) -> dict:
+        """Versão assíncrona de get_repository_info."""
+        try:
+            response = await self._aget(f"/repos/{owner}/{repo}")
+            return self._repository_result(response, owner, repo)
+        except Exception as e:
+            return {
+                "status": "error",
+                "message": f"Erro ao obter info do repositório: {str(e)}"
+            }
+
+    async def aget_user_info(self, username: str) -> dict:
+        """Versão assíncrona de get_user_info."""
+        try:
+            response = await self._aget(f"/users/{username}")
+            return self._user_result(response, username)
+        except Exception as e:
+            return {
+                "status": "error",
+                "message": f"Erro ao obter info do usuário: {str(e)}"
+            }
+
+    async def aget_repositories_info(self, repositories: List[str]) -> dict:
+        """Versão assíncrona de get_repositories_info (concorrência limitada pelo pool)."""
+        results = await asyncio.gather(*(
+            self.aget_repository_info(*self._split_full_name(full_name))
+            for full_name in repositories
+        ))
+        return {
+            "status": "success",
+            "results": list(results),
+            "count": len(results),
+            "errors": sum(1 for result in results if result["status"] != "success")
+        }
@@ -0,0 +1,194 @@
+"""
+Cache HTTP persistente com requisições condicionais (ETag / Last-Modified).
+
+As respostas GET bem-sucedidas ficam em uma tabela SQLite (por padrão ao lado
+do ``agents.db``) e em um LRU em memória:
+
+- dentro do TTL a resposta é servida direto do cache, sem tocar na rede
+- depois do TTL a requisição sai com ``If-None-Match``/``If-Modified-Since``;
+  um 304 renova a entrada e não conta no rate limit do GitHub
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
+
+# Nome do banco do cache dentro do diretório de storage
+DEFAULT_CACHE_DB = "http_cache.db"
+
+# Tempo (segundos) em que uma resposta é servida sem revalidação
+DEFAULT_TTL_SECONDS = 300
+
+# Entradas mantidas no LRU em memória
+DEFAULT_MEMORY_ENTRIES = 1024
+
+
+@dataclass
+class CachedResponse:
+    """Resposta armazenada, com a mesma interface mínima de requests/httpx."""
+
+    url: str
+    status_code: int
+    text: str
+    headers: Dict[str, str] = field(default_factory=dict)
+    stored_at: float = 0.0
+    from_cache: bool = True
+
+    @property
+    def etag(self) -> Optional[str]:
+        return self.headers.get("etag")
+
+    @property
+    def last_modified(self) -> Optional[str]:
+        return self.headers.get("last-modified")
+
+    def json(self) -> Any:
+        return json.loads(self.text)
+
+    def is_fresh(self, ttl: float, now: Optional[float] = None) -> bool:
+        return ((now if now is not None else time.time()) - self.stored_at) < ttl
+
+
+class HTTPResponseCache:
+    """Cache de respostas GET com validadores HTTP e TTL, persistido em SQLite.
+
+    A conexão com o banco só é aberta no primeiro uso.
+    """
+
+    def __init__(self, db_path: Optional[str] = None, ttl: float = DEFAULT_TTL_SECONDS,
+                 memory_entries: int = DEFAULT_MEMORY_ENTRIES):
+        self._db_path = db_path
+        self.ttl = ttl
+        self.memory_entries = memory_entries
+        self._memory: "OrderedDict[str, CachedResponse]" = OrderedDict()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "revalidated": 0, "misses": 0}
+
+    @property
+    def db_path(self) -> str:
+        if self._db_path is None:
+            from app.config.settings import get_storage_path
+
+            self._db_path = get_storage_path(DEFAULT_CACHE_DB)
+        return self._db_path
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS http_cache ("
+                " key TEXT PRIMARY KEY,"
+                " url TEXT NOT NULL,"
+                " status_code INTEGER NOT NULL,"
+                " headers TEXT NOT NULL,"
+                " body TEXT NOT NULL,"
+                " stored_at REAL NOT NULL)"
+            )
+            self._conn.commit()
+        return self._conn
+
+    def _remember(self, key: str, entry: CachedResponse) -> None:
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        """Retorna a entrada armazenada (fresca ou não) ou None."""
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+                return entry
+
+            row = self._connection().execute(
+                "SELECT url, status_code, headers, body, stored_at FROM http_cache WHERE key = ?",
+                (key,)
+            ).fetchone()
+            if row is None:
+                return None
+
+            url, status_code, headers, body, stored_at = row
+            entry = CachedResponse(url, status_code, body, json.loads(headers), stored_at)
+            self._remember(key, entry)
+            return entry
+
+    def put(self, key: str, url: str, response) -> CachedResponse:
+        """Armazena uma resposta 200 (requests.Response ou httpx.Response)."""
+        entry = CachedResponse(
+            url=url,
+            status_code=response.status_code,
+            text=response.text,
+            headers={name.lower(): value for name, value in response.headers.items()},
+            stored_at=time.time()
+        )
+        with self._lock:
+            self._connection().execute(
+                "INSERT OR REPLACE INTO http_cache (key, url, status_code, headers, body, stored_at)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (key, url, entry.status_code, json.dumps(entry.headers), entry.text, entry.stored_at)
+            )
+            self._connection().commit()
+            self._remember(key, entry)
+        return entry
+
+    def touch(self, key: str) -> Optional[CachedResponse]:
+        """Renova o TTL de uma entrada revalidada com 304."""
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                entry.stored_at = now
+            self._connection().execute(
+                "UPDATE http_cache SET stored_at = ? WHERE key = ?", (now, key)
+            )
+            self._connection().commit()
+        return entry or self.get(key)
+
+    def conditional_headers(self, entry: Optional[CachedResponse]) -> Dict[str, str]:
+        """Cabeçalhos de validação para revalidar uma entrada vencida."""
+        headers = {}
+        if entry is not None:
+            if entry.etag:
+                headers["If-None-Match"] = entry.etag
+            if entry.last_modified:
+                headers["If-Modified-Since"] = entry.last_modified
+        return headers
+
+    def lookup(self, key: str):
+        """Retorna (entrada fresca ou None, cabeçalhos condicionais)."""
+        entry = self.get(key)
+        if entry is not None and entry.is_fresh(self.ttl):
+            self.stats["hits"] += 1
+            return entry, {}
+        return None, self.conditional_headers(entry)
+
+    def resolve(self, key: str, url: str, response):
+        """Trata a resposta da rede: 304 vira a entrada em cache, 200 é armazenado."""
+        if response.status_code == 304:
+            entry = self.touch(key)
+            if entry is not None:
+                self.stats["revalidated"] += 1
+                return entry
+        self.stats["misses"] += 1
+        if response.status_code == 200:
+            self.put(key, url, response)
+        return response
+
+    def clear(self) -> None:
+        """Remove todas as entradas (memória e disco)."""
+        with self._lock:
+            self._memory.clear()
+            self._connection().execute("DELETE FROM http_cache")
+            self._connection().commit()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
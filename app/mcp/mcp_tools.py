@@ -1,49 +1,190 @@
 import requests
 import json
-from typing import Dict, Any, List
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Dict, Any, List, Optional
+from requests.adapters import HTTPAdapter
 import datetime
 
+from app.mcp.circuit_breaker import CircuitBreaker
+from app.mcp.registry import MCPServerRegistry
+
+# Timeout das chamadas a serviços MCP (segundos)
+CALL_TIMEOUT = 10
+
+# Conexões keep-alive mantidas por servidor
+POOL_MAXSIZE = 10
+
+# Endpoint JSON-RPC usado para lotes (servidores sem ele recebem as chamadas uma a uma)
+JSONRPC_PATH = "rpc"
+
+# Servidores atendidos em paralelo por call_mcp_batch
+BATCH_MAX_WORKERS = 8
+
+# Códigos que indicam que o servidor não tem o endpoint JSON-RPC
+JSONRPC_UNSUPPORTED_STATUS = {404, 405, 501}
+
+# Timeout de cada sonda /health (segundos)
+HEALTH_TIMEOUT = 5
+
+# Prazo global de um check_mcp_health, somando todas as sondas (segundos)
+HEALTH_DEADLINE = 3
+
+# Validade de um resultado de health em cache (segundos)
+HEALTH_TTL = 30
+
+# Intervalo sugerido para o refresher em segundo plano (menor que o TTL)
+HEALTH_REFRESH_INTERVAL = 15
+
+# Sondas simultâneas
+HEALTH_MAX_WORKERS = 16
+
+
 class MCPTools:
-    """Ferramentas para conectar com serviços Model Context Protocol."""
+    """Ferramentas para conectar com serviços Model Context Protocol.
+
+    Os servidores registrados são persistidos (``MCPServerRegistry``); cada
+    servidor tem sua própria ``requests.Session`` com pool de conexões e um
+    ``CircuitBreaker`` que faz as chamadas falharem na hora enquanto o
+    servidor estiver fora do ar.
+    """
     
-    def __init__(self):
+    def __init__(self, health_refresh_interval: Optional[float] = None,
+                 registry: Optional[MCPServerRegistry] = None, persist: bool = True):
         self.name = "mcp_tools"
-        self.mcp_servers = {}
+        self._registry = (registry or MCPServerRegistry()) if persist else None
+        # Carregado do registro no primeiro acesso
+        self._servers: Optional[Dict[str, str]] = None if persist else {}
+        self._sessions: Dict[str, requests.Session] = {}
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._resources_lock = threading.Lock()
+        # Suporte a lote JSON-RPC descoberto por servidor (None = ainda não testado)
+        self._jsonrpc_support: Dict[str, bool] = {}
+        # Último resultado de health por servidor (com instante em time.monotonic)
+        self._health_cache: Dict[str, Dict[str, Any]] = {}
+        self._health_lock = threading.Lock()
+        self._health_executor: Optional[ThreadPoolExecutor] = None
+        self.health_refresh_interval = health_refresh_interval
+        self._refresher: Optional[threading.Thread] = None
+        self._refresher_stop = threading.Event()
+    
+    @property
+    def mcp_servers(self) -> Dict[str, str]:
+        """Servidores registrados (nome -> URL)."""
+        if self._servers is None:
+            self._servers = self._registry.load()
+            if self._servers:
+                # Servidores recarregados do registro também ficam quentes
+                self._ensure_health_refresher()
+        return self._servers
+
+    def _save_registry(self) -> None:
+        if self._registry is not None:
+            self._registry.save(dict(self.mcp_servers))
+
+    def _session_for(self, name: str) -> requests.Session:
+        """Sessão com pool de conexões dedicada a um servidor."""
+        with self._resources_lock:
+            session = self._sessions.get(name)
+            if session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=POOL_MAXSIZE)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                self._sessions[name] = session
+            return session
+
+    def _breaker_for(self, name: str) -> CircuitBreaker:
+        with self._resources_lock:
+            breaker = self._breakers.get(name)
+            if breaker is None:
+                breaker = self._breakers[name] = CircuitBreaker()
+            return breaker
+
+    def _discard_server_resources(self, name: str) -> None:
+        with self._resources_lock:
+            session = self._sessions.pop(name, None)
+            self._breakers.pop(name, None)
+            self._jsonrpc_support.pop(name, None)
+        if session is not None:
+            session.close()
+        with self._health_lock:
+            self._health_cache.pop(name, None)
+
+    def close(self) -> None:
+        """Para o refresher, encerra o pool de sondas e fecha as sessões de todos os servidores."""
+        self.stop_health_refresher()
+        executor, self._health_executor = self._health_executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+        with self._resources_lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+        for session in sessions:
+            session.close()
     
     def register_mcp_server(self, name: str, url: str, port: int = 8888) -> dict:
         """Registra um servidor MCP."""
         try:
             server_url = f"http://{url}:{port}"
+            if self.mcp_servers.get(name) != server_url:
+                # Servidor novo ou com outro endereço: começar do zero
+                self._discard_server_resources(name)
             self.mcp_servers[name] = server_url
+            self._save_registry()
+            self._ensure_health_refresher()
             
-            # Testa a conexão
-            response = requests.get(f"{server_url}/health", timeout=5)
-            if response.status_code == 200:
+            # Testa a conexão (e já deixa o resultado no cache de health)
+            health = self._probe_server(name, server_url)
+            if health["status"] == "healthy":
                 return {
                     "status": "success",
                     "message": f"Servidor MCP '{name}' registrado com sucesso",
                     "url": server_url
                 }
-            else:
+            elif health["status"] == "unhealthy":
                 return {
                     "status": "warning",
-                    "message": f"Servidor registrado mas não está respondendo: {response.status_code}"
+                    "message": f"Servidor registrado mas não está respondendo: {health['status_code']}"
                 }
+            else:
+                raise ConnectionError(health["error"])
         except Exception as e:
             return {
                 "status": "error",
                 "message": f"Erro ao registrar servidor MCP: {str(e)}"
             }
     
+    def unregister_mcp_server(self, name: str) -> dict:
+        """Remove um servidor MCP do registro."""
+        if name not in self.mcp_servers:
+            return {
+                "status": "error",
+                "message": f"Servidor '{name}' não encontrado"
+            }
+        del self.mcp_servers[name]
+        self._save_registry()
+        self._discard_server_resources(name)
+        return {
+            "status": "success",
+            "message": f"Servidor MCP '{name}' removido"
+        }
+    
     def list_mcp_servers(self) -> dict:
         """Lista todos os servidores MCP registrados."""
         return {
             "servers": list(self.mcp_servers.keys()),
-            "count": len(self.mcp_servers)
+            "count": len(self.mcp_servers),
+            "circuits": {name: self._breaker_for(name).state for name in self.mcp_servers}
         }
     
     def call_mcp_service(self, server_name: str, endpoint: str, data: Dict[str, Any] = None) -> dict:
-        """Faz uma chamada para um serviço MCP."""
+        """Faz uma chamada para um serviço MCP.
+
+        Usa a sessão com pool do servidor. Com o circuito aberto (falhas
+        seguidas) a chamada falha na hora, sem esperar pelo timeout.
+        """
         try:
             if server_name not in self.mcp_servers:
                 return {
@@ -53,11 +194,30 @@ class MCPTools:
             
             server_url = self.mcp_servers[server_name]
             url = f"{server_url}/{endpoint.lstrip('/')}"
-            
-            if data:
-                response = requests.post(url, json=data, timeout=10)
+
+            breaker = self._breaker_for(server_name)
+            if not breaker.allow():
+                return {
+                    "status": "error",
+                    "message": f"Servidor '{server_name}' indisponível (circuito aberto); "
+                               f"nova tentativa em {breaker.retry_in():.0f}s",
+                    "circuit": breaker.state
+                }
+
+            session = self._session_for(server_name)
+            try:
+                if data:
+                    response = session.post(url, json=data, timeout=CALL_TIMEOUT)
+                else:
+                    response = session.get(url, timeout=CALL_TIMEOUT)
+            except requests.RequestException:
+                breaker.record_failure()
+                raise
+
+            if response.status_code >= 500:
+                breaker.record_failure()
             else:
-                response = requests.get(url, timeout=10)
+                breaker.record_success()
             
             return {
                 "status": "success",
@@ -69,37 +229,246 @@ class MCPTools:
                 "status": "error",
                 "message": f"Erro na chamada MCP: {str(e)}"
             }
+
+    @staticmethod
+    def _normalize_call(call: Any) -> tuple:
+        """Aceita (server, endpoint[, data]) ou {"server", "endpoint", "data"}."""
+        if isinstance(call, dict):
+            server = call.get("server") or call.get("server_name")
+            endpoint = call.get("endpoint")
+            data = call.get("data", call.get("payload"))
+        elif isinstance(call, (list, tuple)) and len(call) in (2, 3):
+            server, endpoint = call[0], call[1]
+            data = call[2] if len(call) == 3 else None
+        else:
+            raise ValueError(f"Chamada inválida: {call!r}")
+        if not server or not endpoint:
+            raise ValueError(f"Chamada sem servidor ou endpoint: {call!r}")
+        return server, endpoint, data
+
+    def _send_jsonrpc_batch(self, server_name: str, calls: List[tuple]) -> Optional[List[Dict[str, Any]]]:
+        """Envia as chamadas como um único lote JSON-RPC 2.0.
+
+        Retorna None se o servidor não suporta lotes (o chamador faz as
+        chamadas individualmente).
+        """
+        breaker = self._breaker_for(server_name)
+        if not breaker.allow():
+            error = {
+                "status": "error",
+                "message": f"Servidor '{server_name}' indisponível (circuito aberto)",
+                "circuit": breaker.state
+            }
+            return [dict(error) for _ in calls]
+
+        batch = [
+            {"jsonrpc": "2.0", "id": i, "method": endpoint.strip("/"), "params": data or {}}
+            for i, (endpoint, data) in enumerate(calls)
+        ]
+        url = f"{self.mcp_servers[server_name]}/{JSONRPC_PATH}"
+        try:
+            response = self._session_for(server_name).post(url, json=batch, timeout=CALL_TIMEOUT)
+        except requests.RequestException as e:
+            breaker.record_failure()
+            return [{"status": "error", "message": f"Erro na chamada MCP: {str(e)}"} for _ in calls]
+
+        if response.status_code >= 500 and response.status_code not in JSONRPC_UNSUPPORTED_STATUS:
+            breaker.record_failure()
+            return [
+                {"status": "error", "message": f"Erro na chamada MCP: HTTP {response.status_code}"}
+                for _ in calls
+            ]
+        breaker.record_success()
+
+        try:
+            replies = response.json() if response.status_code not in JSONRPC_UNSUPPORTED_STATUS else None
+        except ValueError:
+            replies = None
+        if not isinstance(replies, list):
+            return None
+
+        by_id = {reply.get("id"): reply for reply in replies if isinstance(reply, dict)}
+        results = []
+        for i in range(len(calls)):
+            reply = by_id.get(i)
+            if reply is None:
+                results.append({"status": "error", "message": "Resposta ausente no lote JSON-RPC"})
+            elif "error" in reply:
+                error = reply["error"] or {}
+                results.append({
+                    "status": "error",
+                    "message": f"Erro na chamada MCP: {error.get('message', error)}",
+                    "code": error.get("code")
+                })
+            else:
+                results.append({
+                    "status": "success",
+                    "status_code": response.status_code,
+                    "data": reply.get("result")
+                })
+        return results
+
+    def _run_server_calls(self, server_name: str, indexed_calls: List[tuple]) -> List[tuple]:
+        """Executa as chamadas de um servidor: lote JSON-RPC ou, sem suporte, em sequência na sessão."""
+        if server_name not in self.mcp_servers:
+            error = {"status": "error", "message": f"Servidor '{server_name}' não encontrado"}
+            return [(index, dict(error)) for index, _, _ in indexed_calls]
+
+        if len(indexed_calls) > 1 and self._jsonrpc_support.get(server_name, True):
+            results = self._send_jsonrpc_batch(
+                server_name, [(endpoint, data) for _, endpoint, data in indexed_calls]
+            )
+            if results is not None:
+                self._jsonrpc_support[server_name] = True
+                return [(index, result) for (index, _, _), result in zip(indexed_calls, results)]
+            self._jsonrpc_support[server_name] = False
+
+        # Chamadas em sequência reaproveitando a conexão keep-alive do servidor
+        return [
+            (index, self.call_mcp_service(server_name, endpoint, data))
+            for index, endpoint, data in indexed_calls
+        ]
+
+    def call_mcp_batch(self, calls: List[Any]) -> dict:
+        """Executa várias chamadas MCP de uma vez, agrupadas por servidor.
+
+        Args:
+            calls: lista de (server, endpoint, data) ou de dicts com as chaves
+                "server", "endpoint" e "data" (data é opcional).
+
+        Servidores diferentes são atendidos em paralelo. Para cada servidor as
+        chamadas vão em um único lote JSON-RPC quando ele suporta, ou uma a uma
+        na mesma conexão caso contrário. Os resultados seguem a ordem de ``calls``.
+        """
+        try:
+            normalized = [self._normalize_call(call) for call in calls]
+        except ValueError as e:
+            return {
+                "status": "error",
+                "message": str(e)
+            }
+
+        groups: Dict[str, List[tuple]] = {}
+        for index, (server_name, endpoint, data) in enumerate(normalized):
+            groups.setdefault(server_name, []).append((index, endpoint, data))
+
+        results: List[Optional[Dict[str, Any]]] = [None] * len(normalized)
+        if groups:
+            workers = min(BATCH_MAX_WORKERS, len(groups))
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="mcp-batch") as executor:
+                futures = [
+                    executor.submit(self._run_server_calls, server_name, indexed_calls)
+                    for server_name, indexed_calls in groups.items()
+                ]
+                for future in futures:
+                    for index, result in future.result():
+                        results[index] = result
+
+        return {
+            "status": "success",
+            "results": results,
+            "count": len(results),
+            "errors": sum(1 for result in results if result["status"] != "success")
+        }
+
+    def _probe_server(self, name: str, url: str, timeout: float = HEALTH_TIMEOUT) -> Dict[str, Any]:
+        """Consulta /health de um servidor e grava o resultado no cache."""
+        try:
+            response = self._session_for(name).get(f"{url}/health", timeout=timeout)
+            result = {
+                "status": "healthy" if response.status_code == 200 else "unhealthy",
+                "response_time": response.elapsed.total_seconds(),
+                "status_code": response.status_code
+            }
+        except Exception as e:
+            result = {
+                "status": "error",
+                "error": str(e)
+            }
+
+        result["checked_at"] = datetime.datetime.now().isoformat()
+        with self._health_lock:
+            # Ignorar servidores removidos enquanto a sonda rodava
+            if self.mcp_servers.get(name) == url:
+                self._health_cache[name] = {"result": result, "monotonic": time.monotonic()}
+        return result
+
+    def _cached_health(self, name: str, ttl: float) -> Optional[Dict[str, Any]]:
+        with self._health_lock:
+            entry = self._health_cache.get(name)
+        if entry is None or time.monotonic() - entry["monotonic"] >= ttl:
+            return None
+        return dict(entry["result"], cached=True)
+
+    def _get_health_executor(self) -> ThreadPoolExecutor:
+        if self._health_executor is None:
+            self._health_executor = ThreadPoolExecutor(
+                max_workers=HEALTH_MAX_WORKERS, thread_name_prefix="mcp-health"
+            )
+        return self._health_executor
+
+    def _probe_concurrently(self, servers: Dict[str, str], deadline: float) -> Dict[str, Dict[str, Any]]:
+        """Sonda vários servidores em paralelo respeitando um prazo global.
+
+        Sondas que não terminam no prazo continuam em segundo plano e
+        atualizam o cache quando concluírem.
+        """
+        executor = self._get_health_executor()
+        futures = {
+            name: executor.submit(self._probe_server, name, url)
+            for name, url in servers.items()
+        }
+        wait(futures.values(), timeout=deadline)
+
+        results = {}
+        for name, future in futures.items():
+            if future.done():
+                results[name] = future.result()
+            else:
+                results[name] = {
+                    "status": "timeout",
+                    "error": f"Sem resposta dentro do prazo de {deadline}s"
+                }
+        return results
     
-    def check_mcp_health(self, server_name: str = None) -> dict:
-        """Verifica a saúde dos servidores MCP."""
+    def check_mcp_health(self, server_name: str = None, use_cache: bool = True,
+                         deadline: float = HEALTH_DEADLINE) -> dict:
+        """Verifica a saúde dos servidores MCP.
+
+        Os servidores são sondados em paralelo e a chamada nunca passa de
+        ``deadline`` segundos. Resultados com menos de ``HEALTH_TTL`` segundos
+        (mantidos quentes pelo refresher em segundo plano, se ativo) são
+        devolvidos direto do cache.
+        """
         try:
             if server_name:
                 servers_to_check = {server_name: self.mcp_servers.get(server_name)}
             else:
-                servers_to_check = self.mcp_servers
+                servers_to_check = dict(self.mcp_servers)
             
             health_status = {}
+            to_probe = {}
             
             for name, url in servers_to_check.items():
                 if url is None:
                     health_status[name] = {"status": "not_found"}
                     continue
-                
-                try:
-                    response = requests.get(f"{url}/health", timeout=5)
-                    health_status[name] = {
-                        "status": "healthy" if response.status_code == 200 else "unhealthy",
-                        "response_time": response.elapsed.total_seconds(),
-                        "status_code": response.status_code
-                    }
-                except Exception as e:
-                    health_status[name] = {
-                        "status": "error",
-                        "error": str(e)
-                    }
+
+                cached = self._cached_health(name, HEALTH_TTL) if use_cache else None
+                if cached is not None:
+                    health_status[name] = cached
+                else:
+                    to_probe[name] = url
+
+            if to_probe:
+                health_status.update(self._probe_concurrently(to_probe, deadline))
             
+            for name, entry in list(health_status.items()):
+                if name in self.mcp_servers:
+                    health_status[name] = dict(entry, circuit=self._breaker_for(name).state)
+
             return {
-                "health_check": health_status,
+                "health_check": {name: health_status[name] for name in servers_to_check},
                 "timestamp": datetime.datetime.now().isoformat()
             }
         except Exception as e:
@@ -107,3 +476,32 @@ class MCPTools:
                 "status": "error",
                 "message": f"Erro no health check: {str(e)}"
             }
+
+    def _ensure_health_refresher(self) -> None:
+        if self.health_refresh_interval and (self._refresher is None or not self._refresher.is_alive()):
+            self.start_health_refresher(self.health_refresh_interval)
+
+    def start_health_refresher(self, interval: float) -> None:
+        """Inicia uma thread que renova o health de todos os servidores a cada ``interval`` s."""
+        self.stop_health_refresher()
+        self.health_refresh_interval = interval
+        self._refresher_stop = threading.Event()
+        stop = self._refresher_stop
+
+        def refresh_loop():
+            while not stop.is_set():
+                servers = dict(self.mcp_servers)
+                if servers:
+                    # Prazo igual ao intervalo: um ciclo lento não acumula sobre o próximo
+                    self._probe_concurrently(servers, deadline=interval)
+                stop.wait(interval)
+
+        self._refresher = threading.Thread(target=refresh_loop, name="mcp-health-refresher", daemon=True)
+        self._refresher.start()
+
+    def stop_health_refresher(self) -> None:
+        """Interrompe o refresher em segundo plano, se estiver rodando."""
+        if self._refresher is not None:
+            self._refresher_stop.set()
+            self._refresher.join(timeout=HEALTH_TIMEOUT)
+            self._refresher = None
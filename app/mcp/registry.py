@@ -0,0 +1,61 @@
+"""
+Registro persistente de servidores MCP.
+
+Os servidores registrados ficam em um arquivo JSON no diretório de storage
+(ao lado do ``agents.db``), de modo que sobrevivem a reinícios do backend.
+"""
+
+import json
+import os
+import tempfile
+import threading
+from typing import Dict, Optional
+
+# Nome do arquivo do registro dentro do diretório de storage
+DEFAULT_REGISTRY_FILE = "mcp_servers.json"
+
+
+class MCPServerRegistry:
+    """Mapa nome -> URL de servidores MCP persistido em JSON.
+
+    O caminho padrão só é resolvido no primeiro acesso ao disco.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self._path = path
+        self._lock = threading.Lock()
+
+    @property
+    def path(self) -> str:
+        if self._path is None:
+            from app.config.settings import get_storage_path
+
+            self._path = get_storage_path(DEFAULT_REGISTRY_FILE)
+        return self._path
+
+    def load(self) -> Dict[str, str]:
+        """Lê os servidores gravados (vazio se o arquivo não existe ou está corrompido)."""
+        with self._lock:
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    servers = json.load(f)
+            except (FileNotFoundError, json.JSONDecodeError):
+                return {}
+        if not isinstance(servers, dict):
+            return {}
+        return {str(name): str(url) for name, url in servers.items()}
+
+    def save(self, servers: Dict[str, str]) -> None:
+        """Grava os servidores de forma atômica (arquivo temporário + rename)."""
+        with self._lock:
+            directory = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(prefix=".mcp_servers.", dir=directory)
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump(servers, f, indent=2, ensure_ascii=False)
+                os.replace(tmp_path, self.path)
+            except BaseException:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
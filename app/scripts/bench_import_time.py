@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Benchmark do tempo de importação dos módulos principais (python -X importtime)
+
+Uso:
+python app/scripts/bench_import_time.py [--runs 5]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+# Adicionar diretório raiz ao path
+project_root = Path(__file__).parent.parent.parent
+
+MODULES = [
+    "app.config.gemini_simple",
+    "app.config.gemini_advanced",
+    "app.agents.teams_manager",
+    "app.backend.agno_teams_playground",
+]
+
+def measure(module: str) -> int:
+    """Retorna o tempo cumulativo de importação do módulo em microssegundos."""
+    env = dict(os.environ, PYTHONPATH=str(project_root))
+    env.setdefault("GOOGLE_API_KEY", "test-key-for-benchmark")
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, env=env, cwd=project_root
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+    
+    for line in result.stderr.splitlines():
+        fields = [field.strip() for field in line.replace("import time:", "").split("|")]
+        if len(fields) == 3 and fields[2] == module:
+            return int(fields[1])
+    raise RuntimeError(f"Módulo {module} não encontrado na saída de -X importtime")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de tempo de importação")
+    parser.add_argument("--runs", type=int, default=5, help="Execuções por módulo")
+    args = parser.parse_args()
+    
+    print(f"⏱️  Tempo de importação (mediana de {args.runs} execuções)")
+    print("=" * 60)
+    for module in MODULES:
+        try:
+            samples = [measure(module) for _ in range(args.runs)]
+            print(f"{module:<45} {statistics.median(samples) / 1000:>8.1f} ms")
+        except RuntimeError as e:
+            print(f"{module:<45} ❌ {e}")
+
+if __name__ == "__main__":
+    main()
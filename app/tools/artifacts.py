@@ -0,0 +1,117 @@
+"""
+Armazenamento de artefatos binários (gráficos PNG) servidos por URL.
+
+Em vez de devolver ``data:image/png;base64,...`` (que passa pelo contexto do
+LLM, pelo SQLite das sessões e pela resposta HTTP), as ferramentas gravam os
+bytes aqui e retornam só uma URL curta ``/v1/artifacts/<id>``. O backend
+serve o arquivo nesse endpoint e o frontend busca a imagem diretamente.
+
+Os IDs são endereçados por conteúdo: o mesmo PNG gera sempre o mesmo ID.
+"""
+
+import hashlib
+import os
+import re
+import tempfile
+import threading
+from typing import Optional
+
+# Prefixo dos IDs de artefato
+ARTIFACT_ID_PREFIX = "art_"
+
+# Subdiretório de storage com os arquivos
+ARTIFACTS_DIR = "artifacts"
+
+# Rota HTTP do playground que serve os artefatos
+ARTIFACTS_ROUTE = "/v1/artifacts"
+
+# Tipos de conteúdo aceitos, por extensão
+CONTENT_TYPES = {"png": "image/png"}
+
+ARTIFACT_ID_PATTERN = re.compile(r"art_[0-9a-f]{32}\.(?:png)")
+
+
+class ArtifactStore:
+    """Artefatos em arquivos locais (``storage/artifacts``), um por ID."""
+
+    def __init__(self, directory: Optional[str] = None):
+        self._directory = directory
+
+    @property
+    def directory(self) -> str:
+        if self._directory is None:
+            from app.config.settings import get_storage_path
+
+            self._directory = get_storage_path(ARTIFACTS_DIR)
+        return self._directory
+
+    @staticmethod
+    def is_artifact_id(value: str) -> bool:
+        return isinstance(value, str) and ARTIFACT_ID_PATTERN.fullmatch(value) is not None
+
+    @staticmethod
+    def content_type(artifact_id: str) -> str:
+        return CONTENT_TYPES.get(artifact_id.rsplit(".", 1)[-1], "application/octet-stream")
+
+    def path_for(self, artifact_id: str) -> str:
+        """Caminho do arquivo (o ID é validado para evitar path traversal)."""
+        if not self.is_artifact_id(artifact_id):
+            raise ValueError(f"ID de artefato inválido: {artifact_id!r}")
+        return os.path.join(self.directory, artifact_id[len(ARTIFACT_ID_PREFIX):][:2], artifact_id)
+
+    def put(self, data: bytes, extension: str = "png") -> str:
+        """Grava os bytes (se ainda não existirem) e retorna o ID."""
+        if extension not in CONTENT_TYPES:
+            raise ValueError(f"Extensão não suportada: {extension}")
+
+        digest = hashlib.blake2b(data, digest_size=16).hexdigest()
+        artifact_id = f"{ARTIFACT_ID_PREFIX}{digest}.{extension}"
+        path = self.path_for(artifact_id)
+        if os.path.exists(path):
+            return artifact_id
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(prefix=".artifact.", dir=os.path.dirname(path))
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        return artifact_id
+
+    def get(self, artifact_id: str) -> Optional[bytes]:
+        """Bytes do artefato ou None se não existir (ou o ID for inválido)."""
+        try:
+            with open(self.path_for(artifact_id), "rb") as f:
+                return f.read()
+        except (ValueError, FileNotFoundError):
+            return None
+
+    def exists(self, artifact_id: str) -> bool:
+        try:
+            return os.path.exists(self.path_for(artifact_id))
+        except ValueError:
+            return False
+
+
+def artifact_url(artifact_id: str, base_url: Optional[str] = None) -> str:
+    """URL do artefato no playground (relativa, a menos que ARTIFACTS_BASE_URL esteja definida)."""
+    if base_url is None:
+        base_url = os.getenv("ARTIFACTS_BASE_URL", "")
+    return f"{base_url.rstrip('/')}{ARTIFACTS_ROUTE}/{artifact_id}"
+
+
+_store: Optional[ArtifactStore] = None
+_store_lock = threading.Lock()
+
+
+def get_artifact_store() -> ArtifactStore:
+    """Store compartilhado pelo processo (criado no primeiro uso)."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = ArtifactStore()
+        return _store
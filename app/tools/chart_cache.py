@@ -0,0 +1,181 @@
+"""
+Cache endereçado por conteúdo para os PNGs gerados pelo serviço de gráficos.
+
+A chave é um hash dos dados de entrada (já reduzidos, quando acima do
+orçamento de pontos), do tipo de gráfico, das colunas, do título e da redução
+aplicada (além da resolução). As imagens ficam em um LRU em memória limitado por
+bytes; em disco os bytes ficam só no store de artefatos (``storage/artifacts``,
+o mesmo que serve as URLs) e ``storage/charts`` guarda apenas, por chave, o ID
+do artefato. Assim um gráfico repetido, em outra rodada ou outra sessão, não
+passa pelo matplotlib, e cada PNG é gravado em disco uma única vez.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+if TYPE_CHECKING:
+    from app.tools.artifacts import ArtifactStore
+
+# Orçamento do LRU em memória (64 MB)
+DEFAULT_MEMORY_BYTES = 64 * 1024 * 1024
+
+# Subdiretório de storage com o índice chave -> ID do artefato
+CHARTS_DIR = "charts"
+
+# Parte da especificação (além dos dados) que entra na chave
+_SPEC_FIELDS = ("kind", "chart_type", "x_col", "y_col", "title", "reduction")
+
+# Dados pré-agregados (arrays numpy) que substituem frame/x/y após a redução
+_ARRAY_FIELDS = ("density", "histogram")
+
+
+def chart_key(spec: Dict[str, Any], **extra: Any) -> str:
+    """Hash hexadecimal que identifica o PNG gerado por ``spec``.
+
+    ``extra`` permite incluir parâmetros de renderização (ex.: dpi).
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    header = {field: spec.get(field) for field in _SPEC_FIELDS}
+    header.update(extra)
+    digest.update(json.dumps(header, sort_keys=True, default=str).encode("utf-8"))
+
+    frame = spec.get("frame")
+    if frame is not None:
+        digest.update(json.dumps([list(map(str, frame.columns)), list(map(str, frame.dtypes))]).encode("utf-8"))
+        digest.update(pd.util.hash_pandas_object(frame, index=True).to_numpy().tobytes())
+    else:
+        digest.update(json.dumps([spec.get("x"), spec.get("y")], default=str).encode("utf-8"))
+
+    for field in _ARRAY_FIELDS:
+        arrays = spec.get(field)
+        if arrays:
+            for name in sorted(arrays):
+                array = np.ascontiguousarray(arrays[name])
+                digest.update(f"{field}.{name}:{array.dtype}:{array.shape}".encode("utf-8"))
+                digest.update(array.tobytes())
+
+    return digest.hexdigest()
+
+
+class ChartCache:
+    """LRU de PNGs em memória (limitado por bytes) sobre o store de artefatos."""
+
+    def __init__(self, max_memory_bytes: int = DEFAULT_MEMORY_BYTES, directory: Optional[str] = None,
+                 store: Optional["ArtifactStore"] = None):
+        self.max_memory_bytes = max_memory_bytes
+        self._directory = directory
+        self._store = store
+        self._memory: "OrderedDict[str, bytes]" = OrderedDict()
+        self.current_bytes = 0
+        self._lock = threading.Lock()
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0}
+
+    @property
+    def directory(self) -> str:
+        if self._directory is None:
+            from app.config.settings import get_storage_path
+
+            self._directory = get_storage_path(CHARTS_DIR)
+        return self._directory
+
+    @property
+    def store(self) -> "ArtifactStore":
+        if self._store is None:
+            from app.tools.artifacts import get_artifact_store
+
+            self._store = get_artifact_store()
+        return self._store
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], key)
+
+    def artifact_id(self, key: str) -> Optional[str]:
+        """ID do artefato com o PNG da chave, ou None se ainda não houver."""
+        try:
+            with open(self._path(key), "r", encoding="utf-8") as f:
+                artifact_id = f.read().strip()
+        except FileNotFoundError:
+            return None
+        return artifact_id if self.store.is_artifact_id(artifact_id) else None
+
+    def _remember(self, key: str, png: bytes) -> None:
+        if len(png) > self.max_memory_bytes:
+            return
+        if key in self._memory:
+            self.current_bytes -= len(self._memory.pop(key))
+        self._memory[key] = png
+        self.current_bytes += len(png)
+        while self.current_bytes > self.max_memory_bytes:
+            _, evicted = self._memory.popitem(last=False)
+            self.current_bytes -= len(evicted)
+
+    def get(self, key: str) -> Optional[bytes]:
+        """PNG armazenado para a chave (memória, depois disco) ou None."""
+        with self._lock:
+            png = self._memory.get(key)
+            if png is not None:
+                self._memory.move_to_end(key)
+                self.stats["memory_hits"] += 1
+                return png
+
+        artifact_id = self.artifact_id(key)
+        png = self.store.get(artifact_id) if artifact_id is not None else None
+        if png is None:
+            with self._lock:
+                self.stats["misses"] += 1
+            return None
+
+        with self._lock:
+            self.stats["disk_hits"] += 1
+            self._remember(key, png)
+        return png
+
+    def put(self, key: str, png: bytes) -> str:
+        """Armazena o PNG em memória e no store de artefatos; retorna o ID do artefato."""
+        with self._lock:
+            self._remember(key, png)
+
+        artifact_id = self.store.put(png)
+        if self.artifact_id(key) == artifact_id:
+            return artifact_id
+
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(prefix=".chart.", dir=os.path.dirname(path))
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(artifact_id)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        return artifact_id
+
+    def get_or_render(self, key: str, render: Callable[[], bytes]) -> bytes:
+        """Retorna o PNG em cache ou renderiza e armazena."""
+        png = self.get(key)
+        if png is None:
+            png = render()
+            self.put(key, png)
+        return png
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            if key in self._memory:
+                return True
+        artifact_id = self.artifact_id(key)
+        return artifact_id is not None and self.store.exists(artifact_id)
+
+    def clear_memory(self) -> None:
+        with self._lock:
+            self._memory.clear()
+            self.current_bytes = 0
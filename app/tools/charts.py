@@ -0,0 +1,392 @@
+"""
+Serviço de renderização de gráficos.
+
+Os gráficos são desenhados com a API orientada a objetos do matplotlib
+(``Figure`` + ``FigureCanvasAgg``), sem o estado global do ``pyplot``, em um
+pool de processos cujos workers já importaram matplotlib e seaborn. Assim
+pedidos de sessões diferentes renderizam em paralelo sem compartilhar figuras.
+
+- simple_chart_spec / advanced_chart_spec: validam os parâmetros no processo
+  chamador e montam uma especificação serializável (só as colunas usadas);
+  acima de ``max_points`` os dados já vão reduzidos (LTTB, grade de densidade
+  ou histograma pré-agrupado, ver ``app.tools.downsampling``)
+- render_spec: desenha a especificação e devolve os bytes PNG
+- ChartRenderer: pool de processos com fallback para renderização local e,
+  opcionalmente, um ``ChartCache`` que evita renderizar o mesmo gráfico de novo
+"""
+
+import io
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from app.tools.chart_cache import ChartCache, chart_key
+from app.tools.downsampling import (
+    DEFAULT_POINT_BUDGET,
+    as_numeric,
+    density_grid,
+    histogram_bins,
+    lttb_indices,
+)
+
+# Workers do pool de renderização (0 = renderizar no próprio processo)
+CHART_WORKERS = int(os.getenv("CHART_RENDER_WORKERS", min(4, os.cpu_count() or 1)))
+
+# Tempo máximo de espera por um gráfico (segundos)
+RENDER_TIMEOUT = 60
+
+# Resolução dos PNGs gerados
+CHART_DPI = 150
+
+# Renderizações no próprio processo mexem em rcParams globais: uma por vez
+_INPROCESS_LOCK = threading.Lock()
+
+
+class ChartSpecError(ValueError):
+    """Parâmetros inválidos para o gráfico (mensagem pronta para o usuário)."""
+
+
+def _float_array(values) -> Optional[np.ndarray]:
+    """Valores como float ou None se não forem numéricos."""
+    try:
+        return np.asarray(values, dtype=float)
+    except (TypeError, ValueError):
+        return None
+
+
+def _is_numeric(series: pd.Series) -> bool:
+    return pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series)
+
+
+def _reduction(method: str, points: int, max_points: int) -> Dict[str, Any]:
+    """Descrição da redução aplicada (entra na chave do cache e na legenda)."""
+    return {"method": method, "points": points, "max_points": max_points}
+
+
+def simple_chart_spec(data: Union[List, Dict], chart_type: str = "line",
+                      max_points: Optional[int] = None) -> Dict[str, Any]:
+    """Especificação de create_visualization (lista de valores ou dict rótulo -> valor).
+
+    Com mais de ``max_points`` valores, linhas passam por LTTB, dispersão vira
+    grade de densidade e histogramas são pré-agrupados.
+    """
+    if isinstance(data, dict):
+        x = list(data.keys())
+        y = list(data.values())
+    elif isinstance(data, list):
+        x = list(range(len(data)))
+        y = data
+    else:
+        raise ChartSpecError("Formato de dados não suportado. Use list ou dict.")
+
+    if not y:
+        raise ChartSpecError("Não há dados para visualizar.")
+
+    spec: Dict[str, Any] = {"kind": "simple", "chart_type": chart_type, "x": x, "y": list(y)}
+    max_points = DEFAULT_POINT_BUDGET if max_points is None else max_points
+    y_values = _float_array(y) if len(y) > max_points else None
+    if y_values is None:
+        return spec
+
+    if chart_type == "line":
+        indices = lttb_indices(as_numeric(x), y_values, max_points)
+        spec["x"] = [x[i] for i in indices]
+        spec["y"] = y_values[indices].tolist()
+        spec["reduction"] = _reduction("lttb", len(y), max_points)
+    elif chart_type == "scatter":
+        counts, xedges, yedges = density_grid(as_numeric(x), y_values)
+        spec["x"] = spec["y"] = None
+        spec["density"] = {"counts": counts, "xedges": xedges, "yedges": yedges}
+        spec["reduction"] = _reduction("density", len(y), max_points)
+    elif chart_type == "histogram":
+        counts, edges = histogram_bins(y_values)
+        spec["x"] = spec["y"] = None
+        spec["histogram"] = {"counts": counts, "edges": edges}
+        spec["reduction"] = _reduction("histogram", len(y), max_points)
+
+    return spec
+
+
+def advanced_chart_spec(df: pd.DataFrame, x_col: str, y_col: Optional[str] = None,
+                        chart_type: str = "line", title: Optional[str] = None,
+                        max_points: Optional[int] = None) -> Dict[str, Any]:
+    """Especificação de create_advanced_visualization com apenas as colunas necessárias.
+
+    Com mais de ``max_points`` linhas, ``line`` é reduzido por LTTB, ``scatter``
+    vira grade de densidade e ``distribution`` numérica é pré-agrupada.
+    """
+    spec: Dict[str, Any] = {
+        "kind": "advanced", "chart_type": chart_type, "x_col": x_col, "y_col": y_col, "title": title
+    }
+    max_points = DEFAULT_POINT_BUDGET if max_points is None else max_points
+
+    if chart_type == "correlation":
+        # Matriz de correlação (ignora x_col e y_col para este tipo)
+        numeric_cols = df.select_dtypes(include=[np.number]).columns
+        if len(numeric_cols) < 2:
+            raise ChartSpecError("Dados insuficientes para matriz de correlação (precisa de 2+ colunas numéricas)")
+        spec["frame"] = df[numeric_cols]
+
+    elif chart_type == "distribution":
+        if not x_col or x_col not in df.columns:
+            raise ChartSpecError(f"Coluna '{x_col}' não encontrada ou não especificada")
+        spec["frame"] = df[[x_col]]
+
+        if len(df) > max_points and _is_numeric(df[x_col]):
+            counts, edges = histogram_bins(as_numeric(df[x_col]))
+            spec["frame"] = None
+            spec["histogram"] = {"counts": counts, "edges": edges}
+            spec["reduction"] = _reduction("histogram", len(df), max_points)
+
+    elif chart_type in ("scatter", "line") and y_col:
+        if not x_col or not y_col or x_col not in df.columns or y_col not in df.columns:
+            raise ChartSpecError(f"Colunas não encontradas: {x_col}, {y_col}")
+        spec["frame"] = df[[x_col, y_col]]
+
+        if len(df) > max_points and _is_numeric(df[y_col]):
+            if chart_type == "line":
+                frame = spec["frame"].dropna()
+                indices = lttb_indices(as_numeric(frame[x_col]), as_numeric(frame[y_col]), max_points)
+                spec["frame"] = frame.iloc[indices]
+                spec["reduction"] = _reduction("lttb", len(df), max_points)
+            elif _is_numeric(df[x_col]):
+                counts, xedges, yedges = density_grid(as_numeric(df[x_col]), as_numeric(df[y_col]))
+                spec["frame"] = None
+                spec["density"] = {"counts": counts, "xedges": xedges, "yedges": yedges}
+                spec["reduction"] = _reduction("density", len(df), max_points)
+
+    elif chart_type == "box":
+        if not x_col or x_col not in df.columns:
+            raise ChartSpecError(f"Coluna '{x_col}' não encontrada ou não especificada")
+        if y_col and y_col in df.columns:
+            spec["frame"] = df[[x_col, y_col]]
+        else:
+            spec["y_col"] = None
+            spec["frame"] = df[[x_col]]
+
+    else:
+        raise ChartSpecError(f"Tipo de gráfico '{chart_type}' não suportado ou parâmetros incorretos")
+
+    return spec
+
+
+def _draw_density(fig, ax, density: Dict[str, np.ndarray]) -> None:
+    """Grade de densidade (escala log) no lugar de milhões de marcadores."""
+    from matplotlib.colors import LogNorm
+
+    counts = density["counts"]
+    norm = LogNorm() if counts.max() > 0 else None
+    mesh = ax.pcolormesh(density["xedges"], density["yedges"], counts.T, norm=norm, cmap="viridis")
+    fig.colorbar(mesh, ax=ax, label="Pontos")
+
+
+def _draw_histogram(ax, histogram: Dict[str, np.ndarray]) -> None:
+    ax.stairs(histogram["counts"], histogram["edges"], fill=True, alpha=0.7)
+
+
+def _annotate_reduction(fig, reduction: Optional[Dict[str, Any]]) -> None:
+    """Nota discreta no rodapé indicando que os dados foram resumidos."""
+    if not reduction:
+        return
+    labels = {
+        "lttb": f"LTTB: {reduction['max_points']:,} de {reduction['points']:,} pontos",
+        "density": f"Densidade de {reduction['points']:,} pontos",
+        "histogram": f"Histograma de {reduction['points']:,} valores",
+    }
+    fig.text(0.99, 0.01, labels[reduction["method"]].replace(",", "."),
+             ha="right", va="bottom", fontsize=8, color="gray")
+
+
+def _draw_simple(fig, spec: Dict[str, Any]) -> None:
+    chart_type, x, y = spec["chart_type"], spec["x"], spec["y"]
+    reduced = spec.get("reduction") is not None
+    ax = fig.add_subplot()
+
+    if chart_type == "line":
+        ax.plot(x, y, marker=None if reduced else 'o', linewidth=2, markersize=4)
+    elif chart_type == "bar":
+        ax.bar(x, y, alpha=0.7)
+    elif chart_type == "scatter" and reduced:
+        _draw_density(fig, ax, spec["density"])
+    elif chart_type == "scatter":
+        ax.scatter(x, y, alpha=0.7, s=50)
+    elif chart_type == "histogram" and reduced:
+        _draw_histogram(ax, spec["histogram"])
+    elif chart_type == "histogram":
+        ax.hist(y, bins=20, alpha=0.7, edgecolor='black')
+    else:
+        ax.plot(x, y)  # Fallback para line
+
+    ax.set_title(f"Gráfico {chart_type.title()}", fontsize=14, fontweight='bold')
+    ax.set_xlabel("X", fontsize=12)
+    ax.set_ylabel("Y", fontsize=12)
+    ax.grid(True, alpha=0.3)
+
+
+def _draw_advanced(fig, spec: Dict[str, Any]) -> None:
+    import seaborn as sns
+
+    chart_type, df = spec["chart_type"], spec["frame"]
+    x_col, y_col, title = spec["x_col"], spec["y_col"], spec["title"]
+    reduced = spec.get("reduction") is not None
+
+    with sns.axes_style("whitegrid"):
+        ax = fig.add_subplot()
+
+    if chart_type == "correlation":
+        sns.heatmap(df.corr(), annot=True, cmap='coolwarm', center=0,
+                    square=True, linewidths=0.5, ax=ax)
+        ax.set_title(title or "Matriz de Correlação", fontsize=14, fontweight='bold')
+
+    elif chart_type == "distribution":
+        if reduced:
+            # Histograma já agrupado no processo chamador (sem KDE)
+            _draw_histogram(ax, spec["histogram"])
+        elif df[x_col].dtype in ['object', 'category']:
+            # Variável categórica
+            df[x_col].value_counts().plot(kind='bar', alpha=0.7, ax=ax)
+            ax.tick_params(axis='x', labelrotation=45)
+        else:
+            # Variável numérica
+            sns.histplot(df[x_col], kde=True, alpha=0.7, ax=ax)
+        ax.set_title(title or f"Distribuição de {x_col}", fontsize=14, fontweight='bold')
+        ax.set_xlabel(x_col, fontsize=12)
+        ax.set_ylabel("Frequência", fontsize=12)
+
+    elif chart_type == "scatter":
+        if reduced:
+            _draw_density(fig, ax, spec["density"])
+            ax.set_xlabel(x_col, fontsize=12)
+            ax.set_ylabel(y_col, fontsize=12)
+        else:
+            sns.scatterplot(data=df, x=x_col, y=y_col, alpha=0.7, ax=ax)
+        ax.set_title(title or f"{y_col} vs {x_col}", fontsize=14, fontweight='bold')
+
+    elif chart_type == "line":
+        ax.plot(df[x_col], df[y_col], marker=None if reduced else 'o', linewidth=2, markersize=4)
+        ax.set_title(title or f"{y_col} ao longo de {x_col}", fontsize=14, fontweight='bold')
+        ax.set_xlabel(x_col, fontsize=12)
+        ax.set_ylabel(y_col, fontsize=12)
+
+    elif chart_type == "box":
+        if y_col:
+            sns.boxplot(data=df, x=y_col, y=x_col, ax=ax)
+            ax.set_title(title or f"Box Plot: {x_col} por {y_col}", fontsize=14, fontweight='bold')
+        else:
+            sns.boxplot(y=df[x_col], ax=ax)
+            ax.set_title(title or f"Box Plot: {x_col}", fontsize=14, fontweight='bold')
+
+
+def render_spec(spec: Dict[str, Any]) -> bytes:
+    """Desenha a especificação em uma Figure própria e retorna o PNG."""
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    if spec["kind"] == "simple":
+        fig = Figure(figsize=(10, 6))
+        FigureCanvasAgg(fig)
+        _draw_simple(fig, spec)
+    else:
+        fig = Figure(figsize=(12, 8))
+        FigureCanvasAgg(fig)
+        _draw_advanced(fig, spec)
+
+    fig.tight_layout()
+    _annotate_reduction(fig, spec.get("reduction"))
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format='png', dpi=CHART_DPI, bbox_inches='tight',
+                facecolor='white', edgecolor='none')
+    return buffer.getvalue()
+
+
+def _warm_worker() -> None:
+    """Inicializador dos workers: importa matplotlib/seaborn e aquece o cache de fontes."""
+    import matplotlib
+    matplotlib.use("Agg")
+    import seaborn  # noqa: F401
+
+    render_spec({"kind": "simple", "chart_type": "line", "x": [0, 1], "y": [0, 1]})
+
+
+def _noop() -> None:
+    pass
+
+
+class ChartRenderer:
+    """Pool de processos para renderizar gráficos em paralelo.
+
+    Com ``max_workers=0`` (ou se o pool quebrar) os gráficos são renderizados
+    no próprio processo, um por vez. Com ``cache`` os PNGs são reaproveitados
+    por conteúdo (dados, tipo, colunas e título).
+    """
+
+    def __init__(self, max_workers: int = CHART_WORKERS, timeout: float = RENDER_TIMEOUT,
+                 cache: Optional[ChartCache] = None):
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.cache = cache
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> Optional[ProcessPoolExecutor]:
+        if self.max_workers <= 0:
+            return None
+        with self._lock:
+            if self._executor is None:
+                # spawn: seguro mesmo com o servidor já rodando threads
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_warm_worker
+                )
+            return self._executor
+
+    def warm_up(self) -> None:
+        """Sobe todos os workers em segundo plano (não bloqueia)."""
+        executor = self._get_executor()
+        if executor is not None:
+            for _ in range(self.max_workers):
+                executor.submit(_noop)
+
+    def render(self, spec: Dict[str, Any]) -> bytes:
+        """Retorna o PNG da especificação (do cache, se houver, ou renderizando)."""
+        if self.cache is None:
+            return self._render(spec)
+        return self.cache.get_or_render(chart_key(spec, dpi=CHART_DPI), lambda: self._render(spec))
+
+    def _render(self, spec: Dict[str, Any]) -> bytes:
+        executor = self._get_executor()
+        if executor is not None:
+            try:
+                return executor.submit(render_spec, spec).result(timeout=self.timeout)
+            except BrokenProcessPool:
+                # Worker morreu: descartar o pool e renderizar localmente desta vez
+                self.shutdown(wait=False)
+
+        with _INPROCESS_LOCK:
+            return render_spec(spec)
+
+    def shutdown(self, wait: bool = True) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
+
+
+_renderer: Optional[ChartRenderer] = None
+_renderer_lock = threading.Lock()
+
+
+def get_chart_renderer() -> ChartRenderer:
+    """Renderer compartilhado pelo processo (criado no primeiro uso)."""
+    global _renderer
+    with _renderer_lock:
+        if _renderer is None:
+            _renderer = ChartRenderer(cache=ChartCache())
+        return _renderer
@@ -0,0 +1,600 @@
+"""
+Análise estrutural de projetos Python inteiros.
+
+- analyze_source: classes, funções, métodos, imports e linhas de um arquivo,
+  com complexidade, aninhamento e tamanho por função e hot spots (laços
+  aninhados, funções complexas), tudo em uma passada de ``ast.NodeVisitor``
+- discover_python_files: arquivos ``.py`` do projeto, ignorando ambientes
+  virtuais, caches e diretórios ocultos
+- AnalysisCache: resultado por arquivo em ``storage/code_analysis``, validado
+  por mtime/tamanho e, se estes mudarem, pelo hash do conteúdo
+- ProjectAnalyzer: analisa só os arquivos novos ou alterados em um pool de
+  processos e agrega o projeto (totais, módulos e grafo de imports internos);
+  o mesmo pool atende o índice de símbolos (``app.tools.symbol_index``)
+"""
+
+import ast
+import hashlib
+import json
+import multiprocessing
+import os
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Workers do pool de análise (0 = analisar no próprio processo)
+CODE_ANALYSIS_WORKERS = int(os.getenv("CODE_ANALYSIS_WORKERS", min(4, os.cpu_count() or 1)))
+
+# Abaixo disso não compensa subir o pool
+MIN_FILES_FOR_POOL = 32
+
+# Arquivos enviados a cada worker por vez
+FILES_PER_TASK = 16
+
+# Tempo máximo de espera pela análise de um projeto (segundos)
+ANALYSIS_TIMEOUT = 300
+
+# Subdiretório de storage com o cache por projeto
+CODE_ANALYSIS_DIR = "code_analysis"
+
+# Diretórios que nunca fazem parte do código do projeto
+SKIP_DIRS = frozenset({
+    "__pycache__", "node_modules", "site-packages", "venv", "env", "build", "dist",
+})
+
+# Versão do formato dos resultados (invalida caches antigos)
+ANALYSIS_VERSION = 2
+
+# Limites para hot spots por função: (tipo, métrica, valor mínimo)
+HOT_SPOT_LIMITS = (
+    ("high_complexity", "complexity", 10),
+    ("deep_nesting", "max_nesting", 4),
+    ("long_function", "lines", 80),
+)
+
+# Hot spots listados no resumo do projeto (os de maior valor)
+MAX_PROJECT_HOT_SPOTS = 20
+
+
+def module_name(relative_path: str) -> str:
+    """Nome do módulo para um caminho relativo à raiz (``pkg/mod.py`` -> ``pkg.mod``)."""
+    parts = relative_path.replace(os.sep, "/")[:-len(".py")].split("/")
+    if parts[-1] == "__init__":
+        parts.pop()
+    return ".".join(parts)
+
+
+def resolve_relative_import(module: str, is_package: bool, level: int, target: Optional[str]) -> str:
+    """Nome absoluto de ``from <.*level><target> import ...`` dentro de ``module``."""
+    package = module.split(".") if is_package else module.split(".")[:-1]
+    if level > 1:
+        package = package[:len(package) - (level - 1)]
+    return ".".join(part for part in package + ([target] if target else []) if part)
+
+
+# Nós sem nada a medir abaixo deles (não são percorridos)
+_LEAF_NODES = (
+    ast.Name, ast.Constant, ast.expr_context, ast.operator, ast.unaryop, ast.cmpop, ast.boolop,
+    ast.alias, ast.Pass, ast.Break, ast.Continue, ast.Global, ast.Nonlocal,
+)
+
+
+class _StructureVisitor(ast.NodeVisitor):
+    """Estrutura e métricas de um módulo em uma única passada.
+
+    Por função: tamanho em linhas, complexidade ciclomática (1 + pontos de
+    decisão: ``if``/``elif``, laços, ``except``, ``case``, operandos extras de
+    ``and``/``or``, ``assert``, expressões condicionais e compreensões) e
+    profundidade máxima de blocos aninhados. Funções internas têm métricas
+    próprias e não somam na função de fora. Hot spots são laços aninhados e
+    funções acima dos limites de complexidade, aninhamento ou tamanho.
+    """
+
+    # Método visit_* por tipo de nó (evita getattr a cada nó)
+    _dispatch: Dict[type, Callable] = {}
+
+    def __init__(self, module: str, is_package: bool):
+        self.module = module
+        self.is_package = is_package
+        self.classes: List[str] = []
+        self.functions: List[str] = []
+        self.methods: List[str] = []
+        self.imports: List[str] = []
+        self.imported_modules: List[str] = []
+        self.function_metrics: List[Dict[str, Any]] = []
+        self.hot_spots: List[Dict[str, Any]] = []
+        self._scope: List[Tuple[str, bool]] = []
+        self._function: Optional[Dict[str, Any]] = None
+        self._nesting = 0
+        self._loops = 0
+        self._loop_spot: Optional[Dict[str, Any]] = None
+
+    def visit(self, node: ast.AST) -> None:
+        method = self._dispatch.get(node.__class__)
+        if method is None:
+            if issubclass(node.__class__, _LEAF_NODES):
+                method = _StructureVisitor._skip
+            else:
+                method = getattr(type(self), "visit_" + node.__class__.__name__, type(self).generic_visit)
+            self._dispatch[node.__class__] = method
+        method(self, node)
+
+    def generic_visit(self, node: ast.AST) -> None:
+        # Igual ao do NodeVisitor, sem o custo de ast.iter_fields
+        visit = self.visit
+        for field in node._fields:
+            value = getattr(node, field, None)
+            if value.__class__ is list:
+                for item in value:
+                    if isinstance(item, ast.AST):
+                        visit(item)
+            elif isinstance(value, ast.AST):
+                visit(value)
+
+    def _skip(self, node: ast.AST) -> None:
+        pass
+
+    def _visit_all(self, nodes) -> None:
+        for node in nodes:
+            if node is not None:
+                self.visit(node)
+
+    def _decision(self, count: int = 1) -> None:
+        if self._function is not None:
+            self._function["complexity"] += count
+
+    def _block(self, body: List[ast.stmt], loop_node: Optional[ast.AST] = None, loops: int = 1) -> None:
+        """Visita ``body`` um nível mais fundo (e dentro de ``loops`` laços, se ``loop_node``)."""
+        self._nesting += 1
+        if self._function is not None:
+            self._function["max_nesting"] = max(self._function["max_nesting"], self._nesting)
+        if loop_node is not None:
+            self._enter_loop(loop_node, loops)
+        self._visit_all(body)
+        if loop_node is not None:
+            self._exit_loop(loops)
+        self._nesting -= 1
+
+    def _enter_loop(self, node: ast.AST, loops: int) -> None:
+        self._loops += loops
+        if self._loops >= 2:
+            if self._loop_spot is None:
+                self._loop_spot = {"kind": "nested_loop", "function": self._qualname() or "<module>",
+                                   "line": node.lineno, "value": self._loops}
+                self.hot_spots.append(self._loop_spot)
+            self._loop_spot["value"] = max(self._loop_spot["value"], self._loops)
+
+    def _exit_loop(self, loops: int) -> None:
+        self._loops -= loops
+        if self._loops < 2:
+            self._loop_spot = None
+
+    def _qualname(self, name: Optional[str] = None) -> str:
+        return ".".join([part for part, _ in self._scope] + ([name] if name else []))
+
+    def visit_ClassDef(self, node: ast.ClassDef) -> None:
+        self.classes.append(node.name)
+        self._visit_all(node.decorator_list + node.bases + node.keywords)
+        self._scope.append((node.name, True))
+        self._visit_all(node.body)
+        self._scope.pop()
+
+    def visit_FunctionDef(self, node) -> None:
+        is_method = bool(self._scope) and self._scope[-1][1]
+        qualname = self._qualname(node.name)
+        (self.methods if is_method else self.functions).append(qualname)
+
+        # Decoradores e defaults são avaliados no escopo de fora
+        self._visit_all(node.decorator_list + node.args.defaults + node.args.kw_defaults)
+        metrics = {
+            "name": qualname,
+            "kind": "method" if is_method else "function",
+            "async": isinstance(node, ast.AsyncFunctionDef),
+            "line": node.lineno,
+            "lines": (node.end_lineno or node.lineno) - node.lineno + 1,
+            "complexity": 1,
+            "max_nesting": 0
+        }
+        saved = (self._function, self._nesting, self._loops, self._loop_spot)
+        self._function, self._nesting, self._loops, self._loop_spot = metrics, 0, 0, None
+        self._scope.append((node.name, False))
+        self._visit_all(node.body)
+        self._scope.pop()
+        self._function, self._nesting, self._loops, self._loop_spot = saved
+
+        self.function_metrics.append(metrics)
+        for kind, field, limit in HOT_SPOT_LIMITS:
+            if metrics[field] >= limit:
+                self.hot_spots.append({"kind": kind, "function": qualname, "line": node.lineno,
+                                       "value": metrics[field]})
+
+    visit_AsyncFunctionDef = visit_FunctionDef
+
+    def visit_If(self, node: ast.If) -> None:
+        self._decision()
+        self.visit(node.test)
+        self._block(node.body)
+        if len(node.orelse) == 1 and isinstance(node.orelse[0], ast.If):
+            # elif: mesmo nível do if
+            self.visit(node.orelse[0])
+        elif node.orelse:
+            self._block(node.orelse)
+
+    def visit_For(self, node) -> None:
+        self._decision()
+        self._visit_all([node.target, node.iter])
+        self._block(node.body, loop_node=node)
+        if node.orelse:
+            self._block(node.orelse)
+
+    visit_AsyncFor = visit_For
+
+    def visit_While(self, node: ast.While) -> None:
+        self._decision()
+        self.visit(node.test)
+        self._block(node.body, loop_node=node)
+        if node.orelse:
+            self._block(node.orelse)
+
+    def visit_With(self, node) -> None:
+        self._visit_all(node.items)
+        self._block(node.body)
+
+    visit_AsyncWith = visit_With
+
+    def visit_Try(self, node) -> None:
+        self._block(node.body)
+        for handler in node.handlers:
+            self._decision()
+            self._visit_all([handler.type])
+            self._block(handler.body)
+        for body in (node.orelse, node.finalbody):
+            if body:
+                self._block(body)
+
+    visit_TryStar = visit_Try
+
+    def visit_Match(self, node) -> None:
+        self.visit(node.subject)
+        for case in node.cases:
+            self._decision()
+            self._visit_all([case.guard])
+            self._block(case.body)
+
+    def visit_BoolOp(self, node: ast.BoolOp) -> None:
+        self._decision(len(node.values) - 1)
+        self.generic_visit(node)
+
+    def visit_IfExp(self, node: ast.IfExp) -> None:
+        self._decision()
+        self.generic_visit(node)
+
+    def visit_Assert(self, node: ast.Assert) -> None:
+        self._decision()
+        self.generic_visit(node)
+
+    def _visit_comprehension(self, node) -> None:
+        loops = len(node.generators)
+        self._decision(sum(1 + len(generator.ifs) for generator in node.generators))
+        self._enter_loop(node, loops)
+        self.generic_visit(node)
+        self._exit_loop(loops)
+
+    visit_ListComp = visit_SetComp = visit_DictComp = visit_GeneratorExp = _visit_comprehension
+
+    def visit_Import(self, node: ast.Import) -> None:
+        for alias in node.names:
+            self.imports.append(alias.name)
+            self.imported_modules.append(alias.name)
+
+    def visit_ImportFrom(self, node: ast.ImportFrom) -> None:
+        base = node.module or ""
+        if node.level:
+            base = resolve_relative_import(self.module, self.is_package, node.level, node.module)
+        for alias in node.names:
+            self.imports.append(f"{node.module or ''}.{alias.name}")
+            # "from pkg import mod" pode importar um submódulo
+            self.imported_modules.append(f"{base}.{alias.name}" if base else alias.name)
+
+
+def analyze_source(content: str, module: str = "", is_package: bool = False) -> Dict[str, Any]:
+    """Estrutura e métricas de um arquivo Python (uma passada pela AST).
+
+    ``functions`` traz funções (inclusive ``async`` e internas, como
+    ``externa.interna``) e ``methods`` os métodos (``Classe.metodo``).
+    ``imports`` segue o formato de ``analyze_python_file`` (``modulo.nome``);
+    ``imported_modules`` traz os módulos absolutos (imports relativos
+    resolvidos a partir de ``module``), usados no grafo de imports.
+    """
+    visitor = _StructureVisitor(module, is_package)
+    visitor.visit(ast.parse(content))
+
+    return {
+        "classes": visitor.classes,
+        "functions": visitor.functions,
+        "methods": visitor.methods,
+        "imports": visitor.imports,
+        "imported_modules": visitor.imported_modules,
+        "lines_of_code": len(content.split('\n')),
+        "function_metrics": visitor.function_metrics,
+        "hot_spots": visitor.hot_spots
+    }
+
+
+def discover_python_files(root: str) -> List[str]:
+    """Caminhos relativos (ordenados) dos arquivos ``.py`` sob ``root``."""
+    found = []
+    for directory, subdirs, files in os.walk(root):
+        subdirs[:] = sorted(d for d in subdirs if d not in SKIP_DIRS and not d.startswith(".")
+                            and not d.endswith(".egg-info"))
+        for name in files:
+            if name.endswith(".py"):
+                found.append(os.path.relpath(os.path.join(directory, name), root))
+    return sorted(found)
+
+
+def content_hash(data: bytes) -> str:
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def _analyze_file(root: str, relative_path: str, known_hash: Optional[str]) -> Dict[str, Any]:
+    """Lê, faz o hash e (se o conteúdo mudou) analisa um arquivo.
+
+    Retorna ``result=None`` quando o hash coincide com ``known_hash``: só o
+    mtime mudou e o resultado em cache continua válido.
+    """
+    path = os.path.join(root, relative_path)
+    stat = os.stat(path)
+    with open(path, "rb") as f:
+        data = f.read()
+    entry = {"path": relative_path, "mtime_ns": stat.st_mtime_ns, "size": stat.st_size,
+             "hash": content_hash(data), "result": None}
+    if entry["hash"] == known_hash:
+        return entry
+
+    try:
+        module = module_name(relative_path)
+        is_package = os.path.basename(relative_path) == "__init__.py"
+        entry["result"] = analyze_source(data.decode("utf-8"), module, is_package)
+    except (SyntaxError, UnicodeDecodeError, ValueError) as e:
+        entry["result"] = {"error": f"{type(e).__name__}: {e}"}
+    return entry
+
+
+def _analyze_batch(root: str, batch: List[Tuple[str, Optional[str]]]) -> List[Dict[str, Any]]:
+    """Tarefa de um worker: vários arquivos por vez para diluir o custo de IPC."""
+    entries = []
+    for relative_path, known_hash in batch:
+        try:
+            entries.append(_analyze_file(root, relative_path, known_hash))
+        except OSError as e:
+            entries.append({"path": relative_path, "result": {"error": str(e)}})
+    return entries
+
+
+class AnalysisCache:
+    """Resultados por arquivo de um projeto, em ``storage/code_analysis/<projeto>.json``."""
+
+    def __init__(self, directory: Optional[str] = None):
+        self._directory = directory
+
+    @property
+    def directory(self) -> str:
+        if self._directory is None:
+            from app.config.settings import get_storage_path
+
+            self._directory = get_storage_path(CODE_ANALYSIS_DIR)
+        return self._directory
+
+    def _path(self, root: str) -> str:
+        name = hashlib.blake2b(os.path.abspath(root).encode("utf-8"), digest_size=8).hexdigest()
+        return os.path.join(self.directory, f"{name}.json")
+
+    def load(self, root: str) -> Dict[str, Dict[str, Any]]:
+        """Entradas do projeto por caminho relativo (vazio se não houver cache)."""
+        try:
+            with open(self._path(root), encoding="utf-8") as f:
+                data = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+        if data.get("version") != ANALYSIS_VERSION:
+            return {}
+        return data.get("files", {})
+
+    def save(self, root: str, files: Dict[str, Dict[str, Any]]) -> None:
+        """Grava as entradas do projeto (escrita atômica)."""
+        os.makedirs(self.directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(prefix=".analysis.", dir=self.directory)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"version": ANALYSIS_VERSION, "root": os.path.abspath(root), "files": files}, f)
+            os.replace(tmp_path, self._path(root))
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+
+def _internal_target(imported: str, modules: Dict[str, str]) -> Optional[str]:
+    """Módulo do projeto correspondente a um import (maior prefixo conhecido)."""
+    name = imported
+    while name:
+        if name in modules:
+            return name
+        name = name.rpartition(".")[0]
+    return None
+
+
+def aggregate(files: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    """Resumo do projeto a partir dos resultados por arquivo."""
+    modules = {module_name(path): path for path, entry in files.items() if "error" not in entry["result"]}
+    summary = {"files": len(files), "classes": 0, "functions": 0, "methods": 0, "imports": 0,
+               "lines_of_code": 0}
+    per_module = {}
+    import_graph = {}
+    external = {}
+    errors = {}
+    complexities = []
+    hot_spots = []
+
+    for path in sorted(files):
+        result = files[path]["result"]
+        if "error" in result:
+            errors[path] = result["error"]
+            continue
+        module = module_name(path)
+        summary["classes"] += len(result["classes"])
+        summary["functions"] += len(result["functions"])
+        summary["methods"] += len(result["methods"])
+        summary["imports"] += len(result["imports"])
+        summary["lines_of_code"] += result["lines_of_code"]
+        module_complexities = [metrics["complexity"] for metrics in result["function_metrics"]]
+        complexities.extend(module_complexities)
+        hot_spots.extend({"path": path, **spot} for spot in result["hot_spots"])
+        per_module[module] = {
+            "path": path,
+            "classes": result["classes"],
+            "functions": result["functions"],
+            "methods": result["methods"],
+            "lines_of_code": result["lines_of_code"],
+            "max_complexity": max(module_complexities, default=0)
+        }
+
+        edges = set()
+        for imported in result["imported_modules"]:
+            target = _internal_target(imported, modules)
+            if target is None:
+                top_level = imported.split(".")[0]
+                external[top_level] = external.get(top_level, 0) + 1
+            elif target != module:
+                edges.add(target)
+        import_graph[module] = sorted(edges)
+
+    summary["average_complexity"] = round(sum(complexities) / len(complexities), 2) if complexities else 0.0
+    summary["max_complexity"] = max(complexities, default=0)
+    summary["hot_spots"] = len(hot_spots)
+
+    return {
+        "summary": summary,
+        "modules": per_module,
+        "hot_spots": sorted(hot_spots, key=lambda spot: (-spot["value"], spot["path"], spot["line"]))[
+            :MAX_PROJECT_HOT_SPOTS],
+        "import_graph": import_graph,
+        "external_imports": dict(sorted(external.items(), key=lambda item: (-item[1], item[0]))),
+        "errors": errors
+    }
+
+
+class ProjectAnalyzer:
+    """Analisa projetos em um pool de processos, reaproveitando o cache por arquivo.
+
+    Arquivos com mtime e tamanho iguais aos do cache não são lidos; se só o
+    mtime mudou, o hash do conteúdo evita a nova análise. Com
+    ``max_workers=0`` (ou se o pool quebrar) tudo roda no próprio processo.
+    """
+
+    def __init__(self, max_workers: int = CODE_ANALYSIS_WORKERS, timeout: float = ANALYSIS_TIMEOUT,
+                 cache: Optional[AnalysisCache] = None):
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.cache = cache if cache is not None else AnalysisCache()
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> Optional[ProcessPoolExecutor]:
+        if self.max_workers <= 0:
+            return None
+        with self._lock:
+            if self._executor is None:
+                # spawn: seguro mesmo com o servidor já rodando threads
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._executor
+
+    def run(self, root: str, pending: List[Tuple[str, Optional[str]]],
+            task: Optional[Callable[[str, List[Tuple[str, Optional[str]]]], List[Dict[str, Any]]]] = None
+            ) -> List[Dict[str, Any]]:
+        """Executa ``task(root, lote)`` sobre lotes de ``(caminho, hash conhecido)``.
+
+        ``task`` precisa ser uma função de módulo (é enviada aos workers);
+        o padrão é a análise estrutural de ``analyze_source``. Se os workers
+        passarem de ``timeout`` o pool é descartado e ``TimeoutError`` é levantado.
+        """
+        task = task or _analyze_batch
+        batches = [pending[i:i + FILES_PER_TASK] for i in range(0, len(pending), FILES_PER_TASK)]
+        executor = self._get_executor() if len(pending) >= MIN_FILES_FOR_POOL else None
+        if executor is not None:
+            try:
+                futures = [executor.submit(task, root, batch) for batch in batches]
+                return [entry for future in futures for entry in future.result(timeout=self.timeout)]
+            except BrokenProcessPool:
+                # Worker morreu: descartar o pool e analisar localmente desta vez
+                self.shutdown(wait=False)
+            except FuturesTimeoutError:
+                # Worker preso: cancelar os lotes pendentes e encerrar o pool
+                for future in futures:
+                    future.cancel()
+                self.shutdown(wait=False, terminate=True)
+                raise TimeoutError(f"Tempo limite de {self.timeout}s excedido na análise do projeto") from None
+        return [entry for batch in batches for entry in task(root, batch)]
+
+    def analyze(self, root: str) -> Dict[str, Any]:
+        """Resumo agregado do projeto e contagem de arquivos analisados/reaproveitados."""
+        cached = self.cache.load(root)
+        files: Dict[str, Dict[str, Any]] = {}
+        pending = []
+        for relative_path in discover_python_files(root):
+            entry = cached.get(relative_path)
+            try:
+                stat = os.stat(os.path.join(root, relative_path))
+            except OSError:
+                continue
+            if entry and entry.get("mtime_ns") == stat.st_mtime_ns and entry.get("size") == stat.st_size:
+                files[relative_path] = entry
+            else:
+                pending.append((relative_path, entry.get("hash") if entry else None))
+
+        analyzed = 0
+        for new_entry in self.run(root, pending):
+            path = new_entry["path"]
+            if new_entry["result"] is None:
+                new_entry["result"] = cached[path]["result"]
+            else:
+                analyzed += 1
+            files[path] = new_entry
+
+        if pending or len(files) != len(cached):
+            self.cache.save(root, files)
+
+        report = aggregate(files)
+        report["cache"] = {"analyzed": analyzed, "reused": len(files) - analyzed}
+        return report
+
+    def shutdown(self, wait: bool = True, terminate: bool = False) -> None:
+        """Encerra o pool; com ``terminate`` os workers ainda ocupados são finalizados."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            # Um worker preso em um lote não termina com shutdown()
+            processes = list((executor._processes or {}).values()) if terminate else []
+            executor.shutdown(wait=wait, cancel_futures=True)
+            for process in processes:
+                process.terminate()
+
+
+_analyzer: Optional[ProjectAnalyzer] = None
+_analyzer_lock = threading.Lock()
+
+
+def get_project_analyzer() -> ProjectAnalyzer:
+    """Analisador compartilhado pelo processo (criado no primeiro uso)."""
+    global _analyzer
+    with _analyzer_lock:
+        if _analyzer is None:
+            _analyzer = ProjectAnalyzer()
+        return _analyzer
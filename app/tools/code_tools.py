@@ -1,69 +1,251 @@
-from typing import List
-import subprocess
+from typing import List, Optional
 import ast
 import os
 
+from app.tools.code_analysis import ProjectAnalyzer, analyze_source, get_project_analyzer
+from app.tools.docstrings import module_docstring_patch
+from app.tools.symbol_index import (
+    DEFAULT_LOOKUP_LIMIT,
+    DEFINITION_KINDS,
+    SYMBOL_KINDS,
+    SymbolIndex,
+    get_symbol_index,
+)
+from app.tools.style_check import StyleChecker, get_style_checker
+
+# Módulos detalhados na resposta de analyze_python_project (o resumo cobre todos)
+DEFAULT_MAX_MODULES = 200
+
+# Arquivos com problemas detalhados na resposta de check_code_style_batch
+DEFAULT_MAX_FILES_LISTED = 50
+
 class CodeAnalysisTools:
     """Ferramentas para análise e geração de código."""
     
-    def __init__(self):
+    def __init__(self, analyzer: Optional[ProjectAnalyzer] = None, symbol_index: Optional[SymbolIndex] = None,
+                 style_checker: Optional[StyleChecker] = None):
         self.name = "code_analysis"
+        self._analyzer = analyzer
+        self._symbol_index = symbol_index
+        self._style_checker = style_checker
+    
+    @property
+    def analyzer(self) -> ProjectAnalyzer:
+        """Analisador de projetos (o compartilhado pelo processo, se nenhum foi passado)."""
+        if self._analyzer is None:
+            self._analyzer = get_project_analyzer()
+        return self._analyzer
+    
+    @property
+    def symbol_index(self) -> SymbolIndex:
+        """Índice de símbolos (o compartilhado pelo processo, se nenhum foi passado)."""
+        if self._symbol_index is None:
+            self._symbol_index = get_symbol_index()
+        return self._symbol_index
+    
+    @property
+    def style_checker(self) -> StyleChecker:
+        """Verificador de estilo (o compartilhado pelo processo, se nenhum foi passado)."""
+        if self._style_checker is None:
+            self._style_checker = get_style_checker()
+        return self._style_checker
     
     def analyze_python_file(self, file_path: str) -> dict:
-        """Analisa um arquivo Python e retorna informações sobre sua estrutura."""
+        """Analisa um arquivo Python e retorna informações sobre sua estrutura.
+        
+        Além de classes, funções (inclusive ``async``), métodos e imports, traz
+        por função o tamanho, a complexidade ciclomática e a profundidade de
+        aninhamento, e os hot spots (laços aninhados, funções complexas,
+        muito aninhadas ou longas).
+        """
         try:
             with open(file_path, 'r', encoding='utf-8') as file:
                 content = file.read()
             
-            tree = ast.parse(content)
-            
-            classes = []
-            functions = []
-            imports = []
-            
-            for node in ast.walk(tree):
-                if isinstance(node, ast.ClassDef):
-                    classes.append(node.name)
-                elif isinstance(node, ast.FunctionDef):
-                    functions.append(node.name)
-                elif isinstance(node, ast.Import):
-                    for alias in node.names:
-                        imports.append(alias.name)
-                elif isinstance(node, ast.ImportFrom):
-                    module = node.module or ""
-                    for alias in node.names:
-                        imports.append(f"{module}.{alias.name}")
+            result = analyze_source(content)
+            complexities = [metrics["complexity"] for metrics in result["function_metrics"]]
             
             return {
                 "file_path": file_path,
-                "classes": classes,
-                "functions": functions,
-                "imports": imports,
-                "lines_of_code": len(content.split('\n'))
+                "classes": result["classes"],
+                "functions": result["functions"],
+                "methods": result["methods"],
+                "imports": result["imports"],
+                "lines_of_code": result["lines_of_code"],
+                "complexity": {
+                    "average": round(sum(complexities) / len(complexities), 2) if complexities else 0.0,
+                    "max": max(complexities, default=0)
+                },
+                "function_metrics": result["function_metrics"],
+                "hot_spots": result["hot_spots"]
             }
         except Exception as e:
             return {"error": f"Erro ao analisar arquivo: {str(e)}"}
     
+    def analyze_python_project(self, project_path: str, max_modules: int = DEFAULT_MAX_MODULES) -> dict:
+        """Analisa todos os arquivos Python de um diretório de uma vez.
+        
+        Retorna totais de classes, funções, métodos, imports, linhas e
+        complexidade, a estrutura de cada módulo, os principais hot spots, o
+        grafo de imports entre módulos do projeto e os pacotes externos mais
+        importados. Os arquivos são analisados em paralelo e o
+        resultado fica em cache: uma nova análise só relê os arquivos alterados.
+        
+        Args:
+            project_path: Diretório raiz do projeto
+            max_modules: Máximo de módulos detalhados em ``modules``/``import_graph``
+        """
+        try:
+            if not os.path.isdir(project_path):
+                return {"error": f"Diretório não encontrado: {project_path}"}
+            
+            report = self.analyzer.analyze(project_path)
+            
+            # Módulos mais importados dentro do projeto
+            in_degree = {}
+            for targets in report["import_graph"].values():
+                for target in targets:
+                    in_degree[target] = in_degree.get(target, 0) + 1
+            most_imported = sorted(in_degree.items(), key=lambda item: (-item[1], item[0]))[:10]
+            
+            shown = sorted(report["modules"])[:max_modules]
+            result = {
+                "project_path": project_path,
+                "summary": report["summary"],
+                "modules": {module: report["modules"][module] for module in shown},
+                "hot_spots": report["hot_spots"],
+                "import_graph": {module: report["import_graph"][module] for module in shown},
+                "most_imported": dict(most_imported),
+                "external_imports": report["external_imports"],
+                "errors": report["errors"],
+                "cache": report["cache"]
+            }
+            if len(report["modules"]) > len(shown):
+                result["info"] = (f"Mostrando {len(shown)} de {len(report['modules'])} módulos; "
+                                  f"os totais em 'summary' cobrem o projeto inteiro")
+            return result
+        except Exception as e:
+            return {"error": f"Erro ao analisar projeto: {str(e)}"}
+    
+    def find_symbol(self, project_path: str, name: str, kinds: Optional[List[str]] = None,
+                    limit: int = DEFAULT_LOOKUP_LIMIT) -> dict:
+        """Encontra onde um símbolo é definido, importado e usado em um projeto.
+        
+        Usa um índice persistente atualizado só com os arquivos alterados desde
+        a última consulta, então buscas repetidas em projetos grandes são rápidas.
+        
+        Args:
+            project_path: Diretório raiz do projeto
+            name: Nome do símbolo (``Classe``, ``funcao``, ``Classe.metodo``) ou
+                prefixo com ``*`` (``preco*``) para buscar definições parecidas
+            kinds: Tipos a incluir: class, function, method, variable,
+                attribute, import, reference (padrão: todos)
+            limit: Máximo de resultados por tipo
+        """
+        try:
+            if not os.path.isdir(project_path):
+                return {"error": f"Diretório não encontrado: {project_path}"}
+            invalid = [kind for kind in kinds or [] if kind not in SYMBOL_KINDS]
+            if invalid:
+                return {"error": f"Tipos inválidos: {invalid}. Use: {', '.join(SYMBOL_KINDS)}"}
+            
+            index_stats = self.symbol_index.update(project_path)
+            found = self.symbol_index.lookup(project_path, name, kinds, limit)
+            
+            def locations(symbol_kinds):
+                return [
+                    {"qualname": s["qualname"], "kind": s["kind"], "location": f"{s['path']}:{s['line']}"}
+                    for s in found["symbols"] if s["kind"] in symbol_kinds
+                ]
+            
+            result = {
+                "project_path": project_path,
+                "symbol": name,
+                "definitions": locations(DEFINITION_KINDS),
+                "imports": locations(("import",)),
+                # Em referências, qualname é o escopo onde o nome é usado
+                "references": locations(("reference",)),
+                "totals": found["totals"],
+                "index": index_stats
+            }
+            if not found["symbols"]:
+                result["info"] = f"Nenhum símbolo encontrado para '{name}'; tente um prefixo como '{name}*'"
+            elif any(total > limit for total in found["totals"].values()):
+                result["info"] = f"Mostrando até {limit} resultados por tipo; veja 'totals'"
+            return result
+        except Exception as e:
+            return {"error": f"Erro ao buscar símbolo: {str(e)}"}
+    
     def check_code_style(self, file_path: str) -> dict:
-        """Verifica o estilo do código usando flake8."""
+        """Verifica o estilo do código usando flake8.
+        
+        Cada problema vem como registro com ``path``, ``line``, ``column``,
+        ``code`` e ``message``.
+        """
         try:
-            result = subprocess.run(
-                ['flake8', file_path], 
-                capture_output=True, 
-                text=True
-            )
+            report = self.style_checker.check([file_path])
+            if report["errors"]:
+                return {"error": f"Erro ao verificar estilo: {next(iter(report['errors'].values()))}"}
+            
+            issues = [{**issue, "path": file_path} for records in report["files"].values() for issue in records]
             return {
                 "file_path": file_path,
-                "style_issues": result.stdout.split('\n') if result.stdout else [],
-                "clean": len(result.stdout.strip()) == 0
+                "style_issues": issues,
+                "clean": len(issues) == 0
+            }
+        except FileNotFoundError:
+            return {"error": "flake8 não está instalado"}
+        except Exception as e:
+            return {"error": f"Erro ao verificar estilo: {str(e)}"}
+    
+    def check_code_style_batch(self, paths: List[str], max_files_listed: int = DEFAULT_MAX_FILES_LISTED) -> dict:
+        """Verifica o estilo de vários arquivos ou diretórios de uma vez usando flake8.
+        
+        O flake8 roda em lotes paralelos com tempo limite, e arquivos não
+        alterados desde a última verificação vêm do cache.
+        
+        Args:
+            paths: Arquivos e/ou diretórios (diretórios incluem todos os ``.py``)
+            max_files_listed: Máximo de arquivos com problemas detalhados em ``files``
+        """
+        try:
+            missing = [path for path in paths if not os.path.exists(path)]
+            if missing:
+                return {"error": f"Caminhos não encontrados: {missing}"}
+            
+            report = self.style_checker.check(paths)
+            
+            by_code = {}
+            for records in report["files"].values():
+                for issue in records:
+                    by_code[issue["code"]] = by_code.get(issue["code"], 0) + 1
+            with_issues = {path: records for path, records in report["files"].items() if records}
+            # Arquivos com mais problemas primeiro
+            listed = sorted(with_issues, key=lambda path: (-len(with_issues[path]), path))[:max_files_listed]
+            
+            result = {
+                "root": report["root"],
+                "files_checked": len(report["files"]),
+                "clean_files": len(report["files"]) - len(with_issues),
+                "issue_count": sum(by_code.values()),
+                "issues_by_code": dict(sorted(by_code.items(), key=lambda item: (-item[1], item[0]))),
+                "files": {path: with_issues[path] for path in listed},
+                "errors": report["errors"],
+                "cache": report["cache"]
             }
+            if len(with_issues) > len(listed):
+                result["info"] = f"Mostrando {len(listed)} de {len(with_issues)} arquivos com problemas"
+            return result
         except FileNotFoundError:
             return {"error": "flake8 não está instalado"}
         except Exception as e:
             return {"error": f"Erro ao verificar estilo: {str(e)}"}
     
     def generate_docstring(self, function_code: str) -> str:
-        """Gera uma docstring para uma função Python."""
+        """Gera uma docstring para uma função Python.
+        
+        Para documentar um arquivo inteiro de uma vez, use generate_module_docstrings.
+        """
         try:
             tree = ast.parse(function_code)
             func_node = None
@@ -91,3 +273,31 @@ class CodeAnalysisTools:
             return docstring
         except Exception as e:
             return f"Erro ao gerar docstring: {str(e)}"
+    
+    def generate_module_docstrings(self, file_path: str, include_private: bool = False) -> dict:
+        """Gera docstrings para todas as classes, funções e métodos sem docstring de um arquivo.
+        
+        O arquivo é analisado uma vez e não é alterado: a resposta traz um
+        patch unificado (``patch``) com todas as docstrings, pronto para
+        revisão e aplicação com ``git apply``.
+        
+        Args:
+            file_path: Caminho do arquivo Python
+            include_private: Incluir também nomes que começam com ``_``
+        """
+        try:
+            with open(file_path, 'r', encoding='utf-8', newline='') as file:
+                content = file.read()
+            
+            # Caminho relativo ao diretório atual, como o git espera no patch
+            result = module_docstring_patch(content, os.path.relpath(file_path), include_private)
+            
+            response = {"file_path": file_path, **result}
+            if not result["documented"]:
+                response["info"] = "Nenhuma definição sem docstring para documentar"
+            elif result["skipped"]:
+                response["info"] = (f"{len(result['skipped'])} definições com o corpo na mesma linha do "
+                                    f"cabeçalho não foram documentadas")
+            return response
+        except Exception as e:
+            return {"error": f"Erro ao gerar docstrings: {str(e)}"}
@@ -0,0 +1,177 @@
+"""
+Extração vetorizada de correlações fortes.
+
+- strong_correlation_pairs: varre o triângulo superior de uma matriz de
+  correlação já calculada com NumPy (sem laços Python por célula)
+- blockwise_strong_correlations: calcula as correlações bloco a bloco direto
+  dos dados, sem nunca materializar a matriz N×N completa
+"""
+
+from typing import List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# A partir deste número de colunas numéricas as ferramentas usam o modo em blocos
+BLOCKWISE_MIN_COLUMNS = 500
+
+# Colunas por bloco no modo em blocos
+DEFAULT_BLOCK_SIZE = 256
+
+# Variância relativa (var / média²) a partir da qual a coluna não é constante:
+# uma coluna com todos os valores 0.1 tem variância de arredondamento (~1e-34),
+# não zero, e sem essa tolerância viraria correlação ±1 com qualquer outra
+ZERO_VARIANCE_RTOL = float(np.finfo(float).eps)
+
+CorrelationPair = Tuple[str, str, float]
+
+
+def _select_top(values: np.ndarray, top_k: Optional[int]) -> np.ndarray:
+    """Índices de ``values`` ordenados por |valor| decrescente, limitados a top_k."""
+    strength = np.abs(values)
+    if top_k is not None and top_k <= 0:
+        return np.empty(0, dtype=np.intp)
+    if top_k is not None and top_k < values.size:
+        candidates = np.argpartition(-strength, top_k - 1)[:top_k]
+    else:
+        candidates = np.arange(values.size)
+    order = np.argsort(-strength[candidates], kind="stable")
+    return candidates[order]
+
+
+def strong_correlation_pairs(corr_matrix: pd.DataFrame, threshold: float = 0.0,
+                             top_k: Optional[int] = None) -> List[CorrelationPair]:
+    """Retorna pares (var1, var2, r) com |r| >= threshold, do mais forte ao mais fraco.
+
+    Pares com correlação indefinida (NaN) são ignorados.
+    """
+    columns = corr_matrix.columns
+    values = corr_matrix.to_numpy(dtype=float)
+    rows, cols = np.triu_indices(len(columns), k=1)
+    pair_values = values[rows, cols]
+
+    with np.errstate(invalid="ignore"):
+        mask = np.abs(pair_values) >= threshold
+    rows, cols, pair_values = rows[mask], cols[mask], pair_values[mask]
+
+    selected = _select_top(pair_values, top_k)
+    return [
+        (columns[rows[i]], columns[cols[i]], float(pair_values[i]))
+        for i in selected
+    ]
+
+
+def near_zero_variance(variance: np.ndarray, mean: np.ndarray) -> np.ndarray:
+    """True onde a variância é só erro de arredondamento de uma coluna constante."""
+    return variance <= ZERO_VARIANCE_RTOL * mean ** 2
+
+
+def correlation_from_sums(n: np.ndarray, sums_i: np.ndarray, sums_j: np.ndarray,
+                          squares_i: np.ndarray, squares_j: np.ndarray, products: np.ndarray,
+                          shift_i: np.ndarray, shift_j: np.ndarray) -> np.ndarray:
+    """Pearson por par a partir de somas por pares completos.
+
+    Para o par (i, j): ``n`` linhas em que ambos são válidos e, nessas linhas,
+    Σx_i, Σx_j, Σx_i², Σx_j² e Σx_i·x_j, com cada coluna deslocada por
+    ``shift`` (a média, para evitar cancelamento numérico). Pares com menos de
+    duas linhas ou com um lado de variância nula ficam NaN, como em
+    ``df.corr()``.
+    """
+    with np.errstate(divide="ignore", invalid="ignore"):
+        variance_i = n * squares_i - sums_i ** 2
+        variance_j = n * squares_j - sums_j ** 2
+        # n²·var contra n²·média², sem dividir por n
+        constant = (near_zero_variance(variance_i, n * shift_i[:, None] + sums_i)
+                    | near_zero_variance(variance_j, n * shift_j[None, :] + sums_j))
+        corr = (n * products - sums_i * sums_j) / np.sqrt(variance_i * variance_j)
+    corr[constant | (n < 2)] = np.nan
+    return np.clip(corr, -1.0, 1.0)
+
+
+def _pairwise_complete_tile(x_i: np.ndarray, valid_i: np.ndarray, shift_i: np.ndarray,
+                            x_j: np.ndarray, valid_j: np.ndarray, shift_j: np.ndarray) -> np.ndarray:
+    """Pearson por pares completos entre dois blocos de colunas.
+
+    ``x`` vem deslocado por ``shift`` e zerado onde falta valor; para cada par
+    (i, j) as somas usam só as linhas em que ambos são válidos.
+    """
+    return correlation_from_sums(
+        valid_i.T @ valid_j,
+        x_i.T @ valid_j, valid_i.T @ x_j,
+        (x_i ** 2).T @ valid_j, valid_i.T @ (x_j ** 2),
+        x_i.T @ x_j,
+        shift_i, shift_j
+    )
+
+
+def blockwise_strong_correlations(df: pd.DataFrame, threshold: float = 0.7,
+                                  top_k: Optional[int] = None,
+                                  block_size: int = DEFAULT_BLOCK_SIZE) -> List[CorrelationPair]:
+    """Correlações de Pearson fortes calculadas bloco a bloco.
+
+    Cada bloco de ``block_size`` × ``block_size`` colunas é obtido por produto
+    de matrizes, e só os pares que passam pelo limiar (e pelo top_k, se
+    informado) são mantidos. O resultado coincide com ``df.corr()``: sem
+    valores ausentes o bloco sai dos dados padronizados; com ausentes cada par
+    usa só as linhas completas (contagens e somas por bloco a partir de uma
+    máscara de valores válidos).
+    """
+    numeric = df.select_dtypes(include=[np.number])
+    columns = numeric.columns
+    data = numeric.to_numpy(dtype=float, na_value=np.nan)
+    n_obs = data.shape[0]
+    if n_obs < 2 or len(columns) < 2:
+        return []
+
+    valid = ~np.isnan(data)
+    has_missing = not valid.all()
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = np.nan_to_num(np.nanmean(data, axis=0))
+        if has_missing:
+            # Centrar pela média evita cancelamento numérico nas somas por par
+            x = np.where(valid, data - mean, 0.0)
+            valid = valid.astype(float)
+        else:
+            variance = np.var(data, axis=0, ddof=1)
+            constant = near_zero_variance(variance, mean)
+            z = (data - mean) / np.sqrt(variance)
+            # Colunas constantes: pares NaN, fora do ranking (como em df.corr())
+            z[:, constant] = np.nan
+
+    found_rows = np.empty(0, dtype=np.intp)
+    found_cols = np.empty(0, dtype=np.intp)
+    found_values = np.empty(0, dtype=float)
+
+    n_cols = len(columns)
+    for i0 in range(0, n_cols, block_size):
+        i1 = min(i0 + block_size, n_cols)
+        for j0 in range(i0, n_cols, block_size):
+            j1 = min(j0 + block_size, n_cols)
+            if has_missing:
+                tile = _pairwise_complete_tile(x[:, i0:i1], valid[:, i0:i1], mean[i0:i1],
+                                               x[:, j0:j1], valid[:, j0:j1], mean[j0:j1])
+            else:
+                tile = np.clip(z[:, i0:i1].T @ z[:, j0:j1] / (n_obs - 1), -1.0, 1.0)
+
+            with np.errstate(invalid="ignore"):
+                mask = np.abs(tile) >= threshold
+            if i0 == j0:
+                # Bloco diagonal: apenas o triângulo superior estrito
+                mask &= np.triu(np.ones_like(mask), k=1)
+            tile_rows, tile_cols = np.nonzero(mask)
+            if tile_rows.size == 0:
+                continue
+
+            found_rows = np.concatenate([found_rows, tile_rows + i0])
+            found_cols = np.concatenate([found_cols, tile_cols + j0])
+            found_values = np.concatenate([found_values, tile[tile_rows, tile_cols]])
+
+            if top_k is not None and found_values.size > top_k:
+                keep = _select_top(found_values, top_k)
+                found_rows, found_cols, found_values = found_rows[keep], found_cols[keep], found_values[keep]
+
+    selected = _select_top(found_values, top_k)
+    return [
+        (columns[found_rows[i]], columns[found_cols[i]], float(found_values[i]))
+        for i in selected
+    ]
@@ -1,22 +1,57 @@
 import pandas as pd
 import numpy as np
-import matplotlib
-matplotlib.use('Agg')  # Backend sem display para funcionar em servidores
-import matplotlib.pyplot as plt
-import seaborn as sns
-from typing import Union, List, Dict, Any
+from typing import Union, List, Dict, Any, Optional
 import io
+import os
 import base64
 
+from app.tools.artifacts import artifact_url, get_artifact_store
+from app.tools.charts import (
+    ChartSpecError,
+    advanced_chart_spec,
+    get_chart_renderer,
+    simple_chart_spec,
+)
+from app.tools.sketches import RunningMoments, KLLSketch
+from app.tools.correlations import (
+    BLOCKWISE_MIN_COLUMNS,
+    blockwise_strong_correlations,
+    strong_correlation_pairs,
+)
+
+# Arquivos acima deste tamanho são perfilados em streaming por padrão (100 MB)
+STREAMING_THRESHOLD_BYTES = 100 * 1024 * 1024
+
+# Linhas lidas por bloco no modo streaming
+DEFAULT_CHUNKSIZE = 100_000
+
 class DataAnalysisTools:
     """Ferramentas para análise de dados e visualização."""
     
     def __init__(self):
         self.name = "data_analysis"
+
+    @staticmethod
+    def _publish_chart(png: bytes, inline: bool) -> str:
+        """URL curta do artefato com o PNG (ou data URL base64 se ``inline``)."""
+        if inline:
+            return f"data:image/png;base64,{base64.b64encode(png).decode()}"
+        return artifact_url(get_artifact_store().put(png))
     
-    def load_csv(self, file_path: str) -> dict:
-        """Carrega um arquivo CSV e retorna informações básicas."""
+    def load_csv(self, file_path: str, streaming: Optional[bool] = None,
+                 chunksize: int = DEFAULT_CHUNKSIZE) -> dict:
+        """Carrega um arquivo CSV e retorna informações básicas.
+        
+        Com ``streaming=True`` (padrão automático para arquivos grandes) o arquivo
+        é percorrido em blocos e as estatísticas são agregadas incrementalmente,
+        mantendo a memória constante; os quantis passam a ser aproximados.
+        """
         try:
+            if streaming is None:
+                streaming = os.path.getsize(file_path) > STREAMING_THRESHOLD_BYTES
+            if streaming:
+                return self._profile_csv_streaming(file_path, chunksize)
+            
             df = pd.read_csv(file_path)
             return {
                 "shape": df.shape,
@@ -29,61 +64,97 @@ class DataAnalysisTools:
         except Exception as e:
             return {"error": f"Erro ao carregar CSV: {str(e)}"}
     
-    def create_visualization(self, data: Union[List, Dict], chart_type: str = "line") -> str:
-        """Cria uma visualização dos dados e retorna como base64."""
-        try:
-            # Garantir que o backend está configurado
-            plt.switch_backend('Agg')
-            
-            # Criar figura
-            plt.figure(figsize=(10, 6))
-            
-            if isinstance(data, dict):
-                x = list(data.keys())
-                y = list(data.values())
-            elif isinstance(data, list):
-                x = range(len(data))
-                y = data
-            else:
-                plt.close()
-                return "❌ Formato de dados não suportado. Use list ou dict."
-            
-            # Verificar se há dados
-            if not y:
-                plt.close()
-                return "❌ Não há dados para visualizar."
-            
-            # Criar gráfico baseado no tipo
-            if chart_type == "line":
-                plt.plot(x, y, marker='o', linewidth=2, markersize=4)
-            elif chart_type == "bar":
-                plt.bar(x, y, alpha=0.7)
-            elif chart_type == "scatter":
-                plt.scatter(x, y, alpha=0.7, s=50)
-            elif chart_type == "histogram":
-                plt.hist(y, bins=20, alpha=0.7, edgecolor='black')
-            else:
-                plt.plot(x, y)  # Fallback para line
+    @staticmethod
+    def _combined_dtype(current: Any, new: Any) -> Any:
+        """Tipo de uma coluna após mais um bloco, como o pandas faria lendo o arquivo inteiro."""
+        if current == new:
+            return current
+        if all(pd.api.types.is_numeric_dtype(d) and not pd.api.types.is_bool_dtype(d) for d in (current, new)):
+            # int + float -> float, como na leitura completa
+            return np.result_type(current, new)
+        # Tipos mistos (ex.: texto em parte dos blocos) viram object
+        return np.dtype(object)
+    
+    def _profile_csv_streaming(self, file_path: str, chunksize: int = DEFAULT_CHUNKSIZE) -> dict:
+        """Perfila um CSV bloco a bloco com o mesmo formato de retorno de load_csv.
+        
+        Os tipos das colunas são combinados entre os blocos: uma coluna que
+        parecia numérica no primeiro bloco e tem texto em um bloco posterior
+        sai de ``description``, como na leitura completa.
+        """
+        n_rows = 0
+        columns: List[str] = []
+        dtypes: Dict[str, Any] = {}
+        missing_values: Dict[str, int] = {}
+        head: Dict[str, Any] = {}
+        moments: Dict[str, RunningMoments] = {}
+        sketches: Dict[str, KLLSketch] = {}
+        
+        for chunk in pd.read_csv(file_path, chunksize=chunksize):
+            if not columns:
+                columns = chunk.columns.tolist()
+                dtypes = chunk.dtypes.to_dict()
+                head = chunk.head().to_dict()
+                missing_values = {col: 0 for col in columns}
+                numeric_cols = chunk.select_dtypes(include=[np.number]).columns
+                moments = {col: RunningMoments() for col in numeric_cols}
+                sketches = {col: KLLSketch() for col in numeric_cols}
             
-            # Configurar aparência
-            plt.title(f"Gráfico {chart_type.title()}", fontsize=14, fontweight='bold')
-            plt.xlabel("X", fontsize=12)
-            plt.ylabel("Y", fontsize=12)
-            plt.grid(True, alpha=0.3)
-            plt.tight_layout()
+            n_rows += len(chunk)
+            for col, nulls in chunk.isnull().sum().items():
+                missing_values[col] += int(nulls)
             
-            # Salvar como base64
-            buffer = io.BytesIO()
-            plt.savefig(buffer, format='png', dpi=150, bbox_inches='tight', 
-                       facecolor='white', edgecolor='none')
-            buffer.seek(0)
-            image_base64 = base64.b64encode(buffer.getvalue()).decode()
-            plt.close()
+            for col in columns:
+                dtypes[col] = self._combined_dtype(dtypes[col], chunk[col].dtype)
             
-            return f"data:image/png;base64,{image_base64}"
+            for col in list(moments):
+                if dtypes[col] == object:
+                    # Texto em um bloco posterior: a coluna não é mais numérica
+                    del moments[col], sketches[col]
+                    continue
+                values = chunk[col].to_numpy(dtype=float, na_value=np.nan)
+                moments[col].update(values)
+                sketches[col].update(values)
+        
+        description = {}
+        for col, stats in moments.items():
+            q25, q50, q75 = sketches[col].quantiles([0.25, 0.5, 0.75])
+            empty = stats.count == 0
+            description[col] = {
+                "count": float(stats.count),
+                "mean": float("nan") if empty else stats.mean,
+                "std": stats.std,
+                "min": float("nan") if empty else stats.min,
+                "25%": q25,
+                "50%": q50,
+                "75%": q75,
+                "max": float("nan") if empty else stats.max,
+            }
+        
+        return {
+            "shape": (n_rows, len(columns)),
+            "columns": columns,
+            "dtypes": dtypes,
+            "missing_values": missing_values,
+            "head": head,
+            "description": description
+        }
+    
+    def create_visualization(self, data: Union[List, Dict], chart_type: str = "line",
+                             inline: bool = False, max_points: Optional[int] = None) -> str:
+        """Cria uma visualização dos dados e retorna a URL do PNG (``/v1/artifacts/...``).
+
+        Com ``inline=True`` retorna a imagem como data URL base64. Séries com
+        mais de ``max_points`` valores são resumidas antes de plotar.
+        """
+        try:
+            spec = simple_chart_spec(data, chart_type, max_points=max_points)
+            png = get_chart_renderer().render(spec)
+            return self._publish_chart(png, inline)
             
+        except ChartSpecError as e:
+            return f"❌ {e}"
         except Exception as e:
-            plt.close()  # Garantir que fecha a figura
             error_msg = f"❌ Erro ao criar visualização: {str(e)}"
             print(f"DEBUG: {error_msg}")  # Para debug
             return error_msg
@@ -105,123 +176,64 @@ class DataAnalysisTools:
         except Exception as e:
             return {"error": f"Erro no cálculo estatístico: {str(e)}"}
     
-    def correlation_analysis(self, data: Dict[str, List[float]]) -> dict:
-        """Analisa correlações entre variáveis."""
+    def correlation_analysis(self, data: Dict[str, List[float]], threshold: float = 0.7,
+                             top_k: Optional[int] = None, blockwise: Optional[bool] = None) -> dict:
+        """Analisa correlações entre variáveis.
+        
+        Com ``blockwise=True`` (automático para tabelas muito largas) as
+        correlações são calculadas em blocos e apenas os pares fortes são
+        retornados, sem a matriz completa.
+        """
         try:
             df = pd.DataFrame(data)
-            correlation_matrix = df.corr()
+            if blockwise is None:
+                blockwise = df.select_dtypes(include=[np.number]).shape[1] >= BLOCKWISE_MIN_COLUMNS
+            
+            if blockwise:
+                pairs = blockwise_strong_correlations(df, threshold=threshold, top_k=top_k)
+                return {
+                    "correlation_matrix": None,
+                    "strong_correlations": [
+                        {"var1": var1, "var2": var2, "correlation": value}
+                        for var1, var2, value in pairs
+                    ]
+                }
+            
+            correlation_matrix = df.corr(numeric_only=True)
             return {
                 "correlation_matrix": correlation_matrix.to_dict(),
-                "strong_correlations": self._find_strong_correlations(correlation_matrix)
+                "strong_correlations": self._find_strong_correlations(correlation_matrix, threshold, top_k)
             }
         except Exception as e:
             return {"error": f"Erro na análise de correlação: {str(e)}"}
     
-    def _find_strong_correlations(self, corr_matrix: pd.DataFrame, threshold: float = 0.7) -> List[dict]:
-        """Encontra correlações fortes entre variáveis."""
-        strong_corr = []
-        for i in range(len(corr_matrix.columns)):
-            for j in range(i+1, len(corr_matrix.columns)):
-                corr_value = corr_matrix.iloc[i, j]
-                if abs(corr_value) >= threshold:
-                    strong_corr.append({
-                        "var1": corr_matrix.columns[i],
-                        "var2": corr_matrix.columns[j],
-                        "correlation": float(corr_value)
-                    })
-        return strong_corr
+    def _find_strong_correlations(self, corr_matrix: pd.DataFrame, threshold: float = 0.7,
+                                  top_k: Optional[int] = None) -> List[dict]:
+        """Encontra correlações fortes entre variáveis, da mais forte à mais fraca."""
+        return [
+            {"var1": var1, "var2": var2, "correlation": value}
+            for var1, var2, value in strong_correlation_pairs(corr_matrix, threshold, top_k)
+        ]
     
     def create_advanced_visualization(self, df: pd.DataFrame, x_col: str, y_col: str = None, 
-                                    chart_type: str = "line", title: str = None) -> str:
-        """Cria visualizações avançadas com pandas/seaborn."""
+                                    chart_type: str = "line", title: str = None,
+                                    inline: bool = False, max_points: Optional[int] = None) -> str:
+        """Cria visualizações avançadas com pandas/seaborn.
+
+        A renderização acontece no pool de processos de ``app.tools.charts``;
+        o retorno é a URL do PNG (ou data URL base64 com ``inline=True``).
+        Acima de ``max_points`` linhas (padrão: CHART_POINT_BUDGET) linhas são
+        reduzidas por LTTB, dispersões viram densidade e distribuições são
+        pré-agrupadas.
+        """
         try:
-            # Garantir backend
-            plt.switch_backend('Agg')
-            
-            # Configurar estilo
-            sns.set_style("whitegrid")
-            plt.figure(figsize=(12, 8))
-            
-            if chart_type == "correlation":
-                # Matriz de correlação (ignora x_col e y_col para este tipo)
-                numeric_cols = df.select_dtypes(include=[np.number]).columns
-                if len(numeric_cols) < 2:
-                    plt.close()
-                    return "❌ Dados insuficientes para matriz de correlação (precisa de 2+ colunas numéricas)"
-                
-                corr_matrix = df[numeric_cols].corr()
-                sns.heatmap(corr_matrix, annot=True, cmap='coolwarm', center=0,
-                           square=True, linewidths=0.5)
-                plt.title(title or "Matriz de Correlação", fontsize=14, fontweight='bold')
-                
-            elif chart_type == "distribution":
-                # Distribuição de uma variável
-                if not x_col or x_col not in df.columns:
-                    plt.close()
-                    return f"❌ Coluna '{x_col}' não encontrada ou não especificada"
-                
-                if df[x_col].dtype in ['object', 'category']:
-                    # Variável categórica
-                    df[x_col].value_counts().plot(kind='bar', alpha=0.7)
-                    plt.xticks(rotation=45)
-                else:
-                    # Variável numérica
-                    sns.histplot(df[x_col], kde=True, alpha=0.7)
-                
-                plt.title(title or f"Distribuição de {x_col}", fontsize=14, fontweight='bold')
-                plt.xlabel(x_col, fontsize=12)
-                plt.ylabel("Frequência", fontsize=12)
-                
-            elif chart_type == "scatter" and y_col:
-                # Gráfico de dispersão
-                if not x_col or not y_col or x_col not in df.columns or y_col not in df.columns:
-                    plt.close()
-                    return f"❌ Colunas não encontradas: {x_col}, {y_col}"
-                
-                sns.scatterplot(data=df, x=x_col, y=y_col, alpha=0.7)
-                plt.title(title or f"{y_col} vs {x_col}", fontsize=14, fontweight='bold')
-                
-            elif chart_type == "line" and y_col:
-                # Gráfico de linha
-                if not x_col or not y_col or x_col not in df.columns or y_col not in df.columns:
-                    plt.close()
-                    return f"❌ Colunas não encontradas: {x_col}, {y_col}"
-                
-                plt.plot(df[x_col], df[y_col], marker='o', linewidth=2, markersize=4)
-                plt.title(title or f"{y_col} ao longo de {x_col}", fontsize=14, fontweight='bold')
-                plt.xlabel(x_col, fontsize=12)
-                plt.ylabel(y_col, fontsize=12)
-                
-            elif chart_type == "box":
-                # Box plot
-                if not x_col or x_col not in df.columns:
-                    plt.close()
-                    return f"❌ Coluna '{x_col}' não encontrada ou não especificada"
-                
-                if y_col and y_col in df.columns:
-                    sns.boxplot(data=df, x=y_col, y=x_col)
-                    plt.title(title or f"Box Plot: {x_col} por {y_col}", fontsize=14, fontweight='bold')
-                else:
-                    sns.boxplot(y=df[x_col])
-                    plt.title(title or f"Box Plot: {x_col}", fontsize=14, fontweight='bold')
-            
-            else:
-                return f"❌ Tipo de gráfico '{chart_type}' não suportado ou parâmetros incorretos"
-            
-            plt.tight_layout()
-            
-            # Salvar como data URL
-            buffer = io.BytesIO()
-            plt.savefig(buffer, format='png', dpi=150, bbox_inches='tight',
-                       facecolor='white', edgecolor='none')
-            buffer.seek(0)
-            image_base64 = base64.b64encode(buffer.getvalue()).decode()
-            plt.close()
-            
-            return f"data:image/png;base64,{image_base64}"
+            spec = advanced_chart_spec(df, x_col, y_col, chart_type, title, max_points=max_points)
+            png = get_chart_renderer().render(spec)
+            return self._publish_chart(png, inline)
             
+        except ChartSpecError as e:
+            return f"❌ {e}"
         except Exception as e:
-            plt.close()
             error_msg = f"❌ Erro ao criar visualização avançada: {str(e)}"
             print(f"DEBUG: {error_msg}")
             return error_msg
@@ -1,22 +1,199 @@
 import pandas as pd
 import numpy as np
-from typing import Union, List, Dict, Any
+import hashlib
+import io
+import json
+import threading
+from collections import OrderedDict
+from typing import Union, List, Dict, Any, Optional, Tuple
+
+from app.tools.correlations import (
+    BLOCKWISE_MIN_COLUMNS,
+    blockwise_strong_correlations,
+    strong_correlation_pairs,
+)
+
+# Prefixo dos identificadores de dataset devolvidos por load_csv
+DATASET_ID_PREFIX = "ds_"
+
+# Orçamento padrão de memória para DataFrames em cache (256 MB)
+DEFAULT_CACHE_BYTES = 256 * 1024 * 1024
+
+# Pares retornados por correlation_analysis em tabelas muito largas
+DEFAULT_TOP_CORRELATIONS = 100
+
+
+class DataFrameCache:
+    """Cache LRU de DataFrames endereçado pelo conteúdo do CSV e limitado em bytes.
+
+    Cada payload CSV é identificado por um hash do seu conteúdo, de modo que o
+    mesmo upload é parseado uma única vez e as ferramentas seguintes podem
+    receber apenas o identificador do dataset em vez do texto completo.
+    
+    Identificadores que não estão em memória são procurados no ``DatasetStore``
+    (datasets enviados pelo endpoint de upload), abertos com memory-map.
+    """
+    
+    def __init__(self, max_bytes: int = DEFAULT_CACHE_BYTES, store=None):
+        self.max_bytes = max_bytes
+        self._store = store
+        self.current_bytes = 0
+        self._frames: "OrderedDict[str, pd.DataFrame]" = OrderedDict()
+        self._sizes: Dict[str, int] = {}
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def dataset_id_for(data: str) -> str:
+        """Calcula o identificador do dataset a partir do conteúdo CSV."""
+        digest = hashlib.blake2b(data.encode("utf-8"), digest_size=8).hexdigest()
+        return f"{DATASET_ID_PREFIX}{digest}"
+    
+    @staticmethod
+    def is_dataset_id(data: str) -> bool:
+        """Indica se a string recebida é um identificador de dataset e não um CSV."""
+        candidate = data.strip()
+        if not candidate.startswith(DATASET_ID_PREFIX):
+            return False
+        digest = candidate[len(DATASET_ID_PREFIX):]
+        return len(digest) == 16 and all(c in "0123456789abcdef" for c in digest)
+    
+    @property
+    def store(self):
+        """``DatasetStore`` com os datasets persistidos (compartilhado, por padrão)."""
+        if self._store is None:
+            from app.tools.dataset_store import get_dataset_store
+            
+            self._store = get_dataset_store()
+        return self._store
+    
+    def __contains__(self, dataset_id: str) -> bool:
+        return dataset_id in self._frames
+    
+    def __len__(self) -> int:
+        return len(self._frames)
+    
+    def get(self, dataset_id: str) -> Optional[pd.DataFrame]:
+        """Retorna o DataFrame em cache (marcando-o como recente) ou None."""
+        with self._lock:
+            df = self._frames.get(dataset_id)
+            if df is not None:
+                self._frames.move_to_end(dataset_id)
+            return df
+    
+    def put(self, dataset_id: str, df: pd.DataFrame) -> None:
+        """Armazena um DataFrame, descartando os menos usados se exceder o orçamento."""
+        size = int(df.memory_usage(deep=True).sum())
+        if size > self.max_bytes:
+            # Maior que o orçamento inteiro: não vale a pena esvaziar o cache por ele
+            return
+        
+        with self._lock:
+            if dataset_id in self._frames:
+                self.current_bytes -= self._sizes.pop(dataset_id)
+                del self._frames[dataset_id]
+            
+            self._frames[dataset_id] = df
+            self._sizes[dataset_id] = size
+            self.current_bytes += size
+            
+            while self.current_bytes > self.max_bytes:
+                evicted_id, _ = self._frames.popitem(last=False)
+                self.current_bytes -= self._sizes.pop(evicted_id)
+    
+    def load(self, data: str) -> Tuple[str, pd.DataFrame]:
+        """Resolve um CSV ou identificador de dataset para (dataset_id, DataFrame).
+        
+        Raises:
+            KeyError: se for um identificador desconhecido ou já descartado.
+        """
+        if self.is_dataset_id(data):
+            dataset_id = data.strip()
+            df = self.get(dataset_id)
+            if df is None and self.store.exists(dataset_id):
+                # Memory-map: reabrir é barato, não ocupa o orçamento do LRU
+                df = self.store.open(dataset_id)
+            if df is None:
+                raise KeyError(
+                    f"Dataset '{dataset_id}' não encontrado no cache. "
+                    "Envie o conteúdo CSV novamente com load_csv."
+                )
+            return dataset_id, df
+        
+        dataset_id = self.dataset_id_for(data)
+        df = self.get(dataset_id)
+        if df is None:
+            df = pd.read_csv(io.StringIO(data))
+            # Tamanho do CSV de origem: usado na detecção de uploads que o estendem
+            df.attrs["source_bytes"] = len(data.encode("utf-8"))
+            self.put(dataset_id, df)
+        return dataset_id, df
+    
+    def clear(self) -> None:
+        """Remove todos os DataFrames do cache."""
+        with self._lock:
+            self._frames.clear()
+            self._sizes.clear()
+            self.current_bytes = 0
+
 
 class DataAnalysisTools:
-    """Ferramentas simplificadas para análise de dados (sem visualizações)."""
+    """Ferramentas simplificadas para análise de dados (sem visualizações).
+    
+    Todas as ferramentas aceitam tanto o conteúdo CSV quanto o ``dataset_id``
+    devolvido por ``load_csv``; o CSV é parseado uma única vez por conteúdo.
+    Datasets enviados por upload (``DatasetStore``) são analisados pelo motor
+    de consultas (DuckDB, Polars ou pandas em blocos), sem materializá-los.
+    """
     
-    def __init__(self):
+    def __init__(self, max_cache_bytes: int = DEFAULT_CACHE_BYTES, engine=None, summaries=None):
         self.name = "data_analysis"
+        self.cache = DataFrameCache(max_bytes=max_cache_bytes)
+        self._engine = engine
+        self._summaries = summaries
+    
+    @property
+    def engine(self):
+        """Motor de consultas sobre o store do cache (criado no primeiro uso)."""
+        if self._engine is None:
+            from app.tools.query_engine import create_query_engine
+            
+            self._engine = create_query_engine(self.cache.store)
+        return self._engine
+    
+    @property
+    def summaries(self):
+        """``SummaryStore`` com os resumos mescláveis por dataset (compartilhado, por padrão)."""
+        if self._summaries is None:
+            from app.tools.summaries import get_summary_store
+            
+            self._summaries = get_summary_store()
+        return self._summaries
+    
+    def _get_dataframe(self, data: str) -> Tuple[str, pd.DataFrame]:
+        """Obtém o DataFrame correspondente a um CSV ou dataset_id."""
+        return self.cache.load(data)
+    
+    def _stored_dataset_id(self, data: str) -> Optional[str]:
+        """ID do dataset se ``data`` referir um dataset persistido (e não em memória)."""
+        if not DataFrameCache.is_dataset_id(data):
+            return None
+        dataset_id = data.strip()
+        if dataset_id in self.cache or not self.cache.store.exists(dataset_id):
+            return None
+        return dataset_id
     
     def load_csv(self, data: str) -> dict:
-        """Carrega dados CSV de uma string e retorna informações básicas."""
+        """Carrega dados CSV de uma string e retorna informações básicas.
+        
+        O resultado inclui um ``dataset_id`` que pode ser passado às demais
+        ferramentas no lugar do CSV completo.
+        """
         try:
-            # Simular carregamento de CSV a partir de string
-            import io
-            df = pd.read_csv(io.StringIO(data))
+            dataset_id, df = self._get_dataframe(data)
             
             result = {
                 "success": True,
+                "dataset_id": dataset_id,
                 "shape": df.shape,
                 "columns": df.columns.tolist(),
                 "data_types": df.dtypes.to_dict(),
@@ -36,10 +213,31 @@ class DataAnalysisTools:
             }
     
     def statistical_summary(self, data: str) -> dict:
-        """Calcula estatísticas descritivas dos dados."""
+        """Calcula estatísticas descritivas dos dados (CSV ou dataset_id).
+        
+        Os resumos ficam guardados por dataset com estado mesclável (momentos
+        e sketches de quantis). Um CSV que só acrescenta linhas ao final de um
+        dataset já resumido tem apenas as linhas novas lidas e mescladas.
+        """
         try:
-            import io
-            df = pd.read_csv(io.StringIO(data))
+            is_id = DataFrameCache.is_dataset_id(data)
+            dataset_id = data.strip() if is_id else DataFrameCache.dataset_id_for(data)
+            summary = self.summaries.get(dataset_id)
+            if summary is None and not is_id and dataset_id not in self.cache:
+                summary = self.summaries.extend(io.BytesIO(data.encode("utf-8")), dataset_id)
+            if summary is not None and summary.statistics:
+                return self._summary_result(summary)
+            
+            stored_id = self._stored_dataset_id(data)
+            if stored_id:
+                result = self._engine_summary(stored_id)
+                if result["success"]:
+                    store = self.cache.store
+                    self._remember_summary(stored_id, store.open(stored_id), result["statistics"],
+                                           store.info(stored_id).get("source_bytes"))
+                return result
+            
+            _, df = self._get_dataframe(data)
             
             numeric_cols = df.select_dtypes(include=[np.number]).columns
             
@@ -63,6 +261,7 @@ class DataAnalysisTools:
                     "q75": float(df[col].quantile(0.75))
                 }
             
+            self._remember_summary(dataset_id, df, stats, df.attrs.get("source_bytes"))
             return {
                 "success": True,
                 "statistics": stats,
@@ -76,13 +275,69 @@ class DataAnalysisTools:
                 "info": "Erro ao calcular estatísticas"
             }
     
-    def correlation_analysis(self, data: str) -> dict:
-        """Analisa correlações entre variáveis numéricas."""
+    def _remember_summary(self, dataset_id: str, df: pd.DataFrame, stats: dict,
+                          source_bytes: Optional[int]) -> None:
+        """Guarda o resumo mesclável do dataset (falhas de disco não afetam a ferramenta)."""
+        from app.tools.summaries import DatasetSummary
+        
+        summary = DatasetSummary.from_frame(df, source_bytes=source_bytes)
+        summary.statistics = stats
         try:
-            import io
-            df = pd.read_csv(io.StringIO(data))
-            
-            numeric_cols = df.select_dtypes(include=[np.number]).columns
+            self.summaries.put(dataset_id, summary)
+        except OSError:
+            pass
+    
+    @staticmethod
+    def _summary_result(summary) -> dict:
+        """Resposta de statistical_summary a partir de um resumo guardado."""
+        result = {
+            "success": True,
+            "statistics": summary.statistics,
+            "info": f"Estatísticas calculadas para {len(summary.statistics)} colunas numéricas"
+        }
+        if summary.base_dataset_id:
+            result.update({
+                "incremental": True,
+                "base_dataset_id": summary.base_dataset_id,
+                "new_rows": summary.delta_rows,
+                "info": (
+                    f"Estatísticas atualizadas com {summary.delta_rows} linhas novas "
+                    f"mescladas ao resumo de {summary.base_dataset_id} (quantis aproximados)"
+                )
+            })
+        return result
+    
+    def _engine_summary(self, dataset_id: str) -> dict:
+        """statistical_summary de um dataset persistido, pelo motor de consultas."""
+        stats = self.engine.describe(dataset_id)
+        if not stats:
+            return {
+                "success": False,
+                "error": "Nenhuma coluna numérica encontrada",
+                "info": "Não é possível calcular estatísticas para dados não numéricos"
+            }
+        return {
+            "success": True,
+            "statistics": stats,
+            "engine": self.engine.name,
+            "info": f"Estatísticas calculadas para {len(stats)} colunas numéricas"
+        }
+    
+    def correlation_analysis(self, data: str, top_k: Optional[int] = None) -> dict:
+        """Analisa correlações entre variáveis numéricas (CSV ou dataset_id).
+        
+        Em tabelas muito largas as correlações são calculadas em blocos e só
+        os ``top_k`` pares mais fortes são retornados, sem a matriz completa.
+        """
+        try:
+            dataset_id = self._stored_dataset_id(data)
+            if dataset_id:
+                # Matriz completa calculada pelo motor, sem materializar o dataset
+                correlation_matrix = self.engine.correlation(dataset_id)
+                numeric_cols = correlation_matrix.columns
+            else:
+                _, df = self._get_dataframe(data)
+                numeric_cols = df.select_dtypes(include=[np.number]).columns
             
             if len(numeric_cols) < 2:
                 return {
@@ -91,27 +346,36 @@ class DataAnalysisTools:
                     "info": "Análise de correlação requer múltiplas variáveis numéricas"
                 }
             
-            correlation_matrix = df[numeric_cols].corr()
+            if dataset_id:
+                pairs = strong_correlation_pairs(
+                    correlation_matrix,
+                    top_k=top_k or (DEFAULT_TOP_CORRELATIONS if len(numeric_cols) >= BLOCKWISE_MIN_COLUMNS else None)
+                )
+                if len(numeric_cols) >= BLOCKWISE_MIN_COLUMNS:
+                    correlation_matrix = None
+            elif len(numeric_cols) >= BLOCKWISE_MIN_COLUMNS:
+                correlation_matrix = None
+                pairs = blockwise_strong_correlations(
+                    df[numeric_cols], threshold=0.0, top_k=top_k or DEFAULT_TOP_CORRELATIONS
+                )
+            else:
+                correlation_matrix = df[numeric_cols].corr()
+                pairs = strong_correlation_pairs(correlation_matrix, top_k=top_k)
             
-            # Encontrar correlações mais fortes
-            correlations = []
-            for i, col1 in enumerate(numeric_cols):
-                for j, col2 in enumerate(numeric_cols):
-                    if i < j:  # Evitar duplicatas
-                        corr_value = correlation_matrix.loc[col1, col2]
-                        correlations.append({
-                            "variable1": col1,
-                            "variable2": col2,
-                            "correlation": float(corr_value),
-                            "strength": self._interpret_correlation(corr_value)
-                        })
-            
-            # Ordenar por força da correlação
-            correlations.sort(key=lambda x: abs(x["correlation"]), reverse=True)
+            # Pares já ordenados pela força da correlação
+            correlations = [
+                {
+                    "variable1": col1,
+                    "variable2": col2,
+                    "correlation": corr_value,
+                    "strength": self._interpret_correlation(corr_value)
+                }
+                for col1, col2, corr_value in pairs
+            ]
             
             return {
                 "success": True,
-                "correlation_matrix": correlation_matrix.to_dict(),
+                "correlation_matrix": correlation_matrix.to_dict() if correlation_matrix is not None else None,
                 "correlations": correlations,
                 "info": f"Análise de correlação entre {len(numeric_cols)} variáveis"
             }
@@ -123,6 +387,48 @@ class DataAnalysisTools:
                 "info": "Erro ao calcular correlações"
             }
     
+    def query_dataset(self, data: str, filters: Optional[List[List[Any]]] = None,
+                      group_by: Optional[List[str]] = None, aggregations: Optional[Dict[str, Any]] = None,
+                      columns: Optional[List[str]] = None, limit: int = 100) -> dict:
+        """Filtra, agrupa e agrega um dataset (CSV ou dataset_id) sem trazê-lo inteiro.
+        
+        Args:
+            filters: lista de [coluna, operador, valor] combinados com E
+                (==, !=, >, >=, <, <=, in, not in, is null, not null)
+            group_by: colunas de agrupamento
+            aggregations: {"coluna": "mean"} ou {"coluna": ["min", "max"]}
+                (count, sum, mean, min, max); {"*": "count"} conta as linhas
+            columns: colunas retornadas quando não há agregação
+            limit: máximo de linhas no resultado
+        """
+        try:
+            from app.tools.query_engine import PandasEngine
+            
+            dataset_id = self._stored_dataset_id(data)
+            if dataset_id:
+                engine = self.engine
+                result = engine.query(dataset_id, filters, group_by, aggregations, columns, limit)
+            else:
+                engine = PandasEngine()
+                _, df = self._get_dataframe(data)
+                result = engine.query_frame(df, filters, group_by, aggregations, columns, limit)
+            
+            return {
+                "success": True,
+                "columns": [str(c) for c in result.columns],
+                "rows": json.loads(result.to_json(orient="records", date_format="iso")),
+                "row_count": len(result),
+                "engine": engine.name,
+                "info": f"Consulta retornou {len(result)} linhas (limite {limit})"
+            }
+            
+        except Exception as e:
+            return {
+                "success": False,
+                "error": str(e),
+                "info": "Erro ao consultar o dataset"
+            }
+    
     def create_visualization(self, data: str, chart_type: str = "summary") -> dict:
         """Placeholder para visualizações (desabilitado temporariamente)."""
         return {
@@ -0,0 +1,243 @@
+"""
+Armazenamento colunar em disco para datasets enviados pelo usuário.
+
+O CSV é convertido uma única vez, no upload, e as ferramentas passam a abrir o
+dataset pelo ``dataset_id`` com memory-map: reabrir um arquivo grande em outra
+rodada custa quase nada e só as colunas usadas são paginadas para a memória.
+
+Formatos:
+- Arrow IPC (``data.arrow``, sem compressão), quando ``pyarrow`` está instalado
+- Fallback sem dependências: um ``.npy`` por coluna; colunas de texto viram
+  categóricas (códigos em ``.npy`` e categorias no ``meta.json``)
+
+Os IDs são os mesmos de ``DataFrameCache`` (hash do conteúdo CSV), então o
+mesmo arquivo enviado por upload ou colado no chat resolve para o mesmo dataset.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from app.tools.data_tools_simple import DATASET_ID_PREFIX, DataFrameCache
+
+# Subdiretório de storage com os datasets
+DATASETS_DIR = "datasets"
+
+# Arquivos de cada dataset
+META_FILE = "meta.json"
+ARROW_FILE = "data.arrow"
+
+# Tamanho dos blocos lidos ao calcular o hash de um arquivo
+HASH_BLOCK_SIZE = 1024 * 1024
+
+
+def has_pyarrow() -> bool:
+    try:
+        import pyarrow  # noqa: F401
+        import pyarrow.csv  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def dataset_id_for_file(path: str) -> str:
+    """ID do dataset para um arquivo CSV (igual a ``DataFrameCache.dataset_id_for`` do texto)."""
+    digest = hashlib.blake2b(digest_size=8)
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b""):
+            digest.update(block)
+    return f"{DATASET_ID_PREFIX}{digest.hexdigest()}"
+
+
+class DatasetStore:
+    """Datasets colunares em ``storage/datasets/<dataset_id>``, abertos via memory-map."""
+
+    def __init__(self, directory: Optional[str] = None, use_arrow: Optional[bool] = None):
+        self._directory = directory
+        self.use_arrow = has_pyarrow() if use_arrow is None else use_arrow
+
+    @property
+    def directory(self) -> str:
+        if self._directory is None:
+            from app.config.settings import get_storage_path
+
+            self._directory = get_storage_path(DATASETS_DIR)
+        return self._directory
+
+    def path_for(self, dataset_id: str) -> str:
+        """Diretório do dataset (o ID é validado para evitar path traversal)."""
+        if not DataFrameCache.is_dataset_id(dataset_id):
+            raise ValueError(f"ID de dataset inválido: {dataset_id!r}")
+        return os.path.join(self.directory, dataset_id.strip())
+
+    def exists(self, dataset_id: str) -> bool:
+        try:
+            return os.path.exists(os.path.join(self.path_for(dataset_id), META_FILE))
+        except ValueError:
+            return False
+
+    def info(self, dataset_id: str) -> Dict[str, Any]:
+        """Metadados do dataset (linhas, colunas, dtypes e formato).
+
+        Raises:
+            KeyError: se o dataset não existir.
+        """
+        try:
+            with open(os.path.join(self.path_for(dataset_id), META_FILE), encoding="utf-8") as f:
+                return json.load(f)
+        except (ValueError, FileNotFoundError):
+            raise KeyError(f"Dataset '{dataset_id}' não encontrado") from None
+
+    def ingest_csv(self, path: str, dataset_id: Optional[str] = None) -> Dict[str, Any]:
+        """Converte um arquivo CSV para o formato colunar e retorna os metadados.
+
+        Se o dataset já existir (mesmo conteúdo), nada é reescrito.
+        """
+        if dataset_id is None:
+            dataset_id = dataset_id_for_file(path)
+        if self.exists(dataset_id):
+            return self.info(dataset_id)
+
+        if self.use_arrow:
+            import pyarrow.csv as pacsv
+
+            def write(tmp_dir):
+                return self._write_arrow(pacsv.read_csv(path), tmp_dir)
+        else:
+            def write(tmp_dir):
+                return self._write_npy(pd.read_csv(path), tmp_dir)
+
+        # Tamanho do CSV original: permite detectar uploads que o estendem
+        return self._commit(dataset_id, write, source_bytes=os.path.getsize(path))
+
+    def put_dataframe(self, dataset_id: str, df: pd.DataFrame) -> Dict[str, Any]:
+        """Grava um DataFrame já carregado sob ``dataset_id``."""
+        if self.exists(dataset_id):
+            return self.info(dataset_id)
+
+        if self.use_arrow:
+            import pyarrow as pa
+
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            return self._commit(dataset_id, lambda tmp_dir: self._write_arrow(table, tmp_dir))
+        return self._commit(dataset_id, lambda tmp_dir: self._write_npy(df, tmp_dir))
+
+    def _commit(self, dataset_id: str, write, **extra: Any) -> Dict[str, Any]:
+        """Escreve em um diretório temporário e o renomeia (atômico) para o destino."""
+        final_dir = self.path_for(dataset_id)
+        os.makedirs(self.directory, exist_ok=True)
+        tmp_dir = tempfile.mkdtemp(prefix=".dataset.", dir=self.directory)
+        try:
+            meta = write(tmp_dir)
+            meta.update(extra, dataset_id=dataset_id)
+            with open(os.path.join(tmp_dir, META_FILE), "w", encoding="utf-8") as f:
+                json.dump(meta, f, ensure_ascii=False)
+            try:
+                os.rename(tmp_dir, final_dir)
+            except OSError:
+                # Outro upload do mesmo conteúdo terminou antes
+                if not self.exists(dataset_id):
+                    raise
+                shutil.rmtree(tmp_dir, ignore_errors=True)
+        except BaseException:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise
+        return self.info(dataset_id)
+
+    @staticmethod
+    def _write_arrow(table, tmp_dir: str) -> Dict[str, Any]:
+        import pyarrow as pa
+
+        with pa.OSFile(os.path.join(tmp_dir, ARROW_FILE), "wb") as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+
+        return {
+            "format": "arrow",
+            "rows": table.num_rows,
+            "columns": [{"name": field.name, "dtype": str(field.type)} for field in table.schema],
+        }
+
+    @staticmethod
+    def _write_npy(df: pd.DataFrame, tmp_dir: str) -> Dict[str, Any]:
+        columns: List[Dict[str, Any]] = []
+        for i, name in enumerate(df.columns):
+            series = df[name]
+            file_name = f"{i}.npy"
+            column: Dict[str, Any] = {"name": str(name), "file": file_name}
+
+            if pd.api.types.is_numeric_dtype(series) or pd.api.types.is_datetime64_any_dtype(series):
+                array = series.to_numpy()
+                if array.dtype == object:
+                    # Inteiros/booleanos anuláveis: float com NaN
+                    array = series.to_numpy(dtype=float, na_value=np.nan)
+                column.update(kind="array", dtype=str(array.dtype))
+            else:
+                categorical = pd.Categorical(series.where(series.isna(), series.astype(str)))
+                array = categorical.codes
+                column.update(kind="categorical", dtype="category",
+                              categories=[str(c) for c in categorical.categories])
+
+            np.save(os.path.join(tmp_dir, file_name), np.ascontiguousarray(array), allow_pickle=False)
+            columns.append(column)
+
+        return {"format": "npy", "rows": len(df), "columns": columns}
+
+    def open(self, dataset_id: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """Abre o dataset com memory-map (apenas ``columns``, se informado).
+
+        Raises:
+            KeyError: se o dataset ou alguma coluna pedida não existir.
+        """
+        meta = self.info(dataset_id)
+        dataset_dir = self.path_for(dataset_id)
+        names = [column["name"] for column in meta["columns"]]
+        missing = [c for c in (columns or []) if c not in names]
+        if missing:
+            raise KeyError(f"Colunas não encontradas no dataset: {missing}")
+
+        if meta["format"] == "arrow":
+            import pyarrow as pa
+
+            source = pa.memory_map(os.path.join(dataset_dir, ARROW_FILE), "r")
+            table = pa.ipc.open_file(source).read_all()
+            if columns:
+                table = table.select(columns)
+            return table.to_pandas(split_blocks=True)
+
+        by_name = {column["name"]: column for column in meta["columns"]}
+        data = {}
+        for name in columns or names:
+            column = by_name[name]
+            array = np.load(os.path.join(dataset_dir, column["file"]), mmap_mode="r")
+            if column["kind"] == "categorical":
+                data[name] = pd.Categorical.from_codes(array, categories=column["categories"])
+            else:
+                data[name] = array
+        return pd.DataFrame(data, copy=False)
+
+    def delete(self, dataset_id: str) -> bool:
+        if not self.exists(dataset_id):
+            return False
+        shutil.rmtree(self.path_for(dataset_id), ignore_errors=True)
+        return True
+
+
+_store: Optional[DatasetStore] = None
+_store_lock = threading.Lock()
+
+
+def get_dataset_store() -> DatasetStore:
+    """Store compartilhado pelo processo (criado no primeiro uso)."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = DatasetStore()
+        return _store
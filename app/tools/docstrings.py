@@ -0,0 +1,159 @@
+"""
+Geração de docstrings para um módulo inteiro.
+
+O arquivo é analisado uma vez; cada classe, função e método sem docstring
+recebe um modelo no mesmo formato de ``generate_docstring`` (Args/Returns),
+ajustado ao que a função realmente faz (``Returns`` só se retorna valor,
+``Yields`` para geradores, ``Raises`` com as exceções lançadas). O resultado
+é um patch unificado: o arquivo não é alterado.
+"""
+
+import ast
+import difflib
+from typing import Any, Dict, List, Tuple
+
+# Parâmetros implícitos que não entram em Args
+_IMPLICIT_ARGS = ("self", "cls")
+
+
+def _is_private(name: str) -> bool:
+    return name.startswith("_")
+
+
+def _own_nodes(node: ast.AST):
+    """Nós do corpo de uma função, sem entrar em funções, lambdas e classes internas."""
+    stack = list(ast.iter_child_nodes(node))
+    while stack:
+        child = stack.pop()
+        if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef, ast.Lambda, ast.ClassDef)):
+            continue
+        yield child
+        stack.extend(ast.iter_child_nodes(child))
+
+
+def _raised_names(node: ast.AST) -> List[str]:
+    names = []
+    for child in _own_nodes(node):
+        if isinstance(child, ast.Raise) and child.exc is not None:
+            exc = child.exc.func if isinstance(child.exc, ast.Call) else child.exc
+            name = exc.id if isinstance(exc, ast.Name) else getattr(exc, "attr", None)
+            if name and name not in names:
+                names.append(name)
+    return names
+
+
+def function_docstring_lines(node, is_method: bool = False) -> List[str]:
+    """Linhas (sem indentação) da docstring modelo de uma função ou método."""
+    own = list(_own_nodes(node))
+    args = node.args
+    names = [arg.arg for arg in args.posonlyargs + args.args]
+    if is_method and names and names[0] in _IMPLICIT_ARGS:
+        names = names[1:]
+    if args.vararg:
+        names.append(f"*{args.vararg.arg}")
+    names += [arg.arg for arg in args.kwonlyargs]
+    if args.kwarg:
+        names.append(f"**{args.kwarg.arg}")
+
+    kind = "método" if is_method else "função"
+    lines = [f'"""Descrição {"do" if is_method else "da"} {kind} {node.name}.']
+    if names:
+        lines += ["", "Args:"]
+        lines += [f"    {name}: Descrição do parâmetro {name.lstrip('*')}." for name in names]
+    if any(isinstance(child, (ast.Yield, ast.YieldFrom)) for child in own):
+        lines += ["", "Yields:", "    Descrição dos valores gerados."]
+    elif any(isinstance(child, ast.Return) and child.value is not None for child in own):
+        lines += ["", "Returns:", "    Descrição do retorno."]
+    raised = _raised_names(node)
+    if raised:
+        lines += ["", "Raises:"]
+        lines += [f"    {name}: Descrição de quando {name} é lançada." for name in raised]
+    if len(lines) == 1:
+        return [lines[0] + '"""']
+    return lines + ['"""']
+
+
+def class_docstring_lines(node: ast.ClassDef) -> List[str]:
+    """Linhas da docstring modelo de uma classe."""
+    return [f'"""Descrição da classe {node.name}."""']
+
+
+def _definitions(tree: ast.Module, include_private: bool) -> List[Tuple[Any, str, str]]:
+    """(nó, nome qualificado, tipo) de classes, funções e métodos, na ordem do arquivo.
+
+    Funções definidas dentro de funções ficam de fora (são detalhes de implementação).
+    """
+    found = []
+
+    def visit(body, prefix: str, in_class: bool) -> None:
+        for node in body:
+            if not isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+                continue
+            if _is_private(node.name) and not include_private:
+                continue
+            qualname = f"{prefix}{node.name}"
+            if isinstance(node, ast.ClassDef):
+                found.append((node, qualname, "class"))
+                visit(node.body, f"{qualname}.", True)
+            else:
+                found.append((node, qualname, "method" if in_class else "function"))
+
+    visit(tree.body, "", False)
+    return found
+
+
+def module_docstring_patch(source: str, path: str = "module.py",
+                           include_private: bool = False) -> Dict[str, Any]:
+    """Docstrings para todas as definições sem docstring de ``source``.
+
+    Retorna ``documented`` (nome, tipo e linha de cada docstring gerada),
+    ``skipped`` (definições cujo corpo está na mesma linha do ``def``),
+    ``already_documented`` e ``patch`` (diff unificado, vazio se nada mudou).
+    """
+    tree = ast.parse(source)
+    lines = source.splitlines(keepends=True)
+    newline = "\r\n" if lines and lines[0].endswith("\r\n") else "\n"
+
+    insertions: List[Tuple[int, List[str]]] = []
+    documented = []
+    skipped = []
+    already_documented = 0
+    for node, qualname, kind in _definitions(tree, include_private):
+        if ast.get_docstring(node, clean=False) is not None:
+            already_documented += 1
+            continue
+        first = node.body[0]
+        indent = lines[first.lineno - 1][:first.col_offset]
+        # Corpo na mesma linha do def/class: precisaria reformatar o código
+        if indent.strip() or first.lineno == node.lineno:
+            skipped.append({"name": qualname, "kind": kind, "line": node.lineno})
+            continue
+        # Logo depois do cabeçalho, antes de comentários que abram o corpo
+        index = first.lineno - 1
+        while index - 1 > node.lineno - 1 and lines[index - 1].strip()[:1] in ("", "#"):
+            index -= 1
+        if kind == "class":
+            docstring = class_docstring_lines(node)
+        else:
+            docstring = function_docstring_lines(node, is_method=(kind == "method"))
+        insertions.append((index, [f"{indent}{text}".rstrip() + newline for text in docstring]))
+        documented.append({"name": qualname, "kind": kind, "line": node.lineno})
+
+    patched = list(lines)
+    # De baixo para cima, para não deslocar as linhas ainda não usadas
+    for index, new_lines in reversed(insertions):
+        patched[index:index] = new_lines
+
+    diff = []
+    for line in difflib.unified_diff(lines, patched, fromfile=f"a/{path}", tofile=f"b/{path}"):
+        diff.append(line)
+        # Última linha sem quebra: sem o marcador, git apply/patch rejeitam o diff
+        if not line.endswith("\n"):
+            diff.append("\n\\ No newline at end of file\n")
+
+    return {
+        "documented": documented,
+        "skipped": skipped,
+        "already_documented": already_documented,
+        "patch": "".join(diff)
+    }
@@ -0,0 +1,90 @@
+"""
+Redução de séries grandes antes da plotagem.
+
+Acima de um orçamento de pontos os gráficos não recebem mais os dados
+brutos, e sim um resumo de tamanho fixo, de modo que o tempo de renderização
+fica limitado qualquer que seja o tamanho da entrada:
+
+- lttb_indices: Largest-Triangle-Three-Buckets para gráficos de linha
+  (mantém picos e vales visualmente relevantes)
+- density_grid: contagens 2D (histogram2d) para gráficos de dispersão
+- histogram_bins: histograma pré-agrupado com ``np.histogram``
+"""
+
+import os
+from typing import Tuple
+
+import numpy as np
+import pandas as pd
+
+# Pontos acima dos quais os gráficos são reduzidos
+DEFAULT_POINT_BUDGET = int(os.getenv("CHART_POINT_BUDGET", 5_000))
+
+# Resolução da grade de densidade (bins por eixo) para dispersão
+DENSITY_BINS = 200
+
+# Número de barras dos histogramas pré-agrupados
+HISTOGRAM_BINS = 50
+
+
+def as_numeric(values) -> np.ndarray:
+    """Converte uma série para float (datas viram nanossegundos; texto vira a posição)."""
+    series = pd.Series(values)
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return series.astype("int64").to_numpy(dtype=float)
+    if pd.api.types.is_numeric_dtype(series) or pd.api.types.is_bool_dtype(series):
+        return series.to_numpy(dtype=float, na_value=np.nan)
+    return np.arange(len(series), dtype=float)
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """Índices dos ``n_out`` pontos escolhidos pelo algoritmo LTTB.
+
+    O primeiro e o último ponto são sempre mantidos; de cada bucket
+    intermediário fica o ponto que forma o maior triângulo com o ponto
+    escolhido no bucket anterior e a média do bucket seguinte.
+    """
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    every = (n - 2) / (n_out - 2)
+    indices = np.empty(n_out, dtype=np.intp)
+    indices[0] = 0
+    a = 0
+
+    for i in range(n_out - 2):
+        start = int(i * every) + 1
+        end = int((i + 1) * every) + 1
+        next_start = end
+        next_end = min(int((i + 2) * every) + 1, n)
+        if next_start >= next_end:
+            # Último bucket: o "seguinte" é o ponto final
+            next_start, next_end = n - 1, n
+
+        avg_x = x[next_start:next_end].mean()
+        avg_y = y[next_start:next_end].mean()
+
+        area = np.abs(
+            (x[a] - avg_x) * (y[start:end] - y[a])
+            - (x[a] - x[start:end]) * (avg_y - y[a])
+        )
+        a = start + int(np.argmax(area))
+        indices[i + 1] = a
+
+    indices[-1] = n - 1
+    return indices
+
+
+def density_grid(x: np.ndarray, y: np.ndarray,
+                 bins: int = DENSITY_BINS) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Contagens 2D (counts[x_bin, y_bin]) e as bordas dos bins, ignorando não finitos."""
+    mask = np.isfinite(x) & np.isfinite(y)
+    counts, xedges, yedges = np.histogram2d(x[mask], y[mask], bins=bins)
+    return counts, xedges, yedges
+
+
+def histogram_bins(values: np.ndarray, bins: int = HISTOGRAM_BINS) -> Tuple[np.ndarray, np.ndarray]:
+    """Histograma (contagens, bordas) dos valores finitos."""
+    values = values[np.isfinite(values)]
+    return np.histogram(values, bins=bins)
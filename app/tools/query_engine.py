@@ -0,0 +1,641 @@
+"""
+Motor de consultas sobre os datasets do ``DatasetStore``, por ``dataset_id``.
+
+Filtros, agrupamentos, ``describe`` e correlações rodam sem materializar o
+dataset inteiro em um DataFrame:
+
+- DuckDBEngine: SQL multi-thread sobre a tabela Arrow/npy em memory-map, com
+  pushdown de filtros e spill para disco (``storage/duckdb_tmp``) em agregações
+  maiores que a memória
+- PolarsEngine: LazyFrame (``scan_ipc``, que usa memory-map, para datasets Arrow)
+- PandasEngine: fallback sem dependências que percorre as colunas em
+  memory-map bloco a bloco com agregados mescláveis (``app.tools.sketches``)
+
+``create_query_engine`` escolhe o primeiro disponível (ou o definido em
+``QUERY_ENGINE``). DuckDB e Polars são opcionais.
+"""
+
+import operator
+import os
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from app.tools.correlations import correlation_from_sums
+from app.tools.sketches import KLLSketch, RunningMoments
+
+# Motor usado por padrão: auto, duckdb, polars ou pandas
+QUERY_ENGINE = os.getenv("QUERY_ENGINE", "auto")
+
+# Operadores aceitos nos filtros ([coluna, operador, valor])
+FILTER_OPS = ("==", "!=", ">", ">=", "<", "<=", "in", "not in", "is null", "not null")
+
+# Comparações dos filtros no motor pandas
+_COMPARISONS = {
+    "==": operator.eq, "!=": operator.ne, ">": operator.gt,
+    ">=": operator.ge, "<": operator.lt, "<=": operator.le,
+}
+
+# Agregações aceitas em query (``{"*": "count"}`` conta as linhas)
+AGGREGATIONS = ("count", "sum", "mean", "min", "max")
+
+# Linhas devolvidas por query quando não há limite explícito
+DEFAULT_QUERY_LIMIT = 100
+
+# Linhas por bloco no motor pandas
+DEFAULT_CHUNK_ROWS = 1_000_000
+
+# Até quantas linhas o motor pandas calcula quantis exatos (acima: KLL)
+EXACT_QUANTILE_ROWS = 1_000_000
+
+# Subdiretório de storage para o spill do DuckDB
+DUCKDB_TEMP_DIR = "duckdb_tmp"
+
+# Valores (linhas × colunas) por bloco na matriz de correlação: limita a
+# memória de cada bloco em tabelas largas (8M valores = 64 MB em float64)
+CORRELATION_CHUNK_VALUES = 8_000_000
+
+
+class QueryError(ValueError):
+    """Consulta inválida (coluna inexistente, operador ou agregação não suportados)."""
+
+
+Filter = Tuple[str, str, Any]
+Aggregation = Tuple[str, str]
+
+
+def normalize_filters(filters: Optional[Iterable[Sequence[Any]]]) -> List[Filter]:
+    """Valida filtros no formato ``[coluna, operador, valor]`` (valor opcional em is null/not null)."""
+    normalized = []
+    for item in filters or []:
+        if not isinstance(item, (list, tuple)) or len(item) not in (2, 3):
+            raise QueryError(f"Filtro inválido: {item!r} (use [coluna, operador, valor])")
+        column, op = item[0], str(item[1]).lower()
+        value = item[2] if len(item) == 3 else None
+        if op not in FILTER_OPS:
+            raise QueryError(f"Operador não suportado: {op} (use {', '.join(FILTER_OPS)})")
+        if op in ("in", "not in") and not isinstance(value, (list, tuple)):
+            raise QueryError(f"O operador '{op}' exige uma lista de valores")
+        normalized.append((column, op, value))
+    return normalized
+
+
+def normalize_aggregations(aggregations: Optional[Dict[str, Any]]) -> List[Aggregation]:
+    """Converte ``{"coluna": "mean"}`` ou ``{"coluna": ["min", "max"]}`` em pares (coluna, função)."""
+    normalized = []
+    for column, funcs in (aggregations or {}).items():
+        for func in ([funcs] if isinstance(funcs, str) else funcs):
+            func = str(func).lower()
+            if func not in AGGREGATIONS:
+                raise QueryError(f"Agregação não suportada: {func} (use {', '.join(AGGREGATIONS)})")
+            if column == "*" and func != "count":
+                raise QueryError("'*' só aceita a agregação count")
+            normalized.append((column, func))
+    return normalized
+
+
+def aggregation_name(column: str, func: str) -> str:
+    """Nome da coluna de resultado de uma agregação."""
+    return "count" if column == "*" else f"{column}_{func}"
+
+
+def correlation_chunk_rows(n_columns: int, limit: Optional[int] = None) -> int:
+    """Linhas por bloco na correlação de ``n_columns`` colunas (até ``limit``)."""
+    rows = max(1, CORRELATION_CHUNK_VALUES // max(1, n_columns))
+    return min(rows, limit) if limit else rows
+
+
+class PairwiseSums:
+    """Somas por pares completos de uma matriz de correlação, acumuladas bloco a bloco.
+
+    Para cada par (i, j) acumula n_ij, Σx_i, Σx_i² (nas linhas em que j
+    também é válido) e Σx_i·x_j; os valores são deslocados pela média do
+    primeiro bloco para evitar cancelamento numérico. Os três motores usam
+    esta classe: o custo é k² por linha em produtos de matrizes, em vez de
+    k(k-1)/2 agregações separadas.
+    """
+
+    def __init__(self, n_columns: int):
+        k = n_columns
+        self.n = np.zeros((k, k))
+        self.sums = np.zeros((k, k))
+        self.squares = np.zeros((k, k))
+        self.products = np.zeros((k, k))
+        self.shift: Optional[np.ndarray] = None
+
+    def update(self, values: np.ndarray) -> None:
+        """Acrescenta um bloco (linhas × colunas, NaN onde falta valor)."""
+        if len(values) == 0:
+            return
+        if self.shift is None:
+            with np.errstate(invalid="ignore"):
+                self.shift = np.nan_to_num(np.nanmean(values, axis=0))
+        valid = (~np.isnan(values)).astype(float)
+        centered = np.where(valid > 0, values - self.shift, 0.0)
+        self.n += valid.T @ valid
+        self.sums += centered.T @ valid
+        self.squares += (centered ** 2).T @ valid
+        self.products += centered.T @ centered
+
+    def matrix(self) -> np.ndarray:
+        """Matriz de Pearson; pares sem duas linhas ou com coluna constante ficam NaN."""
+        shift = self.shift if self.shift is not None else np.zeros(len(self.n))
+        return correlation_from_sums(self.n, self.sums, self.sums.T, self.squares, self.squares.T,
+                                     self.products, shift, shift)
+
+
+def _empty_summary() -> Dict[str, float]:
+    nan = float("nan")
+    return {"count": 0, "mean": nan, "median": nan, "std": nan, "min": nan, "max": nan, "q25": nan, "q75": nan}
+
+
+class QueryEngine(ABC):
+    """Interface comum dos motores: ``describe``, ``correlation`` e ``query`` por dataset_id."""
+
+    name = "base"
+
+    def __init__(self, store=None):
+        self._store = store
+
+    @property
+    def store(self):
+        if self._store is None:
+            from app.tools.dataset_store import get_dataset_store
+
+            self._store = get_dataset_store()
+        return self._store
+
+    def _check_columns(self, dataset_id: str, columns: Iterable[str]) -> None:
+        available = {column["name"] for column in self.store.info(dataset_id)["columns"]}
+        missing = [c for c in columns if c != "*" and c not in available]
+        if missing:
+            raise QueryError(f"Colunas não encontradas: {missing}")
+
+    def _validate(self, dataset_id: str, filters: List[Filter], group_by: List[str],
+                  aggregations: List[Aggregation], columns: Optional[List[str]]) -> None:
+        referenced = [f[0] for f in filters] + group_by + [a[0] for a in aggregations] + list(columns or [])
+        self._check_columns(dataset_id, referenced)
+
+    @abstractmethod
+    def describe(self, dataset_id: str, columns: Optional[List[str]] = None) -> Dict[str, Dict[str, float]]:
+        """Estatísticas das colunas numéricas (count, mean, median, std, min, max, q25, q75)."""
+
+    @abstractmethod
+    def correlation(self, dataset_id: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """Matriz de correlação de Pearson das colunas numéricas (pares completos)."""
+
+    @abstractmethod
+    def query(self, dataset_id: str, filters=None, group_by: Optional[List[str]] = None,
+              aggregations: Optional[Dict[str, Any]] = None, columns: Optional[List[str]] = None,
+              limit: int = DEFAULT_QUERY_LIMIT) -> pd.DataFrame:
+        """Filtra e, opcionalmente, agrupa/agrega o dataset (resultado limitado a ``limit`` linhas)."""
+
+
+class PandasEngine(QueryEngine):
+    """Motor sem dependências: blocos de linhas sobre as colunas em memory-map."""
+
+    name = "pandas"
+
+    def __init__(self, store=None, chunk_rows: int = DEFAULT_CHUNK_ROWS):
+        super().__init__(store)
+        self.chunk_rows = chunk_rows
+
+    def _chunks(self, frame: pd.DataFrame) -> Iterable[pd.DataFrame]:
+        for start in range(0, len(frame), self.chunk_rows):
+            yield frame.iloc[start:start + self.chunk_rows]
+
+    @staticmethod
+    def _mask(chunk: pd.DataFrame, filters: List[Filter]) -> pd.Series:
+        mask = pd.Series(True, index=chunk.index)
+        for column, op, value in filters:
+            values = chunk[column]
+            if op == "is null":
+                mask &= values.isna()
+            elif op == "not null":
+                mask &= values.notna()
+            elif op == "in":
+                mask &= values.isin(value)
+            elif op == "not in":
+                mask &= ~values.isin(value)
+            else:
+                mask &= _COMPARISONS[op](values, value).fillna(False).astype(bool)
+        return mask
+
+    @staticmethod
+    def _numeric_columns(frame: pd.DataFrame, columns: Optional[List[str]]) -> List[str]:
+        numeric = frame.select_dtypes(include=[np.number]).columns.tolist()
+        return [c for c in numeric if not columns or c in columns]
+
+    def describe_frame(self, frame: pd.DataFrame, columns: Optional[List[str]] = None) -> Dict[str, Dict[str, float]]:
+        stats: Dict[str, Dict[str, float]] = {}
+        for column in self._numeric_columns(frame, columns):
+            moments = RunningMoments()
+            sketch = KLLSketch() if len(frame) > EXACT_QUANTILE_ROWS else None
+            for chunk in self._chunks(frame[[column]]):
+                values = chunk[column].to_numpy(dtype=float, na_value=np.nan)
+                moments.update(values)
+                if sketch is not None:
+                    sketch.update(values[~np.isnan(values)])
+
+            if moments.count == 0:
+                stats[column] = _empty_summary()
+                continue
+            if sketch is not None:
+                q25, median, q75 = sketch.quantiles([0.25, 0.5, 0.75])
+            else:
+                q25, median, q75 = (float(v) for v in frame[column].quantile([0.25, 0.5, 0.75]))
+            stats[column] = {
+                "count": int(moments.count), "mean": moments.mean, "median": median, "std": moments.std,
+                "min": moments.min, "max": moments.max, "q25": q25, "q75": q75,
+            }
+        return stats
+
+    def correlation_frame(self, frame: pd.DataFrame, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """Pearson com pares completos a partir de somas acumuladas por bloco (``PairwiseSums``).
+
+        Colunas constantes (variância só de arredondamento) ficam NaN, como em
+        ``df.corr()``.
+        """
+        numeric = self._numeric_columns(frame, columns)
+        sums = PairwiseSums(len(numeric))
+        rows = correlation_chunk_rows(len(numeric), self.chunk_rows)
+        for start in range(0, len(frame), rows):
+            sums.update(frame[numeric].iloc[start:start + rows].to_numpy(dtype=float, na_value=np.nan))
+        return pd.DataFrame(sums.matrix(), index=numeric, columns=numeric)
+
+    def query_frame(self, frame: pd.DataFrame, filters=None, group_by: Optional[List[str]] = None,
+                    aggregations: Optional[Dict[str, Any]] = None, columns: Optional[List[str]] = None,
+                    limit: int = DEFAULT_QUERY_LIMIT) -> pd.DataFrame:
+        filters = normalize_filters(filters)
+        aggs = normalize_aggregations(aggregations)
+        group_by = list(group_by or [])
+        referenced = [f[0] for f in filters] + group_by + [a[0] for a in aggs] + list(columns or [])
+        missing = [c for c in referenced if c != "*" and c not in frame.columns]
+        if missing:
+            raise QueryError(f"Colunas não encontradas: {missing}")
+
+        if not aggs:
+            if group_by:
+                raise QueryError("group_by exige ao menos uma agregação")
+            selected = list(columns or frame.columns)
+            parts, remaining = [], limit
+            for chunk in self._chunks(frame):
+                part = chunk.loc[self._mask(chunk, filters), selected].head(remaining)
+                parts.append(part)
+                remaining -= len(part)
+                if remaining <= 0:
+                    break
+            return pd.concat(parts).reset_index(drop=True) if parts else frame[selected].head(0)
+
+        # Agregados parciais mescláveis por bloco: count, sum, min e max
+        value_columns = list(dict.fromkeys(c for c, _ in aggs if c != "*"))
+        partial: Optional[pd.DataFrame] = None
+        for chunk in self._chunks(frame):
+            rows = chunk[self._mask(chunk, filters)]
+            part = self._partial_aggregates(rows, group_by, value_columns)
+            partial = part if partial is None else self._combine_partials(
+                pd.concat([partial, part], ignore_index=True), group_by, value_columns
+            )
+        if partial is None:
+            partial = self._partial_aggregates(frame.head(0), group_by, value_columns)
+
+        result = pd.DataFrame({key: partial[key] for key in group_by})
+        for column, func in aggs:
+            if column == "*":
+                result["count"] = partial["__rows"].astype(int)
+            elif func == "mean":
+                counts = partial[f"{column}__count"]
+                result[aggregation_name(column, func)] = partial[f"{column}__sum"] / counts.where(counts > 0)
+            elif func == "count":
+                result[aggregation_name(column, func)] = partial[f"{column}__count"].astype(int)
+            else:
+                result[aggregation_name(column, func)] = partial[f"{column}__{func}"]
+        if group_by:
+            result = result.sort_values(group_by, kind="mergesort")
+        return result.head(limit).reset_index(drop=True)
+
+    @staticmethod
+    def _partial_aggregates(rows: pd.DataFrame, group_by: List[str], value_columns: List[str]) -> pd.DataFrame:
+        if group_by:
+            named = {"__rows": (group_by[0], "size")}
+            for column in value_columns:
+                named.update({
+                    f"{column}__count": (column, "count"), f"{column}__sum": (column, "sum"),
+                    f"{column}__min": (column, "min"), f"{column}__max": (column, "max"),
+                })
+            return rows.groupby(group_by, observed=True, dropna=False).agg(**named).reset_index()
+
+        row = {"__rows": len(rows)}
+        for column in value_columns:
+            values = rows[column]
+            row.update({
+                f"{column}__count": int(values.count()), f"{column}__sum": values.sum(),
+                f"{column}__min": values.min(), f"{column}__max": values.max(),
+            })
+        return pd.DataFrame([row])
+
+    @staticmethod
+    def _combine_partials(partials: pd.DataFrame, group_by: List[str], value_columns: List[str]) -> pd.DataFrame:
+        how = {"__rows": "sum"}
+        for column in value_columns:
+            how.update({
+                f"{column}__count": "sum", f"{column}__sum": "sum",
+                f"{column}__min": "min", f"{column}__max": "max",
+            })
+        if group_by:
+            return partials.groupby(group_by, observed=True, dropna=False).agg(how).reset_index()
+        return pd.DataFrame([{column: getattr(partials[column], func)() for column, func in how.items()}])
+
+    def describe(self, dataset_id: str, columns: Optional[List[str]] = None) -> Dict[str, Dict[str, float]]:
+        self._check_columns(dataset_id, columns or [])
+        return self.describe_frame(self.store.open(dataset_id, columns), columns)
+
+    def correlation(self, dataset_id: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        self._check_columns(dataset_id, columns or [])
+        return self.correlation_frame(self.store.open(dataset_id, columns), columns)
+
+    def query(self, dataset_id: str, filters=None, group_by=None, aggregations=None, columns=None,
+              limit: int = DEFAULT_QUERY_LIMIT) -> pd.DataFrame:
+        return self.query_frame(self.store.open(dataset_id), filters, group_by, aggregations, columns, limit)
+
+
+def _quote(identifier: str) -> str:
+    return '"' + str(identifier).replace('"', '""') + '"'
+
+
+class DuckDBEngine(QueryEngine):
+    """Motor DuckDB: SQL multi-thread sobre o dataset em memory-map."""
+
+    name = "duckdb"
+
+    def __init__(self, store=None, memory_limit: Optional[str] = None):
+        super().__init__(store)
+        self.memory_limit = memory_limit or os.getenv("DUCKDB_MEMORY_LIMIT")
+
+    def _connect(self, dataset_id: str):
+        import duckdb
+
+        from app.config.settings import get_storage_path
+
+        con = duckdb.connect()
+        con.execute(f"SET temp_directory = '{get_storage_path(DUCKDB_TEMP_DIR)}'")
+        if self.memory_limit:
+            con.execute(f"SET memory_limit = '{self.memory_limit}'")
+
+        meta = self.store.info(dataset_id)
+        if meta["format"] == "arrow":
+            import pyarrow as pa
+
+            from app.tools.dataset_store import ARROW_FILE
+
+            source = pa.memory_map(os.path.join(self.store.path_for(dataset_id), ARROW_FILE), "r")
+            con.register("dataset", pa.ipc.open_file(source).read_all())
+        else:
+            con.register("dataset", self.store.open(dataset_id))
+        return con
+
+    @staticmethod
+    def _numeric_columns(con, columns: Optional[List[str]]) -> List[str]:
+        numeric_types = ("TINYINT", "SMALLINT", "INTEGER", "BIGINT", "HUGEINT", "FLOAT", "DOUBLE", "DECIMAL",
+                         "UTINYINT", "USMALLINT", "UINTEGER", "UBIGINT")
+        rows = con.execute("DESCRIBE dataset").fetchall()
+        numeric = [name for name, column_type, *_ in rows if str(column_type).upper().startswith(numeric_types)]
+        return [c for c in numeric if not columns or c in columns]
+
+    @staticmethod
+    def _where(filters: List[Filter]) -> Tuple[str, List[Any]]:
+        clauses, params = [], []
+        for column, op, value in filters:
+            if op == "is null":
+                clauses.append(f"{_quote(column)} IS NULL")
+            elif op == "not null":
+                clauses.append(f"{_quote(column)} IS NOT NULL")
+            elif op in ("in", "not in"):
+                placeholders = ", ".join("?" for _ in value) or "NULL"
+                clauses.append(f"{_quote(column)} {op.upper()} ({placeholders})")
+                params.extend(value)
+            else:
+                clauses.append(f"{_quote(column)} {'=' if op == '==' else op} ?")
+                params.append(value)
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def describe(self, dataset_id: str, columns: Optional[List[str]] = None) -> Dict[str, Dict[str, float]]:
+        self._check_columns(dataset_id, columns or [])
+        con = self._connect(dataset_id)
+        try:
+            stats = {}
+            for column in self._numeric_columns(con, columns):
+                c = _quote(column)
+                count, mean, std, minimum, maximum, quartiles = con.execute(
+                    f"SELECT count({c}), avg({c}), stddev_samp({c}), min({c}), max({c}), "
+                    f"quantile_cont({c}, [0.25, 0.5, 0.75]) FROM dataset"
+                ).fetchone()
+                if not count:
+                    stats[column] = _empty_summary()
+                    continue
+                q25, median, q75 = quartiles
+                stats[column] = {
+                    "count": int(count), "mean": float(mean), "median": float(median),
+                    "std": float("nan") if std is None else float(std),
+                    "min": float(minimum), "max": float(maximum), "q25": float(q25), "q75": float(q75),
+                }
+            return stats
+        finally:
+            con.close()
+
+    def correlation(self, dataset_id: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        self._check_columns(dataset_id, columns or [])
+        con = self._connect(dataset_id)
+        try:
+            numeric = self._numeric_columns(con, columns)
+            sums = PairwiseSums(len(numeric))
+            if numeric:
+                # Uma varredura em blocos de vetores (2048 linhas), não uma agregação por par
+                vectors = max(1, correlation_chunk_rows(len(numeric)) // 2048)
+                result = con.execute("SELECT " + ", ".join(
+                    f"CAST({_quote(column)} AS DOUBLE)" for column in numeric
+                ) + " FROM dataset")
+                while True:
+                    chunk = result.fetch_df_chunk(vectors)
+                    if chunk.empty:
+                        break
+                    sums.update(chunk.to_numpy(dtype=float, na_value=np.nan))
+            return pd.DataFrame(sums.matrix(), index=numeric, columns=numeric)
+        finally:
+            con.close()
+
+    def query(self, dataset_id: str, filters=None, group_by=None, aggregations=None, columns=None,
+              limit: int = DEFAULT_QUERY_LIMIT) -> pd.DataFrame:
+        filters = normalize_filters(filters)
+        aggs = normalize_aggregations(aggregations)
+        group_by = list(group_by or [])
+        self._validate(dataset_id, filters, group_by, aggs, columns)
+        if group_by and not aggs:
+            raise QueryError("group_by exige ao menos uma agregação")
+
+        where, params = self._where(filters)
+        if aggs:
+            select = [_quote(key) for key in group_by] + [
+                ("count(*)" if column == "*" else f"{'avg' if func == 'mean' else func}({_quote(column)})")
+                + f" AS {_quote(aggregation_name(column, func))}"
+                for column, func in aggs
+            ]
+            sql = f"SELECT {', '.join(select)} FROM dataset{where}"
+            if group_by:
+                keys = ", ".join(_quote(key) for key in group_by)
+                sql += f" GROUP BY {keys} ORDER BY {keys}"
+        else:
+            selected = ", ".join(_quote(c) for c in columns) if columns else "*"
+            sql = f"SELECT {selected} FROM dataset{where}"
+        sql += f" LIMIT {int(limit)}"
+
+        con = self._connect(dataset_id)
+        try:
+            return con.execute(sql, params).df()
+        finally:
+            con.close()
+
+
+class PolarsEngine(QueryEngine):
+    """Motor Polars: LazyFrame com pushdown de filtros e projeção."""
+
+    name = "polars"
+
+    def _lazy(self, dataset_id: str):
+        import polars as pl
+
+        meta = self.store.info(dataset_id)
+        if meta["format"] == "arrow":
+            from app.tools.dataset_store import ARROW_FILE
+
+            return pl.scan_ipc(os.path.join(self.store.path_for(dataset_id), ARROW_FILE))
+        return pl.from_pandas(self.store.open(dataset_id)).lazy()
+
+    @staticmethod
+    def _numeric_columns(lazy, columns: Optional[List[str]]) -> List[str]:
+        schema = lazy.collect_schema() if hasattr(lazy, "collect_schema") else lazy.schema
+        numeric = [name for name, dtype in schema.items() if dtype.is_numeric()]
+        return [c for c in numeric if not columns or c in columns]
+
+    @staticmethod
+    def _predicate(filters: List[Filter]):
+        import polars as pl
+
+        predicate = None
+        for column, op, value in filters:
+            col = pl.col(column)
+            expression = {
+                "is null": lambda: col.is_null(),
+                "not null": lambda: col.is_not_null(),
+                "in": lambda: col.is_in(list(value)),
+                "not in": lambda: ~col.is_in(list(value)),
+                "==": lambda: col == value, "!=": lambda: col != value,
+                ">": lambda: col > value, ">=": lambda: col >= value,
+                "<": lambda: col < value, "<=": lambda: col <= value,
+            }[op]()
+            predicate = expression if predicate is None else predicate & expression
+        return predicate
+
+    def describe(self, dataset_id: str, columns: Optional[List[str]] = None) -> Dict[str, Dict[str, float]]:
+        import polars as pl
+
+        self._check_columns(dataset_id, columns or [])
+        lazy = self._lazy(dataset_id)
+        numeric = self._numeric_columns(lazy, columns)
+        expressions = []
+        for column in numeric:
+            col = pl.col(column)
+            expressions += [
+                col.count().alias(f"{column}|count"), col.mean().alias(f"{column}|mean"),
+                col.median().alias(f"{column}|median"), col.std().alias(f"{column}|std"),
+                col.min().cast(pl.Float64).alias(f"{column}|min"), col.max().cast(pl.Float64).alias(f"{column}|max"),
+                col.quantile(0.25, "linear").alias(f"{column}|q25"),
+                col.quantile(0.75, "linear").alias(f"{column}|q75"),
+            ]
+        row = lazy.select(expressions).collect().row(0, named=True) if expressions else {}
+
+        stats = {}
+        for column in numeric:
+            if not row[f"{column}|count"]:
+                stats[column] = _empty_summary()
+                continue
+            stats[column] = {
+                key: (int(row[f"{column}|{key}"]) if key == "count"
+                      else float("nan") if row[f"{column}|{key}"] is None else float(row[f"{column}|{key}"]))
+                for key in ("count", "mean", "median", "std", "min", "max", "q25", "q75")
+            }
+        return stats
+
+    def correlation(self, dataset_id: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        import polars as pl
+
+        self._check_columns(dataset_id, columns or [])
+        lazy = self._lazy(dataset_id)
+        numeric = self._numeric_columns(lazy, columns)
+        sums = PairwiseSums(len(numeric))
+        if numeric:
+            lazy = lazy.select([pl.col(column).cast(pl.Float64) for column in numeric])
+            total = lazy.select(pl.len() if hasattr(pl, "len") else pl.count()).collect().item()
+            rows = correlation_chunk_rows(len(numeric))
+            # Fatias com pushdown no scan_ipc: só um bloco de linhas em memória por vez
+            for start in range(0, total, rows):
+                sums.update(lazy.slice(start, rows).collect().to_numpy())
+        return pd.DataFrame(sums.matrix(), index=numeric, columns=numeric)
+
+    def query(self, dataset_id: str, filters=None, group_by=None, aggregations=None, columns=None,
+              limit: int = DEFAULT_QUERY_LIMIT) -> pd.DataFrame:
+        import polars as pl
+
+        filters = normalize_filters(filters)
+        aggs = normalize_aggregations(aggregations)
+        group_by = list(group_by or [])
+        self._validate(dataset_id, filters, group_by, aggs, columns)
+        if group_by and not aggs:
+            raise QueryError("group_by exige ao menos uma agregação")
+
+        lazy = self._lazy(dataset_id)
+        predicate = self._predicate(filters)
+        if predicate is not None:
+            lazy = lazy.filter(predicate)
+
+        if aggs:
+            row_count = pl.len() if hasattr(pl, "len") else pl.count()
+            expressions = [
+                (row_count if column == "*" else getattr(pl.col(column), func)()).alias(aggregation_name(column, func))
+                for column, func in aggs
+            ]
+            lazy = lazy.group_by(group_by).agg(expressions).sort(group_by) if group_by else lazy.select(expressions)
+        elif columns:
+            lazy = lazy.select(columns)
+
+        return lazy.limit(limit).collect().to_pandas()
+
+
+_ENGINES = {"duckdb": DuckDBEngine, "polars": PolarsEngine, "pandas": PandasEngine}
+
+
+def available_engines() -> List[str]:
+    """Motores utilizáveis neste ambiente, em ordem de preferência."""
+    names = []
+    for name, module in (("duckdb", "duckdb"), ("polars", "polars")):
+        try:
+            __import__(module)
+        except ImportError:
+            continue
+        names.append(name)
+    return names + ["pandas"]
+
+
+def create_query_engine(store=None, name: Optional[str] = None) -> QueryEngine:
+    """Cria o motor ``name`` (ou o preferido disponível com ``auto``)."""
+    name = (name or QUERY_ENGINE).lower()
+    available = available_engines()
+    if name == "auto":
+        name = available[0]
+    if name not in _ENGINES:
+        raise QueryError(f"Motor de consultas desconhecido: {name}")
+    if name not in available:
+        raise QueryError(f"Motor de consultas '{name}' não está instalado")
+    return _ENGINES[name](store)
@@ -0,0 +1,183 @@
+"""
+Estatísticas incrementais e mescláveis para perfis de dados em streaming.
+
+- RunningMoments: contagem, média, variância (Welford/Chan), mínimo e máximo
+- KLLSketch: quantis aproximados com memória limitada (sketch KLL)
+
+Ambas as estruturas podem ser atualizadas por blocos e mescladas entre si,
+o que permite processar arquivos maiores que a memória chunk a chunk.
+"""
+
+import math
+import random
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+
+
+class RunningMoments:
+    """Momentos de uma coluna numérica atualizados bloco a bloco."""
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def update(self, values: Iterable[float]) -> None:
+        """Incorpora um bloco de valores (NaN são ignorados)."""
+        arr = np.asarray(values, dtype=float)
+        arr = arr[~np.isnan(arr)]
+        if arr.size == 0:
+            return
+
+        block_mean = float(arr.mean())
+        block_m2 = float(((arr - block_mean) ** 2).sum())
+        self._combine(arr.size, block_mean, block_m2, float(arr.min()), float(arr.max()))
+
+    def merge(self, other: "RunningMoments") -> None:
+        """Mescla outro acumulador neste (fórmula paralela de Chan)."""
+        if other.count == 0:
+            return
+        self._combine(other.count, other.mean, other.m2, other.min, other.max)
+
+    def _combine(self, n_b: int, mean_b: float, m2_b: float, min_b: float, max_b: float) -> None:
+        n_a = self.count
+        total = n_a + n_b
+        delta = mean_b - self.mean
+        self.mean += delta * n_b / total
+        self.m2 += m2_b + delta * delta * n_a * n_b / total
+        self.count = total
+        self.min = min(self.min, min_b)
+        self.max = max(self.max, max_b)
+
+    @property
+    def variance(self) -> float:
+        """Variância amostral (ddof=1, como no pandas)."""
+        if self.count < 2:
+            return float("nan")
+        return self.m2 / (self.count - 1)
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.variance) if self.count >= 2 else float("nan")
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "mean": self.mean,
+            "m2": self.m2,
+            "min": self.min,
+            "max": self.max,
+        }
+
+    @classmethod
+    def from_dict(cls, state: Dict[str, Any]) -> "RunningMoments":
+        moments = cls()
+        moments.count = int(state["count"])
+        moments.mean = float(state["mean"])
+        moments.m2 = float(state["m2"])
+        moments.min = float(state["min"])
+        moments.max = float(state["max"])
+        return moments
+
+
+class KLLSketch:
+    """Sketch KLL para quantis aproximados com memória O(k log n).
+
+    O erro de rank fica em torno de 1.7/k (≈1% com k=200) e o sketch pode
+    ser mesclado com outros construídos sobre partes diferentes dos dados.
+    """
+
+    def __init__(self, k: int = 200, seed: Optional[int] = None):
+        self.k = k
+        self.count = 0
+        self._compactors: List[np.ndarray] = [np.empty(0)]
+        self._rng = random.Random(seed)
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self._compactors) - level - 1
+        return max(2, int(math.ceil(self.k * (2.0 / 3.0) ** depth)))
+
+    def update(self, values: Iterable[float]) -> None:
+        """Incorpora um bloco de valores (NaN são ignorados)."""
+        arr = np.asarray(values, dtype=float)
+        arr = arr[~np.isnan(arr)]
+        if arr.size == 0:
+            return
+
+        self.count += arr.size
+        self._compactors[0] = np.concatenate([self._compactors[0], arr])
+        self._compress()
+
+    def merge(self, other: "KLLSketch") -> None:
+        """Mescla outro sketch neste."""
+        while len(self._compactors) < len(other._compactors):
+            self._compactors.append(np.empty(0))
+        for level, items in enumerate(other._compactors):
+            self._compactors[level] = np.concatenate([self._compactors[level], items])
+        self.count += other.count
+        self._compress()
+
+    def _compress(self) -> None:
+        level = 0
+        while level < len(self._compactors):
+            items = self._compactors[level]
+            if items.size < self._capacity(level):
+                level += 1
+                continue
+
+            if level + 1 == len(self._compactors):
+                self._compactors.append(np.empty(0))
+
+            items = np.sort(items)
+            # Com tamanho ímpar, o maior item permanece no nível atual
+            leftover = items[-1:] if items.size % 2 else items[:0]
+            paired = items[:items.size - leftover.size]
+            promoted = paired[self._rng.randint(0, 1)::2]
+
+            self._compactors[level] = leftover
+            self._compactors[level + 1] = np.concatenate([self._compactors[level + 1], promoted])
+            # A altura pode ter mudado: reavaliar a partir da base
+            level = 0
+
+    def quantile(self, q: float) -> float:
+        """Retorna o quantil aproximado q (0 <= q <= 1)."""
+        return self.quantiles([q])[0]
+
+    def quantiles(self, qs: Iterable[float]) -> List[float]:
+        """Retorna vários quantis aproximados de uma vez."""
+        qs = list(qs)
+        if self.count == 0:
+            return [float("nan")] * len(qs)
+
+        items = np.concatenate(self._compactors)
+        weights = np.concatenate([
+            np.full(level_items.size, 2 ** level, dtype=float)
+            for level, level_items in enumerate(self._compactors)
+        ])
+        order = np.argsort(items, kind="mergesort")
+        items = items[order]
+        cumulative = np.cumsum(weights[order])
+        total = cumulative[-1]
+
+        result = []
+        for q in qs:
+            idx = int(np.searchsorted(cumulative, q * total, side="left"))
+            result.append(float(items[min(idx, items.size - 1)]))
+        return result
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "k": self.k,
+            "count": self.count,
+            "compactors": [level_items.tolist() for level_items in self._compactors],
+        }
+
+    @classmethod
+    def from_dict(cls, state: Dict[str, Any]) -> "KLLSketch":
+        sketch = cls(k=int(state["k"]))
+        sketch.count = int(state["count"])
+        sketch._compactors = [np.asarray(level_items, dtype=float) for level_items in state["compactors"]]
+        return sketch
@@ -0,0 +1,292 @@
+"""
+Verificação de estilo em lote com flake8.
+
+Em vez de um processo do flake8 por arquivo (cada um pagando a subida do
+interpretador), os arquivos são agrupados em execuções de até
+``FILES_PER_RUN`` arquivos, distribuídas em um pool de workers e cada uma com
+tempo limite: um arquivo patológico derruba só a sua execução, não o agente.
+
+A saída é pedida em um formato fixo e convertida em registros
+(``path``, ``line``, ``column``, ``code``, ``message``). Os resultados ficam em
+cache por arquivo (``storage/style_checks``), com chave no conteúdo, no caminho
+relativo, na versão do linter e na configuração do flake8, procurada como o
+próprio flake8 faz (subindo a partir da raiz dos arquivos): arquivos não
+alterados não voltam a ser verificados.
+"""
+
+import configparser
+import hashlib
+import importlib.util
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.tools.code_analysis import content_hash, discover_python_files
+
+# Execuções do linter em paralelo
+STYLE_CHECK_WORKERS = int(os.getenv("STYLE_CHECK_WORKERS", min(4, os.cpu_count() or 1)))
+
+# Arquivos por execução do linter
+FILES_PER_RUN = 200
+
+# Tempo máximo de uma execução (segundos)
+STYLE_CHECK_TIMEOUT = 60
+
+# Subdiretório de storage com os resultados por arquivo
+STYLE_CHECKS_DIR = "style_checks"
+
+# Arquivos de configuração do flake8, na ordem em que ele os procura
+CONFIG_FILES = ("setup.cfg", "tox.ini", ".flake8")
+
+# Seções que fazem do arquivo uma configuração do flake8
+CONFIG_SECTIONS = ("flake8", "flake8:local-plugins")
+
+# Formato de saída pedido ao flake8 (separador que não aparece em caminhos)
+ISSUE_SEPARATOR = "::"
+ISSUE_FORMAT = ISSUE_SEPARATOR.join(["%(path)s", "%(row)d", "%(col)d", "%(code)s", "%(text)s"])
+
+
+def flake8_command() -> Optional[List[str]]:
+    """Comando do flake8 (executável no PATH ou ``python -m flake8``) ou None."""
+    executable = shutil.which("flake8")
+    if executable:
+        return [executable]
+    if importlib.util.find_spec("flake8") is not None:
+        return [sys.executable, "-m", "flake8"]
+    return None
+
+
+def find_flake8_config(root: str) -> Optional[str]:
+    """Configuração que o flake8 usaria rodando em ``root``, ou None.
+
+    Mesma busca do flake8: sobe a partir de ``root`` até a raiz do sistema ou
+    o diretório do usuário e devolve o primeiro ``CONFIG_FILES`` com uma das
+    ``CONFIG_SECTIONS``.
+    """
+    home = os.path.realpath(os.path.expanduser("~"))
+    path = os.path.realpath(root)
+    while True:
+        for name in CONFIG_FILES:
+            candidate = os.path.join(path, name)
+            parser = configparser.RawConfigParser()
+            try:
+                parser.read(candidate, encoding="utf-8")
+            except (UnicodeDecodeError, configparser.Error):
+                continue
+            if any(section in parser for section in CONFIG_SECTIONS):
+                return candidate
+        parent = os.path.dirname(path)
+        if parent == path or parent == home:
+            return None
+        path = parent
+
+
+def parse_issues(output: str) -> Dict[str, List[Dict[str, Any]]]:
+    """Registros por caminho a partir da saída em ``ISSUE_FORMAT``."""
+    issues: Dict[str, List[Dict[str, Any]]] = {}
+    for line in output.splitlines():
+        parts = line.split(ISSUE_SEPARATOR, 4)
+        if len(parts) != 5:
+            continue
+        path, row, col, code, message = parts
+        try:
+            record = {"line": int(row), "column": int(col), "code": code, "message": message}
+        except ValueError:
+            continue
+        issues.setdefault(path, []).append(record)
+    return issues
+
+
+class StyleCache:
+    """Registros por chave em ``storage/style_checks/<xx>/<chave>.json``."""
+
+    def __init__(self, directory: Optional[str] = None):
+        self._directory = directory
+
+    @property
+    def directory(self) -> str:
+        if self._directory is None:
+            from app.config.settings import get_storage_path
+
+            self._directory = get_storage_path(STYLE_CHECKS_DIR)
+        return self._directory
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], f"{key}.json")
+
+    def get(self, key: str) -> Optional[List[Dict[str, Any]]]:
+        try:
+            with open(self._path(key), encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def put(self, key: str, issues: List[Dict[str, Any]]) -> None:
+        """Grava os registros (escrita atômica)."""
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(prefix=".style.", dir=os.path.dirname(path))
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(issues, f)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+
+class StyleChecker:
+    """Executa o linter em lotes, em paralelo, com tempo limite e cache por arquivo.
+
+    ``command`` é o comando do linter (padrão: ``flake8_command()``); ele
+    precisa aceitar ``--format``, ``--jobs``, ``--config`` e ``--version``
+    como o flake8.
+    """
+
+    def __init__(self, command: Optional[List[str]] = None, max_workers: int = STYLE_CHECK_WORKERS,
+                 timeout: float = STYLE_CHECK_TIMEOUT, files_per_run: int = FILES_PER_RUN,
+                 cache: Optional[StyleCache] = None):
+        self._command = command
+        self.max_workers = max(1, max_workers)
+        self.timeout = timeout
+        self.files_per_run = files_per_run
+        self.cache = cache if cache is not None else StyleCache()
+        self._version: Optional[str] = None
+        self._lock = threading.Lock()
+
+    @property
+    def command(self) -> List[str]:
+        if self._command is None:
+            self._command = flake8_command()
+            if self._command is None:
+                raise FileNotFoundError("flake8 não está instalado")
+        return self._command
+
+    def version(self) -> str:
+        """Versão do linter (uma execução por instância)."""
+        with self._lock:
+            if self._version is None:
+                result = subprocess.run(self.command + ["--version"], capture_output=True,
+                                        text=True, timeout=self.timeout)
+                self._version = result.stdout.strip()
+            return self._version
+
+    def _signature(self, config: Optional[str]) -> bytes:
+        """Versão do linter + configuração usada: tudo que muda o resultado além do arquivo."""
+        digest = hashlib.blake2b(self.version().encode("utf-8"), digest_size=16)
+        if config is not None:
+            try:
+                with open(config, "rb") as f:
+                    digest.update(config.encode("utf-8") + b"\0" + f.read())
+            except OSError:
+                pass
+        return digest.digest()
+
+    def _run(self, root: str, batch: List[str],
+             config: Optional[str] = None) -> Tuple[Dict[str, List[Dict[str, Any]]], Dict[str, str]]:
+        """Uma execução do linter sobre ``batch`` (caminhos relativos a ``root``)."""
+        # Configuração explícita: a mesma que entrou na chave do cache
+        options = [f"--config={config}"] if config else []
+        try:
+            result = subprocess.run(
+                # O paralelismo fica no pool: cada execução usa um único processo
+                self.command + [f"--format={ISSUE_FORMAT}", "--jobs=1", *options, "--", *batch],
+                cwd=root, capture_output=True, text=True, timeout=self.timeout
+            )
+        except subprocess.TimeoutExpired:
+            message = f"Tempo limite de {self.timeout}s excedido na verificação de estilo"
+            return {}, {path: message for path in batch}
+
+        # flake8: 0 = sem problemas, 1 = problemas encontrados
+        if result.returncode not in (0, 1):
+            message = (result.stderr.strip().splitlines() or [f"código de saída {result.returncode}"])[-1]
+            return {}, {path: message for path in batch}
+
+        found = parse_issues(result.stdout)
+        issues = {}
+        for path in batch:
+            issues[path] = found.get(path, []) or found.get(os.path.join(".", path), [])
+        return issues, {}
+
+    @staticmethod
+    def expand(paths: List[str]) -> Tuple[str, List[str]]:
+        """Raiz comum e arquivos ``.py`` (relativos a ela) de arquivos e diretórios."""
+        absolute = [os.path.abspath(path) for path in paths]
+        root = os.path.commonpath([path if os.path.isdir(path) else os.path.dirname(path)
+                                   for path in absolute])
+        files = []
+        for path in absolute:
+            if os.path.isdir(path):
+                files.extend(os.path.relpath(os.path.join(path, name), root)
+                             for name in discover_python_files(path))
+            else:
+                files.append(os.path.relpath(path, root))
+        return root, sorted(set(files))
+
+    def check(self, paths: List[str]) -> Dict[str, Any]:
+        """Verifica arquivos e diretórios; retorna registros por arquivo, erros e uso do cache."""
+        if not paths:
+            return {"root": None, "files": {}, "errors": {}, "cache": {"hits": 0, "checked": 0}}
+        root, files = self.expand(paths)
+        config = find_flake8_config(root)
+        signature = self._signature(config)
+
+        issues: Dict[str, List[Dict[str, Any]]] = {}
+        errors: Dict[str, str] = {}
+        keys: Dict[str, str] = {}
+        pending = []
+        hits = 0
+        for path in files:
+            try:
+                with open(os.path.join(root, path), "rb") as f:
+                    data = f.read()
+            except OSError as e:
+                errors[path] = str(e)
+                continue
+            key = hashlib.blake2b(signature + path.encode("utf-8") + b"\0" + content_hash(data).encode("ascii"),
+                                  digest_size=16).hexdigest()
+            cached = self.cache.get(key)
+            if cached is None:
+                keys[path] = key
+                pending.append(path)
+            else:
+                issues[path] = cached
+                hits += 1
+
+        # Lotes iguais entre os workers, sem passar de files_per_run
+        size = max(1, min(self.files_per_run, -(-len(pending) // self.max_workers)))
+        batches = [pending[i:i + size] for i in range(0, len(pending), size)]
+        if batches:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(batches))) as executor:
+                for batch_issues, batch_errors in executor.map(lambda batch: self._run(root, batch, config), batches):
+                    errors.update(batch_errors)
+                    for path, records in batch_issues.items():
+                        issues[path] = records
+                        self.cache.put(keys[path], records)
+
+        return {
+            "root": root,
+            "files": {path: [{"path": path, **record} for record in issues[path]] for path in sorted(issues)},
+            "errors": errors,
+            "cache": {"hits": hits, "checked": len(pending)}
+        }
+
+
+_checker: Optional[StyleChecker] = None
+_checker_lock = threading.Lock()
+
+
+def get_style_checker() -> StyleChecker:
+    """Verificador compartilhado pelo processo (criado no primeiro uso)."""
+    global _checker
+    with _checker_lock:
+        if _checker is None:
+            _checker = StyleChecker()
+        return _checker
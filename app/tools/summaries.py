@@ -0,0 +1,251 @@
+"""
+Resumos estatísticos mescláveis por dataset, para arquivos que crescem.
+
+Para cada ``dataset_id`` ficam em ``storage/summaries`` o estado mesclável
+(``RunningMoments`` e ``KLLSketch`` por coluna numérica), o número de linhas,
+o tamanho em bytes do CSV de origem e as estatísticas já calculadas.
+
+Quando um novo CSV começa exatamente com o conteúdo de um dataset conhecido
+(o mesmo arquivo diário com algumas linhas novas no final), só o trecho novo é
+lido e mesclado ao resumo existente. A detecção é feita em uma única passada
+de hash: o digest é copiado nos tamanhos dos datasets conhecidos e comparado
+com os IDs, que são o próprio hash do conteúdo.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from typing import Any, BinaryIO, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from app.tools.data_tools_simple import DATASET_ID_PREFIX, DataFrameCache
+from app.tools.sketches import KLLSketch, RunningMoments
+
+# Subdiretório de storage com os resumos
+SUMMARIES_DIR = "summaries"
+
+# Índice dataset_id -> tamanho do CSV de origem (candidatos a prefixo)
+INDEX_FILE = "index.json"
+
+# Bytes lidos por vez ao calcular os hashes de prefixo
+READ_BLOCK_SIZE = 1024 * 1024
+
+# Linhas por bloco ao incorporar dados no resumo
+SUMMARY_CHUNK_ROWS = 100_000
+
+
+class DatasetSummary:
+    """Estado mesclável das colunas numéricas de um dataset."""
+
+    def __init__(self, columns: List[str], numeric_columns: List[str], source_bytes: Optional[int] = None):
+        self.columns = list(columns)
+        self.moments = {column: RunningMoments() for column in numeric_columns}
+        self.sketches = {column: KLLSketch() for column in numeric_columns}
+        self.rows = 0
+        self.source_bytes = source_bytes
+        # Saída de statistical_summary correspondente a este estado
+        self.statistics: Dict[str, Dict[str, float]] = {}
+        # Preenchidos quando o resumo foi obtido por mescla incremental
+        self.base_dataset_id: Optional[str] = None
+        self.delta_rows = 0
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, source_bytes: Optional[int] = None) -> "DatasetSummary":
+        """Resumo de um DataFrame inteiro (percorrido em blocos)."""
+        summary = cls(df.columns.tolist(), df.select_dtypes(include=[np.number]).columns.tolist(), source_bytes)
+        for start in range(0, len(df), SUMMARY_CHUNK_ROWS):
+            summary.update(df.iloc[start:start + SUMMARY_CHUNK_ROWS])
+        return summary
+
+    def update(self, chunk: pd.DataFrame) -> None:
+        """Incorpora um bloco de linhas novas."""
+        self.rows += len(chunk)
+        for column, moments in self.moments.items():
+            values = pd.to_numeric(chunk[column], errors="coerce").to_numpy(dtype=float, na_value=np.nan)
+            moments.update(values)
+            self.sketches[column].update(values)
+
+    def compute_statistics(self) -> Dict[str, Dict[str, float]]:
+        """Estatísticas no formato de statistical_summary (quantis pelo sketch KLL)."""
+        stats = {}
+        for column, moments in self.moments.items():
+            if moments.count == 0:
+                continue
+            q25, median, q75 = self.sketches[column].quantiles([0.25, 0.5, 0.75])
+            stats[column] = {
+                "count": int(moments.count),
+                "mean": float(moments.mean),
+                "median": median,
+                "std": float(moments.std),
+                "min": float(moments.min),
+                "max": float(moments.max),
+                "q25": q25,
+                "q75": q75
+            }
+        return stats
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "columns": self.columns,
+            "rows": self.rows,
+            "source_bytes": self.source_bytes,
+            "statistics": self.statistics,
+            "base_dataset_id": self.base_dataset_id,
+            "delta_rows": self.delta_rows,
+            "state": {
+                column: {"moments": moments.to_dict(), "sketch": self.sketches[column].to_dict()}
+                for column, moments in self.moments.items()
+            },
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "DatasetSummary":
+        summary = cls(data["columns"], [], data.get("source_bytes"))
+        summary.rows = int(data["rows"])
+        summary.statistics = data.get("statistics") or {}
+        summary.base_dataset_id = data.get("base_dataset_id")
+        summary.delta_rows = int(data.get("delta_rows") or 0)
+        for column, state in data["state"].items():
+            summary.moments[column] = RunningMoments.from_dict(state["moments"])
+            summary.sketches[column] = KLLSketch.from_dict(state["sketch"])
+        return summary
+
+
+class SummaryStore:
+    """Resumos em arquivos JSON (``storage/summaries/<dataset_id>.json``)."""
+
+    def __init__(self, directory: Optional[str] = None):
+        self._directory = directory
+        self._lock = threading.Lock()
+
+    @property
+    def directory(self) -> str:
+        if self._directory is None:
+            from app.config.settings import get_storage_path
+
+            self._directory = get_storage_path(SUMMARIES_DIR)
+        return self._directory
+
+    def _path(self, dataset_id: str) -> str:
+        if not DataFrameCache.is_dataset_id(dataset_id):
+            raise ValueError(f"ID de dataset inválido: {dataset_id!r}")
+        return os.path.join(self.directory, f"{dataset_id.strip()}.json")
+
+    def _write_json(self, path: str, data: Any) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(prefix=".summary.", dir=self.directory)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def _index(self) -> Dict[str, int]:
+        try:
+            with open(os.path.join(self.directory, INDEX_FILE), encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def get(self, dataset_id: str) -> Optional[DatasetSummary]:
+        """Resumo armazenado para o dataset ou None."""
+        try:
+            with open(self._path(dataset_id), encoding="utf-8") as f:
+                return DatasetSummary.from_dict(json.load(f))
+        except (ValueError, FileNotFoundError, KeyError):
+            return None
+
+    def put(self, dataset_id: str, summary: DatasetSummary) -> None:
+        """Armazena o resumo e, se o tamanho da origem é conhecido, indexa-o para prefixos."""
+        with self._lock:
+            self._write_json(self._path(dataset_id), summary.to_dict())
+            if summary.source_bytes:
+                index = self._index()
+                index[dataset_id.strip()] = int(summary.source_bytes)
+                self._write_json(os.path.join(self.directory, INDEX_FILE), index)
+
+    def find_prefix(self, source: BinaryIO, total_bytes: int) -> Optional[Tuple[str, int]]:
+        """Maior dataset conhecido cujo conteúdo é prefixo de ``source``: (dataset_id, bytes)."""
+        candidates: Dict[int, set] = {}
+        for dataset_id, length in self._index().items():
+            if 0 < length < total_bytes:
+                candidates.setdefault(length, set()).add(dataset_id)
+
+        digest = hashlib.blake2b(digest_size=8)
+        position = 0
+        best = None
+        source.seek(0)
+        for boundary in sorted(candidates):
+            while position < boundary:
+                block = source.read(min(READ_BLOCK_SIZE, boundary - position))
+                if not block:
+                    return best
+                digest.update(block)
+                position += len(block)
+
+            candidate = f"{DATASET_ID_PREFIX}{digest.copy().hexdigest()}"
+            if candidate in candidates[boundary]:
+                best = (candidate, boundary)
+        return best
+
+    def extend(self, source: BinaryIO, dataset_id: str) -> Optional[DatasetSummary]:
+        """Resumo de ``source`` a partir de um dataset conhecido que seja seu prefixo.
+
+        Só as linhas depois do prefixo são lidas. Retorna None (e nada é
+        gravado) se não houver prefixo conhecido ou o trecho novo não puder
+        ser mesclado, por exemplo se o prefixo terminar no meio de uma linha
+        ou as linhas novas não tiverem o mesmo número de campos do cabeçalho.
+        """
+        total_bytes = source.seek(0, os.SEEK_END)
+        found = self.find_prefix(source, total_bytes)
+        if found is None:
+            return None
+        base_id, length = found
+        base = self.get(base_id)
+        if base is None:
+            return None
+
+        # O prefixo precisa terminar em uma quebra de linha (nenhuma linha foi alterada)
+        source.seek(length - 1)
+        previous, following = source.read(1), source.read(1)
+        if previous != b"\n" and following not in (b"\n", b"\r"):
+            return None
+
+        summary = DatasetSummary.from_dict(base.to_dict())
+        source.seek(length)
+        try:
+            # Sem ``names``: linhas com campos a mais não viram índice em silêncio
+            for chunk in pd.read_csv(source, header=None, chunksize=SUMMARY_CHUNK_ROWS):
+                if chunk.shape[1] != len(base.columns):
+                    return None
+                chunk.columns = base.columns
+                summary.update(chunk)
+        except (ValueError, UnicodeDecodeError, pd.errors.ParserError):
+            return None
+
+        summary.source_bytes = total_bytes
+        summary.base_dataset_id = base_id
+        summary.delta_rows = summary.rows - base.rows
+        summary.statistics = summary.compute_statistics()
+        self.put(dataset_id, summary)
+        return summary
+
+
+_store: Optional[SummaryStore] = None
+_store_lock = threading.Lock()
+
+
+def get_summary_store() -> SummaryStore:
+    """Store compartilhado pelo processo (criado no primeiro uso)."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = SummaryStore()
+        return _store
@@ -0,0 +1,372 @@
+"""
+Índice persistente de símbolos de projetos Python.
+
+Definições (classes, funções, métodos, variáveis e atributos de classe),
+imports e referências ficam com arquivo, linha e coluna em uma tabela SQLite
+(``storage/symbols.db``). Nomes de definições e imports também vão para uma
+tabela FTS5, para buscas por parte do nome ou prefixo (``preco*``); sem FTS5
+no SQLite a busca cai para ``LIKE``.
+
+A atualização é incremental, com os mesmos critérios de ``ProjectAnalyzer``:
+arquivos com mtime e tamanho iguais nem são lidos, e se só o mtime mudou o
+hash do conteúdo evita reextrair os símbolos. A extração roda no pool de
+processos do analisador.
+"""
+
+import ast
+import os
+import re
+import sqlite3
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.tools.code_analysis import (
+    ProjectAnalyzer,
+    content_hash,
+    discover_python_files,
+    get_project_analyzer,
+    module_name,
+    resolve_relative_import,
+)
+
+# Nome do banco do índice dentro do diretório de storage
+DEFAULT_SYMBOLS_DB = "symbols.db"
+
+# Tipos de definição e todos os tipos de símbolo, na ordem em que aparecem nas buscas
+DEFINITION_KINDS = ("class", "function", "method", "variable", "attribute")
+SYMBOL_KINDS = DEFINITION_KINDS + ("import", "reference")
+
+# Resultados por tipo em uma busca
+DEFAULT_LOOKUP_LIMIT = 50
+
+# Caracteres que separam termos na busca FTS
+_FTS_TERM = re.compile(r"[A-Za-z0-9_]+")
+
+
+def _like_escape(text: str) -> str:
+    """Texto literal em um padrão LIKE (com ``ESCAPE '\\'``): ``_`` e ``%`` não são curingas."""
+    return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+class _SymbolCollector(ast.NodeVisitor):
+    """Coleta ``(nome, nome qualificado, tipo, linha, coluna)`` em uma passada.
+
+    Para referências o nome qualificado é o escopo onde o nome é usado.
+    """
+
+    def __init__(self, module: str, is_package: bool):
+        self.module = module
+        self.is_package = is_package
+        self.scope: List[Tuple[str, str]] = [(module, "module")] if module else []
+        self.symbols: List[Tuple[str, str, str, int, int]] = []
+
+    def _qualname(self, name: Optional[str] = None) -> str:
+        parts = [part for part, _ in self.scope]
+        return ".".join(parts + [name] if name else parts)
+
+    def _scope_kind(self) -> str:
+        return self.scope[-1][1] if self.scope else "module"
+
+    def _add(self, name: str, kind: str, node: ast.AST, qualname: Optional[str] = None) -> None:
+        self.symbols.append((name, qualname or self._qualname(name), kind,
+                             getattr(node, "lineno", 0), getattr(node, "col_offset", 0)))
+
+    def _visit_all(self, nodes) -> None:
+        for node in nodes:
+            if node is not None:
+                self.visit(node)
+
+    def visit_ClassDef(self, node: ast.ClassDef) -> None:
+        self._visit_all(node.decorator_list + node.bases + node.keywords)
+        self._add(node.name, "class", node)
+        self.scope.append((node.name, "class"))
+        self._visit_all(node.body)
+        self.scope.pop()
+
+    def visit_FunctionDef(self, node) -> None:
+        # Decoradores, defaults e anotações são avaliados no escopo de fora
+        args = node.args
+        arguments = args.posonlyargs + args.args + args.kwonlyargs + [args.vararg, args.kwarg]
+        self._visit_all(node.decorator_list + args.defaults + args.kw_defaults + [node.returns])
+        self._visit_all(arg.annotation for arg in arguments if arg is not None)
+        self._add(node.name, "method" if self._scope_kind() == "class" else "function", node)
+        self.scope.append((node.name, "function"))
+        self._visit_all(node.body)
+        self.scope.pop()
+
+    visit_AsyncFunctionDef = visit_FunctionDef
+
+    def _visit_assignment(self, targets, node) -> None:
+        kind = {"module": "variable", "class": "attribute"}.get(self._scope_kind())
+        if kind:
+            for target in targets:
+                for name in ast.walk(target):
+                    if isinstance(name, ast.Name):
+                        self._add(name.id, kind, name)
+        self.generic_visit(node)
+
+    def visit_Assign(self, node: ast.Assign) -> None:
+        self._visit_assignment(node.targets, node)
+
+    def visit_AnnAssign(self, node: ast.AnnAssign) -> None:
+        self._visit_assignment([node.target], node)
+
+    def visit_Import(self, node: ast.Import) -> None:
+        for alias in node.names:
+            self._add(alias.name.rpartition(".")[2], "import", node, alias.name)
+
+    def visit_ImportFrom(self, node: ast.ImportFrom) -> None:
+        base = node.module or ""
+        if node.level:
+            base = resolve_relative_import(self.module, self.is_package, node.level, node.module)
+        for alias in node.names:
+            self._add(alias.name, "import", node, f"{base}.{alias.name}" if base else alias.name)
+
+    def visit_Name(self, node: ast.Name) -> None:
+        if isinstance(node.ctx, ast.Load):
+            self._add(node.id, "reference", node, self._qualname())
+
+    def visit_Attribute(self, node: ast.Attribute) -> None:
+        self.generic_visit(node)
+        if isinstance(node.ctx, ast.Load):
+            self._add(node.attr, "reference", node, self._qualname())
+
+
+def extract_symbols(content: str, module: str = "",
+                    is_package: bool = False) -> List[Tuple[str, str, str, int, int]]:
+    """Definições, imports e referências de um arquivo Python."""
+    collector = _SymbolCollector(module, is_package)
+    collector.visit(ast.parse(content))
+    return collector.symbols
+
+
+def _index_batch(root: str, batch: List[Tuple[str, Optional[str]]]) -> List[Dict[str, Any]]:
+    """Tarefa de um worker: símbolos dos arquivos cujo hash mudou (``None`` se não mudou)."""
+    entries = []
+    for relative_path, known_hash in batch:
+        path = os.path.join(root, relative_path)
+        try:
+            stat = os.stat(path)
+            with open(path, "rb") as f:
+                data = f.read()
+        except OSError:
+            continue
+        entry = {"path": relative_path, "mtime_ns": stat.st_mtime_ns, "size": stat.st_size,
+                 "hash": content_hash(data), "symbols": None}
+        if entry["hash"] != known_hash:
+            try:
+                entry["symbols"] = extract_symbols(
+                    data.decode("utf-8"), module_name(relative_path),
+                    os.path.basename(relative_path) == "__init__.py"
+                )
+            except (SyntaxError, UnicodeDecodeError, ValueError):
+                # Arquivo inválido fica indexado sem símbolos até ser corrigido
+                entry["symbols"] = []
+        entries.append(entry)
+    return entries
+
+
+class SymbolIndex:
+    """Índice de símbolos em SQLite, atualizado por projeto sob demanda.
+
+    A conexão com o banco só é aberta no primeiro uso.
+    """
+
+    def __init__(self, db_path: Optional[str] = None, analyzer: Optional[ProjectAnalyzer] = None):
+        self._db_path = db_path
+        self._analyzer = analyzer
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self.has_fts = False
+
+    @property
+    def db_path(self) -> str:
+        if self._db_path is None:
+            from app.config.settings import get_storage_path
+
+            self._db_path = get_storage_path(DEFAULT_SYMBOLS_DB)
+        return self._db_path
+
+    @property
+    def analyzer(self) -> ProjectAnalyzer:
+        if self._analyzer is None:
+            self._analyzer = get_project_analyzer()
+        return self._analyzer
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            conn.executescript(
+                "CREATE TABLE IF NOT EXISTS symbol_files ("
+                " project TEXT NOT NULL,"
+                " path TEXT NOT NULL,"
+                " mtime_ns INTEGER NOT NULL,"
+                " size INTEGER NOT NULL,"
+                " hash TEXT NOT NULL,"
+                " PRIMARY KEY (project, path));"
+                "CREATE TABLE IF NOT EXISTS symbols ("
+                " id INTEGER PRIMARY KEY,"
+                " project TEXT NOT NULL,"
+                " path TEXT NOT NULL,"
+                " name TEXT NOT NULL,"
+                " qualname TEXT NOT NULL,"
+                " kind TEXT NOT NULL,"
+                " line INTEGER NOT NULL,"
+                " col INTEGER NOT NULL);"
+                "CREATE INDEX IF NOT EXISTS symbols_by_name ON symbols (project, name);"
+                "CREATE INDEX IF NOT EXISTS symbols_by_path ON symbols (project, path);"
+            )
+            try:
+                # Referências ficam só no índice por nome exato (são a maioria das linhas)
+                conn.executescript(
+                    "CREATE VIRTUAL TABLE IF NOT EXISTS symbols_fts USING fts5("
+                    " name, qualname, content='symbols', content_rowid='id');"
+                    "CREATE TRIGGER IF NOT EXISTS symbols_fts_insert AFTER INSERT ON symbols"
+                    " WHEN new.kind != 'reference' BEGIN"
+                    "  INSERT INTO symbols_fts (rowid, name, qualname) VALUES (new.id, new.name, new.qualname);"
+                    " END;"
+                    "CREATE TRIGGER IF NOT EXISTS symbols_fts_delete AFTER DELETE ON symbols"
+                    " WHEN old.kind != 'reference' BEGIN"
+                    "  INSERT INTO symbols_fts (symbols_fts, rowid, name, qualname)"
+                    "  VALUES ('delete', old.id, old.name, old.qualname);"
+                    " END;"
+                )
+                self.has_fts = True
+            except sqlite3.OperationalError:
+                # SQLite compilado sem FTS5
+                self.has_fts = False
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def update(self, root: str) -> Dict[str, int]:
+        """Sincroniza o índice com os arquivos de ``root``; retorna as contagens."""
+        project = os.path.abspath(root)
+        with self._lock:
+            known = {
+                path: (mtime_ns, size, file_hash)
+                for path, mtime_ns, size, file_hash in self._connection().execute(
+                    "SELECT path, mtime_ns, size, hash FROM symbol_files WHERE project = ?", (project,)
+                )
+            }
+
+        pending = []
+        present = set()
+        for relative_path in discover_python_files(root):
+            try:
+                stat = os.stat(os.path.join(root, relative_path))
+            except OSError:
+                continue
+            present.add(relative_path)
+            previous = known.get(relative_path)
+            if previous is None or previous[:2] != (stat.st_mtime_ns, stat.st_size):
+                pending.append((relative_path, previous[2] if previous else None))
+
+        entries = self.analyzer.run(root, pending, task=_index_batch) if pending else []
+        removed = [path for path in known if path not in present]
+        indexed = sum(1 for entry in entries if entry["symbols"] is not None)
+
+        if entries or removed:
+            with self._lock:
+                conn = self._connection()
+                with conn:
+                    for path in removed:
+                        conn.execute("DELETE FROM symbols WHERE project = ? AND path = ?", (project, path))
+                        conn.execute("DELETE FROM symbol_files WHERE project = ? AND path = ?", (project, path))
+                    for entry in entries:
+                        conn.execute(
+                            "INSERT OR REPLACE INTO symbol_files (project, path, mtime_ns, size, hash)"
+                            " VALUES (?, ?, ?, ?, ?)",
+                            (project, entry["path"], entry["mtime_ns"], entry["size"], entry["hash"])
+                        )
+                        if entry["symbols"] is None:
+                            continue
+                        conn.execute("DELETE FROM symbols WHERE project = ? AND path = ?",
+                                     (project, entry["path"]))
+                        conn.executemany(
+                            "INSERT INTO symbols (project, path, name, qualname, kind, line, col)"
+                            " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                            [(project, entry["path"], *symbol) for symbol in entry["symbols"]]
+                        )
+
+        return {"indexed": indexed, "unchanged": len(present) - indexed, "removed": len(removed)}
+
+    def _fts_query(self, text: str) -> str:
+        # Cada termo vira um prefixo entre aspas: "preco"* AND "final"*
+        return " AND ".join(f'"{term}"*' for term in _FTS_TERM.findall(text))
+
+    def lookup(self, root: str, name: str, kinds: Optional[List[str]] = None,
+               limit: int = DEFAULT_LOOKUP_LIMIT) -> Dict[str, Any]:
+        """Símbolos de ``root`` com esse nome: ``symbols`` (até ``limit`` por tipo) e ``totals``.
+
+        Procura primeiro o nome exato (ou ``Classe.metodo``, pelo final do nome
+        qualificado). Sem resultado, ou com ``*`` no nome, busca definições e
+        imports por prefixo de cada termo.
+        """
+        project = os.path.abspath(root)
+        kinds = [kind for kind in (kinds or SYMBOL_KINDS) if kind in SYMBOL_KINDS]
+        exact = name.strip().rstrip("*")
+        fuzzy_kinds = [kind for kind in kinds if kind != "reference"]
+
+        with self._lock:
+            conn = self._connection()
+            queries = []
+            if kinds and "*" not in name:
+                # Definições e imports pelo final do nome qualificado; "Classe.metodo"
+                # não casa com métodos homônimos de outras classes
+                definition = "(kind != 'reference' AND (qualname = ? OR qualname LIKE ? ESCAPE '\\'))"
+                params = [exact, f"%.{_like_escape(exact)}"]
+                if "." in exact:
+                    # Referências guardam só o último nome
+                    condition = f"((kind = 'reference' AND name = ?) OR {definition})"
+                else:
+                    condition = f"(name = ? OR {definition})"
+                queries.append((condition, kinds, [exact.rpartition(".")[2], *params]))
+            if fuzzy_kinds and _FTS_TERM.search(exact):
+                if self.has_fts:
+                    queries.append(("id IN (SELECT rowid FROM symbols_fts WHERE symbols_fts MATCH ?)",
+                                    fuzzy_kinds, [self._fts_query(exact)]))
+                else:
+                    queries.append(("qualname LIKE ? ESCAPE '\\'", fuzzy_kinds, [f"%{_like_escape(exact)}%"]))
+
+            rows = []
+            for condition, query_kinds, params in queries:
+                rows = conn.execute(
+                    "SELECT name, qualname, kind, path, line, col, total FROM ("
+                    " SELECT *, ROW_NUMBER() OVER (PARTITION BY kind ORDER BY path, line, col) AS position,"
+                    " COUNT(*) OVER (PARTITION BY kind) AS total"
+                    f" FROM symbols WHERE project = ? AND kind IN ({', '.join('?' for _ in query_kinds)})"
+                    f" AND {condition}"
+                    ") WHERE position <= ? ORDER BY path, line, col",
+                    [project, *query_kinds, *params, limit]
+                ).fetchall()
+                if rows:
+                    break
+
+        order = {kind: position for position, kind in enumerate(SYMBOL_KINDS)}
+        symbols = sorted(
+            ({"name": row[0], "qualname": row[1], "kind": row[2], "path": row[3], "line": row[4], "col": row[5]}
+             for row in rows),
+            key=lambda symbol: order[symbol["kind"]]
+        )
+        totals = {kind: total for _, _, kind, _, _, _, total in rows}
+        return {"symbols": symbols, "totals": dict(sorted(totals.items(), key=lambda item: order[item[0]]))}
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+_index: Optional[SymbolIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_symbol_index() -> SymbolIndex:
+    """Índice compartilhado pelo processo (criado no primeiro uso)."""
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = SymbolIndex()
+        return _index
@@ -7,6 +7,31 @@ import pytest
 import pandas as pd
 import tempfile
 import os
+import sys
+
+# Singletons que guardam o diretório de storage resolvido no primeiro uso
+STORAGE_SINGLETONS = (
+    ("app.tools.summaries", "_store"),
+    ("app.tools.dataset_store", "_store"),
+    ("app.tools.artifacts", "_store"),
+    ("app.tools.code_analysis", "_analyzer"),
+    ("app.tools.symbol_index", "_index"),
+    ("app.tools.style_check", "_checker"),
+    ("app.tools.charts", "_renderer"),
+)
+
+
+@pytest.fixture(autouse=True)
+def isolated_storage(tmp_path, monkeypatch):
+    """Storage em diretório temporário: os testes não gravam nem leem o storage/ do repositório"""
+    storage_dir = tmp_path / "storage"
+    monkeypatch.setenv("STORAGE_DIR", str(storage_dir))
+    # Módulos ainda não importados criam o singleton já com o STORAGE_DIR acima
+    for module_name, attribute in STORAGE_SINGLETONS:
+        module = sys.modules.get(module_name)
+        if module is not None:
+            monkeypatch.setattr(module, attribute, None)
+    return storage_dir
 
 
 @pytest.fixture
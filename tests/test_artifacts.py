@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Testes do armazenamento de artefatos e do endpoint que os serve
+"""
+
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+# Adicionar o diretório raiz ao path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.tools import artifacts, charts
+from app.tools.artifacts import ArtifactStore, artifact_url
+
+PNG_BYTES = b"\x89PNG\r\n\x1a\n" + b"conteudo"
+
+
+@pytest.fixture
+def store(tmp_path):
+    """Store de artefatos em um diretório temporário"""
+    return ArtifactStore(str(tmp_path / "artifacts"))
+
+
+class TestArtifactStore:
+    """Testes do store em sistema de arquivos"""
+
+    def test_content_addressed_ids(self, store):
+        """Testa se o mesmo conteúdo gera o mesmo ID e pode ser lido de volta"""
+        artifact_id = store.put(PNG_BYTES)
+
+        assert store.is_artifact_id(artifact_id)
+        assert store.put(PNG_BYTES) == artifact_id
+        assert store.put(PNG_BYTES + b"x") != artifact_id
+        assert store.get(artifact_id) == PNG_BYTES
+        assert store.content_type(artifact_id) == "image/png"
+
+    def test_rejects_invalid_ids(self, store):
+        """Testa se IDs fora do formato (ex.: path traversal) são recusados"""
+        assert store.get("../../etc/passwd") is None
+        assert store.exists("art_../agents.db") is False
+        with pytest.raises(ValueError):
+            store.path_for("art_123.png")
+
+    def test_artifact_url(self, monkeypatch):
+        """Testa a URL relativa e com base configurada"""
+        monkeypatch.delenv("ARTIFACTS_BASE_URL", raising=False)
+        assert artifact_url("art_x.png") == "/v1/artifacts/art_x.png"
+        monkeypatch.setenv("ARTIFACTS_BASE_URL", "http://localhost:7777/")
+        assert artifact_url("art_x.png") == "http://localhost:7777/v1/artifacts/art_x.png"
+
+
+class TestArtifactsEndpoint:
+    """Testes do endpoint GET /v1/artifacts/{id}"""
+
+    @pytest.fixture
+    def client(self, store):
+        pytest.importorskip("httpx")
+        from fastapi import FastAPI
+        from fastapi.testclient import TestClient
+
+        from app.backend.artifacts_api import create_artifacts_router
+
+        app = FastAPI()
+        app.include_router(create_artifacts_router(store))
+        return TestClient(app)
+
+    def test_serves_bytes_with_cache_headers(self, client, store):
+        """Testa bytes, content-type e cabeçalhos de cache"""
+        artifact_id = store.put(PNG_BYTES)
+        response = client.get(f"/v1/artifacts/{artifact_id}")
+
+        assert response.status_code == 200
+        assert response.content == PNG_BYTES
+        assert response.headers["content-type"] == "image/png"
+        assert "immutable" in response.headers["cache-control"]
+        assert response.headers["etag"] == f'"{artifact_id}"'
+
+    def test_conditional_request(self, client, store):
+        """Testa 304 para If-None-Match com o ETag do artefato"""
+        artifact_id = store.put(PNG_BYTES)
+        response = client.get(f"/v1/artifacts/{artifact_id}", headers={"If-None-Match": f'"{artifact_id}"'})
+
+        assert response.status_code == 304
+        assert response.content == b""
+
+    def test_not_found(self, client):
+        """Testa 404 para IDs desconhecidos ou inválidos"""
+        assert client.get("/v1/artifacts/art_" + "0" * 32 + ".png").status_code == 404
+        assert client.get("/v1/artifacts/nao_existe").status_code == 404
+
+
+class TestChartArtifacts:
+    """Testes das ferramentas de visualização com artefatos"""
+
+    def test_visualization_returns_short_url(self, store, monkeypatch):
+        """Testa se o gráfico vira um artefato e a ferramenta retorna só a URL"""
+        from app.tools.data_tools import DataAnalysisTools
+
+        monkeypatch.delenv("ARTIFACTS_BASE_URL", raising=False)
+        monkeypatch.setattr(artifacts, "_store", store)
+        monkeypatch.setattr(charts, "_renderer", charts.ChartRenderer(max_workers=0))
+
+        url = DataAnalysisTools().create_visualization([1, 4, 2, 8], "line")
+        artifact_id = url.rsplit("/", 1)[-1]
+
+        assert url == f"/v1/artifacts/{artifact_id}"
+        assert len(url) < 80
+        assert store.get(artifact_id).startswith(b"\x89PNG")
+
+
+class TestFrontendArtifacts:
+    """Testes da busca de artefatos pelo frontend"""
+
+    def test_extract_and_fetch(self, store):
+        """Testa a extração de IDs do texto e o download do backend"""
+        from app.frontend.artifacts_client import extract_artifact_ids, fetch_artifact
+
+        artifact_id = store.put(PNG_BYTES)
+        text = f"Veja ![Gráfico](/v1/artifacts/{artifact_id}) e de novo http://x/v1/artifacts/{artifact_id}"
+        assert extract_artifact_ids(text) == [artifact_id]
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                data = store.get(self.path.rsplit("/", 1)[-1])
+                self.send_response(200 if data else 404)
+                self.send_header("Content-Length", str(len(data or b"")))
+                self.end_headers()
+                self.wfile.write(data or b"")
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True).start()
+        try:
+            backend = f"http://127.0.0.1:{server.server_address[1]}"
+            assert fetch_artifact(backend, artifact_id) == PNG_BYTES
+            assert fetch_artifact(backend, "art_" + "f" * 32 + ".png") is None
+        finally:
+            server.shutdown()
+            server.server_close()
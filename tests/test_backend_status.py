@@ -17,7 +17,7 @@ BACKEND_URL = "http://localhost:7777"
 
 
 @pytest.fixture(scope="module")
-def backend_server():
+def backend_server(tmp_path_factory):
     """Fixture que inicia o backend para os testes"""
     # Caminho para o script do backend
     backend_script = Path(__file__).parent.parent / "app" / "backend" / "agno_teams_playground.py"
@@ -37,6 +37,8 @@ def backend_server():
     
     # Iniciar o backend
     env = os.environ.copy()
+    # Bancos do backend fora do storage/ do repositório
+    env["STORAGE_DIR"] = str(tmp_path_factory.mktemp("storage"))
     process = subprocess.Popen(
         ["python", str(backend_script)],
         stdout=subprocess.PIPE,
@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""
+Testes do serviço de renderização de gráficos
+"""
+
+import base64
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Adicionar o diretório raiz ao path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.tools import charts
+from app.tools.artifacts import ArtifactStore
+from app.tools.chart_cache import ChartCache, chart_key
+from app.tools.downsampling import lttb_indices
+from app.tools.charts import (
+    ChartRenderer,
+    ChartSpecError,
+    advanced_chart_spec,
+    render_spec,
+    simple_chart_spec,
+)
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+
+@pytest.fixture
+def chart_df():
+    """DataFrame com colunas numéricas e categóricas"""
+    rng = np.random.default_rng(5)
+    return pd.DataFrame({
+        "x": np.arange(200),
+        "y": rng.normal(size=200).cumsum(),
+        "z": rng.normal(size=200),
+        "grupo": rng.choice(["A", "B", "C"], 200),
+    })
+
+
+@pytest.fixture(scope="module")
+def big_df():
+    """DataFrame com 1 milhão de linhas (acima do orçamento de pontos)"""
+    rng = np.random.default_rng(11)
+    n = 1_000_000
+    return pd.DataFrame({
+        "t": np.arange(n),
+        "v": rng.normal(size=n).cumsum(),
+        "w": rng.normal(size=n),
+    })
+
+
+@pytest.fixture(scope="module")
+def process_renderer():
+    """Pool com dois workers compartilhado pelos testes do módulo"""
+    renderer = ChartRenderer(max_workers=2)
+    yield renderer
+    renderer.shutdown()
+
+
+class TestChartSpecs:
+    """Testes da validação e montagem das especificações"""
+
+    def test_simple_spec_errors(self):
+        """Testa as mensagens de erro de create_visualization"""
+        with pytest.raises(ChartSpecError, match="Formato de dados"):
+            simple_chart_spec("texto")
+        with pytest.raises(ChartSpecError, match="Não há dados"):
+            simple_chart_spec([])
+
+    def test_advanced_spec_keeps_only_used_columns(self, chart_df):
+        """Testa se só as colunas necessárias vão para o worker"""
+        spec = advanced_chart_spec(chart_df, "x", "y", "scatter")
+        assert list(spec["frame"].columns) == ["x", "y"]
+
+        with pytest.raises(ChartSpecError, match="não suportado"):
+            advanced_chart_spec(chart_df, "x", None, "pizza")
+        with pytest.raises(ChartSpecError, match="Colunas não encontradas"):
+            advanced_chart_spec(chart_df, "x", "nao_existe", "line")
+
+    @pytest.mark.parametrize("chart_type,y_col", [
+        ("correlation", None), ("distribution", None), ("scatter", "y"),
+        ("line", "y"), ("box", "grupo"), ("box", None),
+    ])
+    def test_render_all_chart_types(self, chart_df, chart_type, y_col):
+        """Testa a renderização de todos os tipos avançados"""
+        x_col = "y" if chart_type == "box" else "x"
+        png = render_spec(advanced_chart_spec(chart_df, x_col, y_col, chart_type))
+        assert png.startswith(PNG_SIGNATURE)
+
+
+class TestChartRenderer:
+    """Testes do pool de renderização"""
+
+    def test_concurrent_renders_match_inprocess(self, chart_df, process_renderer):
+        """Testa se renderizações simultâneas não se misturam"""
+        specs = [
+            simple_chart_spec([1, 3, 2, 5], "line"),
+            simple_chart_spec({"a": 1, "b": 2}, "bar"),
+            advanced_chart_spec(chart_df, "x", "y", "scatter"),
+            advanced_chart_spec(chart_df, "z", None, "distribution"),
+        ] * 2
+        expected = [render_spec(spec) for spec in specs]
+
+        with ThreadPoolExecutor(max_workers=len(specs)) as executor:
+            results = list(executor.map(process_renderer.render, specs))
+
+        assert results == expected
+
+    def test_inprocess_fallback(self):
+        """Testa o modo sem pool (max_workers=0)"""
+        png = ChartRenderer(max_workers=0).render(simple_chart_spec([1, 2, 3]))
+        assert png.startswith(PNG_SIGNATURE)
+
+    def test_tools_return_data_url(self, chart_df, monkeypatch):
+        """Testa o retorno inline (data URL) e as mensagens de erro das ferramentas"""
+        from app.tools.data_tools import DataAnalysisTools
+
+        monkeypatch.setattr(charts, "_renderer", ChartRenderer(max_workers=0))
+        tools = DataAnalysisTools()
+
+        url = tools.create_advanced_visualization(chart_df, "x", "y", "line", inline=True)
+        assert url.startswith("data:image/png;base64,")
+        assert base64.b64decode(url.split(",", 1)[1]).startswith(PNG_SIGNATURE)
+        assert tools.create_visualization([]) == "❌ Não há dados para visualizar."
+        assert tools.create_advanced_visualization(chart_df, "nao_existe", None, "box").startswith("❌ Coluna")
+
+
+class TestChartCache:
+    """Testes do cache de gráficos endereçado por conteúdo"""
+
+    def test_key_depends_on_content(self, chart_df):
+        """Testa se a chave muda com dados, título e colunas, e só com eles"""
+        base = chart_key(advanced_chart_spec(chart_df, "x", "y", "line"))
+
+        assert chart_key(advanced_chart_spec(chart_df.copy(), "x", "y", "line")) == base
+        assert chart_key(advanced_chart_spec(chart_df, "x", "y", "line", title="Outro")) != base
+        assert chart_key(advanced_chart_spec(chart_df, "x", "z", "line")) != base
+        changed = chart_df.copy()
+        changed.loc[0, "y"] += 1
+        assert chart_key(advanced_chart_spec(changed, "x", "y", "line")) != base
+
+    def test_repeat_skips_rendering(self, chart_df, tmp_path, monkeypatch):
+        """Testa se o mesmo gráfico não é renderizado duas vezes"""
+        calls = []
+        original = charts.render_spec
+
+        def counting_render(spec):
+            calls.append(spec["chart_type"])
+            return original(spec)
+
+        monkeypatch.setattr(charts, "render_spec", counting_render)
+        renderer = ChartRenderer(max_workers=0, cache=ChartCache(directory=str(tmp_path)))
+
+        first = renderer.render(advanced_chart_spec(chart_df, "x", "y", "scatter"))
+        second = renderer.render(advanced_chart_spec(chart_df, "x", "y", "scatter"))
+
+        assert first == second
+        assert calls == ["scatter"]
+        assert renderer.cache.stats["memory_hits"] == 1
+
+    def test_disk_store_survives_restart(self, tmp_path):
+        """Testa se outro cache no mesmo diretório reaproveita o PNG do disco"""
+        ChartCache(directory=str(tmp_path)).put("ab" * 16, PNG_SIGNATURE + b"dados")
+
+        cache = ChartCache(directory=str(tmp_path))
+        assert cache.get("ab" * 16) == PNG_SIGNATURE + b"dados"
+        assert cache.stats["disk_hits"] == 1
+
+    def test_png_stored_once_in_artifacts(self, tmp_path):
+        """Testa se o PNG fica só no store de artefatos e o índice guarda apenas o ID"""
+        store = ArtifactStore(str(tmp_path / "artifacts"))
+        cache = ChartCache(directory=str(tmp_path / "charts"), store=store)
+        png = PNG_SIGNATURE + b"dados" * 100
+
+        artifact_id = cache.put("cd" * 16, png)
+
+        assert store.get(artifact_id) == png
+        assert cache.artifact_id("cd" * 16) == artifact_id
+        index_files = [p for p in (tmp_path / "charts").rglob("*") if p.is_file()]
+        assert len(index_files) == 1
+        assert index_files[0].read_text() == artifact_id
+        # Publicar o mesmo PNG não grava outro arquivo
+        assert store.put(png) == artifact_id
+        assert len([p for p in (tmp_path / "artifacts").rglob("*") if p.is_file()]) == 1
+
+    def test_memory_lru_is_bounded(self, tmp_path):
+        """Testa o descarte LRU por bytes na memória"""
+        cache = ChartCache(max_memory_bytes=250, directory=str(tmp_path))
+        for i in range(3):
+            cache.put(f"{i:02d}" * 16, bytes(100))
+
+        assert cache.current_bytes <= 250
+        assert len(cache._memory) == 2
+        # O mais antigo continua disponível em disco
+        assert cache.get("00" * 16) == bytes(100)
+
+
+class TestDownsampling:
+    """Testes da redução de séries grandes antes da plotagem"""
+
+    def test_lttb_keeps_endpoints_and_peaks(self):
+        """Testa se o LTTB mantém extremos e um pico isolado"""
+        x = np.arange(10_000, dtype=float)
+        y = np.sin(x / 500)
+        y[4321] = 50.0
+
+        indices = lttb_indices(x, y, 300)
+
+        assert len(indices) == 300
+        assert indices[0] == 0 and indices[-1] == len(x) - 1
+        assert np.all(np.diff(indices) > 0)
+        assert 4321 in indices
+        assert len(lttb_indices(x[:100], y[:100], 300)) == 100
+
+    def test_specs_respect_point_budget(self, big_df):
+        """Testa se line/scatter/distribution grandes viram dados de tamanho fixo"""
+        line = advanced_chart_spec(big_df, "t", "v", "line", max_points=2_000)
+        assert len(line["frame"]) == 2_000
+        assert line["reduction"] == {"method": "lttb", "points": len(big_df), "max_points": 2_000}
+
+        scatter = advanced_chart_spec(big_df, "v", "w", "scatter", max_points=2_000)
+        assert scatter["frame"] is None
+        assert scatter["density"]["counts"].sum() == len(big_df)
+
+        dist = advanced_chart_spec(big_df, "w", None, "distribution", max_points=2_000)
+        assert dist["histogram"]["counts"].sum() == len(big_df)
+
+        small = advanced_chart_spec(big_df.head(100), "t", "v", "line", max_points=2_000)
+        assert "reduction" not in small and len(small["frame"]) == 100
+
+    def test_simple_spec_reduction(self):
+        """Testa a redução em create_visualization (lista de valores)"""
+        values = list(np.random.default_rng(3).normal(size=50_000))
+
+        line = simple_chart_spec(values, "line", max_points=500)
+        assert len(line["x"]) == len(line["y"]) == 500
+        hist = simple_chart_spec(values, "histogram", max_points=500)
+        assert hist["histogram"]["counts"].sum() == 50_000
+        assert simple_chart_spec(values, "bar", max_points=500).get("reduction") is None
+
+    def test_reduced_charts_render(self, big_df):
+        """Testa se os gráficos reduzidos renderizam e têm chaves distintas"""
+        specs = [
+            advanced_chart_spec(big_df, "t", "v", "line"),
+            advanced_chart_spec(big_df, "v", "w", "scatter"),
+            advanced_chart_spec(big_df, "w", None, "distribution"),
+            simple_chart_spec(big_df["w"].tolist()[:20_000], "scatter"),
+        ]
+        for spec in specs:
+            assert render_spec(spec).startswith(PNG_SIGNATURE)
+
+        assert len({chart_key(spec) for spec in specs}) == len(specs)
+        assert chart_key(advanced_chart_spec(big_df, "t", "v", "line", max_points=1_000)) != chart_key(specs[0])
@@ -0,0 +1,515 @@
+#!/usr/bin/env python3
+"""
+Testes das ferramentas de análise de código
+"""
+
+import ast
+import os
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+# Adicionar o diretório raiz ao path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.tools import code_analysis, style_check
+from app.tools.code_analysis import AnalysisCache, ProjectAnalyzer, discover_python_files
+from app.tools.code_tools import CodeAnalysisTools
+from app.tools.style_check import StyleCache, StyleChecker, find_flake8_config, parse_issues
+from app.tools.symbol_index import SymbolIndex, extract_symbols
+
+PROJECT_FILES = {
+    "loja/__init__.py": "from .modelos import Produto\n",
+    "loja/modelos.py": (
+        "import dataclasses\n"
+        "\n"
+        "class Produto:\n"
+        "    def preco_final(self):\n"
+        "        return 0\n"
+    ),
+    "loja/servicos/__init__.py": "",
+    "loja/servicos/vendas.py": (
+        "import os\n"
+        "from ..modelos import Produto\n"
+        "from loja import servicos\n"
+        "from . import estoque\n"
+        "\n"
+        "def vender(produto):\n"
+        "    return estoque.baixar(produto)\n"
+    ),
+    "loja/servicos/estoque.py": "import pandas as pd\n\ndef baixar(produto):\n    return produto\n",
+    "scripts/rodar.py": "from loja.servicos.vendas import vender\n",
+    "quebrado.py": "def x(:\n",
+    ".venv/lib/ignorado.py": "import os\n",
+    "loja/__pycache__/modelos.py": "import os\n",
+}
+
+
+def write_project(root: Path, files: dict) -> None:
+    for relative_path, content in files.items():
+        path = root / relative_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content, encoding="utf-8")
+
+
+def _hanging_batch(root, batch):
+    """Lote que não termina dentro do tempo limite (roda nos workers do pool)"""
+    import time
+
+    Path(root, "worker.pid").write_text(str(os.getpid()))
+    time.sleep(60)
+    return []
+
+
+@pytest.fixture
+def project(tmp_path):
+    root = tmp_path / "projeto"
+    write_project(root, PROJECT_FILES)
+    return root
+
+
+@pytest.fixture
+def tools(tmp_path):
+    analyzer = ProjectAnalyzer(max_workers=0, cache=AnalysisCache(str(tmp_path / "cache")))
+    symbol_index = SymbolIndex(str(tmp_path / "symbols.db"), analyzer)
+    style_checker = StyleChecker(max_workers=2, cache=StyleCache(str(tmp_path / "style")))
+    yield CodeAnalysisTools(analyzer=analyzer, symbol_index=symbol_index, style_checker=style_checker)
+    symbol_index.close()
+
+
+class TestAnalyzeProject:
+    """Testes de analyze_python_project"""
+
+    def test_discovery_skips_virtualenvs_and_caches(self, project):
+        """Testa se .venv e __pycache__ ficam de fora"""
+        files = discover_python_files(str(project))
+        assert os.path.join(".venv", "lib", "ignorado.py") not in files
+        assert os.path.join("loja", "__pycache__", "modelos.py") not in files
+        assert len(files) == 7
+
+    def test_aggregated_summary(self, tools, project):
+        """Testa totais, módulos, grafo de imports e erros de sintaxe"""
+        result = tools.analyze_python_project(str(project))
+
+        assert result["summary"]["files"] == 7
+        assert result["summary"]["classes"] == 1
+        assert result["summary"]["functions"] == 2
+        assert result["summary"]["methods"] == 1
+        assert result["modules"]["loja.modelos"]["classes"] == ["Produto"]
+        assert result["modules"]["loja.modelos"]["methods"] == ["Produto.preco_final"]
+        assert result["import_graph"]["loja"] == ["loja.modelos"]
+        assert result["import_graph"]["loja.servicos.vendas"] == [
+            "loja.modelos", "loja.servicos", "loja.servicos.estoque"
+        ]
+        assert result["import_graph"]["scripts.rodar"] == ["loja.servicos.vendas"]
+        assert result["most_imported"]["loja.modelos"] == 2
+        assert set(result["external_imports"]) == {"dataclasses", "os", "pandas"}
+        assert list(result["errors"]) == ["quebrado.py"]
+
+    def test_matches_single_file_analysis(self, tools, project):
+        """Testa se o projeto e analyze_python_file concordam por arquivo"""
+        module = tools.analyze_python_project(str(project))["modules"]["loja.servicos.vendas"]
+        single = tools.analyze_python_file(str(project / "loja" / "servicos" / "vendas.py"))
+
+        assert module["functions"] == single["functions"]
+        assert module["lines_of_code"] == single["lines_of_code"]
+        assert single["imports"] == ["os", "modelos.Produto", "loja.servicos", ".estoque"]
+
+    def test_reanalysis_only_touches_changed_files(self, tools, project, monkeypatch):
+        """Testa o cache por arquivo (mtime/tamanho e hash do conteúdo)"""
+        assert tools.analyze_python_project(str(project))["cache"] == {"analyzed": 7, "reused": 0}
+
+        parsed = []
+        original = code_analysis.analyze_source
+
+        def counting_analyze_source(content, module="", is_package=False):
+            parsed.append(module)
+            return original(content, module, is_package)
+
+        monkeypatch.setattr(code_analysis, "analyze_source", counting_analyze_source)
+        assert tools.analyze_python_project(str(project))["cache"] == {"analyzed": 0, "reused": 7}
+
+        # Conteúdo alterado: só esse arquivo é analisado de novo
+        estoque = project / "loja" / "servicos" / "estoque.py"
+        estoque.write_text(estoque.read_text() + "\nclass Lote:\n    pass\n", encoding="utf-8")
+        # Só o mtime mudou: o hash evita a nova análise
+        modelos = project / "loja" / "modelos.py"
+        stat = modelos.stat()
+        os.utime(modelos, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+        result = tools.analyze_python_project(str(project))
+        assert parsed == ["loja.servicos.estoque"]
+        assert result["cache"] == {"analyzed": 1, "reused": 6}
+        assert result["summary"]["classes"] == 2
+
+        # Arquivo removido some do resumo
+        (project / "scripts" / "rodar.py").unlink()
+        assert "scripts.rodar" not in tools.analyze_python_project(str(project))["modules"]
+
+    def test_process_pool_matches_in_process(self, tmp_path, project):
+        """Testa o pool de processos com um projeto acima do limite de uso do pool"""
+        write_project(project, {f"gerado/mod_{i}.py": f"def f_{i}():\n    pass\n" for i in range(40)})
+        pooled = ProjectAnalyzer(max_workers=2, cache=AnalysisCache(str(tmp_path / "pool")))
+        local = ProjectAnalyzer(max_workers=0, cache=AnalysisCache(str(tmp_path / "local")))
+        try:
+            result = pooled.analyze(str(project))
+        finally:
+            pooled.shutdown()
+
+        assert result == local.analyze(str(project))
+        assert result["summary"]["functions"] == 42
+
+    def test_pool_timeout_discards_pool(self, tmp_path):
+        """Testa se lotes presos levantam TimeoutError e encerram os workers"""
+        import multiprocessing
+        import time
+
+        analyzer = ProjectAnalyzer(max_workers=1, timeout=5, cache=AnalysisCache(str(tmp_path / "pool")))
+        pending = [(f"mod_{i}.py", None) for i in range(code_analysis.MIN_FILES_FOR_POOL)]
+        started = time.monotonic()
+
+        with pytest.raises(TimeoutError, match="Tempo limite"):
+            analyzer.run(str(tmp_path), pending, task=_hanging_batch)
+
+        assert time.monotonic() - started < 30
+        assert analyzer._executor is None
+        worker_pid = int((tmp_path / "worker.pid").read_text())
+        deadline = time.monotonic() + 10
+        while any(p.pid == worker_pid for p in multiprocessing.active_children()) and time.monotonic() < deadline:
+            time.sleep(0.1)
+        assert all(p.pid != worker_pid for p in multiprocessing.active_children())
+
+    def test_invalid_directory(self, tools, tmp_path):
+        """Testa a mensagem de erro para diretório inexistente"""
+        assert "error" in tools.analyze_python_project(str(tmp_path / "nao_existe"))
+
+
+COMPLEX_SOURCE = """
+import asyncio
+
+async def baixar_tudo(urls, tentativas):
+    for url in urls:
+        for tentativa in range(tentativas):
+            if url and tentativa or not urls:
+                try:
+                    await asyncio.sleep(0)
+                except ValueError:
+                    continue
+            elif tentativa > 2:
+                break
+    return [u for u in urls if u]
+
+class Cliente:
+    def get(self, url):
+        def montar():
+            return url if url else "/"
+        return montar()
+"""
+
+
+class TestFileMetrics:
+    """Testes das métricas da passada única de analyze_python_file"""
+
+    def test_functions_methods_and_metrics(self, tools, tmp_path):
+        """Testa async, métodos separados, complexidade, aninhamento e tamanho"""
+        source = tmp_path / "cliente.py"
+        source.write_text(COMPLEX_SOURCE, encoding="utf-8")
+        result = tools.analyze_python_file(str(source))
+
+        assert result["functions"] == ["baixar_tudo", "Cliente.get.montar"]
+        assert result["methods"] == ["Cliente.get"]
+        metrics = {item["name"]: item for item in result["function_metrics"]}
+
+        baixar = metrics["baixar_tudo"]
+        assert baixar["async"] is True and baixar["kind"] == "function"
+        # 1 + for + for + if + (and, or) + except + elif + compreensão (for + if)
+        assert baixar["complexity"] == 10
+        assert baixar["max_nesting"] == 4
+        assert baixar["lines"] == 11
+
+        # A função interna tem métricas próprias e não soma no método
+        assert metrics["Cliente.get"]["complexity"] == 1
+        assert metrics["Cliente.get.montar"]["complexity"] == 2
+        assert result["complexity"] == {"average": 4.33, "max": 10}
+
+    def test_hot_spots(self, tools, tmp_path):
+        """Testa laços aninhados e funções acima dos limites"""
+        source = tmp_path / "cliente.py"
+        source.write_text(COMPLEX_SOURCE, encoding="utf-8")
+        result = tools.analyze_python_file(str(source))
+        spots = {(spot["kind"], spot["function"]): spot for spot in result["hot_spots"]}
+
+        assert spots[("nested_loop", "baixar_tudo")]["line"] == 6
+        assert spots[("nested_loop", "baixar_tudo")]["value"] == 2
+        assert spots[("high_complexity", "baixar_tudo")]["value"] == 10
+        assert spots[("deep_nesting", "baixar_tudo")]["value"] == 4
+        assert ("nested_loop", "Cliente.get") not in spots
+
+    def test_project_hot_spots(self, tools, project):
+        """Testa hot spots e complexidade no resumo do projeto"""
+        (project / "loja" / "cliente.py").write_text(COMPLEX_SOURCE, encoding="utf-8")
+        result = tools.analyze_python_project(str(project))
+
+        assert result["summary"]["max_complexity"] == 10
+        assert result["hot_spots"][0] == {
+            "path": "loja/cliente.py", "kind": "high_complexity", "function": "baixar_tudo", "line": 4, "value": 10
+        }
+        assert result["modules"]["loja.cliente"]["max_complexity"] == 10
+
+
+class TestSymbolIndex:
+    """Testes do índice de símbolos e de find_symbol"""
+
+    def test_extract_symbols(self):
+        """Testa tipos, nomes qualificados e escopo das referências"""
+        symbols = extract_symbols(PROJECT_FILES["loja/servicos/vendas.py"], "loja.servicos.vendas")
+        by_kind = {}
+        for name, qualname, kind, line, _ in symbols:
+            by_kind.setdefault(kind, []).append((name, qualname, line))
+
+        assert by_kind["function"] == [("vender", "loja.servicos.vendas.vender", 6)]
+        assert ("Produto", "loja.modelos.Produto", 2) in by_kind["import"]
+        assert ("estoque", "loja.servicos.estoque", 4) in by_kind["import"]
+        assert ("baixar", "loja.servicos.vendas.vender", 7) in by_kind["reference"]
+
+        method = extract_symbols(PROJECT_FILES["loja/modelos.py"], "loja.modelos")
+        assert ("preco_final", "loja.modelos.Produto.preco_final", "method", 4, 4) in method
+
+    def test_find_definitions_imports_and_references(self, tools, project):
+        """Testa a busca por nome exato, por Classe.metodo e por prefixo"""
+        result = tools.find_symbol(str(project), "Produto")
+        assert result["definitions"] == [
+            {"qualname": "loja.modelos.Produto", "kind": "class", "location": "loja/modelos.py:3"}
+        ]
+        assert {item["location"] for item in result["imports"]} == {
+            "loja/__init__.py:1", "loja/servicos/vendas.py:2"
+        }
+        assert result["index"] == {"indexed": 7, "unchanged": 0, "removed": 0}
+
+        method = tools.find_symbol(str(project), "Produto.preco_final", kinds=["method"])
+        assert [item["location"] for item in method["definitions"]] == ["loja/modelos.py:4"]
+
+        prefix = tools.find_symbol(str(project), "preco*")
+        assert [item["qualname"] for item in prefix["definitions"]] == ["loja.modelos.Produto.preco_final"]
+
+        references = tools.find_symbol(str(project), "baixar", kinds=["reference"], limit=1)
+        assert references["references"][0]["qualname"] == "loja.servicos.vendas.vender"
+        assert references["totals"] == {"reference": 1}
+
+        assert "info" in tools.find_symbol(str(project), "NaoExiste")
+        assert "error" in tools.find_symbol(str(project), "Produto", kinds=["modulo"])
+
+    def test_qualified_lookup_is_literal(self, tools, tmp_path):
+        """Testa Classe.metodo com métodos homônimos e _ sem efeito de curinga"""
+        root = tmp_path / "homonimos"
+        write_project(root, {"m.py": (
+            "class A:\n"
+            "    def run(self):\n"
+            "        pass\n\n\n"
+            "class B:\n"
+            "    def run(self):\n"
+            "        pass\n\n\n"
+            "def getax():\n"
+            "    pass\n"
+        )})
+
+        result = tools.find_symbol(str(root), "A.run")
+        assert [item["qualname"] for item in result["definitions"]] == ["m.A.run"]
+        assert [item["qualname"] for item in tools.find_symbol(str(root), "run")["definitions"]] == [
+            "m.A.run", "m.B.run"
+        ]
+        assert tools.find_symbol(str(root), "get_x", kinds=["function"])["definitions"] == []
+
+    def test_incremental_update(self, tools, project):
+        """Testa se só arquivos alterados são reindexados"""
+        tools.find_symbol(str(project), "Produto")
+        assert tools.find_symbol(str(project), "Produto")["index"] == {"indexed": 0, "unchanged": 7, "removed": 0}
+
+        modelos = project / "loja" / "modelos.py"
+        modelos.write_text(modelos.read_text().replace("class Produto", "class Item"), encoding="utf-8")
+        (project / "scripts" / "rodar.py").unlink()
+
+        result = tools.find_symbol(str(project), "Item")
+        assert result["index"] == {"indexed": 1, "unchanged": 5, "removed": 1}
+        assert result["definitions"][0]["location"] == "loja/modelos.py:3"
+        assert tools.find_symbol(str(project), "Produto", kinds=["class"])["definitions"] == []
+        assert tools.find_symbol(str(project), "vender", kinds=["import"])["imports"] == []
+
+
+class TestStyleCheck:
+    """Testes da verificação de estilo em lote"""
+
+    def test_parse_issues(self):
+        """Testa a conversão da saída do flake8 em registros"""
+        output = "a.py::3::1::F401::'os' imported but unused\nlixo\nb/c.py::10::80::E501::linha :: longa\n"
+        assert parse_issues(output) == {
+            "a.py": [{"line": 3, "column": 1, "code": "F401", "message": "'os' imported but unused"}],
+            "b/c.py": [{"line": 10, "column": 80, "code": "E501", "message": "linha :: longa"}],
+        }
+
+    def test_batch_records_and_cache(self, tools, project):
+        """Testa registros estruturados, arquivos limpos e reaproveitamento do cache"""
+        pytest.importorskip("flake8")
+        result = tools.check_code_style_batch([str(project / "loja"), str(project / "scripts")])
+
+        assert result["files_checked"] == 6
+        assert result["cache"] == {"hits": 0, "checked": 6}
+        unused = [issue for issue in result["files"]["loja/modelos.py"] if issue["code"] == "F401"]
+        assert unused[0]["line"] == 1 and unused[0]["path"] == "loja/modelos.py"
+        assert result["issues_by_code"]["F401"] >= 3
+
+        modelos = project / "loja" / "modelos.py"
+        modelos.write_text(modelos.read_text().replace("import dataclasses\n", ""), encoding="utf-8")
+        again = tools.check_code_style_batch([str(project / "loja"), str(project / "scripts")])
+        assert again["cache"] == {"hits": 5, "checked": 1}
+        assert all(issue["code"] != "F401" for issue in again["files"].get("loja/modelos.py", []))
+
+        single = tools.check_code_style(str(project / "loja" / "servicos" / "estoque.py"))
+        assert single["clean"] is False
+        assert single["style_issues"][0]["code"] == "F401"
+
+    def test_parent_config_is_used_and_invalidates_cache(self, tmp_path, project):
+        """Testa se a configuração de um diretório acima entra no comando e na chave do cache"""
+        (project / "setup.cfg").write_text("[metadata]\nname = loja\n", encoding="utf-8")
+        config = project / ".flake8"
+        config.write_text("[flake8]\nmax-line-length = 100\n", encoding="utf-8")
+        assert find_flake8_config(str(project / "loja" / "servicos")) == str(config)
+
+        # Linter falso que registra a configuração recebida
+        calls = tmp_path / "chamadas.txt"
+        recording = [sys.executable, "-c",
+                     "import sys; print('1.0') if '--version' in sys.argv else "
+                     f"open({str(calls)!r}, 'a').write(' '.join(a for a in sys.argv if a.startswith('--config')) + '\\n')"]
+        checker = StyleChecker(command=recording, cache=StyleCache(str(tmp_path / "style")))
+        subdirectory = [str(project / "loja" / "servicos")]
+
+        assert checker.check(subdirectory)["cache"] == {"hits": 0, "checked": 3}
+        assert set(calls.read_text().split()) == {f"--config={config}"}
+        assert checker.check(subdirectory)["cache"] == {"hits": 3, "checked": 0}
+
+        config.write_text("[flake8]\nmax-line-length = 120\n", encoding="utf-8")
+        assert checker.check(subdirectory)["cache"] == {"hits": 0, "checked": 3}
+
+    def test_timeout_stops_hanging_run(self, tmp_path, project):
+        """Testa se uma execução travada vira erro em vez de bloquear o agente"""
+        hanging = [sys.executable, "-c",
+                   "import sys, time; print('1.0') if '--version' in sys.argv else time.sleep(30)"]
+        checker = StyleChecker(command=hanging, timeout=0.5, cache=StyleCache(str(tmp_path / "style")))
+        tools = CodeAnalysisTools(style_checker=checker)
+
+        result = tools.check_code_style_batch([str(project / "scripts")])
+        assert "Tempo limite" in result["errors"]["rodar.py"]
+        assert result["files_checked"] == 0
+        assert "error" in tools.check_code_style(str(project / "scripts" / "rodar.py"))
+
+    def test_missing_linter(self, tmp_path, project, monkeypatch):
+        """Testa a mensagem quando o flake8 não está instalado"""
+        monkeypatch.setattr(style_check, "flake8_command", lambda: None)
+        tools = CodeAnalysisTools(style_checker=StyleChecker(cache=StyleCache(str(tmp_path / "style"))))
+
+        assert tools.check_code_style(str(project / "quebrado.py")) == {"error": "flake8 não está instalado"}
+        assert tools.check_code_style_batch([str(project)]) == {"error": "flake8 não está instalado"}
+
+
+UNDOCUMENTED_SOURCE = """import os
+
+
+class Loja:
+    # Estado da loja
+
+    def __init__(self, nome):
+        self.nome = nome
+
+    def vender(self, produto, *itens, desconto=0):
+        if not produto:
+            raise ValueError("sem produto")
+        return produto
+
+    def listar(self):
+        \"\"\"Lista os produtos.\"\"\"
+        yield from []
+
+    @property
+    def aberta(self): return True
+
+
+async def buscar(urls):
+    def interno():
+        return 1
+    for url in urls:
+        yield url
+
+
+def _auxiliar():
+    pass
+"""
+
+
+class TestModuleDocstrings:
+    """Testes de generate_module_docstrings"""
+
+    @pytest.fixture
+    def module_path(self, tmp_path):
+        path = tmp_path / "loja.py"
+        path.write_text(UNDOCUMENTED_SOURCE, encoding="utf-8")
+        return path
+
+    def test_documents_whole_module_in_one_call(self, tools, module_path):
+        """Testa classes, métodos e funções sem docstring, e o que fica de fora"""
+        result = tools.generate_module_docstrings(str(module_path))
+
+        assert [(item["name"], item["kind"]) for item in result["documented"]] == [
+            ("Loja", "class"), ("Loja.vender", "method"), ("buscar", "function")
+        ]
+        assert result["skipped"] == [{"name": "Loja.aberta", "kind": "method", "line": 20}]
+        assert result["already_documented"] == 1
+        # O arquivo não é alterado
+        assert module_path.read_text(encoding="utf-8") == UNDOCUMENTED_SOURCE
+
+        patch = result["patch"]
+        assert "+    \"\"\"Descrição da classe Loja.\"\"\"" in patch
+        assert "+            *itens: Descrição do parâmetro itens." in patch
+        assert "self: Descrição" not in patch
+        assert "+            ValueError: Descrição de quando ValueError é lançada." in patch
+        assert "+    Yields:" in patch
+        assert "função interno" not in patch
+
+        private = tools.generate_module_docstrings(str(module_path), include_private=True)
+        assert {"_auxiliar", "Loja.__init__"} <= {item["name"] for item in private["documented"]}
+
+    def test_patch_applies_and_produces_docstrings(self, tools, module_path, monkeypatch):
+        """Testa se o patch aplica com git apply e gera código válido com as docstrings"""
+        if shutil.which("git") is None:
+            pytest.skip("git não disponível")
+        monkeypatch.chdir(module_path.parent)
+        patch = tools.generate_module_docstrings("loja.py")["patch"]
+        subprocess.run(["git", "apply", "-"], input=patch, text=True, check=True, cwd=module_path.parent)
+
+        tree = ast.parse(module_path.read_text(encoding="utf-8"))
+        loja = next(node for node in tree.body if isinstance(node, ast.ClassDef))
+        vender = next(node for node in loja.body if getattr(node, "name", "") == "vender")
+        assert ast.get_docstring(loja) == "Descrição da classe Loja."
+        assert ast.get_docstring(vender).startswith("Descrição do método vender.")
+        assert "Returns:" in ast.get_docstring(vender)
+
+        # Nada mais a documentar depois de aplicado
+        again = tools.generate_module_docstrings("loja.py")
+        assert again["patch"] == "" and "info" in again
+
+        # Arquivo sem quebra de linha no final
+        (module_path.parent / "sem_quebra.py").write_bytes(b"def f(a):\n    return a")
+        patch = tools.generate_module_docstrings("sem_quebra.py")["patch"]
+        assert patch.endswith("\n\\ No newline at end of file\n")
+        subprocess.run(["git", "apply", "-"], input=patch, text=True, check=True, cwd=module_path.parent)
+        content = (module_path.parent / "sem_quebra.py").read_bytes()
+        assert content.startswith(b'def f(a):\n    """Descri') and content.endswith(b"\n    return a")
+
+    def test_invalid_file(self, tools, tmp_path):
+        """Testa a mensagem de erro para arquivo inválido"""
+        broken = tmp_path / "quebrado.py"
+        broken.write_text("def x(:\n", encoding="utf-8")
+        assert "error" in tools.generate_module_docstrings(str(broken))
@@ -0,0 +1,327 @@
+#!/usr/bin/env python3
+"""
+Testes das ferramentas de análise de dados
+"""
+
+import pytest
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+# Adicionar o diretório raiz ao path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.tools import data_tools_simple
+from app.tools.data_tools_simple import DataAnalysisTools, DataFrameCache
+
+
+class TestDataFrameCache:
+    """Testes do cache de DataFrames por conteúdo"""
+
+    def test_load_csv_returns_dataset_id(self, sample_csv_content):
+        """Testa se load_csv devolve um dataset_id reutilizável"""
+        tools = DataAnalysisTools()
+        result = tools.load_csv(sample_csv_content)
+
+        assert result["success"] is True
+        assert DataFrameCache.is_dataset_id(result["dataset_id"])
+        assert result["dataset_id"] == DataFrameCache.dataset_id_for(sample_csv_content)
+
+    def test_tools_accept_dataset_id(self, sample_csv_content):
+        """Testa se as ferramentas aceitam o dataset_id no lugar do CSV"""
+        tools = DataAnalysisTools()
+        dataset_id = tools.load_csv(sample_csv_content)["dataset_id"]
+
+        by_id = tools.statistical_summary(dataset_id)
+        by_csv = tools.statistical_summary(sample_csv_content)
+        assert by_id["success"] is True
+        assert by_id["statistics"] == by_csv["statistics"]
+
+        correlations = tools.correlation_analysis(dataset_id)
+        assert correlations["success"] is True
+
+    def test_csv_parsed_once(self, sample_csv_content, monkeypatch):
+        """Testa se o mesmo CSV é parseado uma única vez entre ferramentas"""
+        calls = []
+        original_read_csv = pd.read_csv
+
+        def counting_read_csv(*args, **kwargs):
+            calls.append(1)
+            return original_read_csv(*args, **kwargs)
+
+        monkeypatch.setattr(data_tools_simple.pd, "read_csv", counting_read_csv)
+
+        tools = DataAnalysisTools()
+        tools.load_csv(sample_csv_content)
+        tools.statistical_summary(sample_csv_content)
+        tools.correlation_analysis(sample_csv_content)
+
+        assert len(calls) == 1
+
+    def test_unknown_dataset_id(self):
+        """Testa erro amigável para dataset_id desconhecido"""
+        tools = DataAnalysisTools()
+        result = tools.statistical_summary("ds_0123456789abcdef")
+
+        assert result["success"] is False
+        assert "não encontrado" in result["error"]
+
+    def test_lru_eviction_by_bytes(self):
+        """Testa descarte LRU quando o orçamento de bytes é excedido"""
+        frames = {
+            f"ds_{i:016x}": pd.DataFrame({"valor": range(1000)}) for i in range(3)
+        }
+        frame_size = int(next(iter(frames.values())).memory_usage(deep=True).sum())
+        cache = DataFrameCache(max_bytes=frame_size * 2)
+
+        ids = list(frames)
+        cache.put(ids[0], frames[ids[0]])
+        cache.put(ids[1], frames[ids[1]])
+        cache.get(ids[0])  # ids[0] passa a ser o mais recente
+        cache.put(ids[2], frames[ids[2]])
+
+        assert ids[0] in cache
+        assert ids[1] not in cache
+        assert ids[2] in cache
+        assert cache.current_bytes <= cache.max_bytes
+
+
+class TestStreamingProfile:
+    """Testes do perfil de CSV em streaming"""
+
+    @pytest.fixture
+    def large_csv(self, tmp_path):
+        """CSV com valores nulos e colunas mistas para perfil em blocos"""
+        import numpy as np
+
+        rng = np.random.default_rng(42)
+        n = 20_000
+        frame = pd.DataFrame({
+            "valor": rng.normal(100, 15, n),
+            "quantidade": rng.integers(0, 1000, n),
+            "categoria": rng.choice(["A", "B", "C"], n),
+        })
+        frame.loc[::97, "valor"] = None
+        path = tmp_path / "grande.csv"
+        frame.to_csv(path, index=False)
+        return str(path)
+
+    def test_streaming_matches_eager_shape(self, large_csv):
+        """Testa se o modo streaming devolve o mesmo formato do modo completo"""
+        from app.tools.data_tools import DataAnalysisTools as FullDataAnalysisTools
+
+        tools = FullDataAnalysisTools()
+        eager = tools.load_csv(large_csv, streaming=False)
+        streamed = tools.load_csv(large_csv, streaming=True, chunksize=3_000)
+
+        assert set(streamed) == set(eager)
+        assert streamed["shape"] == eager["shape"]
+        assert streamed["columns"] == eager["columns"]
+        assert streamed["missing_values"] == eager["missing_values"]
+        assert pd.DataFrame(streamed["head"]).equals(pd.DataFrame(eager["head"]))
+        assert set(streamed["description"]) == set(eager["description"])
+
+    def test_streaming_statistics(self, large_csv):
+        """Testa momentos exatos e quantis aproximados no modo streaming"""
+        from app.tools.data_tools import DataAnalysisTools as FullDataAnalysisTools
+
+        tools = FullDataAnalysisTools()
+        eager = tools.load_csv(large_csv, streaming=False)["description"]
+        streamed = tools.load_csv(large_csv, streaming=True, chunksize=3_000)["description"]
+
+        for col in eager:
+            for stat in ["count", "mean", "std", "min", "max"]:
+                assert streamed[col][stat] == pytest.approx(eager[col][stat], rel=1e-9)
+            spread = eager[col]["max"] - eager[col]["min"]
+            for stat in ["25%", "50%", "75%"]:
+                assert abs(streamed[col][stat] - eager[col][stat]) < 0.03 * spread
+
+
+    def test_streaming_combines_dtypes_across_chunks(self, tmp_path):
+        """Testa se tipos que mudam depois do primeiro bloco seguem a leitura completa"""
+        from app.tools.data_tools import DataAnalysisTools as FullDataAnalysisTools
+
+        n = 9_000
+        frame = pd.DataFrame({
+            "codigo": [str(i) for i in range(n - 1)] + ["X1"],
+            "valor": list(range(n - 1)) + [0.5],
+            "quantidade": range(n),
+        })
+        path = tmp_path / "tipos.csv"
+        frame.to_csv(path, index=False)
+
+        tools = FullDataAnalysisTools()
+        eager = tools.load_csv(str(path), streaming=False)
+        streamed = tools.load_csv(str(path), streaming=True, chunksize=3_000)
+
+        assert set(streamed["description"]) == set(eager["description"]) == {"valor", "quantidade"}
+        assert streamed["dtypes"]["valor"] == eager["dtypes"]["valor"] == "float64"
+        assert not pd.api.types.is_numeric_dtype(streamed["dtypes"]["codigo"])
+        assert streamed["description"]["valor"]["max"] == eager["description"]["valor"]["max"]
+
+
+class TestSketches:
+    """Testes das estruturas de estatística incremental"""
+
+    def test_running_moments_merge(self):
+        """Testa se mesclar acumuladores equivale a processar tudo junto"""
+        import numpy as np
+        from app.tools.sketches import RunningMoments
+
+        data = np.random.default_rng(0).normal(size=1_000)
+        left, right, full = RunningMoments(), RunningMoments(), RunningMoments()
+        left.update(data[:300])
+        right.update(data[300:])
+        full.update(data)
+        left.merge(right)
+
+        assert left.count == full.count == 1_000
+        assert left.mean == pytest.approx(np.mean(data))
+        assert left.std == pytest.approx(np.std(data, ddof=1))
+
+    def test_kll_quantiles_and_roundtrip(self):
+        """Testa precisão dos quantis KLL e serialização do sketch"""
+        import numpy as np
+        from app.tools.sketches import KLLSketch
+
+        data = np.random.default_rng(1).uniform(0, 1, 50_000)
+        sketch = KLLSketch(seed=7)
+        for block in np.array_split(data, 10):
+            sketch.update(block)
+
+        for q in [0.1, 0.5, 0.9]:
+            assert sketch.quantile(q) == pytest.approx(q, abs=0.03)
+
+        restored = KLLSketch.from_dict(sketch.to_dict())
+        assert restored.count == sketch.count
+        assert restored.quantiles([0.5]) == sketch.quantiles([0.5])
+
+
+class TestCorrelations:
+    """Testes da extração vetorizada de correlações"""
+
+    @pytest.fixture
+    def wide_frame(self):
+        """DataFrame com colunas correlacionadas entre si"""
+        import numpy as np
+
+        rng = np.random.default_rng(3)
+        base = rng.normal(size=(500, 5))
+        noise = rng.normal(scale=0.3, size=(500, 40))
+        data = np.hstack([base, base[:, [i % 5 for i in range(40)]] + noise])
+        return pd.DataFrame(data, columns=[f"c{i}" for i in range(45)])
+
+    def test_pairs_match_nested_loops(self, wide_frame):
+        """Testa se a versão vetorizada encontra os mesmos pares que os laços"""
+        from app.tools.correlations import strong_correlation_pairs
+
+        corr = wide_frame.corr()
+        expected = {
+            (corr.columns[i], corr.columns[j])
+            for i in range(len(corr.columns))
+            for j in range(i + 1, len(corr.columns))
+            if abs(corr.iloc[i, j]) >= 0.7
+        }
+        pairs = strong_correlation_pairs(corr, threshold=0.7)
+
+        assert {(a, b) for a, b, _ in pairs} == expected
+        strengths = [abs(value) for _, _, value in pairs]
+        assert strengths == sorted(strengths, reverse=True)
+
+    def test_top_k(self, wide_frame):
+        """Testa se top_k retorna os k pares mais fortes"""
+        from app.tools.correlations import strong_correlation_pairs
+
+        corr = wide_frame.corr()
+        all_pairs = strong_correlation_pairs(corr)
+        top = strong_correlation_pairs(corr, top_k=5)
+
+        assert [abs(v) for _, _, v in top] == [abs(v) for _, _, v in all_pairs[:5]]
+
+    def test_blockwise_matches_full_matrix(self, wide_frame):
+        """Testa se o modo em blocos coincide com a matriz completa"""
+        from app.tools.correlations import blockwise_strong_correlations, strong_correlation_pairs
+
+        full = {(a, b): v for a, b, v in strong_correlation_pairs(wide_frame.corr(), threshold=0.7)}
+        blocked = {
+            (a, b): v
+            for a, b, v in blockwise_strong_correlations(wide_frame, threshold=0.7, block_size=7)
+        }
+
+        assert blocked.keys() == full.keys()
+        for key, value in full.items():
+            assert blocked[key] == pytest.approx(value, abs=1e-9)
+
+    def test_blockwise_with_missing_values_uses_complete_pairs(self):
+        """Testa se valores ausentes não puxam r para zero (pares completos, como df.corr())"""
+        import numpy as np
+        from app.tools.correlations import blockwise_strong_correlations
+
+        rng = np.random.default_rng(1)
+        base = rng.normal(size=400)
+        frame = pd.DataFrame({
+            "a": base,
+            "b": 0.9 * base + np.sqrt(1 - 0.81) * rng.normal(size=400),
+            "c": rng.normal(size=400),
+            "constante": np.ones(400),
+        })
+        frame.loc[frame.index[::2], "b"] = np.nan
+        frame.loc[frame.index[:5], "a"] = np.nan
+
+        expected = frame.corr()
+        blocked = {(a, b): v for a, b, v in blockwise_strong_correlations(frame, threshold=0.0, block_size=2)}
+
+        assert blocked[("a", "b")] == pytest.approx(expected.loc["a", "b"], abs=1e-9)
+        assert blocked[("a", "b")] > 0.85
+        assert blocked[("b", "c")] == pytest.approx(expected.loc["b", "c"], abs=1e-9)
+        assert not any("constante" in key for key in blocked)
+
+    @pytest.mark.parametrize("missing", [False, True])
+    def test_blockwise_ignores_constant_columns(self, missing):
+        """Testa se colunas constantes não exatas (0.1) não viram correlação ±1"""
+        import numpy as np
+        from app.tools.correlations import blockwise_strong_correlations
+
+        rng = np.random.default_rng(2)
+        frame = pd.DataFrame({
+            "a": np.full(1000, 0.1),
+            "b": rng.normal(size=1000),
+            "c": np.full(1000, 0.3),
+            "d": np.full(1000, 0.7),
+            "e": rng.normal(size=1000),
+        })
+        if missing:
+            frame.loc[frame.index[::3], "b"] = np.nan
+
+        pairs = blockwise_strong_correlations(frame, threshold=0.0, block_size=2)
+
+        assert [(a, b) for a, b, _ in pairs] == [("b", "e")]
+        assert pairs[0][2] == pytest.approx(frame.corr().loc["b", "e"], abs=1e-9)
+
+    def test_correlation_analysis_blockwise_mode(self, wide_frame):
+        """Testa o modo em blocos da ferramenta completa de correlação"""
+        from app.tools.data_tools import DataAnalysisTools as FullDataAnalysisTools
+
+        tools = FullDataAnalysisTools()
+        data = wide_frame.to_dict(orient="list")
+        eager = tools.correlation_analysis(data)
+        blocked = tools.correlation_analysis(data, blockwise=True)
+
+        assert blocked["correlation_matrix"] is None
+        assert len(blocked["strong_correlations"]) == len(eager["strong_correlations"])
+
+    def test_correlation_analysis_counts_numeric_columns(self, wide_frame, monkeypatch):
+        """Testa se só as colunas numéricas decidem o modo em blocos"""
+        from app.tools import data_tools
+
+        monkeypatch.setattr(data_tools, "BLOCKWISE_MIN_COLUMNS", 50)
+        data = wide_frame.to_dict(orient="list")
+        data.update({f"texto{i}": ["a"] * len(wide_frame) for i in range(10)})
+
+        result = data_tools.DataAnalysisTools().correlation_analysis(data)
+
+        assert "error" not in result
+        assert result["correlation_matrix"] is not None
+        assert "texto0" not in result["correlation_matrix"]
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Testes do store colunar de datasets e do endpoint de upload
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Adicionar o diretório raiz ao path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.tools.data_tools_simple import DataAnalysisTools, DataFrameCache
+from app.tools.dataset_store import DatasetStore, dataset_id_for_file, has_pyarrow
+
+STORE_FORMATS = [False] + ([True] if has_pyarrow() else [])
+
+
+@pytest.fixture(params=STORE_FORMATS, ids=lambda arrow: "arrow" if arrow else "npy")
+def store(request, tmp_path):
+    """Store em diretório temporário (npy e, se houver pyarrow, Arrow IPC)"""
+    return DatasetStore(str(tmp_path / "datasets"), use_arrow=request.param)
+
+
+@pytest.fixture
+def csv_file(tmp_path, sample_csv_content):
+    path = tmp_path / "funcionarios.csv"
+    path.write_text(sample_csv_content, encoding="utf-8")
+    return path
+
+
+def is_memory_mapped(array) -> bool:
+    while array is not None:
+        if isinstance(array, np.memmap):
+            return True
+        array = getattr(array, "base", None)
+    return False
+
+
+class TestDatasetStore:
+    """Testes da conversão e leitura com memory-map"""
+
+    def test_id_matches_dataframe_cache(self, csv_file, sample_csv_content):
+        """Testa se upload e CSV colado geram o mesmo dataset_id"""
+        assert dataset_id_for_file(str(csv_file)) == DataFrameCache.dataset_id_for(sample_csv_content)
+
+    def test_roundtrip(self, store, csv_file):
+        """Testa se o dataset aberto tem os mesmos dados do CSV"""
+        meta = store.ingest_csv(str(csv_file))
+        expected = pd.read_csv(csv_file)
+
+        df = store.open(meta["dataset_id"])
+        assert meta["rows"] == len(expected)
+        assert df.columns.tolist() == expected.columns.tolist()
+        np.testing.assert_allclose(df["salario"], expected["salario"])
+        assert df["departamento"].astype(str).tolist() == expected["departamento"].tolist()
+
+        # Reenviar o mesmo conteúdo não reescreve nada
+        assert store.ingest_csv(str(csv_file)) == meta
+
+    def test_open_selected_columns_memory_mapped(self, tmp_path):
+        """Testa a leitura só das colunas pedidas, sem copiar para a memória"""
+        store = DatasetStore(str(tmp_path / "datasets"), use_arrow=False)
+        df = pd.DataFrame({"a": np.arange(1000.0), "b": np.arange(1000), "c": ["x", None] * 500})
+        store.put_dataframe("ds_" + "0" * 16, df)
+
+        opened = store.open("ds_" + "0" * 16, columns=["c", "a"])
+        assert opened.columns.tolist() == ["c", "a"]
+        assert is_memory_mapped(opened["a"].to_numpy())
+        assert opened["c"].isna().sum() == 500
+
+        with pytest.raises(KeyError):
+            store.open("ds_" + "0" * 16, columns=["nao_existe"])
+        with pytest.raises(KeyError):
+            store.open("ds_" + "1" * 16)
+        assert not store.exists("../../etc")
+
+    def test_tools_resolve_stored_dataset(self, store, csv_file):
+        """Testa se as ferramentas de dados abrem o dataset pelo ID"""
+        dataset_id = store.ingest_csv(str(csv_file))["dataset_id"]
+        tools = DataAnalysisTools()
+        tools.cache = DataFrameCache(store=store)
+
+        result = tools.statistical_summary(dataset_id)
+        assert result["success"] is True
+        assert result["statistics"]["idade"]["count"] == 6
+        # Datasets em memory-map não ocupam o LRU
+        assert len(tools.cache) == 0
+
+
+class TestDatasetsEndpoint:
+    """Testes de POST/GET /v1/datasets"""
+
+    @pytest.fixture
+    def client(self, store, tmp_path):
+        pytest.importorskip("httpx")
+        pytest.importorskip("multipart")
+        from fastapi import FastAPI
+        from fastapi.testclient import TestClient
+
+        from app.backend.datasets_api import create_datasets_router
+        from app.tools.summaries import SummaryStore
+
+        app = FastAPI()
+        app.include_router(create_datasets_router(store, SummaryStore(str(tmp_path / "summaries"))))
+        return TestClient(app)
+
+    def test_upload_and_info(self, client, store, sample_csv_content):
+        """Testa o upload e a consulta dos metadados"""
+        response = client.post(
+            "/v1/datasets", files={"file": ("dados.csv", sample_csv_content.encode("utf-8"), "text/csv")}
+        )
+
+        assert response.status_code == 200
+        body = response.json()
+        assert body["dataset_id"] == DataFrameCache.dataset_id_for(sample_csv_content)
+        assert body["rows"] == 6 and body["filename"] == "dados.csv"
+        assert store.exists(body["dataset_id"])
+
+        info = client.get(f"/v1/datasets/{body['dataset_id']}")
+        assert info.status_code == 200 and info.json()["rows"] == 6
+        assert client.get("/v1/datasets/ds_" + "f" * 16).status_code == 404
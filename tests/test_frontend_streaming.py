@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Testes do cliente de streaming usado pelo frontend Streamlit
+"""
+
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+# Adicionar o diretório raiz ao path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.frontend.stream_client import TeamStreamError, iter_stream_events, stream_team_run
+
+
+def team_event(event: str, content=None) -> str:
+    """Serializa um evento como o Agno Playground (JSON indentado, sem separador)"""
+    return json.dumps({"event": event, "content": content, "team_id": "t1"}, indent=2)
+
+
+class StubPlaygroundHandler(BaseHTTPRequestHandler):
+    """Stub do endpoint de runs que envia os eventos em chunks com pausas"""
+
+    events = []
+    delay = 0.0
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for event in self.events:
+            data = event.encode("utf-8")
+            self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+            self.wfile.flush()
+            time.sleep(self.delay)
+        self.wfile.write(b"0\r\n\r\n")
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub_backend():
+    """Servidor HTTP local que simula o playground em modo streaming"""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubPlaygroundHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+class TestStreamEventParsing:
+    """Testes da decodificação incremental de eventos"""
+
+    def test_concatenated_json_split_across_chunks(self):
+        """Testa eventos JSON concatenados quebrados em trechos arbitrários"""
+        raw = team_event("TeamRunStarted") + team_event("TeamRunResponseContent", "Olá")
+        chunks = [raw[i:i + 7] for i in range(0, len(raw), 7)]
+
+        events = list(iter_stream_events(chunks))
+        assert [e["event"] for e in events] == ["TeamRunStarted", "TeamRunResponseContent"]
+        assert events[1]["content"] == "Olá"
+
+    def test_sse_data_lines(self):
+        """Testa o formato SSE com linhas event:/data:"""
+        raw = 'event: content\ndata: {"event": "TeamRunResponseContent", "content": "a"}\n\n: ping\n'
+        events = list(iter_stream_events([raw]))
+        assert events == [{"event": "TeamRunResponseContent", "content": "a"}]
+
+
+    def test_non_json_data_line_is_skipped(self):
+        """Testa se "data: [DONE]" é descartado e os eventos seguintes continuam chegando"""
+        raw = ('data: {"event": "TeamRunResponseContent", "content": "a"}\n\n'
+               'data: [DONE]\n\n'
+               'data: {"event": "TeamRunResponseContent", "content": "b"}\n\n')
+        chunks = [raw[i:i + 5] for i in range(0, len(raw), 5)]
+
+        events = list(iter_stream_events(chunks))
+        assert [e["content"] for e in events] == ["a", "b"]
+
+    def test_pretty_printed_event_split_across_lines(self):
+        """Testa se um evento em várias linhas, ainda incompleto, não é descartado"""
+        chunks = ['{\n  "event": "TeamRunResponseContent",\n', '  "content": "a"\n}\n']
+        assert list(iter_stream_events(chunks)) == [{"event": "TeamRunResponseContent", "content": "a"}]
+
+class TestStreamTeamRun:
+    """Testes de ponta a ponta contra um stub local do playground"""
+
+    def test_tokens_arrive_incrementally(self, stub_backend, monkeypatch):
+        """Testa se o primeiro token chega antes do fim da run"""
+        monkeypatch.setattr(StubPlaygroundHandler, "delay", 0.3)
+        monkeypatch.setattr(StubPlaygroundHandler, "events", [
+            team_event("TeamRunStarted"),
+            team_event("TeamRunResponseContent", "Primeiro "),
+            team_event("RunResponseContent", "texto de um membro"),
+            team_event("TeamRunResponseContent", "segundo."),
+            team_event("TeamRunCompleted", "Primeiro segundo."),
+        ])
+
+        start = time.monotonic()
+        stream = stream_team_run(stub_backend, "t1", "oi")
+        first = next(stream)
+        time_to_first_token = time.monotonic() - start
+        rest = list(stream)
+        total = time.monotonic() - start
+
+        assert first == "Primeiro "
+        assert rest == ["segundo."]
+        assert time_to_first_token < total / 2
+
+    def test_completed_content_fallback(self, stub_backend, monkeypatch):
+        """Testa uso do conteúdo final quando não há eventos incrementais"""
+        monkeypatch.setattr(StubPlaygroundHandler, "events", [
+            team_event("TeamRunCompleted", "Resposta completa"),
+        ])
+        assert list(stream_team_run(stub_backend, "t1", "oi")) == ["Resposta completa"]
+
+    def test_error_event(self, stub_backend, monkeypatch):
+        """Testa se eventos de erro viram TeamStreamError"""
+        monkeypatch.setattr(StubPlaygroundHandler, "events", [
+            team_event("TeamRunResponseContent", "parcial"),
+            team_event("TeamRunError", "quota excedida"),
+        ])
+        stream = stream_team_run(stub_backend, "t1", "oi")
+        assert next(stream) == "parcial"
+        with pytest.raises(TeamStreamError, match="quota excedida"):
+            next(stream)
+
+    def test_connection_error(self):
+        """Testa erro amigável quando o backend não está acessível"""
+        with pytest.raises(TeamStreamError, match="Conexão perdida"):
+            list(stream_team_run("http://127.0.0.1:9", "t1", "oi"))
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Testes da configuração compartilhada do Gemini
+"""
+
+import pytest
+import sys
+from pathlib import Path
+
+# Adicionar o diretório raiz ao path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.config import gemini_simple
+
+
+@pytest.fixture(autouse=True)
+def clean_registry(monkeypatch):
+    """Garante registro vazio e API key de teste em cada teste"""
+    monkeypatch.setenv("GOOGLE_API_KEY", "test-key-for-testing")
+    gemini_simple.reset_model_registry()
+    yield
+    gemini_simple.reset_model_registry()
+
+
+class TestModelRegistry:
+    """Testes do registro de modelos Gemini compartilhados"""
+
+    def test_same_params_share_instance(self):
+        """Testa se a mesma configuração devolve a mesma instância"""
+        assert gemini_simple.create_ultra_fast_gemini() is gemini_simple.create_ultra_fast_gemini()
+
+    def test_different_params_share_client(self):
+        """Testa se configurações diferentes compartilham o cliente HTTP"""
+        fast = gemini_simple.create_fast_gemini()
+        ultra_fast = gemini_simple.create_ultra_fast_gemini()
+
+        assert fast is not ultra_fast
+        assert fast.client is not None
+        assert fast.get_client() is ultra_fast.get_client()
+
+    def test_client_uses_bounded_pool(self):
+        """Testa se o cliente compartilhado usa pool limitado com keep-alive"""
+        client = gemini_simple.get_shared_client()
+        pool = client._api_client._httpx_client._transport._pool
+
+        assert pool._max_connections == gemini_simple.MAX_CONNECTIONS
+        assert pool._max_keepalive_connections == gemini_simple.MAX_KEEPALIVE_CONNECTIONS
+        assert pool._keepalive_expiry == gemini_simple.KEEPALIVE_EXPIRY_SECONDS
+
+    def test_without_api_key_client_is_lazy(self, monkeypatch):
+        """Testa se sem API key o modelo é criado sem cliente pré-construído"""
+        monkeypatch.delenv("GOOGLE_API_KEY")
+        gemini_simple.reset_model_registry()
+
+        model = gemini_simple.create_ultra_fast_gemini()
+        assert model.client is None
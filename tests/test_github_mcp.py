@@ -0,0 +1,377 @@
+#!/usr/bin/env python3
+"""
+Testes das ferramentas GitHub MCP contra um servidor GitHub falso local
+"""
+
+import asyncio
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlencode, urlparse
+
+import pytest
+
+# Adicionar o diretório raiz ao path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.mcp.github_mcp import GitHubAPIError, GitHubMCPTools
+from app.mcp.http_cache import HTTPResponseCache
+
+
+def fake_repository(full_name: str) -> dict:
+    """Payload mínimo de /repos/{owner}/{repo}"""
+    return {
+        "full_name": full_name,
+        "description": f"Repositório {full_name}",
+        "stargazers_count": 10,
+        "forks_count": 2,
+        "watchers_count": 10,
+        "language": "Python",
+        "topics": [],
+        "created_at": "2024-01-01T00:00:00Z",
+        "updated_at": "2024-06-01T00:00:00Z",
+        "clone_url": f"https://github.com/{full_name}.git",
+        "html_url": f"https://github.com/{full_name}",
+        "default_branch": "main",
+    }
+
+
+def fake_issue(number: int) -> dict:
+    """Payload mínimo de uma issue (múltiplos de 5 são pull requests)"""
+    issue = {
+        "number": number,
+        "title": f"Issue {number}",
+        "state": "open",
+        "created_at": "2024-01-01T00:00:00Z",
+        "updated_at": "2024-01-02T00:00:00Z",
+        "user": {"login": "dev"},
+        "labels": [{"name": "bug"}],
+        "html_url": f"https://github.com/org/big/issues/{number}",
+    }
+    if number % 5 == 0:
+        issue["pull_request"] = {}
+    return issue
+
+
+# Itens disponíveis nos endpoints paginados do servidor falso
+PAGINATED_TOTAL = 250
+
+
+class FakeGitHubHandler(BaseHTTPRequestHandler):
+    """Servidor GitHub falso com keep-alive que registra requisições e conexões"""
+
+    protocol_version = "HTTP/1.1"
+    delay = 0.0
+    requests = []
+    connections = set()
+    not_modified = 0
+
+    def send_json(self, status: int, payload, etag: str = None) -> None:
+        if etag and self.headers.get("If-None-Match") == etag:
+            type(self).not_modified += 1
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        if etag:
+            self.send_header("ETag", etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_page(self, path: str, query: dict, make_item, wrap=None) -> None:
+        """Responde uma página com cabeçalho Link no formato do GitHub"""
+        per_page = int(query.get("per_page", ["30"])[0])
+        page = int(query.get("page", ["1"])[0])
+        start = (page - 1) * per_page
+        items = [make_item(i) for i in range(start + 1, min(start + per_page, PAGINATED_TOTAL) + 1)]
+
+        body = json.dumps(wrap(items) if wrap else items).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        if start + per_page < PAGINATED_TOTAL:
+            next_query = {key: values[0] for key, values in query.items()}
+            next_query["page"] = page + 1
+            base = f"http://{self.headers['Host']}{path}"
+            self.send_header("Link", f'<{base}?{urlencode(next_query)}>; rel="next"')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        type(self).requests.append(self.path)
+        type(self).connections.add(self.client_address)
+        time.sleep(self.delay)
+
+        parsed = urlparse(self.path)
+        path, query = parsed.path, parse_qs(parsed.query)
+        parts = path.strip("/").split("/")
+        if path == "/search/repositories" and query.get("q") == ["many"]:
+            self.send_page(path, query, lambda i: fake_repository(f"org/repo{i}"),
+                           wrap=lambda items: {"total_count": PAGINATED_TOTAL, "items": items})
+        elif path == "/search/repositories":
+            self.send_json(200, {
+                "total_count": 3,
+                "items": [fake_repository(f"org/repo{i}") for i in range(3)],
+            })
+        elif len(parts) == 4 and parts[3] == "issues":
+            if parts[2] == "broken" and query.get("page", ["1"])[0] != "1":
+                self.send_json(500, {"message": "Server Error"})
+            else:
+                self.send_page(path, query, fake_issue)
+        elif len(parts) == 3 and parts[0] == "repos":
+            if parts[2] == "missing":
+                self.send_json(404, {"message": "Not Found"})
+            else:
+                self.send_json(200, fake_repository(f"{parts[1]}/{parts[2]}"),
+                               etag=f'"{parts[1]}-{parts[2]}-v1"')
+        else:
+            self.send_json(404, {"message": "Not Found"})
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def fake_github(monkeypatch):
+    """Servidor GitHub falso em uma porta livre"""
+    monkeypatch.setattr(FakeGitHubHandler, "requests", [])
+    monkeypatch.setattr(FakeGitHubHandler, "connections", set())
+    monkeypatch.setattr(FakeGitHubHandler, "not_modified", 0)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeGitHubHandler)
+    thread = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def cache(tmp_path):
+    """Cache HTTP isolado em um banco temporário"""
+    return HTTPResponseCache(str(tmp_path / "http_cache.db"))
+
+
+class TestConnectionPooling:
+    """Testes do cliente com pool de conexões"""
+
+    def test_session_reuses_connection(self, fake_github, cache):
+        """Testa se chamadas seguidas reutilizam a mesma conexão keep-alive"""
+        with GitHubMCPTools(base_url=fake_github, cache=cache) as tools:
+            for i in range(5):
+                assert tools.get_repository_info("org", f"repo{i}")["status"] == "success"
+
+        assert len(FakeGitHubHandler.requests) == 5
+        assert len(FakeGitHubHandler.connections) == 1
+
+    def test_not_found(self, fake_github, cache):
+        """Testa a mensagem de repositório inexistente"""
+        with GitHubMCPTools(base_url=fake_github, cache=cache) as tools:
+            result = tools.get_repository_info("org", "missing")
+
+        assert result["status"] == "error"
+        assert "não encontrado" in result["message"]
+
+
+class TestFanOut:
+    """Testes das buscas concorrentes"""
+
+    def test_repositories_info_runs_concurrently(self, fake_github, cache, monkeypatch):
+        """Testa se várias consultas rodam em paralelo e mantêm a ordem"""
+        monkeypatch.setattr(FakeGitHubHandler, "delay", 0.3)
+        names = [f"org/repo{i}" for i in range(10)] + ["org/missing"]
+
+        start = time.monotonic()
+        with GitHubMCPTools(base_url=fake_github, cache=cache) as tools:
+            result = tools.get_repositories_info(names)
+        elapsed = time.monotonic() - start
+
+        assert [r.get("repository", {}).get("name") for r in result["results"][:10]] == names[:10]
+        assert result["errors"] == 1
+        # Em série seriam ~3.3 s
+        assert elapsed < 1.5
+
+    def test_empty_repository_list(self, fake_github, cache):
+        """Testa se a lista vazia devolve as mesmas chaves de uma consulta normal"""
+        with GitHubMCPTools(base_url=fake_github, cache=cache) as tools:
+            empty = tools.get_repositories_info([])
+            single = tools.get_repositories_info(["org/repo0"])
+
+        assert empty == {"status": "success", "results": [], "count": 0, "errors": 0}
+        assert set(empty) == set(single)
+
+    def test_search_with_details(self, fake_github, cache):
+        """Testa a busca com detalhes anexados a cada resultado"""
+        with GitHubMCPTools(base_url=fake_github, cache=cache) as tools:
+            result = tools.search_repositories("agno", include_details=True)
+
+        assert result["status"] == "success"
+        assert [repo["details"]["default_branch"] for repo in result["repositories"]] == ["main"] * 3
+
+    def test_async_client(self, fake_github, cache, monkeypatch):
+        """Testa o cliente assíncrono compartilhado"""
+        pytest.importorskip("httpx")
+        monkeypatch.setattr(FakeGitHubHandler, "delay", 0.3)
+        names = [f"org/repo{i}" for i in range(8)]
+
+        async def run():
+            tools = GitHubMCPTools(base_url=fake_github, cache=cache)
+            try:
+                return await tools.aget_repositories_info(names)
+            finally:
+                await tools.aclose()
+
+        start = time.monotonic()
+        result = asyncio.run(run())
+        elapsed = time.monotonic() - start
+
+        assert [r["repository"]["name"] for r in result["results"]] == names
+        # Em série seriam ~2.4 s
+        assert elapsed < 1.5
+
+
+class TestConditionalCache:
+    """Testes do cache HTTP com ETag e TTL"""
+
+    def test_fresh_entry_skips_network(self, fake_github, cache):
+        """Testa se consultas repetidas dentro do TTL não vão à rede"""
+        with GitHubMCPTools(base_url=fake_github, cache=cache) as tools:
+            first = tools.get_repository_info("org", "repo1")
+            second = tools.get_repository_info("org", "repo1")
+
+        assert first == second
+        assert len(FakeGitHubHandler.requests) == 1
+        assert cache.stats["hits"] == 1
+
+    def test_stale_entry_revalidates_with_etag(self, fake_github, tmp_path):
+        """Testa revalidação com If-None-Match e resposta 304"""
+        cache = HTTPResponseCache(str(tmp_path / "http_cache.db"), ttl=0)
+        with GitHubMCPTools(base_url=fake_github, cache=cache) as tools:
+            first = tools.get_repository_info("org", "repo1")
+            second = tools.get_repository_info("org", "repo1")
+
+        assert second == first
+        assert len(FakeGitHubHandler.requests) == 2
+        assert FakeGitHubHandler.not_modified == 1
+        assert cache.stats["revalidated"] == 1
+
+    def test_cache_persists_on_disk(self, fake_github, tmp_path):
+        """Testa se outra instância reaproveita as respostas gravadas no SQLite"""
+        db_path = str(tmp_path / "http_cache.db")
+        with GitHubMCPTools(base_url=fake_github, cache=HTTPResponseCache(db_path)) as tools:
+            tools.get_repository_info("org", "repo1")
+
+        with GitHubMCPTools(base_url=fake_github, cache=HTTPResponseCache(db_path)) as tools:
+            result = tools.get_repository_info("org", "repo1")
+
+        assert result["repository"]["name"] == "org/repo1"
+        assert len(FakeGitHubHandler.requests) == 1
+
+    def test_errors_are_not_cached(self, fake_github, cache):
+        """Testa se respostas de erro não entram no cache"""
+        with GitHubMCPTools(base_url=fake_github, cache=cache) as tools:
+            tools.get_repository_info("org", "missing")
+            tools.get_repository_info("org", "missing")
+
+        assert len(FakeGitHubHandler.requests) == 2
+
+    def test_tokens_do_not_share_entries(self, fake_github, cache):
+        """Testa se respostas autenticadas não vazam para outro token"""
+        with GitHubMCPTools(token="a", base_url=fake_github, cache=cache) as tools:
+            tools.get_repository_info("org", "repo1")
+        with GitHubMCPTools(token="b", base_url=fake_github, cache=cache) as tools:
+            tools.get_repository_info("org", "repo1")
+
+        assert len(FakeGitHubHandler.requests) == 2
+
+
+class TestPagination:
+    """Testes da paginação por cabeçalho Link"""
+
+    @staticmethod
+    def pages_requested() -> list:
+        return [
+            int(parse_qs(urlparse(path).query).get("page", ["1"])[0])
+            for path in FakeGitHubHandler.requests
+            if path.startswith("/repos/org/big/issues")
+        ]
+
+    def test_iterates_all_pages(self, fake_github, cache):
+        """Testa se o gerador percorre todas as páginas e descarta pull requests"""
+        with GitHubMCPTools(base_url=fake_github, cache=cache) as tools:
+            issues = list(tools.iter_repository_issues("org", "big"))
+
+        numbers = [issue["number"] for issue in issues]
+        assert numbers == [n for n in range(1, PAGINATED_TOTAL + 1) if n % 5]
+        assert sorted(self.pages_requested()) == [1, 2, 3]
+
+    def test_max_items_budget(self, fake_github, cache):
+        """Testa se o orçamento limita os registros e as páginas buscadas"""
+        with GitHubMCPTools(base_url=fake_github, cache=cache) as tools:
+            issues = list(tools.iter_repository_issues("org", "big", max_items=30))
+
+        assert len(issues) == 30
+        # 30 por página: a 2ª completa o orçamento e no máximo a 3ª é pré-buscada
+        assert max(self.pages_requested()) <= 3
+
+    def test_next_page_is_prefetched(self, fake_github, cache, monkeypatch):
+        """Testa se a próxima página é pedida enquanto a atual é consumida"""
+        monkeypatch.setattr(FakeGitHubHandler, "delay", 0.1)
+        with GitHubMCPTools(base_url=fake_github, cache=cache) as tools:
+            issues = tools.iter_repository_issues("org", "big")
+            next(issues)
+
+            deadline = time.monotonic() + 2
+            while 2 not in self.pages_requested() and time.monotonic() < deadline:
+                time.sleep(0.01)
+            assert 2 in self.pages_requested()
+            issues.close()
+
+    def test_error_mid_iteration(self, fake_github, cache):
+        """Testa erro em uma página intermediária"""
+        with GitHubMCPTools(base_url=fake_github, cache=cache) as tools:
+            with pytest.raises(GitHubAPIError) as excinfo:
+                list(tools.iter_repository_issues("org", "broken"))
+            result = tools.get_repository_issues("org", "broken", max_items=500)
+
+        assert excinfo.value.status_code == 500
+        assert result["status"] == "error"
+
+    def test_tools_follow_pages_with_budget(self, fake_github, cache):
+        """Testa get_repository_issues e search_repositories com max_items"""
+        with GitHubMCPTools(base_url=fake_github, cache=cache) as tools:
+            issues = tools.get_repository_issues("org", "big", max_items=150)
+            search = tools.search_repositories("many", max_items=150)
+            FakeGitHubHandler.requests.clear()
+            default = tools.get_repository_issues("org", "big")
+
+        assert issues["count"] == 150
+        assert len(search["repositories"]) == 150
+        assert search["total_count"] == PAGINATED_TOTAL
+        # Sem max_items: uma única página (10 itens, 2 deles pull requests)
+        assert default["count"] == 8
+        assert self.pages_requested() == [1]
+
+    def test_page_budget(self, fake_github, cache, monkeypatch):
+        """Testa se max_pages limita as requisições mesmo sem completar max_items"""
+        with GitHubMCPTools(base_url=fake_github, cache=cache) as tools:
+            issues = list(tools.iter_repository_issues("org", "big", per_page=20, max_items=200, max_pages=2))
+        assert len(issues) == 32
+        assert sorted(self.pages_requested()) == [1, 2]
+
+        # Página de 100 itens com 20 pull requests: o orçamento de 1 página para em 80
+        monkeypatch.setattr("app.mcp.github_mcp.MAX_PAGES_PER_CALL", 1)
+        FakeGitHubHandler.requests.clear()
+        with GitHubMCPTools(base_url=fake_github, cache=cache) as tools:
+            result = tools.get_repository_issues("org", "big", max_items=100)
+        assert result["count"] == 80
+        assert self.pages_requested() == [1]
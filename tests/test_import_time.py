@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Regressão de tempo de importação e efeitos colaterais (python -X importtime)
+"""
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+project_root = Path(__file__).parent.parent
+
+# Módulos que devem ser baratos e sem efeitos colaterais na importação
+LIGHT_MODULES = [
+    "app.config.gemini_simple",
+    "app.config.gemini_advanced",
+    "app.agents.teams_manager",
+    "app.backend.agno_teams_playground",
+]
+
+# Bibliotecas pesadas que só devem ser carregadas no primeiro uso
+HEAVY_PACKAGES = ("agno", "google.genai", "pandas", "httpx")
+
+# Orçamento generoso de importação (antes: ~1-2 s por módulo)
+IMPORT_BUDGET_US = 300_000
+
+PROBE = """
+import json, os, sys
+before = dict(os.environ)
+import {module}
+print(json.dumps({{
+    "env_changed": sorted(k for k in set(before) | set(os.environ) if before.get(k) != os.environ.get(k)),
+    "heavy_loaded": sorted(m for m in sys.modules if any(m == p or m.startswith(p + ".") for p in {heavy!r})),
+}}))
+"""
+
+
+def profile_import(module: str, cwd: Path) -> dict:
+    """Importa o módulo num processo novo com -X importtime e retorna o perfil"""
+    env = dict(os.environ, PYTHONPATH=str(project_root), GOOGLE_API_KEY="test-key-for-testing")
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", PROBE.format(module=module, heavy=HEAVY_PACKAGES)],
+        capture_output=True, text=True, cwd=cwd, env=env, timeout=60,
+    )
+    assert result.returncode == 0, result.stderr[-2000:]
+
+    cumulative_us = None
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = [field.strip() for field in line[len("import time:"):].split("|")]
+        if fields[2] == module:
+            cumulative_us = int(fields[1])
+
+    profile = json.loads(result.stdout.strip().splitlines()[-1])
+    profile["cumulative_us"] = cumulative_us
+    return profile
+
+
+@pytest.mark.parametrize("module", LIGHT_MODULES)
+class TestImportTime:
+    """Importar módulos de configuração e teams não deve inicializar nada"""
+
+    def test_no_heavy_imports(self, module, tmp_path):
+        """Testa se agno/google-genai/pandas não são carregados na importação"""
+        profile = profile_import(module, tmp_path)
+        assert profile["heavy_loaded"] == []
+
+    def test_no_environment_changes(self, module, tmp_path):
+        """Testa se a importação não altera os.environ"""
+        profile = profile_import(module, tmp_path)
+        assert profile["env_changed"] == []
+
+    def test_no_storage_created(self, module, tmp_path):
+        """Testa se a importação não cria bancos SQLite nem diretórios de storage"""
+        profile_import(module, tmp_path)
+        assert list(tmp_path.iterdir()) == []
+
+    def test_import_time_budget(self, module, tmp_path):
+        """Testa se o tempo cumulativo de importação fica dentro do orçamento"""
+        profile = profile_import(module, tmp_path)
+        assert profile["cumulative_us"] is not None
+        assert profile["cumulative_us"] < IMPORT_BUDGET_US, (
+            f"{module} levou {profile['cumulative_us'] / 1000:.0f} ms para importar"
+        )
@@ -0,0 +1,392 @@
+#!/usr/bin/env python3
+"""
+Testes das ferramentas MCP contra servidores MCP locais de teste
+"""
+
+import json
+import socket
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+# Adicionar o diretório raiz ao path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.mcp import mcp_tools
+from app.mcp.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+from app.mcp.mcp_tools import MCPTools
+from app.mcp.registry import MCPServerRegistry
+
+
+class StubMCPHandler(BaseHTTPRequestHandler):
+    """Servidor MCP de teste; ``delay`` atrasa /health e ``call_delay`` atrasa /slow"""
+
+    protocol_version = "HTTP/1.1"
+
+    def send_json(self, status: int, payload) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        self.server.requests.append(self.path)
+        self.server.connections.add(self.client_address)
+        if self.path == "/health":
+            time.sleep(self.server.delay)
+            self.send_json(200, {"status": "ok"})
+        elif self.path == "/slow":
+            time.sleep(self.server.call_delay)
+            self.send_json(200, {"path": self.path})
+        elif self.path == "/fail":
+            self.send_json(500, {"error": "falha"})
+        else:
+            self.send_json(200, {"path": self.path})
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"null")
+        self.server.requests.append(self.path)
+        self.server.connections.add(self.client_address)
+        if self.path == "/rpc":
+            if not self.server.jsonrpc:
+                self.send_json(404, {"error": "not found"})
+                return
+            replies = []
+            for request in body:
+                if request["method"] == "fail":
+                    replies.append({"jsonrpc": "2.0", "id": request["id"],
+                                    "error": {"code": -32000, "message": "falhou"}})
+                else:
+                    replies.append({"jsonrpc": "2.0", "id": request["id"],
+                                    "result": {"method": request["method"], "echo": request["params"]}})
+            # Respostas de lote podem vir em qualquer ordem
+            self.send_json(200, list(reversed(replies)))
+        else:
+            self.send_json(200, {"path": self.path, "echo": body})
+
+    def log_message(self, *args):
+        pass
+
+
+class QuietHTTPServer(ThreadingHTTPServer):
+    """Não imprime BrokenPipe quando o cliente desiste por timeout"""
+
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        pass
+
+
+@pytest.fixture
+def start_server():
+    """Fábrica de servidores MCP locais; retorna a porta"""
+    servers = []
+
+    def start(delay: float = 0.0, call_delay: float = 0.0, jsonrpc: bool = False) -> ThreadingHTTPServer:
+        server = QuietHTTPServer(("127.0.0.1", 0), StubMCPHandler)
+        server.delay = delay
+        server.call_delay = call_delay
+        server.jsonrpc = jsonrpc
+        server.requests = []
+        server.connections = set()
+        threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True).start()
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.fixture
+def make_tools(tmp_path):
+    """Fábrica de MCPTools com registro isolado em um diretório temporário"""
+    created = []
+
+    def make(**kwargs) -> MCPTools:
+        kwargs.setdefault("registry", MCPServerRegistry(str(tmp_path / "mcp_servers.json")))
+        tools = MCPTools(**kwargs)
+        created.append(tools)
+        return tools
+
+    yield make
+    for tools in created:
+        tools.close()
+
+
+def free_port() -> int:
+    """Porta local sem ninguém escutando (servidor fora do ar)"""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def health_requests(server) -> int:
+    return server.requests.count("/health")
+
+
+class TestHealthCheck:
+    """Testes do health check concorrente"""
+
+    def test_probes_run_concurrently_with_deadline(self, start_server, make_tools):
+        """Testa se servidores lentos e fora do ar não bloqueiam além do prazo"""
+        tools = make_tools()
+        healthy = [start_server() for _ in range(5)]
+        slow = [start_server(delay=2.0) for _ in range(3)]
+        for i, server in enumerate(healthy + slow):
+            tools.mcp_servers[f"s{i}"] = f"http://127.0.0.1:{server.server_address[1]}"
+        for i in range(4):
+            tools.mcp_servers[f"down{i}"] = f"http://127.0.0.1:{free_port()}"
+
+        start = time.monotonic()
+        result = tools.check_mcp_health(deadline=0.5)
+        elapsed = time.monotonic() - start
+
+        statuses = {name: entry["status"] for name, entry in result["health_check"].items()}
+        assert elapsed < 1.5
+        assert list(statuses) == list(tools.mcp_servers)
+        assert all(statuses[f"s{i}"] == "healthy" for i in range(5))
+        assert all(statuses[f"s{i}"] == "timeout" for i in range(5, 8))
+        assert all(statuses[f"down{i}"] == "error" for i in range(4))
+
+    def test_results_cached_with_ttl(self, start_server, make_tools, monkeypatch):
+        """Testa se resultados recentes vêm do cache e expiram após o TTL"""
+        server = start_server()
+        tools = make_tools()
+        tools.mcp_servers["s"] = f"http://127.0.0.1:{server.server_address[1]}"
+
+        first = tools.check_mcp_health("s")["health_check"]["s"]
+        second = tools.check_mcp_health("s")["health_check"]["s"]
+        assert "cached" not in first
+        assert second["cached"] is True
+        assert health_requests(server) == 1
+
+        monkeypatch.setattr(mcp_tools, "HEALTH_TTL", 0)
+        tools.check_mcp_health("s")
+        assert health_requests(server) == 2
+
+    def test_late_probe_warms_cache(self, start_server, make_tools):
+        """Testa se uma sonda que estourou o prazo atualiza o cache ao terminar"""
+        server = start_server(delay=0.5)
+        tools = make_tools()
+        tools.mcp_servers["s"] = f"http://127.0.0.1:{server.server_address[1]}"
+
+        assert tools.check_mcp_health("s", deadline=0.1)["health_check"]["s"]["status"] == "timeout"
+        time.sleep(0.8)
+        entry = tools.check_mcp_health("s", deadline=0.1)["health_check"]["s"]
+        assert entry["status"] == "healthy"
+        assert entry["cached"] is True
+
+    def test_background_refresher(self, start_server, make_tools):
+        """Testa se o refresher mantém o health quente sem chamadas explícitas"""
+        server = start_server()
+        tools = make_tools(health_refresh_interval=0.1)
+        port = server.server_address[1]
+        assert tools.register_mcp_server("s", "127.0.0.1", port)["status"] == "success"
+
+        try:
+            time.sleep(0.5)
+            assert health_requests(server) >= 3
+            entry = tools.check_mcp_health("s")["health_check"]["s"]
+            assert entry["cached"] is True
+        finally:
+            tools.stop_health_refresher()
+
+    def test_refresher_starts_for_reloaded_servers(self, start_server, make_tools):
+        """Testa se servidores recarregados do registro ficam quentes sem novo registro"""
+        server = start_server()
+        make_tools().register_mcp_server("s", "127.0.0.1", server.server_address[1])
+        before = health_requests(server)
+
+        restarted = make_tools(health_refresh_interval=0.1)
+        assert restarted.list_mcp_servers()["servers"] == ["s"]
+        time.sleep(0.5)
+        assert health_requests(server) - before >= 3
+        assert restarted.check_mcp_health("s")["health_check"]["s"]["cached"] is True
+
+    def test_close_shuts_down_probe_pool(self, start_server, make_tools):
+        """Testa se close() encerra as threads do pool de sondas"""
+        server = start_server()
+        tools = make_tools()
+        tools.register_mcp_server("s", "127.0.0.1", server.server_address[1])
+        tools.check_mcp_health(use_cache=False)
+        executor = tools._health_executor
+        assert executor is not None
+
+        tools.close()
+        assert tools._health_executor is None
+        for thread in list(executor._threads):
+            thread.join(timeout=2)
+            assert not thread.is_alive()
+
+    def test_unknown_server(self, make_tools):
+        """Testa servidor não registrado"""
+        result = make_tools().check_mcp_health("nao_existe")
+        assert result["health_check"]["nao_existe"] == {"status": "not_found"}
+
+
+class TestRegistry:
+    """Testes do registro persistente de servidores"""
+
+    def test_registry_survives_restart(self, start_server, make_tools):
+        """Testa se os servidores registrados são recarregados em outra instância"""
+        server = start_server()
+        port = server.server_address[1]
+        make_tools().register_mcp_server("s", "127.0.0.1", port)
+
+        restarted = make_tools()
+        assert restarted.list_mcp_servers()["servers"] == ["s"]
+        assert restarted.call_mcp_service("s", "/tools")["data"] == {"path": "/tools"}
+
+    def test_unregister(self, start_server, make_tools):
+        """Testa se a remoção também é persistida"""
+        server = start_server()
+        tools = make_tools()
+        tools.register_mcp_server("s", "127.0.0.1", server.server_address[1])
+
+        assert tools.unregister_mcp_server("s")["status"] == "success"
+        assert make_tools().list_mcp_servers()["count"] == 0
+        assert tools.unregister_mcp_server("s")["status"] == "error"
+
+    def test_corrupted_registry_file(self, tmp_path):
+        """Testa se um arquivo de registro inválido é tratado como vazio"""
+        path = tmp_path / "mcp_servers.json"
+        path.write_text("{nao é json")
+        assert MCPServerRegistry(str(path)).load() == {}
+
+
+class TestConnectionReuse:
+    """Testes das sessões com pool por servidor"""
+
+    def test_calls_reuse_connection(self, start_server, make_tools):
+        """Testa se chamadas seguidas usam a mesma conexão keep-alive"""
+        server = start_server()
+        tools = make_tools(persist=False)
+        tools.register_mcp_server("s", "127.0.0.1", server.server_address[1])
+
+        for i in range(5):
+            result = tools.call_mcp_service("s", f"/tool/{i}", {"i": i})
+            assert result["data"]["echo"] == {"i": i}
+
+        assert len(server.connections) == 1
+
+
+class TestCircuitBreaker:
+    """Testes do circuit breaker"""
+
+    def test_state_transitions(self):
+        """Testa abertura após falhas, teste half-open único e fechamento"""
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.1)
+        breaker.record_failure()
+        assert breaker.state == CLOSED
+        breaker.record_failure()
+        assert breaker.state == OPEN
+        assert breaker.allow() is False
+
+        time.sleep(0.15)
+        assert breaker.state == HALF_OPEN
+        assert breaker.allow() is True
+        assert breaker.allow() is False  # apenas uma chamada de teste
+        breaker.record_failure()
+        assert breaker.state == OPEN
+
+        time.sleep(0.15)
+        assert breaker.allow() is True
+        breaker.record_success()
+        assert breaker.state == CLOSED
+
+    def test_slow_server_fails_fast(self, start_server, make_tools, monkeypatch):
+        """Testa se, com o circuito aberto, as chamadas não esperam o timeout"""
+        monkeypatch.setattr(mcp_tools, "CALL_TIMEOUT", 0.2)
+        server = start_server(call_delay=1.0)
+        tools = make_tools(persist=False)
+        tools.register_mcp_server("s", "127.0.0.1", server.server_address[1])
+
+        for _ in range(3):
+            assert tools.call_mcp_service("s", "/slow")["status"] == "error"
+        calls_before = server.requests.count("/slow")
+
+        start = time.monotonic()
+        result = tools.call_mcp_service("s", "/slow")
+        assert time.monotonic() - start < 0.05
+        assert result["circuit"] == OPEN
+        assert server.requests.count("/slow") == calls_before
+        assert tools.list_mcp_servers()["circuits"]["s"] == OPEN
+
+    def test_server_errors_open_circuit(self, start_server, make_tools):
+        """Testa se respostas 5xx contam como falha"""
+        server = start_server()
+        tools = make_tools(persist=False)
+        tools.register_mcp_server("s", "127.0.0.1", server.server_address[1])
+
+        for _ in range(3):
+            assert tools.call_mcp_service("s", "/fail")["status_code"] == 500
+        assert tools.call_mcp_service("s", "/tools")["circuit"] == OPEN
+
+
+class TestBatchCalls:
+    """Testes de call_mcp_batch"""
+
+    @pytest.fixture
+    def servers(self, start_server, make_tools):
+        """Um servidor com JSON-RPC em lote e outro só com endpoints HTTP"""
+        rpc, plain = start_server(jsonrpc=True), start_server()
+        tools = make_tools(persist=False)
+        tools.register_mcp_server("rpc", "127.0.0.1", rpc.server_address[1])
+        tools.register_mcp_server("plain", "127.0.0.1", plain.server_address[1])
+        return tools, rpc, plain
+
+    def test_results_in_order(self, servers):
+        """Testa se os resultados seguem a ordem das chamadas, intercalando servidores"""
+        tools, rpc, plain = servers
+        calls = [
+            ("rpc", "tools/list", None),
+            ("plain", "/resources", {"a": 1}),
+            ("rpc", "/echo", {"x": 2}),
+            {"server": "plain", "endpoint": "/prompts"},
+            ["rpc", "fail"],
+        ]
+        result = tools.call_mcp_batch(calls)
+
+        data = [r.get("data") for r in result["results"]]
+        assert data[0] == {"method": "tools/list", "echo": {}}
+        assert data[1] == {"path": "/resources", "echo": {"a": 1}}
+        assert data[2] == {"method": "echo", "echo": {"x": 2}}
+        assert data[3] == {"path": "/prompts"}
+        assert result["results"][4]["status"] == "error"
+        assert result["errors"] == 1
+
+    def test_jsonrpc_server_gets_single_request(self, servers):
+        """Testa se um servidor com JSON-RPC recebe o lote em uma única requisição"""
+        tools, rpc, _ = servers
+        tools.call_mcp_batch([("rpc", f"tool{i}", {"i": i}) for i in range(10)])
+
+        assert rpc.requests.count("/rpc") == 1
+
+    def test_fallback_reuses_connection(self, servers):
+        """Testa o modo sem JSON-RPC: chamadas individuais na mesma conexão"""
+        tools, _, plain = servers
+        tools.call_mcp_batch([("plain", f"/tool{i}", {"i": i}) for i in range(5)])
+        tools.call_mcp_batch([("plain", f"/tool{i}", {"i": i}) for i in range(5)])
+
+        # O endpoint de lote só é testado uma vez por servidor
+        assert plain.requests.count("/rpc") == 1
+        assert sum(path.startswith("/tool") for path in plain.requests) == 10
+        assert len(plain.connections) == 1
+
+    def test_unknown_server_and_invalid_call(self, servers):
+        """Testa servidor desconhecido e chamada malformada"""
+        tools, _, _ = servers
+        result = tools.call_mcp_batch([("nao_existe", "/x"), ("rpc", "a")])
+        assert "não encontrado" in result["results"][0]["message"]
+        assert result["results"][1]["status"] == "success"
+
+        assert tools.call_mcp_batch([("so_servidor",)])["status"] == "error"
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Testes do motor de consultas por dataset_id (pandas em blocos, DuckDB e Polars)
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Adicionar o diretório raiz ao path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.tools.data_tools_simple import DataAnalysisTools, DataFrameCache
+from app.tools.dataset_store import DatasetStore
+from app.tools import query_engine
+from app.tools.query_engine import (
+    PandasEngine,
+    QueryError,
+    create_query_engine,
+)
+from app.tools.summaries import SummaryStore
+
+DATASET_ID = "ds_" + "a" * 16
+
+
+@pytest.fixture
+def sales_df():
+    """Vendas com NaN, texto e valores inteiros"""
+    rng = np.random.default_rng(21)
+    n = 5_000
+    df = pd.DataFrame({
+        "regiao": rng.choice(["Norte", "Sul", "Leste"], n),
+        "unidades": rng.integers(0, 100, n),
+        "preco": rng.normal(50, 10, n),
+        "desconto": rng.normal(0, 1, n),
+    })
+    df["receita"] = df["unidades"] * df["preco"]
+    df.loc[::7, "desconto"] = np.nan
+    return df
+
+
+@pytest.fixture(params=[False, True], ids=["npy", "arrow"])
+def store(request, tmp_path, sales_df):
+    """Store npy e Arrow IPC (o Arrow exercita o memory-map do DuckDB e o scan_ipc do Polars)"""
+    if request.param:
+        pytest.importorskip("pyarrow")
+    store = DatasetStore(str(tmp_path / "datasets"), use_arrow=request.param)
+    store.put_dataframe(DATASET_ID, sales_df)
+    return store
+
+
+@pytest.fixture(params=["duckdb", "polars", "pandas"])
+def engine(request, store):
+    """Os três motores (DuckDB e Polars pulados se não instalados); o pandas com blocos pequenos"""
+    if request.param != "pandas":
+        pytest.importorskip(request.param)
+    engine = create_query_engine(store, request.param)
+    if isinstance(engine, PandasEngine):
+        engine.chunk_rows = 777
+    return engine
+
+
+class TestQueryEngine:
+    """Resultados dos motores comparados com pandas em memória"""
+
+    def test_describe_matches_pandas(self, engine, sales_df):
+        """Testa count/mean/std/min/max/quantis"""
+        stats = engine.describe(DATASET_ID)
+
+        assert set(stats) == {"unidades", "preco", "desconto", "receita"}
+        for column, values in stats.items():
+            expected = sales_df[column]
+            assert values["count"] == expected.count()
+            assert values["mean"] == pytest.approx(expected.mean())
+            assert values["std"] == pytest.approx(expected.std())
+            assert values["min"] == pytest.approx(expected.min())
+            assert values["median"] == pytest.approx(expected.median())
+            assert values["q75"] == pytest.approx(expected.quantile(0.75))
+
+    def test_correlation_matches_pandas(self, engine, sales_df):
+        """Testa Pearson com pares completos (coluna com NaN)"""
+        corr = engine.correlation(DATASET_ID)
+        expected = sales_df.select_dtypes(include=[np.number]).corr()
+
+        np.testing.assert_allclose(corr.loc[expected.index, expected.columns], expected, atol=1e-9)
+
+    def test_correlation_constant_columns(self, engine, store):
+        """Testa se colunas constantes não exatas (0.1) ficam NaN, como em df.corr()"""
+        rng = np.random.default_rng(5)
+        frame = pd.DataFrame({
+            "a": np.full(1000, 0.1),
+            "b": rng.normal(size=1000),
+            "c": np.full(1000, 0.3),
+            "d": np.full(1000, 0.7),
+        })
+        frame.loc[::3, "b"] = np.nan
+        dataset_id = "ds_" + "c" * 16
+        store.put_dataframe(dataset_id, frame)
+        if isinstance(engine, PandasEngine):
+            engine.chunk_rows = 300
+
+        corr = engine.correlation(dataset_id)
+        expected = frame.corr()
+
+        np.testing.assert_allclose(corr.loc[expected.index, expected.columns], expected, atol=1e-9)
+        assert corr.loc["b", "b"] == pytest.approx(1.0)
+        assert np.isnan(corr.loc["a", "b"]) and np.isnan(corr.loc["c", "d"])
+
+    def test_correlation_wide_table_in_chunks(self, engine, store, monkeypatch):
+        """Testa a matriz de uma tabela larga acumulada em vários blocos de linhas"""
+        rng = np.random.default_rng(8)
+        base = rng.normal(size=(1500, 4))
+        frame = pd.DataFrame(
+            base[:, [i % 4 for i in range(60)]] + rng.normal(scale=0.5, size=(1500, 60)),
+            columns=[f"c{i}" for i in range(60)]
+        )
+        frame.loc[::11, "c3"] = np.nan
+        dataset_id = "ds_" + "d" * 16
+        store.put_dataframe(dataset_id, frame)
+        # ~100 linhas por bloco: 15 blocos (DuckDB arredonda para vetores de 2048 linhas)
+        monkeypatch.setattr(query_engine, "CORRELATION_CHUNK_VALUES", 6_000)
+
+        corr = engine.correlation(dataset_id)
+
+        np.testing.assert_allclose(corr.loc[frame.columns, frame.columns], frame.corr(), atol=1e-9)
+
+    def test_group_by_aggregations(self, engine, sales_df):
+        """Testa filtros + group_by + várias agregações"""
+        result = engine.query(
+            DATASET_ID,
+            filters=[["unidades", ">=", 10], ["regiao", "in", ["Norte", "Sul"]]],
+            group_by=["regiao"],
+            aggregations={"*": "count", "receita": ["sum", "mean"], "desconto": "count"},
+        )
+
+        filtered = sales_df[(sales_df["unidades"] >= 10) & sales_df["regiao"].isin(["Norte", "Sul"])]
+        expected = filtered.groupby("regiao").agg(
+            count=("regiao", "size"), receita_sum=("receita", "sum"),
+            receita_mean=("receita", "mean"), desconto_count=("desconto", "count"),
+        ).reset_index()
+
+        assert result["regiao"].astype(str).tolist() == ["Norte", "Sul"]
+        np.testing.assert_array_equal(result["count"], expected["count"])
+        np.testing.assert_allclose(result["receita_sum"], expected["receita_sum"])
+        np.testing.assert_allclose(result["receita_mean"], expected["receita_mean"])
+        np.testing.assert_array_equal(result["desconto_count"], expected["desconto_count"])
+
+    def test_filtered_rows_and_totals(self, engine, sales_df):
+        """Testa seleção de linhas com limite e agregação sem agrupamento"""
+        rows = engine.query(DATASET_ID, filters=[["desconto", "is null"]], columns=["preco"], limit=10)
+        assert rows.columns.tolist() == ["preco"] and len(rows) == 10
+        np.testing.assert_allclose(rows["preco"], sales_df.loc[sales_df["desconto"].isna(), "preco"].head(10))
+
+        total = engine.query(DATASET_ID, aggregations={"unidades": ["min", "max"], "*": "count"})
+        assert total.loc[0, "count"] == len(sales_df)
+        assert total.loc[0, "unidades_max"] == sales_df["unidades"].max()
+
+    def test_invalid_queries(self, engine):
+        """Testa as mensagens de erro de consultas inválidas"""
+        with pytest.raises(QueryError, match="Colunas não encontradas"):
+            engine.query(DATASET_ID, filters=[["nao_existe", "==", 1]])
+        with pytest.raises(QueryError, match="Operador"):
+            engine.query(DATASET_ID, filters=[["preco", "~", 1]])
+        with pytest.raises(QueryError, match="Agregação"):
+            engine.query(DATASET_ID, aggregations={"preco": "median"})
+        with pytest.raises(QueryError, match="group_by"):
+            engine.query(DATASET_ID, group_by=["regiao"])
+
+    def test_engines_implement_interface(self):
+        """Testa se a interface é abstrata e um motor incompleto não pode ser criado"""
+        class IncompleteEngine(query_engine.QueryEngine):
+            def describe(self, dataset_id, columns=None):
+                return {}
+
+        for cls in (query_engine.QueryEngine, IncompleteEngine):
+            with pytest.raises(TypeError):
+                cls()
+        assert isinstance(query_engine.PandasEngine(), query_engine.QueryEngine)
+
+
+class TestDataToolsIntegration:
+    """As ferramentas de dados usam o motor para datasets persistidos"""
+
+    def test_tools_use_engine_for_stored_dataset(self, tmp_path, store, sales_df):
+        """Testa statistical_summary, correlation_analysis e query_dataset pelo ID"""
+        tools = DataAnalysisTools(engine=PandasEngine(store, chunk_rows=1_000),
+                                  summaries=SummaryStore(str(tmp_path / "summaries")))
+        tools.cache = DataFrameCache(store=store)
+
+        summary = tools.statistical_summary(DATASET_ID)
+        assert summary["success"] is True and summary["engine"] == "pandas"
+        assert summary["statistics"]["preco"]["mean"] == pytest.approx(sales_df["preco"].mean())
+
+        correlations = tools.correlation_analysis(DATASET_ID, top_k=3)
+        assert correlations["success"] is True and len(correlations["correlations"]) == 3
+
+        result = tools.query_dataset(DATASET_ID, group_by=["regiao"], aggregations={"*": "count"})
+        assert result["success"] is True
+        assert sum(row["count"] for row in result["rows"]) == len(sales_df)
+        assert len(tools.cache) == 0
+
+    def test_query_dataset_on_csv_text(self, sample_csv_content):
+        """Testa query_dataset com o CSV colado no chat"""
+        tools = DataAnalysisTools()
+
+        result = tools.query_dataset(
+            sample_csv_content, filters=[["departamento", "==", "TI"]], aggregations={"salario": "mean"}
+        )
+        assert result["success"] is True
+        assert result["rows"][0]["salario_mean"] == pytest.approx((5500.50 + 5800.00) / 2)
+
+        error = tools.query_dataset(sample_csv_content, filters=[["x", "==", 1]])
+        assert error["success"] is False and "Colunas não encontradas" in error["error"]
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Testes dos resumos estatísticos mescláveis e da atualização incremental
+"""
+
+import io
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Adicionar o diretório raiz ao path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.tools import summaries as summaries_module
+from app.tools.data_tools_simple import DataAnalysisTools, DataFrameCache
+from app.tools.dataset_store import DatasetStore
+from app.tools.summaries import DatasetSummary, SummaryStore
+
+
+def _stock_frame(days: int = 5_000, seed: int = 3) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "data": pd.date_range("2010-01-01", periods=days).strftime("%Y-%m-%d"),
+        "acao": rng.choice(["PETR4", "VALE3", "ITUB4"], days),
+        "preco_fechamento": (30 + rng.normal(0, 1, days).cumsum()).round(2),
+        "volume": rng.integers(1_000_000, 20_000_000, days),
+    })
+
+
+STOCKS = _stock_frame()
+
+
+def stock_csv(days: int) -> str:
+    """Primeiros ``days`` dias de um CSV de cotações no estilo de acoes_exemplo.csv"""
+    return STOCKS.head(days).to_csv(index=False)
+
+
+@pytest.fixture
+def summary_store(tmp_path):
+    return SummaryStore(str(tmp_path / "summaries"))
+
+
+@pytest.fixture
+def tools(summary_store):
+    return DataAnalysisTools(summaries=summary_store)
+
+
+class TestDatasetSummary:
+    """Testes do estado mesclável"""
+
+    def test_merge_matches_full_scan(self):
+        """Testa se resumir em duas partes equivale a resumir tudo"""
+        df = pd.read_csv(io.StringIO(stock_csv(3_000)))
+        merged = DatasetSummary.from_frame(df.iloc[:2_000])
+        merged.update(df.iloc[2_000:])
+
+        stats = merged.compute_statistics()
+        assert merged.rows == len(df)
+        for column in ("preco_fechamento", "volume"):
+            assert stats[column]["count"] == df[column].count()
+            assert stats[column]["mean"] == pytest.approx(df[column].mean())
+            assert stats[column]["std"] == pytest.approx(df[column].std())
+            assert stats[column]["max"] == df[column].max()
+            # Erro do sketch KLL é de rank: a mediana estimada fica perto do rank 0.5
+            assert (df[column] <= stats[column]["median"]).mean() == pytest.approx(0.5, abs=0.02)
+
+    def test_json_roundtrip(self, summary_store):
+        """Testa se o resumo sobrevive à gravação em disco"""
+        summary = DatasetSummary.from_frame(pd.read_csv(io.StringIO(stock_csv(50))), source_bytes=123)
+        summary.statistics = summary.compute_statistics()
+        summary_store.put("ds_" + "1" * 16, summary)
+
+        loaded = summary_store.get("ds_" + "1" * 16)
+        assert loaded.to_dict() == summary.to_dict()
+        assert summary_store.get("ds_" + "2" * 16) is None
+
+
+class TestIncrementalSummary:
+    """Testes da detecção de prefixo e da mescla só das linhas novas"""
+
+    def test_appended_rows_are_merged(self, tools, summary_store, monkeypatch):
+        """Testa se um CSV estendido lê apenas o trecho novo"""
+        base, extended = stock_csv(500), stock_csv(520)
+        assert extended.startswith(base)
+        tools.statistical_summary(base)
+        expected = pd.read_csv(io.StringIO(extended))
+
+        parsed_rows = []
+        original_read_csv = pd.read_csv
+
+        def counting_read_csv(*args, **kwargs):
+            for chunk in original_read_csv(*args, **kwargs):
+                parsed_rows.append(len(chunk))
+                yield chunk
+
+        monkeypatch.setattr(summaries_module.pd, "read_csv", counting_read_csv)
+        result = tools.statistical_summary(extended)
+
+        assert result["incremental"] is True
+        assert result["base_dataset_id"] == DataFrameCache.dataset_id_for(base)
+        assert result["new_rows"] == 20
+        assert sum(parsed_rows) == 20
+        assert DataFrameCache.dataset_id_for(extended) not in tools.cache
+        volume = result["statistics"]["volume"]
+        assert volume["count"] == len(expected)
+        assert volume["mean"] == pytest.approx(expected["volume"].mean())
+        assert volume["min"] == expected["volume"].min()
+
+        # Reenviar o mesmo arquivo reaproveita o resumo gravado
+        assert tools.statistical_summary(extended)["statistics"] == result["statistics"]
+
+    def test_longest_prefix_wins(self, tools, summary_store):
+        """Testa se, com várias versões conhecidas, a mais recente é usada"""
+        for days in (100, 110):
+            tools.statistical_summary(stock_csv(days))
+
+        result = tools.statistical_summary(stock_csv(115))
+        assert result["base_dataset_id"] == DataFrameCache.dataset_id_for(stock_csv(110))
+        assert result["new_rows"] == 5
+
+    def test_changed_rows_fall_back_to_full_scan(self, tools):
+        """Testa se conteúdo alterado (não só acrescentado) é recalculado do zero"""
+        base = stock_csv(100)
+        tools.statistical_summary(base)
+
+        # Última linha do original foi editada: não é mais prefixo
+        changed = base[:-3] + "999\n" + stock_csv(110)[len(base):]
+        result = tools.statistical_summary(changed)
+        assert "incremental" not in result
+        assert result["statistics"]["volume"]["count"] == 110
+
+        # Sem quebra de linha no fim do original: a linha foi estendida, não acrescentada
+        partial = base.rstrip("\n")
+        tools.statistical_summary(partial)
+        assert "incremental" not in tools.statistical_summary(partial + "0\n")
+
+    def test_field_count_mismatch_falls_back_to_full_scan(self, tools, summary_store):
+        """Testa se linhas novas com outro número de campos não são mescladas"""
+        base = stock_csv(100)
+        tools.statistical_summary(base)
+
+        for delta in ("2020-01-01,PETR4,30.5,1000000,extra\n", "2020-01-01,PETR4\n"):
+            source = io.BytesIO((base + delta).encode("utf-8"))
+            assert summary_store.extend(source, "ds_teste") is None
+            assert "incremental" not in tools.statistical_summary(base + delta)
+
+
+class TestUploadIncremental:
+    """Upload do mesmo CSV diário com linhas novas"""
+
+    def test_upload_extends_summary(self, tmp_path, summary_store):
+        pytest.importorskip("httpx")
+        pytest.importorskip("multipart")
+        from fastapi import FastAPI
+        from fastapi.testclient import TestClient
+
+        from app.backend.datasets_api import create_datasets_router
+
+        store = DatasetStore(str(tmp_path / "datasets"), use_arrow=False)
+        app = FastAPI()
+        app.include_router(create_datasets_router(store, summary_store))
+        client = TestClient(app)
+        tools = DataAnalysisTools(summaries=summary_store)
+        tools.cache = DataFrameCache(store=store)
+
+        def upload(content: str) -> dict:
+            files = {"file": ("acoes.csv", content.encode("utf-8"), "text/csv")}
+            return client.post("/v1/datasets", files=files).json()
+
+        first = upload(stock_csv(300))
+        assert "base_dataset_id" not in first
+        assert tools.statistical_summary(first["dataset_id"])["success"] is True
+
+        second = upload(stock_csv(301))
+        assert second["base_dataset_id"] == first["dataset_id"]
+        assert second["new_rows"] == 1
+
+        result = tools.statistical_summary(second["dataset_id"])
+        assert result["incremental"] is True
+        assert result["statistics"]["volume"]["count"] == 301
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Testes do gerenciador de teams
+"""
+
+import pytest
+import sys
+from pathlib import Path
+import os
+
+# Adicionar o diretório raiz ao path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+# Configurar variáveis de ambiente necessárias
+os.environ.setdefault("GOOGLE_API_KEY", "test-key-for-testing")
+
+try:
+    from app.agents import teams_manager as teams_module
+except ImportError as e:
+    pytest.skip(f"Gerenciador de teams não disponível: {e}", allow_module_level=True)
+
+
+@pytest.fixture
+def built_specialists(monkeypatch):
+    """Conta quantas vezes cada especialista é construído"""
+    built = []
+    for key, factory in list(teams_module.SPECIALIST_FACTORIES.items()):
+        def counting_factory(key=key, factory=factory):
+            built.append(key)
+            return factory()
+        monkeypatch.setitem(teams_module.SPECIALIST_FACTORIES, key, counting_factory)
+    return built
+
+
+@pytest.fixture
+def manager():
+    """Gerenciador sem memória persistente"""
+    return teams_module.AgnoTeamsManager(enable_memory=False, enable_history=False)
+
+
+class TestLazyTeams:
+    """Testes da construção sob demanda de teams e especialistas"""
+
+    def test_manager_builds_nothing_upfront(self, built_specialists, manager):
+        """Testa se criar o gerenciador não constrói teams nem especialistas"""
+        assert built_specialists == []
+        assert manager.teams == {}
+        assert set(manager.list_teams()) == {"main", "research", "development", "analysis"}
+
+    def test_team_built_on_first_use(self, built_specialists, manager):
+        """Testa se o team e seus especialistas são criados no primeiro acesso"""
+        team = manager.get_team("research")
+
+        assert team is not None
+        assert sorted(built_specialists) == ["data", "github", "web"]
+        assert manager.get_team("research") is team
+        assert sorted(built_specialists) == ["data", "github", "web"]
+
+    def test_specialists_shared_across_teams(self, built_specialists, manager):
+        """Testa se modelo e ferramentas do especialista são compartilhados, mas não o Agent"""
+        teams = manager.initialize_all_teams()
+
+        assert sorted(built_specialists) == sorted(teams_module.AVAILABLE_SPECIALISTS)
+        data_main = next(m for m in teams["main"].members if m.name == "Data Specialist")
+        data_analysis = next(m for m in teams["analysis"].members if m.name == "Data Specialist")
+        assert data_main is not data_analysis
+        assert data_main.model is data_analysis.model
+        assert [t.__self__ for t in data_main.tools] == [t.__self__ for t in data_analysis.tools]
+
+    def test_team_context_not_shared(self, manager):
+        """Testa se o contexto gravado pelo Team em um membro não aparece no de outro team"""
+        main = manager.get_team("main")
+        analysis = manager.get_team("analysis")
+        data_main = next(m for m in main.members if m.name == "Data Specialist")
+        data_analysis = next(m for m in analysis.members if m.name == "Data Specialist")
+
+        main.team_id = "team-main"
+        main.team_session_state = {"usuario": "a"}
+        main._initialize_member(data_main, session_id="sessao-main")
+
+        assert data_main.team_session_id == "sessao-main"
+        assert data_analysis.team_session_id is None
+        assert data_analysis.team_session_state is None
+        assert data_main.team_id == "team-main"
+        assert data_analysis.team_id is None
+
+    def test_custom_team_reuses_specialists(self, built_specialists, manager):
+        """Testa se teams customizados reaproveitam especialistas existentes"""
+        manager.get_team("analysis")
+        manager.create_custom_team("Dados", "coordinate", ["data", "finance"])
+
+        assert sorted(built_specialists) == ["data", "finance", "web"]
+        assert "dados" in manager.list_teams()
+
+    def test_invalid_specialist(self, manager):
+        """Testa erro para especialista desconhecido"""
+        with pytest.raises(ValueError):
+            manager.create_custom_team("X", "route", ["inexistente"])